@@ -12,22 +12,35 @@ Usage:
     python circuitpython/deploy.py --target valve-node --env nonprod
     python circuitpython/deploy.py --target display-node --env prod --source
     python circuitpython/deploy.py --target test --device /Volumes/CIRCUITPY
+    python circuitpython/deploy.py --target valve-node --env nonprod --source --incremental
+    python circuitpython/deploy.py --target valve-node --env nonprod --source --mpy
+    python circuitpython/deploy.py --target display-node --source --prune --code code.py
+    python circuitpython/deploy.py --fleet --source --incremental
 """
 
 import argparse
+import ast
+import fnmatch
 import glob
+import hashlib
 import json
 import os
+import re
 import shutil
+import subprocess
 import sys
+import threading
+import time
 import urllib.error
 import urllib.request
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Bundle configuration
 BUNDLE_VERSION = "9.x"
 BUNDLE_DATE = "20241224"  # Update this when downloading newer bundle
+BUNDLE_SHA256 = None  # SHA-256 of the bundle zip; pin it when updating BUNDLE_DATE
 BUNDLE_URL_TEMPLATE = (
     "https://github.com/adafruit/Adafruit_CircuitPython_Bundle/releases/download/"
     "{date}/adafruit-circuitpython-bundle-{version}-mpy-{date}.zip"
@@ -42,9 +55,40 @@ REQUIREMENTS_DIR = SCRIPT_DIR / "requirements"
 PROJECT_ROOT = SCRIPT_DIR.parent
 CONFIGS_DIR = SCRIPT_DIR / "configs"
 
+# Written to each device so fleet deploys know its target and environment
+DEVICE_MARKER = "poolio_target.json"
+FLEET_MOUNT_PATTERNS = (
+    "/Volumes/CIRCUITPY*",
+    "/media/*/CIRCUITPY*",
+    "/run/media/*/CIRCUITPY*",
+)
+
+# Downloaded archives, stored by SHA-256 (see fetch_cached)
+CACHE_DIR_NAME = "cache"
+DOWNLOAD_TIMEOUT = 60
+DOWNLOAD_CHUNK_SIZE = 65536
+
 # Valid environments
 VALID_ENVIRONMENTS = ("prod", "nonprod")
 
+# Incremental deploy manifest, kept in the root of CIRCUITPY
+MANIFEST_NAME = ".deploy_manifest.json"
+MANIFEST_VERSION = 1
+
+# Files never copied from the source trees
+SOURCE_IGNORE = ("__pycache__", "*.pyc", "*.pyi")
+TESTS_IGNORE = ("__pycache__", "*.pyc")
+
+# Compiled shared/ modules, cached by source hash (see compile_tree)
+MPY_CACHE_DIR = SCRIPT_DIR / "build" / "mpy"
+MPY_CROSS_ENV = "MPY_CROSS"
+MPY_CROSS_URL = "https://adafruit-circuit-python.s3.amazonaws.com/index.html?prefix=bin/mpy-cross/"
+
+# Sections in write order. CircuitPython auto-reloads after writes to
+# CIRCUITPY, so libraries go before the shared code that imports them and
+# config.json last, keeping the time a reload can see a half-updated tree short.
+SECTION_ORDER = ("libraries", "source", "tests", "config")
+
 
 def find_device():
     """Auto-detect CIRCUITPY device mount point."""
@@ -67,44 +111,175 @@ def find_device():
     return None
 
 
-def download_bundle(bundle_dir):
-    """Download the Adafruit CircuitPython bundle if not present."""
+def _load_cache_index(cache_dir):
+    """Return the URL to SHA-256 map of the download cache."""
+    try:
+        with open(cache_dir / "index.json") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return index if isinstance(index, dict) else {}
+
+
+def fetch_cached(url, cache_dir, sha256=None):
+    """
+    Return the cached copy of a zip archive, downloading it if needed.
+
+    Archives are stored as <sha256>.zip, with index.json mapping each URL
+    to the digest of its content. An interrupted download is kept as a
+    .part file and resumed with an HTTP Range request. A new download must
+    match sha256 when given and must pass a CRC check of every member; a
+    cached copy is checked against its digest before use.
+
+    Args:
+        url: Archive URL (http(s):// or file://)
+        cache_dir: Cache directory
+        sha256: Expected SHA-256 hex digest, or None to trust the first download
+
+    Returns:
+        Path of the cached archive
+
+    Raises:
+        urllib.error.URLError, OSError: If the download fails
+        ValueError: If the download does not match sha256 or is corrupt
+    """
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    index = _load_cache_index(cache_dir)
+
+    digest = sha256 or index.get(url)
+    if digest:
+        cached = cache_dir / f"{digest}.zip"
+        if cached.exists() and file_digest(cached) == digest:
+            return cached
+
+    part = cache_dir / f"{hashlib.sha256(url.encode()).hexdigest()[:16]}.part"
+    offset = part.stat().st_size if part.exists() else 0
+    request = urllib.request.Request(url)
+    if offset:
+        request.add_header("Range", f"bytes={offset}-")
+        print(f"Resuming download from {url} at {format_bytes(offset)}...")
+    else:
+        print(f"Downloading {url}...")
+
+    with urllib.request.urlopen(request, timeout=DOWNLOAD_TIMEOUT) as response:
+        # A server that ignores Range sends the whole file again
+        resumed = offset and getattr(response, "status", None) == 206
+        with open(part, "ab" if resumed else "wb") as f:
+            shutil.copyfileobj(response, f, DOWNLOAD_CHUNK_SIZE)
+
+    digest = file_digest(part)
+    if sha256 and digest != sha256:
+        part.unlink()
+        raise ValueError(f"Checksum mismatch for {url}: expected {sha256}, got {digest}")
+    try:
+        with zipfile.ZipFile(part) as zf:
+            bad = zf.testzip()
+    except zipfile.BadZipFile as e:
+        bad = str(e)
+    if bad:
+        part.unlink()
+        raise ValueError(f"Corrupt archive from {url}: {bad}")
+
+    cached = cache_dir / f"{digest}.zip"
+    os.replace(part, cached)
+    index[url] = digest
+    with open(cache_dir / "index.json", "w") as f:
+        json.dump(index, f, indent=1, sort_keys=True)
+    print(f"Cached: {cached.name} ({format_bytes(cached.stat().st_size)})")
+    return cached
+
+
+def _library_members(names):
+    """Group the lib/ members of a bundle zip by top-level library name."""
+    members = {}
+    for member in names:
+        parts = member.split("/")
+        if len(parts) < 3 or parts[1] != "lib" or not parts[2] or member.endswith("/"):
+            continue
+        library = parts[2] if len(parts) > 3 else parts[2].rsplit(".", 1)[0]
+        members.setdefault(library, []).append(member)
+    return members
+
+
+def extract_libraries(zip_path, dest_dir, libraries, follow=False):
+    """
+    Extract only the lib/ entries of the given libraries from a bundle zip.
+
+    Files already extracted with the right size are skipped, so repeated
+    deploys extract nothing.
+
+    Args:
+        zip_path: Bundle zip
+        dest_dir: Directory the bundle is extracted into
+        libraries: Top-level library names, or None for every library
+        follow: Also extract the libraries the extracted .mpy files import
+
+    Returns:
+        Set of library names found in the bundle
+
+    Raises:
+        ValueError: If a member would be written outside dest_dir
+    """
+    dest_dir = Path(dest_dir)
+    dest_resolved = dest_dir.resolve()
+    found = set()
+    extracted = 0
+    with zipfile.ZipFile(zip_path) as zf:
+        members = _library_members(zf.namelist())
+        pending = list(members if libraries is None else libraries)
+        while pending:
+            library = pending.pop()
+            if library in found or library not in members:
+                continue
+            found.add(library)
+            for member in members[library]:
+                # Validate each member path before extraction to prevent path traversal
+                target = (dest_dir / member).resolve()
+                if not str(target).startswith(str(dest_resolved)):
+                    raise ValueError(f"Zip member escapes target directory: {member}")
+                info = zf.getinfo(member)
+                if not (target.exists() and target.stat().st_size == info.file_size):
+                    zf.extract(info, dest_dir)
+                    extracted += 1
+                if follow and member.endswith(".mpy"):
+                    pending.extend(name.split(".")[0] for name in mpy_names(target))
+    if extracted:
+        print(f"Extracted {extracted} files for {len(found)} libraries")
+    return found
+
+
+def download_bundle(bundle_dir, libraries=(), follow=False):
+    """
+    Fetch the Adafruit CircuitPython bundle and extract the given libraries.
+
+    The zip is kept in bundle_dir/cache (see fetch_cached), so later runs
+    and other targets extract from it without downloading again. Only the
+    lib/ entries of libraries (plus, with follow, what they import) are
+    extracted; libraries=None extracts the whole lib/ directory.
+
+    Returns:
+        Path of the extracted bundle directory
+    """
     bundle_dir = Path(bundle_dir)
     bundle_name = f"adafruit-circuitpython-bundle-{BUNDLE_VERSION}-mpy-{BUNDLE_DATE}"
     extracted_dir = bundle_dir / bundle_name
-
-    if extracted_dir.exists():
-        print(f"Bundle already exists: {extracted_dir}")
-        return extracted_dir
-
-    bundle_dir.mkdir(parents=True, exist_ok=True)
-
     url = BUNDLE_URL_TEMPLATE.format(version=BUNDLE_VERSION, date=BUNDLE_DATE)
-    zip_path = bundle_dir / f"{bundle_name}.zip"
 
-    print(f"Downloading bundle from {url}...")
     try:
-        urllib.request.urlretrieve(url, zip_path)
-    except (urllib.error.URLError, urllib.error.HTTPError, OSError) as e:
+        zip_path = fetch_cached(url, bundle_dir / CACHE_DIR_NAME, BUNDLE_SHA256)
+    except (urllib.error.URLError, OSError, ValueError) as e:
+        lib_dir = extracted_dir / "lib"
+        names = () if libraries is None else libraries
+        if lib_dir.exists() and all(find_library_in_bundle(lib_dir, n) for n in names):
+            print(f"WARNING: Could not fetch bundle ({e}); using {extracted_dir}")
+            return extracted_dir
         print(f"ERROR: Failed to download bundle: {e}")
         print(f"\nYou can manually download from:\n  {url}")
         print(f"\nAnd extract to:\n  {bundle_dir}")
         sys.exit(1)
 
-    print(f"Extracting to {bundle_dir}...")
-    with zipfile.ZipFile(zip_path, "r") as zf:
-        # Validate each member path before extraction to prevent path traversal
-        bundle_dir_resolved = bundle_dir.resolve()
-        for member in zf.namelist():
-            member_path = (bundle_dir / member).resolve()
-            if not str(member_path).startswith(str(bundle_dir_resolved)):
-                raise ValueError(f"Zip member escapes target directory: {member}")
-        zf.extractall(bundle_dir)
-
-    # Clean up zip file
-    zip_path.unlink()
-
-    print(f"Bundle ready: {extracted_dir}")
+    extract_libraries(zip_path, bundle_dir, libraries, follow)
     return extracted_dir
 
 
@@ -171,34 +346,47 @@ def copy_library(src, dest_lib_dir):
         print(f"  Copied: {src.name}/ (directory)")
 
 
-def deploy_libraries(bundle_dir, device_path, libraries):
-    """Deploy libraries from bundle to device."""
+def resolve_libraries(bundle_dir, libraries):
+    """Find libraries in the bundle; return (list of source paths, missing names)."""
     bundle_lib_dir = bundle_dir / "lib"
-    device_lib_dir = device_path / "lib"
-
     if not bundle_lib_dir.exists():
         print(f"ERROR: Bundle lib directory not found: {bundle_lib_dir}")
         sys.exit(1)
 
-    device_lib_dir.mkdir(exist_ok=True)
-
-    print(f"\nDeploying {len(libraries)} libraries to {device_lib_dir}...")
-
+    found = []
     missing = []
     for library in libraries:
         src = find_library_in_bundle(bundle_lib_dir, library)
         if src:
-            copy_library(src, device_lib_dir)
+            found.append(src)
         else:
             missing.append(library)
+    return found, missing
+
 
+def warn_missing_libraries(missing):
+    """Print a warning for libraries not found in the bundle."""
     if missing:
         print(f"\nWARNING: Libraries not found in bundle: {', '.join(missing)}")
         print("These may need to be installed separately or the names may be incorrect.")
 
 
-def deploy_source(device_path, include_tests=False):
-    """Deploy project source code to device."""
+def deploy_libraries(bundle_dir, device_path, libraries):
+    """Deploy libraries from bundle to device."""
+    found, missing = resolve_libraries(bundle_dir, libraries)
+    device_lib_dir = device_path / "lib"
+    device_lib_dir.mkdir(exist_ok=True)
+
+    print(f"\nDeploying {len(libraries)} libraries to {device_lib_dir}...")
+
+    for src in found:
+        copy_library(src, device_lib_dir)
+
+    warn_missing_libraries(missing)
+
+
+def deploy_source(device_path, include_tests=False, mpy_cross=None):
+    """Deploy project source code to device (shared/ compiled to .mpy with mpy_cross)."""
     device_lib_dir = device_path / "lib"
     device_lib_dir.mkdir(exist_ok=True)
 
@@ -210,12 +398,20 @@ def deploy_source(device_path, include_tests=False):
         print("\nDeploying source code...")
         if shared_dest.exists():
             shutil.rmtree(shared_dest)
-        shutil.copytree(
-            shared_src,
-            shared_dest,
-            ignore=shutil.ignore_patterns("__pycache__", "*.pyc", "*.pyi"),
-        )
-        print("  Copied: shared/")
+        if mpy_cross:
+            files = compile_tree(shared_src, "lib/shared", mpy_cross)
+            for rel_path, src in sorted(files.items()):
+                dest = device_path / rel_path
+                dest.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(src, dest)
+            print("  Copied: shared/ (.mpy)")
+        else:
+            shutil.copytree(
+                shared_src,
+                shared_dest,
+                ignore=shutil.ignore_patterns(*SOURCE_IGNORE),
+            )
+            print("  Copied: shared/")
 
     # Deploy tests if requested
     if include_tests:
@@ -229,11 +425,96 @@ def deploy_source(device_path, include_tests=False):
             shutil.copytree(
                 tests_src,
                 tests_dest,
-                ignore=shutil.ignore_patterns("__pycache__", "*.pyc"),
+                ignore=shutil.ignore_patterns(*TESTS_IGNORE),
             )
             print("  Copied: tests/device/")
 
 
+def find_mpy_cross(path=None):
+    """Return the mpy-cross executable: path, $MPY_CROSS or mpy-cross on PATH."""
+    return path or os.environ.get(MPY_CROSS_ENV) or shutil.which("mpy-cross")
+
+
+def check_mpy_cross(mpy_cross):
+    """
+    Check that mpy-cross emits .mpy files for the CircuitPython major version
+    of the bundle; exit if not.
+
+    Returns:
+        Version string reported by mpy-cross
+    """
+    try:
+        result = subprocess.run(
+            [mpy_cross, "--version"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"ERROR: Could not run mpy-cross ({mpy_cross}): {e}")
+        print(f"Download mpy-cross for CircuitPython {BUNDLE_VERSION} from:\n  {MPY_CROSS_URL}")
+        sys.exit(1)
+
+    version = result.stdout.strip()
+    match = re.search(r"CircuitPython (\d+)\.", version)
+    expected = BUNDLE_VERSION.split(".")[0]
+    if not match or match.group(1) != expected:
+        print(f"ERROR: mpy-cross is not for CircuitPython {BUNDLE_VERSION}: {version}")
+        print(f"Download a matching mpy-cross from:\n  {MPY_CROSS_URL}")
+        sys.exit(1)
+    return version
+
+
+def compile_tree(src_dir, dest_dir, mpy_cross, cache_dir=MPY_CACHE_DIR, ignore=SOURCE_IGNORE):
+    """
+    Compile the .py files under src_dir to .mpy.
+
+    Artifacts are cached in cache_dir under the SHA-256 of the mpy-cross
+    version, device path and source, so only changed modules are compiled
+    again. Other files (e.g. py.typed) are passed through unchanged.
+
+    Args:
+        src_dir: Local source directory
+        dest_dir: Device path of the directory, relative to the device root
+        mpy_cross: mpy-cross executable
+        cache_dir: Directory for compiled artifacts
+        ignore: fnmatch patterns for names to skip
+
+    Returns:
+        Dictionary of device-relative path to local Path (see collect_tree)
+    """
+    version = check_mpy_cross(mpy_cross)
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    files = {}
+    compiled = 0
+    for rel_path, src in collect_tree(src_dir, dest_dir, ignore).items():
+        if not rel_path.endswith(".py"):
+            files[rel_path] = src
+            continue
+
+        key = hashlib.sha256()
+        key.update(f"{version}\0{rel_path}\0".encode())
+        key.update(src.read_bytes())
+        artifact = cache_dir / f"{key.hexdigest()}.mpy"
+        if not artifact.exists():
+            # Source name as seen on the device, for tracebacks
+            source_name = rel_path[len("lib/") :] if rel_path.startswith("lib/") else rel_path
+            tmp = artifact.with_suffix(".tmp")
+            result = subprocess.run(
+                [mpy_cross, "-s", source_name, "-o", str(tmp), str(src)],
+                capture_output=True,
+                text=True,
+            )
+            if result.returncode != 0:
+                print(f"ERROR: mpy-cross failed for {src}:\n{result.stderr.strip()}")
+                sys.exit(1)
+            os.replace(tmp, artifact)
+            compiled += 1
+        files[rel_path[:-3] + ".mpy"] = artifact
+
+    print(f"  Compiled {compiled} modules ({len(files)} files, cache: {cache_dir})")
+    return files
+
+
 def check_settings_toml(device_path: Path) -> bool:
     """Check if settings.toml exists on device and warn if missing."""
     settings_file = device_path / "settings.toml"
@@ -253,8 +534,8 @@ def check_settings_toml(device_path: Path) -> bool:
     return True
 
 
-def deploy_config(device_path: Path, target: str, environment: str) -> bool:
-    """Deploy environment-specific config.json to device."""
+def find_config(target: str, environment: str):
+    """Return the validated config.json source for a target, or None."""
     # Validate target directory exists to prevent path traversal
     target_dir = CONFIGS_DIR / target
     if not target_dir.is_dir():
@@ -262,14 +543,14 @@ def deploy_config(device_path: Path, target: str, environment: str) -> bool:
         print(f"\nERROR: Unknown target '{target}' for config deployment")
         if available:
             print(f"  Available targets with configs: {', '.join(available)}")
-        return False
+        return None
 
     config_source = target_dir / environment / "config.json"
 
     if not config_source.exists():
         print(f"\nWARNING: Config not found: {config_source}")
         print("Skipping config deployment.")
-        return False
+        return None
 
     # Validate JSON before copying
     try:
@@ -277,7 +558,7 @@ def deploy_config(device_path: Path, target: str, environment: str) -> bool:
             config_data = json.load(f)
     except json.JSONDecodeError as e:
         print(f"\nERROR: Invalid JSON in {config_source}: {e}")
-        return False
+        return None
 
     # Verify environment matches
     if config_data.get("environment") != environment:
@@ -285,12 +566,770 @@ def deploy_config(device_path: Path, target: str, environment: str) -> bool:
         print(f"  Expected: {environment}")
         print(f"  Found: {config_data.get('environment')}")
 
+    return config_source
+
+
+def deploy_config(device_path: Path, target: str, environment: str) -> bool:
+    """Deploy environment-specific config.json to device."""
+    config_source = find_config(target, environment)
+    if config_source is None:
+        return False
+
     config_dest = device_path / "config.json"
     shutil.copy2(config_source, config_dest)
     print(f"  Deployed: config.json ({environment})")
     return True
 
 
+def file_digest(path):
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def collect_tree(src_dir, dest_dir, ignore=()):
+    """
+    List the files under src_dir as device paths.
+
+    Args:
+        src_dir: Local directory
+        dest_dir: Device path of the directory, relative to the device root
+        ignore: fnmatch patterns for file and directory names to skip
+
+    Returns:
+        Dictionary of device-relative POSIX path to local Path
+    """
+    src_dir = Path(src_dir)
+    files = {}
+    for root, dirs, names in os.walk(src_dir):
+        dirs[:] = sorted(d for d in dirs if not _ignored(d, ignore))
+        for name in sorted(names):
+            if _ignored(name, ignore):
+                continue
+            path = Path(root) / name
+            files[f"{dest_dir}/{path.relative_to(src_dir).as_posix()}"] = path
+    return files
+
+
+def _ignored(name, patterns):
+    return any(fnmatch.fnmatch(name, pattern) for pattern in patterns)
+
+
+def collect_libraries(bundle_dir, libraries):
+    """Return the device files for libraries (see collect_tree)."""
+    found, missing = resolve_libraries(bundle_dir, libraries)
+    files = {}
+    for src in found:
+        if src.is_dir():
+            files.update(collect_tree(src, f"lib/{src.name}"))
+        else:
+            files[f"lib/{src.name}"] = src
+    warn_missing_libraries(missing)
+    return files
+
+
+def find_imports(path):
+    """Return the modules a .py file imports (absolute imports only)."""
+    tree = ast.parse(Path(path).read_text(), filename=str(path))
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            names.add(node.module)
+            # "from package import module" imports a submodule
+            names.update(f"{node.module}.{alias.name}" for alias in node.names)
+    return names
+
+
+def find_source_imports(paths):
+    """Return the modules imported by the .py files in paths (files or directories)."""
+    names = set()
+    for path in paths:
+        path = Path(path)
+        files = sorted(path.rglob("*.py")) if path.is_dir() else [path]
+        for file in files:
+            try:
+                names.update(find_imports(file))
+            except (OSError, SyntaxError, UnicodeDecodeError) as e:
+                print(f"  WARNING: Could not scan {file}: {e}")
+    return names
+
+
+# Identifier-like strings in a .mpy, for files whose qstr table can't be read
+_MPY_NAME = re.compile(rb"[A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)*")
+
+# .mpy v6 header: magic ("C" for CircuitPython, "M" for MicroPython) and version
+_MPY_MAGIC = (ord("C"), ord("M"))
+_MPY_VERSION = 6
+# Feature flag: an arch flags uint follows the header
+_MPY_ARCH_FLAGS = 0x40
+
+
+def _read_uint(data, offset):
+    """Read a .mpy variable-length uint (7 bits per byte, high bit continues)."""
+    value = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value = (value << 7) | (byte & 0x7F)
+        if not byte & 0x80:
+            return value, offset
+
+
+def _mpy_qstrs(data):
+    """
+    Return the qstr table of a .mpy v6 file, or None if it can't be read.
+
+    Each entry is a uint holding len << 1 (static qstrs set bit 0 and
+    store an index instead), then the bytes and a null terminator.
+    """
+    if len(data) < 4 or data[0] not in _MPY_MAGIC or data[1] != _MPY_VERSION:
+        return None
+    try:
+        offset = 4
+        if data[2] & _MPY_ARCH_FLAGS:
+            _, offset = _read_uint(data, offset)
+        n_qstr, offset = _read_uint(data, offset)
+        _, offset = _read_uint(data, offset)
+        names = set()
+        for _ in range(n_qstr):
+            length, offset = _read_uint(data, offset)
+            if length & 1:
+                continue
+            end = offset + (length >> 1)
+            if end >= len(data) or data[end] != 0:
+                return None
+            names.add(data[offset:end].decode())
+            offset = end + 1
+    except (IndexError, UnicodeDecodeError):
+        return None
+    return names
+
+
+def mpy_names(path):
+    """
+    Return the names in a compiled .mpy file.
+
+    Reads the qstr table, which holds every imported name, of .mpy v6
+    files; other files are scanned for identifier-like strings.
+    """
+    data = Path(path).read_bytes()
+    names = _mpy_qstrs(data)
+    if names is None:
+        names = {match.group().decode() for match in _MPY_NAME.finditer(data)}
+    return names
+
+
+def index_bundle(bundle_lib_dir):
+    """Map dotted module names in the bundle to their .mpy file or package directory."""
+    bundle_lib_dir = Path(bundle_lib_dir)
+    index = {}
+    for path in sorted(bundle_lib_dir.rglob("*")):
+        parts = path.relative_to(bundle_lib_dir).parts
+        if path.is_dir():
+            index[".".join(parts)] = path
+        elif path.suffix == ".mpy" and path.stem != "__init__":
+            index[".".join(parts[:-1] + (path.stem,))] = path
+    return index
+
+
+def _with_parents(name):
+    """Return name and its parent packages ("a.b.c" -> a, a.b, a.b.c)."""
+    parts = name.split(".")
+    return [".".join(parts[: i + 1]) for i in range(len(parts))]
+
+
+def resolve_imports(index, roots):
+    """
+    Return the bundle modules reachable from the imported names in roots.
+
+    Follows imports through the bundle's .mpy files by matching the strings
+    in each file against module names. A .mpy keeps "from pkg import mod"
+    as the separate names "pkg" and "mod", so each name is also tried
+    relative to the file's own package and to every bundle package named
+    in the same file. Strings that are not imports can only add modules.
+
+    Args:
+        index: Bundle index from index_bundle()
+        roots: Module names imported by the deployed code
+
+    Returns:
+        Set of dotted module and package names
+    """
+    reached = set()
+    seen = set()
+    pending = list(roots)
+    while pending:
+        name = pending.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        for module in _with_parents(name):
+            if module in reached or module not in index:
+                continue
+            reached.add(module)
+            path = index[module]
+            if path.is_dir():
+                package = module
+                path = path / "__init__.mpy"
+                if not path.exists():
+                    continue
+            else:
+                package = module.rpartition(".")[0]
+            tokens = mpy_names(path)
+            prefixes = set(_with_parents(package)) if package else set()
+            prefixes.update(t for t in tokens if t in index and index[t].is_dir())
+            for token in tokens:
+                pending.append(token)
+                pending.extend(f"{prefix}.{token}" for prefix in prefixes)
+    return reached
+
+
+def collect_pruned_libraries(bundle_dir, libraries, imports):
+    """
+    Return the device files of only the library modules the code imports.
+
+    Libraries listed in the requirements that nothing imports are pruned,
+    as are the unused modules of packages; bundle libraries that are
+    imported but not listed are added. Both are reported.
+
+    Args:
+        bundle_dir: Extracted bundle directory
+        libraries: Library names from the requirements files
+        imports: Module names imported by the deployed code
+
+    Returns:
+        Dictionary of device-relative path to local Path (see collect_tree)
+    """
+    bundle_lib_dir = bundle_dir / "lib"
+    if not bundle_lib_dir.exists():
+        print(f"ERROR: Bundle lib directory not found: {bundle_lib_dir}")
+        sys.exit(1)
+    index = index_bundle(bundle_lib_dir)
+    reached = resolve_imports(index, imports)
+
+    files = {}
+    for name in sorted(reached):
+        path = index[name]
+        if path.is_dir():
+            # Package __init__ and data files; submodules are listed on their own
+            candidates = [p for p in sorted(path.iterdir()) if p.is_file()]
+            candidates = [p for p in candidates if p.suffix != ".mpy" or p.stem == "__init__"]
+        else:
+            candidates = [path]
+        for file in candidates:
+            files[f"lib/{file.relative_to(bundle_lib_dir).as_posix()}"] = file
+
+    top_level = sorted({name.split(".")[0] for name in reached})
+    found, missing = resolve_libraries(bundle_dir, libraries)
+    full_bytes = sum(_tree_size(src) for src in found)
+    deployed_bytes = sum(src.stat().st_size for src in files.values())
+
+    requested = {src.name.split(".")[0] for src in found}
+    unused = sorted(requested - set(top_level))
+    added = sorted(set(top_level) - requested)
+    print(f"  Resolved {len(reached)} modules in {len(top_level)} libraries")
+    if unused:
+        print(f"  Pruned (not imported): {', '.join(unused)}")
+    if added:
+        print(f"  Added (imported, not in requirements): {', '.join(added)}")
+    print(
+        f"  Library files: {format_bytes(deployed_bytes)} "
+        f"(requirements: {format_bytes(full_bytes)})"
+    )
+    warn_missing_libraries(missing)
+    return files
+
+
+def _tree_size(path):
+    """Return the size of a file or of all files under a directory."""
+    if path.is_file():
+        return path.stat().st_size
+    return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+
+
+def node_code_paths(device_path, target, include_tests=False, extra=()):
+    """Return the code scanned for imports when pruning libraries."""
+    paths = [PROJECT_ROOT / "src" / "shared"]
+    node_src = PROJECT_ROOT / "src" / target.replace("-", "_")
+    if node_src.is_dir():
+        paths.append(node_src)
+    if include_tests:
+        paths.append(PROJECT_ROOT / "tests" / "device")
+    # code.py, boot.py and other top-level modules already on the device
+    paths.extend(sorted(Path(device_path).glob("*.py")))
+    paths.extend(Path(path) for path in extra)
+    return [path for path in paths if path.exists()]
+
+
+def deploy_library_files(device_path, files):
+    """Copy selected library files, replacing the library packages they belong to."""
+    device_lib_dir = device_path / "lib"
+    device_lib_dir.mkdir(exist_ok=True)
+    print(f"\nDeploying {len(files)} library files to {device_lib_dir}...")
+
+    replaced = set()
+    for rel_path, src in sorted(files.items()):
+        package = device_lib_dir / Path(rel_path).parts[1]
+        if package not in replaced and package.is_dir():
+            shutil.rmtree(package)
+        replaced.add(package)
+        dest = device_path / rel_path
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(src, dest)
+
+
+def collect_source(include_tests=False, mpy_cross=None):
+    """Return the device files for shared/ and optionally the device tests."""
+    sections = {}
+    shared_src = PROJECT_ROOT / "src" / "shared"
+    if shared_src.exists() and mpy_cross:
+        sections["source"] = compile_tree(shared_src, "lib/shared", mpy_cross)
+    elif shared_src.exists():
+        sections["source"] = collect_tree(shared_src, "lib/shared", SOURCE_IGNORE)
+    tests_src = PROJECT_ROOT / "tests" / "device"
+    if include_tests and tests_src.exists():
+        sections["tests"] = collect_tree(tests_src, "lib/tests/device", TESTS_IGNORE)
+    return sections
+
+
+def load_manifest(device_path):
+    """Return the files recorded by the last incremental deploy ({} if none)."""
+    try:
+        with open(Path(device_path) / MANIFEST_NAME) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+        return {}
+    files = data.get("files")
+    return files if isinstance(files, dict) else {}
+
+
+def save_manifest(device_path, files):
+    """Write the manifest to the device."""
+    with open(Path(device_path) / MANIFEST_NAME, "w") as f:
+        json.dump({"version": MANIFEST_VERSION, "files": files}, f, indent=1, sort_keys=True)
+
+
+def format_bytes(count):
+    """Format a byte count for the deploy report."""
+    if count < 1024:
+        return f"{count} B"
+    if count < 1024 * 1024:
+        return f"{count / 1024:.1f} KB"
+    return f"{count / (1024 * 1024):.1f} MB"
+
+
+class DeployStats:
+    """Counters reported after an incremental deploy."""
+
+    def __init__(self):
+        self.written = 0
+        self.skipped = 0
+        self.removed = 0
+        self.bytes_written = 0
+        self.bytes_skipped = 0
+
+    def summary(self):
+        return (
+            f"{self.written} written ({format_bytes(self.bytes_written)}), "
+            f"{self.skipped} unchanged ({format_bytes(self.bytes_skipped)}), "
+            f"{self.removed} removed"
+        )
+
+
+def _is_current(dest, entry, digest, size):
+    """Return True if the device file already has the given contents."""
+    try:
+        stat = dest.stat()
+    except OSError:
+        return False
+    if stat.st_size != size:
+        return False
+    # Trust the manifest while the file is as the last deploy left it
+    if (
+        entry
+        and entry.get("sha256") == digest
+        and entry.get("size") == stat.st_size
+        and entry.get("mtime") == stat.st_mtime_ns
+    ):
+        return True
+    # Unknown or touched since: compare contents (reads don't cost what writes do)
+    return file_digest(dest) == digest
+
+
+def _remove_empty_dirs(directory, device_path):
+    """Remove directory and its parents while they are empty, up to device_path."""
+    device_path = Path(device_path)
+    while directory != device_path and device_path in directory.parents:
+        try:
+            directory.rmdir()
+        except OSError:
+            return
+        directory = directory.parent
+
+
+def sync_files(device_path, sections, verbose=False):
+    """
+    Copy only changed files to the device.
+
+    A manifest on the device records the SHA-256, size and mtime of every
+    file written. A file is skipped when the device copy still matches its
+    manifest entry (or, with no usable entry, when its contents hash the
+    same), so a redeploy writes only what changed. Files a previous deploy
+    of the same section wrote that are no longer in the source are removed;
+    files the deploy never wrote (settings.toml, code.py) are left alone,
+    except a .py next to a deployed .mpy, which would shadow it.
+
+    Sections are written in SECTION_ORDER. Files are copied without
+    metadata to keep FAT writes down.
+
+    Args:
+        device_path: Device mount path
+        sections: Dictionary of section name to {device path: local Path}
+        verbose: Print every file written or removed
+
+    Returns:
+        DeployStats
+    """
+    device_path = Path(device_path)
+    old = load_manifest(device_path)
+    stats = DeployStats()
+
+    # Entries of sections not deployed this time are kept as they are
+    files = {path: entry for path, entry in old.items() if entry.get("section") not in sections}
+
+    order = sorted(
+        sections,
+        key=lambda name: SECTION_ORDER.index(name) if name in SECTION_ORDER else len(SECTION_ORDER),
+    )
+    for section in order:
+        for rel_path, src in sorted(sections[section].items()):
+            digest = file_digest(src)
+            size = src.stat().st_size
+            dest = device_path / rel_path
+            if _is_current(dest, old.get(rel_path), digest, size):
+                stats.skipped += 1
+                stats.bytes_skipped += size
+            else:
+                dest.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(src, dest)
+                stats.written += 1
+                stats.bytes_written += size
+                if verbose:
+                    print(f"  Wrote: {rel_path}")
+            if rel_path.endswith(".mpy"):
+                # CircuitPython imports foo.py in preference to foo.mpy
+                shadow = dest.with_suffix(".py")
+                if shadow.exists():
+                    shadow.unlink()
+                    stats.removed += 1
+            stat = dest.stat()
+            files[rel_path] = {
+                "sha256": digest,
+                "size": stat.st_size,
+                "mtime": stat.st_mtime_ns,
+                "section": section,
+            }
+
+    for rel_path, entry in sorted(old.items()):
+        if entry.get("section") in sections and rel_path not in files:
+            dest = device_path / rel_path
+            try:
+                dest.unlink()
+            except FileNotFoundError:
+                pass
+            stats.removed += 1
+            _remove_empty_dirs(dest.parent, device_path)
+            if verbose:
+                print(f"  Removed: {rel_path}")
+
+    if files != old:
+        save_manifest(device_path, files)
+    return stats
+
+
+def find_devices():
+    """Return every mounted CIRCUITPY volume (CIRCUITPY, CIRCUITPY1, "CIRCUITPY 1", ...)."""
+    devices = []
+    for pattern in FLEET_MOUNT_PATTERNS:
+        for path in sorted(glob.glob(pattern)):
+            path = Path(path)
+            if path.is_dir() and path not in devices:
+                devices.append(path)
+    return devices
+
+
+def read_boot_out(device_path):
+    """Return the CircuitPython version line and board ID from boot_out.txt, or None."""
+    try:
+        lines = (Path(device_path) / "boot_out.txt").read_text().splitlines()
+    except (OSError, UnicodeDecodeError):
+        return None
+    info = {"version": lines[0].strip() if lines else "", "board_id": ""}
+    for line in lines:
+        if line.startswith("Board ID:"):
+            info["board_id"] = line.split(":", 1)[1].strip()
+    return info
+
+
+def identify_device(device_path):
+    """
+    Return (target, environment) for a device.
+
+    Read from the DEVICE_MARKER a previous deploy wrote, else from the
+    device_type and environment of the config.json on the device. Board IDs
+    in boot_out.txt are not used: all nodes can run on the same board.
+
+    Returns:
+        (target, environment); either may be None
+    """
+    device_path = Path(device_path)
+    for name, target_key in ((DEVICE_MARKER, "target"), ("config.json", "device_type")):
+        try:
+            with open(device_path / name) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if isinstance(data, dict) and data.get(target_key):
+            return data[target_key], data.get("environment")
+    return None, None
+
+
+def write_device_marker(device_path, target, environment):
+    """
+    Record the device's target and environment (only written when changed).
+
+    An environment of None keeps the recorded one: a deploy without --env
+    leaves the device's config.json as it was.
+    """
+    current = identify_device(device_path)
+    if environment is None:
+        environment = current[1]
+    if current == (target, environment) and (Path(device_path) / DEVICE_MARKER).exists():
+        return
+    with open(Path(device_path) / DEVICE_MARKER, "w") as f:
+        json.dump({"target": target, "environment": environment}, f)
+
+
+class PrefixedOutput:
+    """
+    sys.stdout stand-in for concurrent deploys.
+
+    Lines printed by a thread that called set_prefix() are written whole,
+    prefixed with that thread's device name; other threads write through.
+    """
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def set_prefix(self, prefix):
+        self._local.prefix = prefix
+        self._local.buffer = ""
+
+    def write(self, text):
+        prefix = getattr(self._local, "prefix", None)
+        if prefix is None:
+            with self._lock:
+                return self._stream.write(text)
+        *lines, self._local.buffer = (self._local.buffer + text).split("\n")
+        with self._lock:
+            for line in lines:
+                if line.strip():
+                    self._stream.write(f"[{prefix}] {line}\n")
+        return len(text)
+
+    def flush(self):
+        with self._lock:
+            self._stream.flush()
+
+
+class DeployResult:
+    """Outcome of deploying one device."""
+
+    def __init__(self, device_path, target, environment):
+        self.device_path = device_path
+        self.target = target
+        self.environment = environment
+        self.has_settings = True
+        self.config_deployed = True
+        self.stats = None
+        self.error = None
+        self.elapsed = 0.0
+
+
+def prepare_bundle(bundle_dir, devices, args):
+    """Fetch the bundle once and extract what every (device_path, target) needs."""
+    roots = set()
+    for device_path, target in devices:
+        roots.update(load_requirements(target))
+        if args.prune:
+            paths = node_code_paths(device_path, target, args.tests, args.code)
+            roots.update(name.split(".")[0] for name in find_source_imports(paths))
+    return download_bundle(bundle_dir, sorted(roots), follow=args.prune)
+
+
+def deploy_device(device_path, target, environment, bundle_path, args, mpy_cross=None):
+    """
+    Deploy libraries, source code and config to one device.
+
+    Args:
+        device_path: Device mount path
+        target: Deployment target (valve-node, ...)
+        environment: Environment for config.json, or None to skip it
+        bundle_path: Extracted bundle directory (see prepare_bundle)
+        args: Parsed options (source, tests, prune, code, incremental, verbose)
+        mpy_cross: mpy-cross executable to compile shared/, or None
+
+    Returns:
+        DeployResult
+    """
+    result = DeployResult(device_path, target, environment)
+    start = time.monotonic()
+
+    # Check for settings.toml (secrets)
+    result.has_settings = check_settings_toml(device_path)
+
+    libraries = load_requirements(target)
+    library_files = None
+    if libraries and args.prune:
+        print("\nResolving library imports...")
+        paths = node_code_paths(device_path, target, args.tests, args.code)
+        library_files = collect_pruned_libraries(bundle_path, libraries, find_source_imports(paths))
+
+    if args.incremental:
+        sections = {}
+        if library_files is not None:
+            sections["libraries"] = library_files
+        elif libraries:
+            sections["libraries"] = collect_libraries(bundle_path, libraries)
+        if args.source or args.tests:
+            sections.update(collect_source(include_tests=args.tests, mpy_cross=mpy_cross))
+        if environment:
+            config_source = find_config(target, environment)
+            result.config_deployed = config_source is not None
+            if result.config_deployed:
+                sections["config"] = {"config.json": config_source}
+        print("\nSyncing changed files...")
+        result.stats = sync_files(device_path, sections, verbose=args.verbose)
+        print(f"  {result.stats.summary()} in {time.monotonic() - start:.1f}s")
+    else:
+        # Load and deploy libraries
+        if library_files is not None:
+            deploy_library_files(device_path, library_files)
+        elif libraries:
+            deploy_libraries(bundle_path, device_path, libraries)
+
+        # Deploy source code if requested
+        if args.source or args.tests:
+            deploy_source(device_path, include_tests=args.tests, mpy_cross=mpy_cross)
+
+        # Deploy environment config if specified
+        if environment:
+            print("\nDeploying configuration...")
+            result.config_deployed = deploy_config(device_path, target, environment)
+
+    write_device_marker(device_path, target, environment)
+    result.elapsed = time.monotonic() - start
+    return result
+
+
+def deploy_fleet(bundle_dir, args, mpy_cross=None):
+    """
+    Deploy every mounted CIRCUITPY device concurrently.
+
+    Each device's target and environment come from identify_device();
+    --target and --env select which devices to deploy. Shared work (bundle
+    download and extraction, .mpy compilation) is done once up front; the
+    devices are then written by a thread pool, one thread per device,
+    with output lines prefixed by the device name.
+
+    Returns:
+        Exit code (0 if every selected device deployed)
+    """
+    jobs = []
+    skipped = []
+    for device_path in find_devices():
+        target, environment = identify_device(device_path)
+        if not target:
+            skipped.append((device_path, "unknown target (deploy it once with --target)"))
+        elif args.target and target != args.target:
+            skipped.append((device_path, f"target {target}"))
+        elif args.env and environment != args.env:
+            skipped.append((device_path, f"environment {environment}"))
+        else:
+            jobs.append((device_path, target, environment))
+
+    if not jobs and not skipped:
+        print("ERROR: No CIRCUITPY devices found.")
+        return 1
+
+    print(f"Fleet: {len(jobs)} devices to deploy, {len(skipped)} skipped")
+    for device_path, target, environment in jobs:
+        board = read_boot_out(device_path) or {}
+        print(
+            f"  {device_path.name}: {target} ({environment or 'no config'}) "
+            f"{board.get('board_id', '')} {board.get('version', '')}".rstrip()
+        )
+    for device_path, reason in skipped:
+        print(f"  {device_path.name}: skipped, {reason}")
+    if not jobs:
+        return 0
+
+    bundle_path = prepare_bundle(bundle_dir, [(d, t) for d, t, _ in jobs], args)
+    if mpy_cross and (args.source or args.tests):
+        # Fill the .mpy cache before the threads read it
+        compile_tree(PROJECT_ROOT / "src" / "shared", "lib/shared", mpy_cross)
+
+    output = PrefixedOutput(sys.stdout)
+
+    def deploy(job):
+        device_path, target, environment = job
+        output.set_prefix(device_path.name)
+        start = time.monotonic()
+        try:
+            return deploy_device(device_path, target, environment, bundle_path, args, mpy_cross)
+        except (Exception, SystemExit) as e:
+            result = DeployResult(device_path, target, environment)
+            result.error = str(e) or type(e).__name__
+            result.elapsed = time.monotonic() - start
+            print(f"ERROR: {result.error}")
+            return result
+
+    saved_stdout = sys.stdout
+    sys.stdout = output
+    try:
+        with ThreadPoolExecutor(max_workers=args.jobs or len(jobs)) as pool:
+            results = list(pool.map(deploy, jobs))
+    finally:
+        sys.stdout = saved_stdout
+
+    print("\nFleet summary:")
+    failed = 0
+    for result in results:
+        if result.error:
+            failed += 1
+            status = f"FAILED: {result.error}"
+        else:
+            status = result.stats.summary() if result.stats else "deployed"
+            if not result.has_settings:
+                status += "; no settings.toml"
+            if result.environment and not result.config_deployed:
+                status += "; config.json not deployed"
+        print(
+            f"  {result.device_path.name:<12} {result.target:<13} "
+            f"{result.environment or '-':<8} {result.elapsed:5.1f}s  {status}"
+        )
+    return 1 if failed else 0
+
+
 def list_targets():
     """List available deployment targets."""
     print("Available targets:")
@@ -308,8 +1347,11 @@ Examples:
   %(prog)s --target valve-node --env nonprod   Deploy valve node to nonprod
   %(prog)s --target display-node --env prod    Deploy display node to prod
   %(prog)s --target test --source              Deploy test libs + source code
+  %(prog)s --target valve-node --source --mpy  Deploy shared/ compiled to .mpy
+  %(prog)s --target valve-node --prune         Deploy only imported library modules
+  %(prog)s --fleet --source --incremental      Deploy all connected devices
   %(prog)s --list-targets                      Show available targets
-  %(prog)s --download-only                     Just download the bundle
+  %(prog)s --download-only                     Download and extract the whole bundle
         """,
     )
 
@@ -345,6 +1387,50 @@ Examples:
         action="store_true",
         help="Also deploy device tests (tests/device/)",
     )
+    parser.add_argument(
+        "--mpy",
+        action="store_true",
+        help="Compile src/shared/ to .mpy with mpy-cross before deploying",
+    )
+    parser.add_argument(
+        "--mpy-cross",
+        help=f"mpy-cross executable (default: ${MPY_CROSS_ENV} or mpy-cross on PATH)",
+    )
+    parser.add_argument(
+        "--prune",
+        action="store_true",
+        help="Deploy only the library modules the deployed code imports",
+    )
+    parser.add_argument(
+        "--code",
+        action="append",
+        default=[],
+        help="With --prune, more node code (file or directory) to scan for imports",
+    )
+    parser.add_argument(
+        "--incremental",
+        "-i",
+        action="store_true",
+        help=f"Copy only changed files, tracked by {MANIFEST_NAME} on the device",
+    )
+    parser.add_argument(
+        "--verbose",
+        "-v",
+        action="store_true",
+        help="With --incremental, list every file written or removed",
+    )
+    parser.add_argument(
+        "--fleet",
+        action="store_true",
+        help=f"Deploy every mounted CIRCUITPY device concurrently (target from {DEVICE_MARKER}"
+        " or config.json; --target/--env select devices)",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        help="With --fleet, devices deployed at once (default: all)",
+    )
     parser.add_argument(
         "--list-targets",
         "-l",
@@ -354,7 +1440,7 @@ Examples:
     parser.add_argument(
         "--download-only",
         action="store_true",
-        help="Only download the bundle, don't deploy",
+        help="Only download the bundle and extract all of its libraries, don't deploy",
     )
 
     args = parser.parse_args()
@@ -364,14 +1450,23 @@ Examples:
         list_targets()
         return 0
 
-    # Ensure bundle is downloaded
     bundle_dir = Path(args.bundle) if args.bundle else BUNDLE_DIR
-    bundle_path = download_bundle(bundle_dir)
-
     if args.download_only:
+        download_bundle(bundle_dir, None)
         print("\nBundle downloaded. Use --target to deploy.")
         return 0
 
+    mpy_cross = None
+    if args.mpy:
+        mpy_cross = find_mpy_cross(args.mpy_cross)
+        if not mpy_cross:
+            print("ERROR: mpy-cross not found (use --mpy-cross or set $MPY_CROSS)")
+            print(f"Download mpy-cross for CircuitPython {BUNDLE_VERSION} from:\n  {MPY_CROSS_URL}")
+            sys.exit(1)
+
+    if args.fleet:
+        return deploy_fleet(bundle_dir, args, mpy_cross)
+
     # Require target for deployment
     if not args.target:
         parser.error("--target is required for deployment (use --list-targets to see options)")
@@ -388,29 +1483,14 @@ Examples:
     if args.env:
         print(f"Environment: {args.env}")
 
-    # Check for settings.toml (secrets)
-    has_settings = check_settings_toml(device_path)
-
-    # Load and deploy libraries
-    libraries = load_requirements(args.target)
-    if libraries:
-        deploy_libraries(bundle_path, device_path, libraries)
-
-    # Deploy source code if requested
-    if args.source or args.tests:
-        deploy_source(device_path, include_tests=args.tests)
-
-    # Deploy environment config if specified
-    config_deployed = True
-    if args.env:
-        print("\nDeploying configuration...")
-        config_deployed = deploy_config(device_path, args.target, args.env)
+    bundle_path = prepare_bundle(bundle_dir, [(device_path, args.target)], args)
+    result = deploy_device(device_path, args.target, args.env, bundle_path, args, mpy_cross)
 
     # Summary
     print("\nDeployment complete!")
-    if not has_settings:
+    if not result.has_settings:
         print("  Note: settings.toml not found - device may not connect to WiFi/cloud")
-    if args.env and not config_deployed:
+    if args.env and not result.config_deployed:
         print("  Warning: config.json was not deployed")
     return 0
 
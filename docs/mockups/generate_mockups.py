@@ -4,11 +4,29 @@ Display Node UI Mockup Generator
 
 Generates PNG mockups for the Poolio Display Node at 240x320 resolution.
 Based on specifications in docs/display-node-ui-design.md
+
+Screens whose drawing code and arguments are unchanged since the last run
+are skipped (see .render_cache.json). Use --jobs to render in parallel and
+--force to regenerate everything.
+
+Usage:
+    python docs/mockups/generate_mockups.py             # Render changed screens
+    python docs/mockups/generate_mockups.py --jobs 4    # Use 4 worker processes
+    python docs/mockups/generate_mockups.py --force     # Ignore the render cache
 """
 
 from PIL import Image, ImageDraw, ImageFont
+from concurrent.futures import ProcessPoolExecutor
+from functools import cache
 from pathlib import Path
+import argparse
+import hashlib
+import inspect
+import json
 import math
+import os
+import time
+import types
 
 # Display dimensions
 WIDTH = 240
@@ -32,6 +50,7 @@ COLORS = {
 }
 
 
+@cache
 def get_font(size):
     """Get a font at the specified size. Uses default if TrueType not available."""
     try:
@@ -43,14 +62,21 @@ def get_font(size):
             return ImageFont.load_default()
 
 
+# Base images keyed by nonprod flag; callers get a copy to draw on
+_base_images = {}
+
+
 def create_base_image(nonprod=False):
     """Create a base image with black background and optional nonprod border."""
-    img = Image.new("RGB", (WIDTH, HEIGHT), COLORS["background"])
-    if nonprod:
-        draw = ImageDraw.Draw(img)
-        # 1px orange border around entire screen
-        draw.rectangle([0, 0, WIDTH-1, HEIGHT-1], outline=COLORS["warning"], width=1)
-    return img
+    base = _base_images.get(nonprod)
+    if base is None:
+        base = Image.new("RGB", (WIDTH, HEIGHT), COLORS["background"])
+        if nonprod:
+            draw = ImageDraw.Draw(base)
+            # 1px orange border around entire screen
+            draw.rectangle([0, 0, WIDTH-1, HEIGHT-1], outline=COLORS["warning"], width=1)
+        _base_images[nonprod] = base
+    return base.copy()
 
 
 def draw_text_right_aligned(draw, text, x_right, y, font, fill):
@@ -773,47 +799,167 @@ def generate_navigation_flow():
     return img
 
 
+# Screen definitions: (filename, generator name, kwargs, scale)
+# Screens are saved at 2x (better for documentation); the navigation
+# flow diagram is already large and saved as-is.
+SCREENS = [
+    ("00_navigation_flow.png", "generate_navigation_flow", {}, 1),
+    ("01_main_dashboard.png", "generate_main_dashboard", {}, 2),
+    ("02_main_dashboard_nonprod.png", "generate_main_dashboard", {"nonprod": True}, 2),
+    ("03_main_dashboard_stale.png", "generate_main_dashboard", {"pool_stale": True}, 2),
+    ("04_pool_detail.png", "generate_pool_detail", {}, 2),
+    ("05_pool_detail_stale.png", "generate_pool_detail_stale", {}, 2),
+    ("06_valve_detail.png", "generate_valve_detail", {"filling": False}, 2),
+    ("07_valve_detail_filling.png", "generate_valve_detail", {"filling": True}, 2),
+    ("08_settings.png", "generate_settings", {}, 2),
+    ("09_dialog_fill_confirm.png", "generate_confirmation_dialog", {
+        "title": "Start Fill Now?",
+        "message": "This will open the\nfill valve for up to\n9 minutes.",
+    }, 2),
+    ("10_dialog_reset_confirm.png", "generate_confirmation_dialog", {
+        "title": "Reset Device?",
+        "message": "The display will\nrestart. This may\ntake 30 seconds.",
+    }, 2),
+    ("11_historical_24h.png", "generate_historical_view", {"range_type": "24h"}, 2),
+    ("12_historical_7d.png", "generate_historical_view", {"range_type": "7d"}, 2),
+    ("13_historical_30d.png", "generate_historical_view", {"range_type": "30d"}, 2),
+]
+
+CACHE_FILENAME = ".render_cache.json"
+
+
+def _code_names(code):
+    """Collect global names referenced by a code object and its nested code."""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _code_names(const)
+    return names
+
+
+def _dependency_source(func, seen=None):
+    """
+    Collect the source of a generator and every module-level helper it uses.
+
+    Module constants it references (COLORS, WIDTH, ...) are included by value,
+    so a change to any of them invalidates the screens that use them. Private
+    module state (_base_images) is a runtime cache, not an input, and is skipped.
+    """
+    if seen is None:
+        seen = set()
+    parts = [inspect.getsource(func)]
+    module_globals = globals()
+    for name in sorted(_code_names(func.__code__)):
+        if name in seen or name not in module_globals or name.startswith("_"):
+            continue
+        seen.add(name)
+        value = module_globals[name]
+        if isinstance(value, types.FunctionType) and value.__module__ == func.__module__:
+            parts.append(_dependency_source(value, seen))
+        elif hasattr(value, "__wrapped__") and getattr(value, "__module__", None) == func.__module__:
+            parts.append(_dependency_source(value.__wrapped__, seen))
+        elif isinstance(value, (int, float, str, tuple, list, dict)):
+            parts.append(f"{name}={value!r}")
+    return "\n".join(parts)
+
+
+def screen_key(spec):
+    """Content hash of everything that affects a screen's pixels."""
+    filename, generator, kwargs, scale = spec
+    digest = hashlib.sha256()
+    digest.update(_dependency_source(globals()[generator]).encode())
+    digest.update(json.dumps([generator, kwargs, scale], sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+def render_screen(spec, output_dir):
+    """Render one screen and save it. Runs in worker processes with --jobs."""
+    filename, generator, kwargs, scale = spec
+    img = globals()[generator](**kwargs)
+    if scale != 1:
+        img = img.resize((img.width * scale, img.height * scale), Image.Resampling.NEAREST)
+    filepath = Path(output_dir) / filename
+    img.save(filepath)
+    return filepath
+
+
+def load_cache(cache_path):
+    """Load the render cache, returning an empty one if missing or corrupt."""
+    try:
+        with open(cache_path) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def save_cache(cache_path, cache):
+    """Write the render cache."""
+    with open(cache_path, "w") as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def generate(output_dir, jobs=1, force=False, screens=None):
+    """
+    Render the screens whose cache key changed.
+
+    Returns:
+        (paths of the screens generated, number of unchanged screens skipped)
+    """
+    screens = SCREENS if screens is None else screens
+    output_dir = Path(output_dir)
+    output_dir.mkdir(exist_ok=True)
+    cache_path = output_dir / CACHE_FILENAME
+    cache = {} if force else load_cache(cache_path)
+
+    pending = []
+    skipped = 0
+    for spec in screens:
+        key = screen_key(spec)
+        if cache.get(spec[0]) == key and (output_dir / spec[0]).exists():
+            skipped += 1
+            continue
+        pending.append((spec, key))
+
+    jobs = jobs if jobs > 0 else (os.cpu_count() or 1)
+    specs = [spec for spec, _ in pending]
+    if jobs > 1 and len(specs) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(specs))) as executor:
+            paths = list(executor.map(render_screen, specs, [output_dir] * len(specs)))
+    else:
+        paths = [render_screen(spec, output_dir) for spec in specs]
+
+    for (spec, key), path in zip(pending, paths, strict=True):
+        cache[spec[0]] = key
+        print(f"Generated: {path}")
+    # Drop entries for screens that no longer exist
+    known = {spec[0] for spec in screens}
+    cache = {name: key for name, key in cache.items() if name in known}
+    save_cache(cache_path, cache)
+    return paths, skipped
+
+
 def main():
-    """Generate all mockups and save to files."""
+    """Generate changed mockups and save to files."""
+    parser = argparse.ArgumentParser(description="Generate Display Node UI mockups")
+    parser.add_argument(
+        "--jobs", "-j", type=int, default=1,
+        help="Worker processes for rendering (0 = one per CPU, default: 1)",
+    )
+    parser.add_argument(
+        "--force", "-f", action="store_true",
+        help="Re-render every screen, ignoring the render cache",
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
     output_dir = Path(__file__).parent
-    output_dir.mkdir(exist_ok=True)
+    paths, skipped = generate(output_dir, args.jobs, args.force)
 
-    mockups = [
-        ("01_main_dashboard.png", generate_main_dashboard()),
-        ("02_main_dashboard_nonprod.png", generate_main_dashboard(nonprod=True)),
-        ("03_main_dashboard_stale.png", generate_main_dashboard(pool_stale=True)),
-        ("04_pool_detail.png", generate_pool_detail()),
-        ("05_pool_detail_stale.png", generate_pool_detail_stale()),
-        ("06_valve_detail.png", generate_valve_detail(filling=False)),
-        ("07_valve_detail_filling.png", generate_valve_detail(filling=True)),
-        ("08_settings.png", generate_settings()),
-        ("09_dialog_fill_confirm.png", generate_confirmation_dialog(
-            "Start Fill Now?",
-            "This will open the\nfill valve for up to\n9 minutes."
-        )),
-        ("10_dialog_reset_confirm.png", generate_confirmation_dialog(
-            "Reset Device?",
-            "The display will\nrestart. This may\ntake 30 seconds."
-        )),
-        ("11_historical_24h.png", generate_historical_view("24h")),
-        ("12_historical_7d.png", generate_historical_view("7d")),
-        ("13_historical_30d.png", generate_historical_view("30d")),
-    ]
-
-    # Save 2x scaled versions only (better for documentation)
-    for filename, img in mockups:
-        scaled_img = img.resize((WIDTH * 2, HEIGHT * 2), Image.Resampling.NEAREST)
-        filepath = output_dir / filename
-        scaled_img.save(filepath)
-        print(f"Generated: {filepath}")
-
-    # Generate navigation flow diagram (not scaled, already large)
-    nav_flow = generate_navigation_flow()
-    nav_path = output_dir / "00_navigation_flow.png"
-    nav_flow.save(nav_path)
-    print(f"Generated: {nav_path}")
-
-    print(f"\nAll mockups saved to: {output_dir}")
+    elapsed = time.perf_counter() - start
+    print(f"\n{len(paths)} generated, {skipped} unchanged in {elapsed:.2f}s")
+    print(f"All mockups saved to: {output_dir}")
 
 
 if __name__ == "__main__":
@@ -12,11 +12,27 @@ Environment variables can be used instead of command-line arguments:
     export AIO_USERNAME="your_username"
     export AIO_KEY="your_aio_key"
     python scripts/adafruit_io_setup.py --environment nonprod
+
+Bulk mode lists existing groups and feeds in one request and creates only
+what is missing, several feeds at a time:
+    python scripts/adafruit_io_setup.py --environment nonprod --bulk
+    python scripts/adafruit_io_setup.py --environment nonprod --bulk --verify
 """
 
 import argparse
+import json
 import os
 import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from shared.cloud.feeds import FEED_NAMES  # noqa: E402
 
 try:
     from Adafruit_IO import Client, Feed, Group, RequestError
@@ -26,21 +42,33 @@ except ImportError:
     sys.exit(1)
 
 
-# Feed definitions: (name, description)
-FEEDS = [
-    ("gateway", "Central message bus for poolio system messages"),
-    ("pooltemp", "Pool water temperature readings (Fahrenheit)"),
-    ("outsidetemp", "Outside air temperature readings (Fahrenheit)"),
-    ("insidetemp", "Inside temperature readings (Fahrenheit)"),
-    ("poolnodebattery", "Pool node battery percentage (0-100)"),
-    ("poolvalveruntime", "Daily valve runtime in minutes"),
-    ("valvestarttime", "Scheduled fill window start time (HH:MM format)"),
-    ("config", "Device configuration JSON"),
-    ("config-pool-node", "Pool Node device configuration"),
-    ("config-valve-node", "Valve Node device configuration"),
-    ("config-display-node", "Display Node device configuration"),
-    ("events", "System events and diagnostic messages"),
-]
+# Feed descriptions; the feed list itself is FEED_NAMES in shared.cloud.feeds
+FEED_DESCRIPTIONS = {
+    "gateway": "Central message bus for poolio system messages",
+    "pooltemp": "Pool water temperature readings (Fahrenheit)",
+    "outsidetemp": "Outside air temperature readings (Fahrenheit)",
+    "insidetemp": "Inside temperature readings (Fahrenheit)",
+    "poolnodebattery": "Pool node battery percentage (0-100)",
+    "poolvalveruntime": "Daily valve runtime in minutes",
+    "valvestarttime": "Scheduled fill window start time (HH:MM format)",
+    "config": "Device configuration JSON",
+    "config-pool-node": "Pool Node device configuration",
+    "config-valve-node": "Valve Node device configuration",
+    "config-display-node": "Display Node device configuration",
+    "events": "System events and diagnostic messages",
+    "logs": "Device log segments shipped by LogShipper",
+}
+
+# Feed definitions: (name, description), in FEED_NAMES order
+FEEDS = [(name, FEED_DESCRIPTIONS[name]) for name in FEED_NAMES]
+
+
+# Bulk provisioning (see provision_feeds)
+AIO_BASE_URL = "https://io.adafruit.com"
+HTTP_TIMEOUT = 10
+DEFAULT_WORKERS = 4
+MAX_RETRIES = 5
+MAX_BACKOFF = 60.0
 
 
 def get_group_name(environment: str) -> str:
@@ -185,6 +213,197 @@ def verify_feeds(username: str, key: str, environment: str) -> int:
         return 1
 
 
+class ProvisioningError(Exception):
+    """An Adafruit IO request failed."""
+
+
+class AdafruitIOAPI:
+    """
+    Minimal Adafruit IO REST client for bulk provisioning.
+
+    Uses only the standard library so it can run against any base URL,
+    including a local stand-in server. Safe to share between threads: a
+    429 response from any request pauses all of them until the rate limit
+    window has passed (Retry-After, else exponential backoff).
+    """
+
+    def __init__(
+        self,
+        username: str,
+        key: str,
+        base_url: str = AIO_BASE_URL,
+        max_retries: int = MAX_RETRIES,
+    ) -> None:
+        self.username = username
+        self.base_url = base_url.rstrip("/")
+        self.max_retries = max_retries
+        self.requests = 0
+        self.throttled = 0
+        self._key = key
+        self._lock = threading.Lock()
+        self._resume_at = 0.0
+
+    def _wait_for_rate_limit(self) -> None:
+        with self._lock:
+            delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def _throttle(self, retry_after: str | None, attempt: int) -> None:
+        try:
+            delay = float(retry_after) if retry_after is not None else None
+        except ValueError:
+            delay = None
+        if delay is None:
+            delay = min(2.0**attempt, MAX_BACKOFF)
+        with self._lock:
+            self.throttled += 1
+            self._resume_at = max(self._resume_at, time.monotonic() + delay)
+
+    def request(self, method: str, path: str, body: dict | None = None):
+        """Send a request to /api/v2/{username}/{path} and return the decoded JSON."""
+        url = f"{self.base_url}/api/v2/{self.username}/{path}"
+        data = json.dumps(body).encode() if body is not None else None
+        headers = {"X-AIO-Key": self._key, "Content-Type": "application/json"}
+        for attempt in range(self.max_retries + 1):
+            self._wait_for_rate_limit()
+            request = urllib.request.Request(url, data=data, headers=headers, method=method)
+            with self._lock:
+                self.requests += 1
+            try:
+                with urllib.request.urlopen(request, timeout=HTTP_TIMEOUT) as response:
+                    payload = response.read()
+            except urllib.error.HTTPError as e:
+                if e.code == 429 and attempt < self.max_retries:
+                    self._throttle(e.headers.get("Retry-After"), attempt)
+                    continue
+                detail = e.read().decode("utf-8", errors="replace")[:200]
+                raise ProvisioningError(f"HTTP {e.code} for {method} {path}: {detail}") from None
+            except (urllib.error.URLError, OSError) as e:
+                raise ProvisioningError(f"{method} {path} failed: {e}") from None
+            return json.loads(payload) if payload else None
+        raise ProvisioningError(f"{method} {path} still rate limited")  # pragma: no cover
+
+    def list_groups(self) -> list:
+        """Return all groups, each with its feeds."""
+        return self.request("GET", "groups") or []
+
+    def create_group(self, name: str, description: str):
+        return self.request("POST", "groups", {"name": name, "description": description})
+
+    def create_feed(self, group_key: str, name: str, description: str):
+        return self.request(
+            "POST",
+            f"groups/{group_key}/feeds",
+            {"feed": {"name": name, "description": description}},
+        )
+
+
+def plan_feeds(groups: list, group_name: str, feeds=FEEDS):
+    """
+    Compare the existing groups with the wanted group and feeds.
+
+    Returns:
+        (group_exists, missing feeds as (name, description), extra feed keys
+        in the group that are not in feeds)
+    """
+    group = next((g for g in groups if group_name in (g.get("key"), g.get("name"))), None)
+    if group is None:
+        return False, list(feeds), []
+
+    prefix = f"{group_name}."
+    existing = set()
+    for feed in group.get("feeds") or []:
+        key = feed.get("key") or feed.get("name") or ""
+        existing.add(key[len(prefix) :] if key.startswith(prefix) else key)
+    wanted = {name for name, _ in feeds}
+    missing = [(name, desc) for name, desc in feeds if name not in existing]
+    extra = sorted(prefix + key for key in existing - wanted)
+    return True, missing, extra
+
+
+def provision_feeds(
+    username: str,
+    key: str,
+    environment: str,
+    base_url: str = AIO_BASE_URL,
+    workers: int = DEFAULT_WORKERS,
+    verify_only: bool = False,
+) -> int:
+    """
+    Create the group and feeds for an environment in bulk.
+
+    Lists every group with its feeds in one request, computes what is
+    missing and creates only that: the group first, then the missing feeds
+    through a pool of workers threads. With verify_only nothing is created.
+    """
+    api = AdafruitIOAPI(username, key, base_url)
+    group_name = get_group_name(environment)
+    start = time.monotonic()
+
+    action = "Verifying" if verify_only else "Provisioning"
+    print(f"\n{action} Adafruit IO feeds for environment: {environment}")
+    print(f"Group: {group_name}")
+    print("-" * 50)
+
+    try:
+        groups = api.list_groups()
+    except ProvisioningError as e:
+        print(f"  ERROR listing groups: {e}")
+        return 1
+
+    group_exists, missing, extra = plan_feeds(groups, group_name)
+    present = len(FEEDS) - len(missing)
+    print(f"  Group '{group_name}' {'exists' if group_exists else 'missing'}")
+    print(f"  Feeds: {present} present, {len(missing)} missing")
+    for feed_key in extra:
+        print(f"  Note: '{feed_key}' is not in FEEDS")
+
+    if verify_only:
+        for name, _ in missing:
+            print(f"  ERROR: Feed '{group_name}.{name}' not found")
+        print("-" * 50)
+        if group_exists and not missing:
+            print(f"\nAll {len(FEEDS)} feeds verified successfully!")
+            return 0
+        print(f"\n{len(missing)} feed(s) missing")
+        return 1
+
+    if not group_exists:
+        try:
+            api.create_group(group_name, f"Poolio {environment} feeds")
+            print(f"  Created group '{group_name}'")
+        except ProvisioningError as e:
+            print(f"  ERROR creating group '{group_name}': {e}")
+            return 1
+
+    def create(feed):
+        name, description = feed
+        try:
+            api.create_feed(group_name, name, description)
+        except ProvisioningError as e:
+            return f"  ERROR creating feed '{group_name}.{name}': {e}"
+        return f"  Created feed '{group_name}.{name}'"
+
+    errors = 0
+    if missing:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            for message in pool.map(create, missing):
+                print(message)
+                errors += "ERROR" in message
+
+    elapsed = time.monotonic() - start
+    print("-" * 50)
+    print(
+        f"\n{len(missing) - errors} created, {present} already present in {elapsed:.1f}s "
+        f"({api.requests} requests, {api.throttled} rate limited)"
+    )
+    if errors:
+        print(f"Completed with {errors} error(s)")
+        return 1
+    return 0
+
+
 def main() -> int:
     """Main entry point."""
     parser = argparse.ArgumentParser(
@@ -199,6 +418,7 @@ Examples:
   %(prog)s --environment nonprod
   %(prog)s --username myuser --key mykey --environment prod
   %(prog)s --environment nonprod --verify
+  %(prog)s --environment nonprod --bulk --workers 8
         """,
     )
     parser.add_argument(
@@ -227,6 +447,25 @@ Examples:
         help="Verify feeds exist instead of creating them",
     )
 
+    parser.add_argument(
+        "--bulk",
+        "-b",
+        action="store_true",
+        help="List existing feeds once and create only missing ones concurrently",
+    )
+    parser.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"With --bulk, feeds created at once (default: {DEFAULT_WORKERS})",
+    )
+    parser.add_argument(
+        "--base-url",
+        default=AIO_BASE_URL,
+        help=f"With --bulk, Adafruit IO URL (default: {AIO_BASE_URL})",
+    )
+
     args = parser.parse_args()
 
     if not args.username:
@@ -236,6 +475,15 @@ Examples:
         print("ERROR: API key required. Use --key or set AIO_KEY")
         return 1
 
+    if args.bulk:
+        return provision_feeds(
+            args.username,
+            args.key,
+            args.environment,
+            base_url=args.base_url,
+            workers=args.workers,
+            verify_only=args.verify,
+        )
     if args.verify:
         return verify_feeds(args.username, args.key, args.environment)
     else:
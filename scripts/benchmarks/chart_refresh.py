@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Benchmark incremental chart refresh against full redraws.
+
+Uses a PIL image as a stand-in for the ILI9341 framebuffer and counts the
+pixels pushed per refresh. The estimated SPI time assumes 16-bit pixels
+and ignores per-window command overhead.
+
+Usage:
+    python scripts/benchmarks/chart_refresh.py
+    python scripts/benchmarks/chart_refresh.py --refreshes 500 --spi-hz 40000000
+"""
+
+import argparse
+import math
+import sys
+import time
+from pathlib import Path
+
+from PIL import Image, ImageChops, ImageDraw
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from display_node.ui.chart import SparklineChart, WhiskerChart  # noqa: E402
+
+# Display dimensions and colors (match docs/mockups/generate_mockups.py)
+WIDTH = 240
+HEIGHT = 320
+BACKGROUND = (0, 0, 0)
+ACCENT = (127, 255, 212)
+
+
+class PILSurface:
+    """Chart surface backed by a PIL image."""
+
+    def __init__(self, image):
+        self.draw = ImageDraw.Draw(image)
+
+    def fill_rect(self, x, y, width, height, color):
+        self.draw.rectangle([x, y, x + width - 1, y + height - 1], fill=color)
+
+
+def sparkline_samples(count):
+    """Pool temperature-like samples (see generate_main_dashboard)."""
+    return [54 + 3 * math.sin(i * 0.3) + (i * 0.02) for i in range(count)]
+
+
+def whisker_samples(count):
+    """Daily min/max pairs (see generate_historical_view)."""
+    data = []
+    for day in range(count):
+        base = 55 + day * 0.3
+        variation = 3 * math.sin(day * 0.5)
+        data.append((base + variation - 5, base + variation + 7))
+    return data
+
+
+def run(make_chart, updates, incremental):
+    """
+    Render a chart through a series of updates.
+
+    Returns:
+        Tuple of (pixels_per_refresh, rects_per_refresh, seconds, image)
+    """
+    image = Image.new("RGB", (WIDTH, HEIGHT), BACKGROUND)
+    surface = PILSurface(image)
+    chart = make_chart()
+    chart.render(surface)
+
+    pixels = 0
+    rects = 0
+    start = time.perf_counter()
+    for update in updates:
+        update(chart)
+        if not incremental:
+            chart.invalidate()
+        pixels += chart.render(surface)
+        rects += chart.rects_pushed
+    elapsed = time.perf_counter() - start
+
+    count = max(1, len(updates))
+    return pixels / count, rects / count, elapsed, image
+
+
+def report(name, make_chart, updates, spi_hz):
+    """Run both modes for one chart type and print the comparison."""
+    full_px, full_rects, full_s, full_img = run(make_chart, updates, incremental=False)
+    inc_px, inc_rects, inc_s, inc_img = run(make_chart, updates, incremental=True)
+    identical = ImageChops.difference(full_img, inc_img).getbbox() is None
+
+    def spi_ms(pixels):
+        return pixels * 16 / spi_hz * 1000
+
+    print(f"\n{name} ({len(updates)} refreshes)")
+    print(f"  {'mode':<12}{'px/refresh':>12}{'rects':>8}{'SPI ms':>9}{'host ms':>10}")
+    for mode, px, rects, secs in (
+        ("full", full_px, full_rects, full_s),
+        ("incremental", inc_px, inc_rects, inc_s),
+    ):
+        host_ms = secs / max(1, len(updates)) * 1000
+        print(f"  {mode:<12}{px:>12.0f}{rects:>8.1f}{spi_ms(px):>9.2f}{host_ms:>10.3f}")
+    if inc_px:
+        print(f"  pixel reduction: {full_px / inc_px:.1f}x")
+    print(f"  final frames identical: {identical}")
+    return identical
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark incremental chart refresh")
+    parser.add_argument(
+        "--refreshes", "-n", type=int, default=200, help="Refreshes per chart (default: 200)"
+    )
+    parser.add_argument(
+        "--spi-hz",
+        type=int,
+        default=24_000_000,
+        help="SPI clock used for the transfer estimate (default: 24000000)",
+    )
+    args = parser.parse_args()
+
+    stream = sparkline_samples(50 + args.refreshes)
+    spark_updates = [lambda c, v=v: c.append(v) for v in stream[50:]]
+
+    def make_sparkline():
+        chart = SparklineChart(10, 215, 200, 85, capacity=50, color=ACCENT, background=BACKGROUND)
+        chart.set_values(stream[:50])
+        return chart
+
+    days = whisker_samples(30 + args.refreshes)
+    whisker_updates = [lambda c, d=d: c.append(*d) for d in days[30:]]
+
+    def make_whisker():
+        chart = WhiskerChart(5, 55, 230, 110, capacity=30, color=ACCENT, background=BACKGROUND)
+        chart.set_data(days[:30])
+        return chart
+
+    ok = report("Dashboard sparkline 200x85", make_sparkline, spark_updates, args.spi_hz)
+    ok = report("30-day whisker 230x110", make_whisker, whisker_updates, args.spi_hz) and ok
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark the import cost of the shared packages per node type.
+
+Each run starts a fresh interpreter, imports the names a node uses
+(tests/device/runner.py NODE_IMPORTS) and reports the import time, the
+peak and retained heap (tracemalloc) and the modules loaded. "eager" also
+loads every export of each package, which is what importing a package
+cost before its exports became lazy (shared/_lazy.py).
+
+CPython numbers only show the relative difference; for device numbers run
+tests.device.runner.run_node_import_profile() on the board.
+
+Usage:
+    python scripts/benchmarks/import_cost.py
+    python scripts/benchmarks/import_cost.py --runs 20 --node valve_node
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+
+sys.path.insert(0, str(ROOT))
+
+from tests.device.runner import NODE_IMPORTS  # noqa: E402
+
+# Runs in the child interpreter: argv is node type, "eager" or "lazy"
+CHILD = """
+import json, sys, time, tracemalloc
+sys.path[:0] = [{root!r}, {src!r}]
+from tests.device.runner import load_node_imports
+before = set(sys.modules)
+tracemalloc.start()
+start = time.perf_counter()
+load_node_imports(sys.argv[1], sys.argv[2] == "eager")
+elapsed = time.perf_counter() - start
+retained, peak = tracemalloc.get_traced_memory()
+modules = sorted(m for m in set(sys.modules) - before if m.startswith("shared."))
+print(json.dumps([elapsed, peak, retained, modules]))
+"""
+
+
+def measure(node_type, eager):
+    """Import one node's names in a fresh interpreter and return the results."""
+    code = CHILD.format(root=str(ROOT), src=str(ROOT / "src"))
+    mode = "eager" if eager else "lazy"
+    output = subprocess.run(
+        [sys.executable, "-c", code, node_type, mode],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    elapsed, peak, retained, modules = json.loads(output)
+    return {"seconds": elapsed, "peak": peak, "retained": retained, "modules": modules}
+
+
+def profile(node_type, runs):
+    """Return median time and heap for a node, eager and lazy."""
+    results = {}
+    for eager in (True, False):
+        samples = [measure(node_type, eager) for _ in range(runs)]
+        results["eager" if eager else "lazy"] = {
+            "ms": statistics.median(s["seconds"] for s in samples) * 1000,
+            "peak_kb": statistics.median(s["peak"] for s in samples) / 1024,
+            "retained_kb": statistics.median(s["retained"] for s in samples) / 1024,
+            "modules": samples[0]["modules"],
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--runs", type=int, default=10, help="Runs per mode (median)")
+    parser.add_argument(
+        "--node", choices=sorted(NODE_IMPORTS), action="append", help="Node type (repeatable)"
+    )
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    report = {node: profile(node, args.runs) for node in args.node or sorted(NODE_IMPORTS)}
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"{'node':<14}{'mode':<7}{'modules':>8}{'time ms':>10}{'peak KiB':>10}{'held KiB':>10}")
+    for node, results in report.items():
+        for mode in ("eager", "lazy"):
+            r = results[mode]
+            print(
+                f"{node:<14}{mode:<7}{len(r['modules']):>8}{r['ms']:>10.2f}"
+                f"{r['peak_kb']:>10.1f}{r['retained_kb']:>10.1f}"
+            )
+        eager, lazy = results["eager"], results["lazy"]
+        skipped = sorted(set(eager["modules"]) - set(lazy["modules"]))
+        print(
+            f"{'':<14}saved  {len(skipped):>8}{eager['ms'] - lazy['ms']:>10.2f}"
+            f"{eager['peak_kb'] - lazy['peak_kb']:>10.1f}"
+            f"{eager['retained_kb'] - lazy['retained_kb']:>10.1f}"
+        )
+        print(f"{'':<14}not loaded: {', '.join(m.split('.', 1)[1] for m in skipped) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
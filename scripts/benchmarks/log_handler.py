@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark log handler throughput (records/sec).
+
+Compares the previous per-record flush + stat behaviour with the current
+RotatingFileHandler, BufferedRotatingFileHandler (inline and threaded) and
+BinaryLogHandler, and reports bytes written per record.
+Run it against a directory on the slow medium you care about (e.g. a
+mounted CIRCUITPY volume or an SD card) with --dir.
+
+Usage:
+    python scripts/benchmarks/log_handler.py
+    python scripts/benchmarks/log_handler.py --records 50000 --dir /Volumes/CIRCUITPY
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from shared.logging import (  # noqa: E402
+    BinaryLogHandler,
+    BufferedRotatingFileHandler,
+    RotatingFileHandler,
+)
+
+
+class StatPerRecordHandler(RotatingFileHandler):
+    """Previous behaviour: flush + getsize before every record, then flush again."""
+
+    def _should_rotate(self):
+        if self.maxBytes <= 0:
+            return False
+        self._file.flush()
+        return os.path.getsize(self.filename) >= self.maxBytes
+
+
+MESSAGE = "Pool temp %.1fF battery %d%% cycle %d"
+
+HANDLERS = [
+    ("stat per record", lambda path: StatPerRecordHandler(path)),
+    ("in-memory size", lambda path: RotatingFileHandler(path)),
+    ("buffered", lambda path: BufferedRotatingFileHandler(path)),
+    ("buffered+thread", lambda path: BufferedRotatingFileHandler(path, threaded=True)),
+    ("binary", lambda path: BinaryLogHandler(path)),
+    ("binary+buffered", lambda path: BinaryLogHandler(path, bufferSize=4096)),
+]
+
+
+def run(make_handler, directory, records):
+    """Emit records through a handler and return (records/sec, bytes/record)."""
+    path = os.path.join(directory, "bench.log")
+    handler = make_handler(path)
+    handler.setFormatter(logging.Formatter("%(levelname)s pool-node: %(message)s"))
+    logger = logging.getLogger(f"bench-{id(handler)}")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(handler)
+
+    start = time.perf_counter()
+    for i in range(records):
+        logger.info(MESSAGE, 78.5, 87, i)
+
+    # Steady-state encoded size (strings already defined for binary)
+    record = logger.makeRecord(logger.name, logging.INFO, __file__, 0, MESSAGE, (78.5, 87, 1), None)
+    size = len(handler._encode(record))
+    handler.close()
+    elapsed = time.perf_counter() - start
+
+    logger.removeHandler(handler)
+    return records / elapsed, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark log handler throughput")
+    parser.add_argument(
+        "--records", "-n", type=int, default=20000, help="Records per handler (default: 20000)"
+    )
+    parser.add_argument("--dir", "-d", help="Directory to write logs in (default: temp dir)")
+    args = parser.parse_args()
+
+    print(f"{'handler':<18}{'records/sec':>14}{'speedup':>10}{'bytes/rec':>11}")
+    baseline = None
+    for name, make_handler in HANDLERS:
+        with tempfile.TemporaryDirectory(dir=args.dir) as directory:
+            rate, size = run(make_handler, directory, args.records)
+        if baseline is None:
+            baseline = rate
+        print(f"{name:<18}{rate:>14,.0f}{rate / baseline:>9.1f}x{size:>11.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
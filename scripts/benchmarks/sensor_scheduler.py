@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark awake time per wake cycle: sequential vs scheduled sensor reads.
+
+Simulates the pool node's sensors on a virtual clock (no real sleeping):
+a DS18X20 with a 750ms conversion, an LC709203F fuel gauge read, and
+float switch debouncing (30 reads, 10ms apart). Sensors fail at random
+with --fail-rate, and a failure costs a bus recovery and a retry.
+
+"sequential" reads one sensor after another with blocking backoff, as
+the nodes do today; "scheduled" runs the same jobs through
+SensorScheduler so reads overlap the temperature conversion.
+
+Usage:
+    python scripts/benchmarks/sensor_scheduler.py
+    python scripts/benchmarks/sensor_scheduler.py --cycles 1000 --fail-rate 0.1
+"""
+
+import argparse
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from shared.sensors.scheduler import SensorScheduler  # noqa: E402
+
+CONVERSION_TIME = 0.75
+GAUGE_READ_TIME = 0.005
+SWITCH_READS = 30
+SWITCH_INTERVAL = 0.01
+RECOVERY_TIME = 0.001
+
+
+class VirtualClock:
+    """Clock that advances only when something sleeps or does work."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += max(0, seconds)
+
+
+def make_jobs(clock, rng, fail_rate):
+    """Return (name, job, recover) tuples for one wake cycle."""
+
+    def fails():
+        return rng.random() < fail_rate
+
+    def read_temperature():
+        # start_temperature_read() then collect the scratchpad
+        yield CONVERSION_TIME
+        clock.sleep(0.01)
+        if fails():
+            raise OSError("CRC error")
+        return 78.5
+
+    def read_battery():
+        clock.sleep(GAUGE_READ_TIME)
+        if fails():
+            raise OSError("I2C NACK")
+        return 87
+
+    def read_water_level():
+        high = 0
+        for _ in range(SWITCH_READS):
+            high += 1
+            yield SWITCH_INTERVAL
+        return high > SWITCH_READS // 2
+
+    def recover():
+        clock.sleep(RECOVERY_TIME)
+
+    return [
+        ("temperature", read_temperature, recover),
+        ("battery", read_battery, recover),
+        ("water_level", read_water_level, None),
+    ]
+
+
+def run_cycle(clock, jobs, sequential):
+    """Run one wake cycle and return its awake time."""
+    start = clock.time()
+    if sequential:
+        # One scheduler per job: each read waits for the previous one
+        for name, job, recover in jobs:
+            scheduler = SensorScheduler(clock=clock.time, sleep=clock.sleep)
+            scheduler.add(name, job, recover=recover)
+            scheduler.run()
+    else:
+        scheduler = SensorScheduler(clock=clock.time, sleep=clock.sleep)
+        for name, job, recover in jobs:
+            scheduler.add(name, job, recover=recover)
+        scheduler.run()
+    return clock.time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sensor read scheduling")
+    parser.add_argument(
+        "--cycles", "-n", type=int, default=500, help="Wake cycles to simulate (default: 500)"
+    )
+    parser.add_argument(
+        "--fail-rate",
+        type=float,
+        default=0.05,
+        help="Probability that a sensor read fails (default: 0.05)",
+    )
+    parser.add_argument("--seed", type=int, default=1, help="Random seed (default: 1)")
+    args = parser.parse_args()
+
+    print(f"{'mode':<12}{'mean ms':>10}{'max ms':>10}{'saving':>9}")
+    baseline = None
+    for mode in ("sequential", "scheduled"):
+        rng = random.Random(args.seed)
+        clock = VirtualClock()
+        times = []
+        for _ in range(args.cycles):
+            jobs = make_jobs(clock, rng, args.fail_rate)
+            times.append(run_cycle(clock, jobs, mode == "sequential"))
+        mean = sum(times) / len(times)
+        if baseline is None:
+            baseline = mean
+        print(
+            f"{mode:<12}{mean * 1000:>10.0f}{max(times) * 1000:>10.0f}{1 - mean / baseline:>9.0%}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Decode binary logs written by BinaryLogHandler into text.
+
+Given the active log file, rolled segments (app.log.1, app.log.7.z, ...)
+are decoded first, oldest to newest. Pass --no-segments to decode only
+the named files.
+
+Usage:
+    python scripts/decode_logs.py /Volumes/CIRCUITPY/logs/valve.log
+    python scripts/decode_logs.py valve.log --level WARNING
+    python scripts/decode_logs.py valve.log.3.z --no-segments --utc
+"""
+
+import argparse
+import os
+import sys
+from datetime import UTC, datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from shared.logging.binary_format import (  # noqa: E402
+    LEVEL_NAMES,
+    decode,
+    level_name,
+    render_message,
+)
+from shared.logging.segments import list_segments, read_segment  # noqa: E402
+
+
+def collect_paths(files, segments=True):
+    """Return the files to decode, oldest first."""
+    paths = []
+    for path in files:
+        if segments:
+            paths.extend(list_segments(path))
+        if os.path.exists(path):
+            paths.append(path)
+    return paths
+
+
+def format_line(entry, utc=False):
+    """Render one decoded record as a text log line."""
+    timestamp, level, name, template, args = entry
+    if utc:
+        when = datetime.fromtimestamp(timestamp, UTC)
+    else:
+        when = datetime.fromtimestamp(timestamp)
+    message = render_message(template, args)
+    return f"{when:%Y-%m-%d %H:%M:%S} {level_name(level)} {name}: {message}"
+
+
+def parse_level(value):
+    """Parse a level name or number."""
+    for number, name in LEVEL_NAMES.items():
+        if value.upper() == name:
+            return number
+    try:
+        return int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"unknown level: {value}") from None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Decode binary Poolio logs")
+    parser.add_argument("files", nargs="+", help="Log files to decode")
+    parser.add_argument(
+        "--no-segments",
+        action="store_true",
+        help="Don't include rolled segments of the given files",
+    )
+    parser.add_argument(
+        "--level",
+        "-l",
+        type=parse_level,
+        default=0,
+        help="Minimum level to show (name or number)",
+    )
+    parser.add_argument("--utc", action="store_true", help="Show timestamps in UTC")
+    args = parser.parse_args()
+
+    paths = collect_paths(args.files, segments=not args.no_segments)
+    if not paths:
+        print("ERROR: No log files found", file=sys.stderr)
+        return 1
+
+    for path in paths:
+        data = b"".join(read_segment(path))
+        for entry in decode(data):
+            if entry[1] >= args.level:
+                print(format_line(entry, utc=args.utc))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
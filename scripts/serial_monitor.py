@@ -7,15 +7,38 @@ Usage:
     python scripts/serial_monitor.py --timeout 120     # Monitor for 120 seconds
     python scripts/serial_monitor.py --port /dev/...   # Specify port
     python scripts/serial_monitor.py --reset           # Send Ctrl+D to reset first
+
+Capture mode (soak tests, several boards):
+    python scripts/serial_monitor.py --capture logs/ --all-ports
+    python scripts/serial_monitor.py --capture logs/ -p /dev/ttyACM0 -p /dev/ttyACM1 -t 3600
 """
 
 import argparse
 import glob
+import gzip
+import json
+import os
+import re
+import selectors
 import sys
 import time
 
 import serial
 
+# Console lines from get_logger(): "LEVEL device_id: message"
+LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+LOG_LINE = re.compile(r"(DEBUG|INFO|WARNING|ERROR|CRITICAL) (\S+): (.*)")
+
+# Terminal title (ESC ] 0;... BEL) and CSI sequences CircuitPython writes
+ESCAPE_SEQUENCE = re.compile(r"\x1b\][^\x07]*(?:\x07|\x1b\\)|\x1b\[[0-9;?]*[A-Za-z]")
+
+# Bytes requested per read in capture mode
+READ_SIZE = 65536
+
+# Capture file rotation defaults
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_BACKUPS = 20
+
 
 def find_serial_port():
     """Auto-detect CircuitPython serial port."""
@@ -30,6 +53,290 @@ def find_serial_port():
     return None
 
 
+def find_serial_ports():
+    """Return all CircuitPython serial ports."""
+    ports = []
+    for pattern in ("/dev/cu.usbmodem*", "/dev/ttyACM*"):
+        ports.extend(sorted(glob.glob(pattern)))
+    return ports
+
+
+def parse_line(line, port, timestamp):
+    """
+    Parse one console line into a record.
+
+    Lines from get_logger() give level, device and message; other lines
+    (REPL, test runner output) keep level and device None.
+
+    Returns:
+        Dictionary with time, port, level, device and message
+    """
+    match = LOG_LINE.match(line)
+    if match:
+        level, device, message = match.groups()
+    else:
+        level, device, message = None, None, line
+    return {"time": timestamp, "port": port, "level": level, "device": device, "message": message}
+
+
+class LineBuffer:
+    """Splits a byte stream into text lines, holding back a partial last line."""
+
+    def __init__(self):
+        self._pending = b""
+
+    def feed(self, data):
+        """Add bytes; return the complete, non-empty lines (escape sequences removed)."""
+        *lines, self._pending = (self._pending + data).split(b"\n")
+        return self._decode(lines)
+
+    def flush(self):
+        """Return the partial last line, if any, as a complete line."""
+        lines, self._pending = [self._pending], b""
+        return self._decode(lines)
+
+    @staticmethod
+    def _decode(lines):
+        result = []
+        for raw in lines:
+            line = ESCAPE_SEQUENCE.sub("", raw.decode("utf-8", errors="replace")).strip()
+            if line:
+                result.append(line)
+        return result
+
+
+class RotatingGzipWriter:
+    """
+    Writes records as JSON lines to gzip files, starting a new file every
+    max_bytes of uncompressed output and keeping the newest backups files.
+
+    Files are named <prefix>.<index>.jsonl.gz; numbering continues after
+    the files already in the directory.
+
+    Raises:
+        ValueError: If backups is less than 1
+    """
+
+    def __init__(
+        self, directory, prefix="capture", max_bytes=DEFAULT_MAX_BYTES, backups=DEFAULT_BACKUPS
+    ):
+        if backups < 1:
+            raise ValueError(f"backups must be at least 1, got {backups}")
+        self.directory = directory
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.records = 0
+        os.makedirs(directory, exist_ok=True)
+        self._index = max(self._existing(), default=0)
+        self._file = None
+        self._size = 0
+
+    def _existing(self):
+        """Return the indexes of capture files in the directory."""
+        pattern = re.compile(re.escape(self.prefix) + r"\.(\d+)\.jsonl\.gz$")
+        indexes = []
+        for name in os.listdir(self.directory):
+            match = pattern.match(name)
+            if match:
+                indexes.append(int(match.group(1)))
+        return sorted(indexes)
+
+    def path(self, index):
+        return os.path.join(self.directory, f"{self.prefix}.{index:04d}.jsonl.gz")
+
+    def _open(self):
+        self._index += 1
+        self._file = gzip.open(self.path(self._index), "wb")
+        self._size = 0
+        # Keep the newest backups files, including the one just opened
+        for index in self._existing()[: -self.backups]:
+            os.remove(self.path(index))
+
+    def write(self, record):
+        line = json.dumps(record, separators=(",", ":"), ensure_ascii=False) + "\n"
+        line = line.encode("utf-8")
+        if self._file is None or self._size >= self.max_bytes:
+            self.close()
+            self._open()
+        self._file.write(line)
+        self._size += len(line)
+        self.records += 1
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class CaptureCounters:
+    """Per-device line, warning and error counts with lines/sec since the last report."""
+
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._counts = {}
+        self._window_start = clock()
+
+    def add(self, record):
+        key = record["device"] or record["port"]
+        counts = self._counts.get(key)
+        if counts is None:
+            counts = self._counts[key] = {"lines": 0, "window": 0, "warnings": 0, "errors": 0}
+        counts["lines"] += 1
+        counts["window"] += 1
+        if record["level"] == "WARNING":
+            counts["warnings"] += 1
+        elif record["level"] in ("ERROR", "CRITICAL"):
+            counts["errors"] += 1
+
+    def get(self, key):
+        """Return the counts for a device (or port), or None."""
+        return self._counts.get(key)
+
+    def report(self):
+        """Return one status line per device and start a new rate window."""
+        now = self._clock()
+        elapsed = max(now - self._window_start, 1e-9)
+        self._window_start = now
+        lines = []
+        for key in sorted(self._counts):
+            counts = self._counts[key]
+            rate = counts["window"] / elapsed
+            counts["window"] = 0
+            lines.append(
+                f"  {key:<20} {counts['lines']:>8} lines {rate:>8.1f}/s "
+                f"{counts['warnings']:>5} warnings {counts['errors']:>5} errors"
+            )
+        return lines
+
+
+def capture_ports(
+    sources,
+    writer,
+    counters,
+    duration=None,
+    stats_interval=5.0,
+    echo_level="WARNING",
+    clock=time.monotonic,
+):
+    """
+    Capture several serial ports at once until duration ends or all close.
+
+    Ports are watched with a selector and read READ_SIZE bytes at a time,
+    so one slow or silent board never blocks the others and bursts are
+    drained in a few reads instead of one readline() per line.
+
+    Args:
+        sources: Dictionary of name to open port (anything with fileno()
+            and a non-blocking read(size))
+        writer: RotatingGzipWriter for the parsed records
+        counters: CaptureCounters updated per record
+        duration: Seconds to capture, or None until interrupted
+        stats_interval: Seconds between counter reports
+        echo_level: Lowest level printed to the console; lines that are not
+            log lines (tracebacks, REPL and test output) count as WARNING
+        clock: Monotonic clock
+
+    Returns:
+        Number of records captured
+    """
+    echo_from = 0 if echo_level == "ALL" else LOG_LEVELS.index(echo_level)
+    unleveled = LOG_LEVELS.index("WARNING")
+    prefix = len(sources) > 1
+    selector = selectors.DefaultSelector()
+    for name, source in sources.items():
+        selector.register(source, selectors.EVENT_READ, (name, LineBuffer()))
+
+    def emit(name, lines):
+        timestamp = time.time()
+        for line in lines:
+            record = parse_line(line, name, timestamp)
+            writer.write(record)
+            counters.add(record)
+            level = LOG_LEVELS.index(record["level"]) if record["level"] else unleveled
+            if level >= echo_from:
+                print(f"[{name}] {line}" if prefix else line)
+
+    end = None if duration is None else clock() + duration
+    next_report = clock() + stats_interval
+    try:
+        while selector.get_map():
+            now = clock()
+            if end is not None and now >= end:
+                break
+            timeout = next_report - now
+            if end is not None:
+                timeout = min(timeout, end - now)
+            for key, _ in selector.select(max(timeout, 0)):
+                name, buffer = key.data
+                try:
+                    data = key.fileobj.read(READ_SIZE)
+                except OSError as e:
+                    data = b""
+                    print(f"[{name}] ERROR: {e}")
+                if not data:
+                    # Closed or disconnected
+                    selector.unregister(key.fileobj)
+                    emit(name, buffer.flush())
+                    continue
+                emit(name, buffer.feed(data))
+            if clock() >= next_report:
+                for line in counters.report():
+                    print(line)
+                next_report = clock() + stats_interval
+    finally:
+        # A last line without a newline (e.g. cut off by the end of capture)
+        for key in list(selector.get_map().values()):
+            name, buffer = key.data
+            emit(name, buffer.flush())
+        selector.close()
+    return writer.records
+
+
+def run_capture(
+    ports,
+    directory,
+    duration=None,
+    max_bytes=DEFAULT_MAX_BYTES,
+    backups=DEFAULT_BACKUPS,
+    stats_interval=5.0,
+    echo_level="WARNING",
+    reset=False,
+):
+    """Open ports non-blocking and capture them into directory."""
+    sources = {}
+    for port in ports:
+        try:
+            sources[os.path.basename(port)] = serial.Serial(port, 115200, timeout=0)
+        except serial.SerialException as e:
+            print(f"ERROR: Could not open serial port: {e}")
+    if not sources:
+        return 1
+
+    if reset:
+        print("Sending Ctrl+D to reset...")
+        for source in sources.values():
+            source.write(b"\x04")
+
+    writer = RotatingGzipWriter(directory, max_bytes=max_bytes, backups=backups)
+    counters = CaptureCounters()
+    print(f"Capturing {', '.join(sources)} to {directory} (Ctrl+C to stop)...")
+    try:
+        capture_ports(sources, writer, counters, duration, stats_interval, echo_level)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        writer.close()
+        for source in sources.values():
+            source.close()
+
+    print("=" * 60)
+    for line in counters.report():
+        print(line)
+    print(f"Captured {writer.records} records")
+    return 0
+
+
 def monitor_serial(port, timeout_seconds=60, reset=False):
     """Monitor serial port and print output."""
     print(f"Connecting to {port}...")
@@ -85,22 +392,84 @@ def monitor_serial(port, timeout_seconds=60, reset=False):
 
 def main():
     parser = argparse.ArgumentParser(description="Monitor CircuitPython serial output")
-    parser.add_argument("--port", "-p", help="Serial port (auto-detected if not specified)")
     parser.add_argument(
-        "--timeout", "-t", type=int, default=60, help="Timeout in seconds (default: 60)"
+        "--port",
+        "-p",
+        action="append",
+        help="Serial port (auto-detected if not specified; repeat to capture several)",
+    )
+    parser.add_argument(
+        "--timeout",
+        "-t",
+        type=int,
+        help="Timeout in seconds (default: 60; capture runs until Ctrl+C)",
     )
     parser.add_argument(
         "--reset", "-r", action="store_true", help="Send Ctrl+D to reset board first"
     )
+    parser.add_argument(
+        "--capture",
+        "-c",
+        metavar="DIR",
+        help="Capture parsed log records to rotating compressed files in DIR",
+    )
+    parser.add_argument(
+        "--all-ports", "-a", action="store_true", help="Capture every detected port"
+    )
+    parser.add_argument(
+        "--max-bytes",
+        type=int,
+        default=DEFAULT_MAX_BYTES,
+        help=f"Uncompressed bytes per capture file (default: {DEFAULT_MAX_BYTES})",
+    )
+    parser.add_argument(
+        "--backups",
+        type=int,
+        default=DEFAULT_BACKUPS,
+        help=f"Capture files to keep (default: {DEFAULT_BACKUPS})",
+    )
+    parser.add_argument(
+        "--stats-interval",
+        type=float,
+        default=5.0,
+        help="Seconds between per-device counter reports (default: 5)",
+    )
+    parser.add_argument(
+        "--echo-level",
+        choices=("ALL",) + LOG_LEVELS,
+        default="WARNING",
+        help="Lowest level echoed to the console while capturing; tracebacks and other "
+        "lines that are not log lines count as WARNING (default: WARNING)",
+    )
 
     args = parser.parse_args()
+    if args.backups < 1:
+        parser.error("--backups must be at least 1")
+
+    if args.capture:
+        ports = args.port or (find_serial_ports() if args.all_ports else [find_serial_port()])
+        ports = [port for port in ports if port]
+        if not ports:
+            print("ERROR: No serial port found. Connect a CircuitPython device or specify --port")
+            return 1
+        return run_capture(
+            ports,
+            args.capture,
+            args.timeout,
+            args.max_bytes,
+            args.backups,
+            args.stats_interval,
+            args.echo_level,
+            args.reset,
+        )
 
-    port = args.port or find_serial_port()
+    port = args.port[0] if args.port else find_serial_port()
     if not port:
         print("ERROR: No serial port found. Connect a CircuitPython device or specify --port")
         return 1
 
-    return monitor_serial(port, args.timeout, args.reset)
+    timeout = args.timeout if args.timeout is not None else 60
+    return monitor_serial(port, timeout, args.reset)
 
 
 if __name__ == "__main__":
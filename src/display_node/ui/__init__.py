@@ -0,0 +1,9 @@
+# UI components for the Display Node
+# CircuitPython compatible
+
+from .chart import SparklineChart, WhiskerChart
+
+__all__ = [
+    "SparklineChart",
+    "WhiskerChart",
+]
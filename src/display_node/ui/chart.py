@@ -0,0 +1,392 @@
+# Incremental chart rendering for the Display Node
+# CircuitPython compatible (no dataclasses, no type annotations in signatures)
+#
+# Charts keep a per-column cache of the pixel spans they last drew. On
+# refresh only the pixels that changed are pushed, instead of clearing
+# and redrawing the whole chart zone over SPI.
+#
+# Drawing goes through a "surface" with a single method:
+#
+#     surface.fill_rect(x, y, width, height, color)
+#
+# On the device this wraps the display bitmap (e.g. bitmaptools.fill_region);
+# on the host a PIL ImageDraw works as a stand-in framebuffer.
+
+
+def _merge_spans(spans):
+    """
+    Merge overlapping or adjacent (top, bottom) row spans.
+
+    Args:
+        spans: List of (top, bottom) tuples, inclusive rows
+
+    Returns:
+        Sorted tuple of disjoint (top, bottom) tuples
+    """
+    if not spans:
+        return ()
+    spans = sorted(spans)
+    merged = [spans[0]]
+    for top, bottom in spans[1:]:
+        last_top, last_bottom = merged[-1]
+        if top <= last_bottom + 1:
+            if bottom > last_bottom:
+                merged[-1] = (last_top, bottom)
+        else:
+            merged.append((top, bottom))
+    return tuple(merged)
+
+
+def _subtract_spans(spans, other):
+    """
+    Return the parts of spans not covered by other.
+
+    Args:
+        spans: Sorted tuple of disjoint (top, bottom) spans
+        other: Sorted tuple of disjoint (top, bottom) spans
+
+    Returns:
+        List of (top, bottom) spans
+    """
+    result = []
+    for top, bottom in spans:
+        start = top
+        for other_top, other_bottom in other:
+            if other_bottom < start:
+                continue
+            if other_top > bottom:
+                break
+            if other_top > start:
+                result.append((start, other_top - 1))
+            start = other_bottom + 1
+            if start > bottom:
+                break
+        if start <= bottom:
+            result.append((start, bottom))
+    return result
+
+
+class _Chart:
+    """
+    Base class for charts rendered column by column.
+
+    Subclasses implement _compute_columns(), returning for each pixel
+    column a tuple of (top, bottom) row spans relative to the chart origin.
+    render() diffs those spans against the cached ones and pushes only
+    the difference.
+
+    Attributes:
+        x: Left edge of the chart on the display
+        y: Top edge of the chart on the display
+        width: Chart width in pixels
+        height: Chart height in pixels
+        color: Foreground color
+        background: Background color
+        pixels_pushed: Pixels written by the last render()
+        rects_pushed: fill_rect() calls made by the last render()
+        dirty_region: (x, y, width, height) touched by the last render(),
+            or None if nothing changed
+    """
+
+    def __init__(self, x, y, width, height, color, background=0):
+        """
+        Initialize chart.
+
+        Args:
+            x: Left edge of the chart on the display
+            y: Top edge of the chart on the display
+            width: Chart width in pixels
+            height: Chart height in pixels
+            color: Foreground color (any value the surface accepts)
+            background: Background color (default 0)
+        """
+        if width < 2 or height < 2:
+            raise ValueError("Chart must be at least 2x2 pixels")
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.color = color
+        self.background = background
+        self.pixels_pushed = 0
+        self.rects_pushed = 0
+        self.dirty_region = None
+        self._columns = None  # None forces a full repaint
+
+    def invalidate(self):
+        """Force the next render() to clear and repaint the whole chart."""
+        self._columns = None
+
+    def _scale(self, value, low, value_range):
+        """Map a value to a row (0 is the top of the chart)."""
+        return (self.height - 1) - int((value - low) * (self.height - 1) / value_range)
+
+    def _compute_columns(self):
+        """Return a list of span tuples, one per pixel column."""
+        raise NotImplementedError("Subclasses must implement _compute_columns()")
+
+    def render(self, surface):
+        """
+        Push changed pixels to the surface.
+
+        Args:
+            surface: Object with fill_rect(x, y, width, height, color)
+
+        Returns:
+            Number of pixels pushed
+        """
+        new_columns = self._compute_columns()
+        pixels = 0
+        rects = 0
+        dirty_left = None
+        dirty_right = None
+        dirty_top = None
+        dirty_bottom = None
+
+        old_columns = self._columns
+        if old_columns is None:
+            surface.fill_rect(self.x, self.y, self.width, self.height, self.background)
+            pixels += self.width * self.height
+            rects += 1
+            dirty_left, dirty_right = 0, self.width - 1
+            dirty_top, dirty_bottom = 0, self.height - 1
+            old_columns = [()] * self.width
+
+        for col in range(self.width):
+            new = new_columns[col]
+            old = old_columns[col]
+            if new == old:
+                continue
+
+            for top, bottom in _subtract_spans(old, new):
+                surface.fill_rect(self.x + col, self.y + top, 1, bottom - top + 1, self.background)
+                pixels += bottom - top + 1
+                rects += 1
+            for top, bottom in _subtract_spans(new, old):
+                surface.fill_rect(self.x + col, self.y + top, 1, bottom - top + 1, self.color)
+                pixels += bottom - top + 1
+                rects += 1
+
+            spans = old + new
+            top = min(span[0] for span in spans)
+            bottom = max(span[1] for span in spans)
+            if dirty_left is None:
+                dirty_left, dirty_top, dirty_bottom = col, top, bottom
+            dirty_right = col
+            dirty_top = min(dirty_top, top)
+            dirty_bottom = max(dirty_bottom, bottom)
+
+        self._columns = new_columns
+        self.pixels_pushed = pixels
+        self.rects_pushed = rects
+        if dirty_left is None:
+            self.dirty_region = None
+        else:
+            self.dirty_region = (
+                self.x + dirty_left,
+                self.y + dirty_top,
+                dirty_right - dirty_left + 1,
+                dirty_bottom - dirty_top + 1,
+            )
+        return pixels
+
+
+class SparklineChart(_Chart):
+    """
+    Scrolling sparkline with a fixed number of samples.
+
+    New samples shift the series left; the oldest sample drops off once
+    capacity is reached. Scaling follows the current min/max like
+    draw_sparkline() in the mockup generator.
+
+    Example:
+        chart = SparklineChart(10, 215, 200, 85, capacity=50, color=0x7FFFD4)
+        chart.set_values(history)
+        chart.render(surface)
+        ...
+        chart.append(new_reading)
+        chart.render(surface)  # pushes only the changed pixels
+    """
+
+    def __init__(self, x, y, width, height, capacity, color, background=0, thickness=2):
+        """
+        Initialize SparklineChart.
+
+        Args:
+            x: Left edge of the chart on the display
+            y: Top edge of the chart on the display
+            width: Chart width in pixels
+            height: Chart height in pixels
+            capacity: Maximum number of samples shown
+            color: Line color
+            background: Background color (default 0)
+            thickness: Line thickness in pixels (default 2)
+        """
+        super().__init__(x, y, width, height, color, background)
+        if capacity < 2:
+            raise ValueError("capacity must be at least 2")
+        self.capacity = capacity
+        self.thickness = thickness
+        self._values = []
+
+    @property
+    def values(self):
+        """Return a copy of the samples currently plotted."""
+        return list(self._values)
+
+    @property
+    def min_value(self):
+        """Return the lowest plotted sample, or None if empty."""
+        return min(self._values) if self._values else None
+
+    @property
+    def max_value(self):
+        """Return the highest plotted sample, or None if empty."""
+        return max(self._values) if self._values else None
+
+    def set_values(self, values):
+        """
+        Replace the series (keeps the newest capacity samples).
+
+        Args:
+            values: Iterable of numeric samples, oldest first
+        """
+        self._values = list(values)[-self.capacity :]
+
+    def append(self, value):
+        """
+        Add a sample, dropping the oldest one if at capacity.
+
+        Args:
+            value: Numeric sample
+        """
+        self._values.append(value)
+        if len(self._values) > self.capacity:
+            self._values.pop(0)
+
+    def _compute_columns(self):
+        columns = [()] * self.width
+        count = len(self._values)
+        if count < 2:
+            return columns
+
+        low = min(self._values)
+        high = max(self._values)
+        value_range = high - low if high != low else 1
+        rows = [self._scale(v, low, value_range) for v in self._values]
+
+        last_col = self.width - 1
+        last_row = self.height - 1
+        extra = self.thickness - 1
+        for i in range(count - 1):
+            xa = (i * last_col) // (count - 1)
+            xb = ((i + 1) * last_col) // (count - 1)
+            ya = rows[i]
+            yb = rows[i + 1]
+            dx = xb - xa
+            for col in range(xa, xb + 1):
+                if dx == 0:
+                    y0, y1 = ya, yb
+                else:
+                    y0 = ya + (yb - ya) * (col - xa) // dx
+                    y1 = ya + (yb - ya) * (min(col + 1, xb) - xa) // dx
+                top = min(y0, y1)
+                bottom = min(max(y0, y1) + extra, last_row)
+                current = columns[col]
+                if current:
+                    top = min(top, current[0][0])
+                    bottom = max(bottom, current[0][1])
+                columns[col] = ((top, bottom),)
+        return columns
+
+
+class WhiskerChart(_Chart):
+    """
+    Min/max whisker chart with one bar per period.
+
+    Each bar is a vertical whisker with caps at min and max and a small
+    marker at the midpoint, matching draw_whisker_chart() in the mockup
+    generator. Adding a period shifts the bars left once capacity is
+    reached.
+    """
+
+    def __init__(self, x, y, width, height, capacity, color, background=0):
+        """
+        Initialize WhiskerChart.
+
+        Args:
+            x: Left edge of the chart on the display
+            y: Top edge of the chart on the display
+            width: Chart width in pixels
+            height: Chart height in pixels
+            capacity: Maximum number of bars shown (e.g. 7 or 30 days)
+            color: Bar color
+            background: Background color (default 0)
+        """
+        super().__init__(x, y, width, height, color, background)
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._data = []
+
+    @property
+    def data(self):
+        """Return a copy of the (min, max) periods currently plotted."""
+        return list(self._data)
+
+    def set_data(self, data):
+        """
+        Replace all periods (keeps the newest capacity periods).
+
+        Args:
+            data: Iterable of (min_val, max_val) tuples, oldest first
+        """
+        self._data = [(lo, hi) for lo, hi in data][-self.capacity :]
+
+    def append(self, min_val, max_val):
+        """
+        Add a period, dropping the oldest one if at capacity.
+
+        Args:
+            min_val: Lowest value in the period
+            max_val: Highest value in the period
+        """
+        self._data.append((min_val, max_val))
+        if len(self._data) > self.capacity:
+            self._data.pop(0)
+
+    def _compute_columns(self):
+        spans = [[] for _ in range(self.width)]
+        if not self._data:
+            return [()] * self.width
+
+        low = min(d[0] for d in self._data)
+        high = max(d[1] for d in self._data)
+        value_range = high - low if high != low else 1
+        last_row = self.height - 1
+
+        num_bars = len(self._data)
+        bar_spacing = self.width / num_bars
+        bar_width = max(4, int(bar_spacing * 0.6))
+        cap_width = bar_width // 2
+
+        def add(col_from, col_to, top, bottom):
+            top = max(0, top)
+            bottom = min(last_row, bottom)
+            for col in range(max(0, col_from), min(self.width - 1, col_to) + 1):
+                spans[col].append((top, bottom))
+
+        for i, (min_val, max_val) in enumerate(self._data):
+            bar_x = int(i * bar_spacing + (bar_spacing - bar_width) / 2)
+            center = bar_x + bar_width // 2
+            min_y = self._scale(min_val, low, value_range)
+            max_y = self._scale(max_val, low, value_range)
+            avg_y = self._scale((min_val + max_val) / 2, low, value_range)
+
+            # Whisker (2px wide), caps at both ends, marker at midpoint
+            add(center - 1, center, max_y, min_y)
+            add(center - cap_width, center + cap_width, max_y - 1, max_y)
+            add(center - cap_width, center + cap_width, min_y - 1, min_y)
+            add(center - 2, center + 2, avg_y - 2, avg_y + 2)
+
+        return [_merge_spans(col_spans) for col_spans in spans]
@@ -0,0 +1,47 @@
+# Lazy attribute loading for package __init__ modules
+# CircuitPython compatible (no dataclasses, no type annotations in signatures)
+
+import sys
+
+# Attribute that module __getattr__ answers, used to detect support for it
+_PROBE = "__lazy_probe__"
+
+
+def lazy_exports(package, namespace, exports):
+    """
+    Import a package's exported names from their submodules on first use.
+
+    Installs a module-level __getattr__ (PEP 562) in the package namespace;
+    "from shared.cloud import AdafruitIOHTTP" then imports only
+    adafruit_io_http (and what it imports), and the name is cached in the
+    package so later lookups are plain attribute reads.
+
+    CircuitPython supports module __getattr__ on boards built with
+    MICROPY_MODULE_GETATTR. On builds without it the probe lookup fails
+    and every submodule is imported right away, as before.
+
+    Args:
+        package: Package name (__name__ of the __init__ module)
+        namespace: Package globals() to install __getattr__ in
+        exports: Dictionary of exported name to submodule name
+
+    Returns:
+        True if names load lazily, False if they were imported eagerly
+    """
+
+    def __getattr__(name):
+        submodule = exports.get(name)
+        if submodule is None:
+            if name == _PROBE:
+                return True
+            raise AttributeError(f"module '{package}' has no attribute '{name}'")
+        value = getattr(__import__(package + "." + submodule, None, None, (name,)), name)
+        namespace[name] = value
+        return value
+
+    namespace["__getattr__"] = __getattr__
+    if getattr(sys.modules[package], _PROBE, False):
+        return True
+    for name in exports:
+        __getattr__(name)
+    return False
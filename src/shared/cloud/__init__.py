@@ -1,9 +1,29 @@
 # Cloud backend module for Poolio IoT system
 # CircuitPython compatible
+#
+# Names are imported from their submodules on first use (see shared._lazy),
+# so a node using only AdafruitIOHTTP never loads the MQTT client.
 
-from .adafruit_io_http import AdafruitIOHTTP
-from .adafruit_io_mqtt import AdafruitIOMQTT
-from .base import CloudBackend
-from .mock import MockBackend
+from .._lazy import lazy_exports
 
-__all__ = ["CloudBackend", "AdafruitIOHTTP", "AdafruitIOMQTT", "MockBackend"]
+_EXPORTS = {
+    "CloudBackend": "base",
+    "AdafruitIOHTTP": "adafruit_io_http",
+    "AdafruitIOMQTT": "adafruit_io_mqtt",
+    "MockBackend": "mock",
+    "FEED_NAMES": "feeds",
+    "Feed": "feeds",
+    "FeedRegistry": "feeds",
+}
+
+__all__ = [
+    "CloudBackend",
+    "AdafruitIOHTTP",
+    "AdafruitIOMQTT",
+    "MockBackend",
+    "FEED_NAMES",
+    "Feed",
+    "FeedRegistry",
+]
+
+_LAZY = lazy_exports(__name__, globals(), _EXPORTS)
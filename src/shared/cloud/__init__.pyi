@@ -0,0 +1,25 @@
+# Type stubs for cloud backend module exports
+
+from .adafruit_io_http import (
+    AdafruitIOHTTP as AdafruitIOHTTP,
+)
+from .adafruit_io_mqtt import (
+    AdafruitIOMQTT as AdafruitIOMQTT,
+)
+from .base import (
+    CloudBackend as CloudBackend,
+)
+from .feeds import (
+    FEED_NAMES as FEED_NAMES,
+)
+from .feeds import (
+    Feed as Feed,
+)
+from .feeds import (
+    FeedRegistry as FeedRegistry,
+)
+from .mock import (
+    MockBackend as MockBackend,
+)
+
+__all__: list[str]
@@ -2,6 +2,7 @@
 # CircuitPython compatible (no dataclasses, no type annotations in signatures)
 
 from .base import CloudBackend
+from .feeds import ADAFRUIT_IO_URL, FeedRegistry
 
 # Import requests with fallback for CircuitPython
 try:
@@ -37,7 +38,7 @@ class AdafruitIOHTTP(CloudBackend):
         _base_url: Base URL for Adafruit IO API v2
     """
 
-    def __init__(self, username, api_key, environment="prod"):
+    def __init__(self, username, api_key, environment="prod", feeds=None):
         """
         Initialize AdafruitIOHTTP client.
 
@@ -45,12 +46,16 @@ class AdafruitIOHTTP(CloudBackend):
             username: Adafruit IO username
             api_key: Adafruit IO API key
             environment: Environment name (default: prod)
+            feeds: FeedRegistry for username and environment to share
+                (default: a new one)
         """
-        super().__init__(environment)
+        if feeds is None:
+            feeds = FeedRegistry(environment, username, ADAFRUIT_IO_URL)
+        super().__init__(environment, feeds)
         self._username = username
         self._api_key = api_key
         self._connected = False
-        self._base_url = "https://io.adafruit.com/api/v2"
+        self._base_url = feeds.base_url
 
     def connect(self):
         """
@@ -112,8 +117,7 @@ class AdafruitIOHTTP(CloudBackend):
         # but is not meaningful for HTTP (no QoS concept)
         self._require_requests()
 
-        feed_name = self._get_feed_name(feed)
-        url = f"{self._base_url}/{self._username}/feeds/{feed_name}/data"
+        url = self._feeds.get(feed).data_url
 
         response = requests.post(
             url, headers=self._get_headers(), json={"value": value}, timeout=HTTP_TIMEOUT
@@ -125,6 +129,45 @@ class AdafruitIOHTTP(CloudBackend):
         finally:
             response.close()
 
+    def publish_batch(self, feed, values):
+        """
+        Publish several values to a feed in one request.
+
+        Uses the Adafruit IO batch data endpoint. Each value still counts
+        against the account rate limit.
+
+        Args:
+            feed: Feed name (string)
+            values: List of values to publish, oldest first
+
+        Returns:
+            Number of values published (0 if throttled)
+
+        Raises:
+            RuntimeError: If requests module is not available or HTTP error
+        """
+        if not values:
+            return 0
+        self._require_requests()
+
+        url = self._feeds.get(feed).batch_url
+
+        response = requests.post(
+            url,
+            headers=self._get_headers(),
+            json={"data": [{"value": value} for value in values]},
+            timeout=HTTP_TIMEOUT,
+        )
+        try:
+            if response.status_code == 429:
+                # Rate limited: nothing was stored, the caller retries later
+                return 0
+            if response.status_code >= 400:
+                raise RuntimeError(f"HTTP {response.status_code} from Adafruit IO")
+            return len(values)
+        finally:
+            response.close()
+
     def subscribe(self, feed, callback):
         """
         Subscribe to a feed with a callback.
@@ -157,8 +200,7 @@ class AdafruitIOHTTP(CloudBackend):
         """
         self._require_requests()
 
-        feed_name = self._get_feed_name(feed)
-        url = f"{self._base_url}/{self._username}/feeds/{feed_name}/data/last"
+        url = self._feeds.get(feed).last_url
 
         response = requests.get(url, headers=self._get_headers(), timeout=HTTP_TIMEOUT)
         try:
@@ -195,8 +237,7 @@ class AdafruitIOHTTP(CloudBackend):
         """
         self._require_requests()
 
-        feed_name = self._get_feed_name(feed)
-        url = f"{self._base_url}/{self._username}/feeds/{feed_name}/data/chart"
+        url = self._feeds.get(feed).chart_url
 
         params = {"hours": hours, "resolution": resolution}
         response = requests.get(
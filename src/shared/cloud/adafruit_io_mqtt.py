@@ -5,6 +5,7 @@ import time
 
 from .adafruit_io_http import AdafruitIOHTTP
 from .base import CloudBackend
+from .feeds import FeedRegistry
 
 # Import MQTT with fallback for testing without CircuitPython
 try:
@@ -54,14 +55,14 @@ class AdafruitIOMQTT(CloudBackend):
             socket_pool: Socket pool for CircuitPython (optional)
             ssl_context: SSL context for TLS (optional)
         """
-        super().__init__(environment)
+        super().__init__(environment, FeedRegistry(environment, username))
         self._username = username
         self._api_key = api_key
         self._socket_pool = socket_pool
         self._ssl_context = ssl_context
         self._connected = False
         self._mqtt = None
-        self._http = AdafruitIOHTTP(username, api_key, environment)
+        self._http = AdafruitIOHTTP(username, api_key, environment, self._feeds)
         self._subscribers = {}
         self._throttle_until = 0
         self._throttle_count = 0
@@ -131,8 +132,7 @@ class AdafruitIOMQTT(CloudBackend):
         Returns:
             MQTT topic in format: username/feeds/feed_name
         """
-        feed_name = self._get_feed_name(feed)
-        return f"{self._username}/feeds/{feed_name}"
+        return self._feeds.topic(feed)
 
     def publish(self, feed, value, qos=0):
         """
@@ -249,23 +249,16 @@ class AdafruitIOMQTT(CloudBackend):
             self._handle_throttle(topic, message)
             return
 
-        # Extract feed name from topic (format: username/feeds/feed_name)
-        parts = topic.split("/")
-        if len(parts) >= 3 and parts[1] == "feeds":
-            feed_name = "/".join(parts[2:])  # Handle nested feed names
-
-            # Find the logical feed name (remove environment prefix if present)
-            logical_feed = feed_name
-            if self._environment != "prod" and feed_name.startswith(f"{self._environment}-"):
-                logical_feed = feed_name[len(self._environment) + 1 :]
-
-            # Call registered callbacks
-            if logical_feed in self._subscribers:
-                for callback in self._subscribers[logical_feed]:
-                    try:
-                        callback(logical_feed, message)
-                    except Exception as e:
-                        print(f"Callback error for feed '{logical_feed}' (ignored): {e}")
+        # Resolve the logical feed name (format: username/feeds/feed_name)
+        logical_feed = self._feeds.name_for_topic(topic)
+
+        # Call registered callbacks
+        if logical_feed in self._subscribers:
+            for callback in self._subscribers[logical_feed]:
+                try:
+                    callback(logical_feed, message)
+                except Exception as e:
+                    print(f"Callback error for feed '{logical_feed}' (ignored): {e}")
 
     def fetch_latest(self, feed):
         """
@@ -1,6 +1,8 @@
 # CloudBackend base class for cloud backend implementations
 # CircuitPython compatible (no ABC, no type annotations in signatures)
 
+from .feeds import FeedRegistry
+
 
 class CloudBackend:
     """
@@ -16,16 +18,19 @@ class CloudBackend:
 
     Attributes:
         _environment: Environment name (prod, nonprod, dev, test)
+        _feeds: FeedRegistry resolving logical feed names for the environment
     """
 
-    def __init__(self, environment="prod"):
+    def __init__(self, environment="prod", feeds=None):
         """
         Initialize CloudBackend.
 
         Args:
             environment: Environment name (default: prod)
+            feeds: FeedRegistry to use (default: a new one for environment)
         """
         self._environment = environment
+        self._feeds = FeedRegistry(environment) if feeds is None else feeds
 
     @property
     def environment(self):
@@ -42,9 +47,7 @@ class CloudBackend:
         Returns:
             Feed name with environment prefix (or no prefix for prod)
         """
-        if self._environment == "prod":
-            return logical_name
-        return f"{self._environment}-{logical_name}"
+        return self._feeds.key(logical_name)
 
     def connect(self):
         """
@@ -91,6 +94,31 @@ class CloudBackend:
         """
         raise NotImplementedError("Subclasses must implement publish()")
 
+    def publish_batch(self, feed, values):
+        """
+        Publish several values to one feed.
+
+        The default publishes the values one at a time and stops at the
+        first throttled value. Backends with a batch API override this to
+        send them in one request.
+
+        Args:
+            feed: Feed name (string)
+            values: List of values to publish, oldest first
+
+        Returns:
+            Number of values published (a prefix of values)
+
+        Raises:
+            RuntimeError: If unable to publish
+        """
+        count = 0
+        for value in values:
+            if not self.publish(feed, value):
+                break
+            count += 1
+        return count
+
     def subscribe(self, feed, callback):
         """
         Subscribe to a feed with a callback.
@@ -0,0 +1,141 @@
+# Feed name, URL and topic resolution for cloud backends
+# CircuitPython compatible (no dataclasses, no type annotations in signatures)
+
+# Logical feed names; scripts/adafruit_io_setup.py provisions exactly these
+FEED_NAMES = (
+    "gateway",
+    "pooltemp",
+    "outsidetemp",
+    "insidetemp",
+    "poolnodebattery",
+    "poolvalveruntime",
+    "valvestarttime",
+    "config",
+    "config-pool-node",
+    "config-valve-node",
+    "config-display-node",
+    "events",
+    "logs",
+)
+
+ADAFRUIT_IO_URL = "https://io.adafruit.com/api/v2"
+
+
+class Feed:
+    """
+    Resolved names for one logical feed.
+
+    Attributes:
+        name: Logical feed name (e.g. "pooltemp")
+        key: Environment-prefixed feed key (e.g. "nonprod-pooltemp")
+        topic: MQTT topic ("{username}/feeds/{key}")
+        data_url: HTTP URL of the feed's data endpoint
+        batch_url: data_url + "/batch"
+        last_url: data_url + "/last"
+        chart_url: data_url + "/chart"
+    """
+
+    def __init__(self, name, key, topic, data_url):
+        self.name = name
+        self.key = key
+        self.topic = topic
+        self.data_url = data_url
+        self.batch_url = data_url + "/batch"
+        self.last_url = data_url + "/last"
+        self.chart_url = data_url + "/chart"
+
+
+class FeedRegistry:
+    """
+    Environment-bound cache of resolved feed names.
+
+    Each logical feed is resolved once to a Feed holding its prefixed
+    key, MQTT topic and HTTP URLs; publishing and message dispatch then
+    look strings up instead of building them. The names in FEED_NAMES are
+    resolved up front; any other name is resolved on first use and kept.
+
+    Prefixing follows NFR-ENV-002: prod feeds are unprefixed, other
+    environments use "{environment}-{name}".
+    """
+
+    def __init__(self, environment, username="", base_url=ADAFRUIT_IO_URL, feeds=FEED_NAMES):
+        """
+        Initialize FeedRegistry.
+
+        Args:
+            environment: Environment name (prod, nonprod, dev, test)
+            username: Adafruit IO username for topics and URLs
+            base_url: HTTP API base URL
+            feeds: Logical feed names to resolve up front
+        """
+        self.environment = environment
+        self.username = username
+        self.base_url = base_url
+        self._prefix = "" if environment == "prod" else environment + "-"
+        self._topic_prefix = username + "/feeds/"
+        self._url_prefix = base_url + "/" + username + "/feeds/"
+        self._feeds = {}
+        self._by_topic = {}
+        for name in feeds:
+            self.get(name)
+
+    def get(self, name):
+        """
+        Return the Feed for a logical name, resolving it on first use.
+
+        Args:
+            name: Logical feed name
+
+        Returns:
+            Feed
+        """
+        feed = self._feeds.get(name)
+        if feed is None:
+            key = self._prefix + name
+            feed = Feed(
+                name,
+                key,
+                self._topic_prefix + key,
+                self._url_prefix + key + "/data",
+            )
+            self._feeds[name] = feed
+            self._by_topic[feed.topic] = name
+        return feed
+
+    def key(self, name):
+        """Return the environment-prefixed feed key for a logical name."""
+        return self.get(name).key
+
+    def topic(self, name):
+        """Return the MQTT topic for a logical name."""
+        return self.get(name).topic
+
+    def name_for_topic(self, topic):
+        """
+        Return the logical feed name for an MQTT topic.
+
+        Topics of feeds not resolved yet are parsed (username/feeds/key)
+        and stripped of the environment prefix.
+
+        Args:
+            topic: MQTT topic string
+
+        Returns:
+            Logical feed name, or None if topic is not a feed topic
+        """
+        name = self._by_topic.get(topic)
+        if name is not None:
+            return name
+        parts = topic.split("/")
+        if len(parts) < 3 or parts[1] != "feeds":
+            return None
+        key = "/".join(parts[2:])
+        if self._prefix and key.startswith(self._prefix):
+            return key[len(self._prefix) :]
+        return key
+
+    def __contains__(self, name):
+        return name in self._feeds
+
+    def __iter__(self):
+        return iter(self._feeds.values())
@@ -1,15 +1,28 @@
 # Configuration management module
 # CircuitPython compatible
+#
+# Names are imported from their submodules on first use (see shared._lazy).
 
-from .defaults import NODE_DEFAULTS
-from .environment import (
-    EnvironmentConfig,
-    get_feed_name,
-    select_api_key,
-    validate_environment,
-)
-from .loader import Config, load_config
-from .schema import VALID_ENVIRONMENTS, ConfigurationError
+from .._lazy import lazy_exports
+
+_EXPORTS = {
+    "ConfigurationError": "schema",
+    "VALID_ENVIRONMENTS": "schema",
+    "RESTART_REQUIRED_KEYS": "schema",
+    "validate_settings": "schema",
+    "NODE_DEFAULTS": "defaults",
+    "validate_environment": "environment",
+    "get_feed_name": "environment",
+    "select_api_key": "environment",
+    "EnvironmentConfig": "environment",
+    "Config": "loader",
+    "load_config": "loader",
+    "FrozenDict": "loader",
+    "CONFIG_PATH": "loader",
+    "SETTINGS_PATH": "loader",
+    "parse_settings_toml": "settings_toml",
+    "ConfigStore": "store",
+}
 
 __all__ = [
     "ConfigurationError",
@@ -21,4 +34,13 @@ __all__ = [
     "EnvironmentConfig",
     "Config",
     "load_config",
+    "FrozenDict",
+    "CONFIG_PATH",
+    "SETTINGS_PATH",
+    "validate_settings",
+    "parse_settings_toml",
+    "ConfigStore",
+    "RESTART_REQUIRED_KEYS",
 ]
+
+_LAZY = lazy_exports(__name__, globals(), _EXPORTS)
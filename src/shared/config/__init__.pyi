@@ -0,0 +1,52 @@
+# Type stubs for configuration module exports
+
+from .defaults import (
+    NODE_DEFAULTS as NODE_DEFAULTS,
+)
+from .environment import (
+    EnvironmentConfig as EnvironmentConfig,
+)
+from .environment import (
+    get_feed_name as get_feed_name,
+)
+from .environment import (
+    select_api_key as select_api_key,
+)
+from .environment import (
+    validate_environment as validate_environment,
+)
+from .loader import (
+    CONFIG_PATH as CONFIG_PATH,
+)
+from .loader import (
+    SETTINGS_PATH as SETTINGS_PATH,
+)
+from .loader import (
+    Config as Config,
+)
+from .loader import (
+    FrozenDict as FrozenDict,
+)
+from .loader import (
+    load_config as load_config,
+)
+from .schema import (
+    RESTART_REQUIRED_KEYS as RESTART_REQUIRED_KEYS,
+)
+from .schema import (
+    VALID_ENVIRONMENTS as VALID_ENVIRONMENTS,
+)
+from .schema import (
+    ConfigurationError as ConfigurationError,
+)
+from .schema import (
+    validate_settings as validate_settings,
+)
+from .settings_toml import (
+    parse_settings_toml as parse_settings_toml,
+)
+from .store import (
+    ConfigStore as ConfigStore,
+)
+
+__all__: list[str]
@@ -1,44 +1,133 @@
 # Configuration loader
 # CircuitPython compatible (no dataclasses, no type annotations in signatures)
 
+import json
+import os
+
 try:
     from typing import Any
 except ImportError:
     Any = None  # CircuitPython doesn't have typing module
 
+try:
+    import binascii
+except ImportError:
+    binascii = None
+
+from ..storage import read_atomic, write_atomic
 from .defaults import NODE_DEFAULTS
 from .environment import validate_environment
-from .schema import ConfigurationError
+from .schema import ConfigurationError, validate_settings
+from .settings_toml import parse_settings_toml
 
 # Valid node types
 VALID_NODE_TYPES = ["pool_node", "valve_node", "display_node"]
 
+# Standard file locations on CIRCUITPY
+CONFIG_PATH = "/config.json"
+SETTINGS_PATH = "/settings.toml"
+
+# settings.toml keys with this prefix override settings (POOLIO_SLEEP_DURATION)
+SETTINGS_PREFIX = "POOLIO_"
+
+# Bump when the cache layout or merge rules change
+CACHE_VERSION = 2
+
+# Config attributes that settings keys must not shadow
+_RESERVED = ("node_type", "environment", "settings", "secrets", "get", "with_updates")
+
+
+class FrozenDict(dict):
+    """
+    Read-only dict whose keys can also be read as attributes.
+
+    Used for the settings of a Config snapshot, including nested sections
+    (config.valve.max_fill_duration_minutes).
+    """
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("Config settings are read-only")
+
+    __setitem__ = _read_only
+    __delitem__ = _read_only
+    clear = _read_only
+    pop = _read_only
+    popitem = _read_only
+    setdefault = _read_only
+    update = _read_only
+
+
+def _freeze(value):
+    """Return a read-only copy of a settings value."""
+    if isinstance(value, dict):
+        frozen = FrozenDict()
+        for key, item in value.items():
+            dict.__setitem__(frozen, key, _freeze(item))
+        return frozen
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value):
+    """Return a mutable deep copy of a settings value."""
+    if isinstance(value, dict):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_thaw(item) for item in value]
+    return value
+
 
 class Config:
     """
-    Configuration container for a node.
+    Immutable configuration snapshot for a node.
+
+    Holds merged configuration from defaults, config.json, settings.toml
+    and cloud config updates. Settings can be read with get() or as
+    attributes (config.sleep_duration); attributes are set once at
+    construction, so reading them in a loop is a plain attribute lookup.
+    Nested sections are FrozenDicts with the same attribute access.
 
-    Holds merged configuration from defaults, config.json, and settings.toml.
-    Provides get() method for accessing settings with defaults.
+    A Config cannot be modified; with_updates() returns a new snapshot.
 
     Attributes:
         node_type: Type of node (pool_node, valve_node, display_node)
         environment: Environment name (prod, nonprod)
-        settings: Dictionary of configuration settings
+        settings: Read-only dictionary of configuration settings
+        secrets: Read-only dictionary of settings.toml values (WiFi, API keys)
     """
 
-    def __init__(self, node_type, environment, settings):
+    def __init__(self, node_type, environment, settings, secrets=None):
         """
         Initialize Config.
 
         Args:
             node_type: Type of node
             environment: Environment name
-            settings: Dictionary of configuration settings
+            settings: Dictionary of configuration settings (copied)
+            secrets: Optional dictionary of settings.toml values (copied)
         """
-        self.node_type = node_type
-        self.environment = environment
-        self.settings = settings
+        settings = _freeze(settings)
+        set_attr = object.__setattr__
+        set_attr(self, "node_type", node_type)
+        set_attr(self, "environment", environment)
+        set_attr(self, "settings", settings)
+        set_attr(self, "secrets", _freeze(secrets or {}))
+        for key, value in settings.items():
+            if key not in _RESERVED and not key.startswith("_"):
+                set_attr(self, key, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Config is read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError("Config is read-only")
 
     def get(self, key, default=None):
         """
@@ -53,39 +142,239 @@ class Config:
         """
         return self.settings.get(key, default)
 
+    def with_updates(self, updates):
+        """
+        Return a new snapshot with config updates applied and validated.
+
+        Args:
+            updates: Dictionary of key to value, or an iterable of
+                ConfigUpdate messages or (key, value) pairs. Dotted keys
+                ("valve.max_fill_duration_minutes") update nested sections.
+
+        Returns:
+            New Config
+
+        Raises:
+            ConfigurationError: If an updated value has the wrong type
+        """
+        settings = apply_updates(self.settings, updates)
+        validate_settings(settings, NODE_DEFAULTS.get(self.node_type, {}))
+        return Config(self.node_type, self.environment, settings, self.secrets)
+
+
+def _iter_updates(updates):
+    """Yield (key, value) pairs from the supported update forms."""
+    if isinstance(updates, dict):
+        yield from updates.items()
+        return
+    for update in updates:
+        if hasattr(update, "config_key"):
+            yield update.config_key, update.config_value
+        else:
+            key, value = update
+            yield key, value
+
+
+def apply_updates(settings, updates):
+    """
+    Return a copy of settings with updates applied.
+
+    Args:
+        settings: Settings dictionary (not modified)
+        updates: See Config.with_updates()
+
+    Returns:
+        New settings dictionary
+
+    Raises:
+        ConfigurationError: If a dotted key runs into a non-dict value
+    """
+    result = _thaw(settings)
+    for key, value in _iter_updates(updates):
+        parts = key.split(".")
+        target = result
+        for part in parts[:-1]:
+            target = target.setdefault(part, {})
+            if not isinstance(target, dict):
+                raise ConfigurationError(f"Cannot update {key}: {part} is not a section")
+        target[parts[-1]] = _thaw(value)
+    return result
+
+
+def _merge(target, source):
+    """Deep-merge source into target (dicts merged, other values replaced)."""
+    for key, value in source.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _merge(target[key], value)
+        else:
+            target[key] = _thaw(value)
+
+
+def _read_text(path):
+    """Return the contents of a file, or None if it doesn't exist."""
+    try:
+        with open(path) as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _merge_sources(node_type, env_override, config_path, settings_path):
+    """
+    Merge defaults, config.json and settings.toml, then validate.
+
+    Returns:
+        Tuple of (environment, settings, secrets)
+    """
+    defaults = NODE_DEFAULTS.get(node_type, {})
+    settings = _thaw(defaults)
+    file_environment = None
+
+    text = _read_text(config_path) if config_path else None
+    if text is not None:
+        try:
+            data = json.loads(text)
+        except ValueError as e:
+            raise ConfigurationError(f"Invalid JSON in {config_path}: {e}") from None
+        if not isinstance(data, dict):
+            raise ConfigurationError(f"{config_path} must contain a JSON object")
+        file_environment = data.get("environment")
+        _merge(settings, data)
 
-def load_config(node_type, env_override=None):
+    secrets = {}
+    text = _read_text(settings_path) if settings_path else None
+    if text is not None:
+        for key, value in parse_settings_toml(text).items():
+            if key.startswith(SETTINGS_PREFIX):
+                settings[key[len(SETTINGS_PREFIX) :].lower()] = value
+            else:
+                secrets[key] = value
+
+    environment = env_override or secrets.get("ENVIRONMENT") or file_environment or "prod"
+    validate_environment(environment)
+    validate_settings(settings, defaults)
+    return environment, settings, secrets
+
+
+def _fingerprint(path):
+    """Return [size, mtime, crc32] for a file, or None if it is missing."""
+    if not path:
+        return None
+    try:
+        stat = os.stat(path)
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    crc = binascii.crc32(data) & 0xFFFFFFFF if binascii is not None else None
+    return [stat[6], stat[8], crc]
+
+
+def _read_secrets(settings_path):
+    """Return the settings.toml entries that are not settings overrides."""
+    text = _read_text(settings_path) if settings_path else None
+    if text is None:
+        return {}
+    secrets = {}
+    for key, value in parse_settings_toml(text).items():
+        if not key.startswith(SETTINGS_PREFIX):
+            secrets[key] = value
+    return secrets
+
+
+def _read_cache(cache_path, key):
+    """Return (environment, settings) from the cache if key matches."""
+    data = read_atomic(cache_path)
+    if data is None:
+        return None
+    try:
+        cached = json.loads(data.decode("utf-8"))
+        if cached.get("key") != key:
+            return None
+        return cached["environment"], cached["settings"]
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+def _write_cache(cache_path, key, environment, settings):
+    """Write the merged config (never secrets); ignored on a read-only filesystem."""
+    data = json.dumps({"key": key, "environment": environment, "settings": settings})
+    try:
+        write_atomic(cache_path, data.encode("utf-8"))
+    except OSError:
+        pass
+
+
+def load_config(
+    node_type,
+    env_override=None,
+    config_path=None,
+    settings_path=None,
+    updates=None,
+    cache_path=None,
+):
     """
     Load configuration for a node type.
 
-    Merges configuration from multiple sources:
+    Merges configuration from multiple sources, later ones winning:
     1. NODE_DEFAULTS for the node type
-    2. config.json (if present) - TODO: implement file loading
-    3. settings.toml secrets (if present) - TODO: implement file loading
+    2. config.json (deep-merged)
+    3. settings.toml: POOLIO_<KEY> entries override <key>; all other
+       entries (WiFi, API keys) become Config.secrets
+    4. Cloud config updates (see Config.with_updates())
+
+    The environment is env_override, else ENVIRONMENT from settings.toml,
+    else "environment" from config.json, else "prod". Settings are
+    validated against the types of the defaults once, here.
+
+    With cache_path, the merged and validated settings and environment of
+    steps 1-3 are stored there, keyed by the size, mtime and CRC32 of both
+    files; a warm boot with unchanged files reads one small JSON file
+    instead of parsing config.json and merging and validating both
+    sources. Secrets (WiFi, API keys) are never written to the cache;
+    a warm boot re-reads them from settings.toml. Cache write failures
+    (e.g. read-only CIRCUITPY) are ignored.
 
     Args:
         node_type: Type of node (pool_node, valve_node, display_node)
-        env_override: Optional environment override (defaults to "prod")
+        env_override: Optional environment override
+        config_path: Path to config.json (None to skip, see CONFIG_PATH)
+        settings_path: Path to settings.toml (None to skip, see SETTINGS_PATH)
+        updates: Optional config updates to apply on top
+        cache_path: Optional path for the parsed-config cache
 
     Returns:
-        Config instance with merged configuration
+        Config snapshot with merged configuration
 
     Raises:
-        ConfigurationError: If node_type or environment is invalid
+        ConfigurationError: If node_type, environment or a setting is invalid
     """
     # Validate node type
     if node_type not in VALID_NODE_TYPES:
         raise ConfigurationError(f"Unknown node type: {node_type}. Valid: {VALID_NODE_TYPES}")
 
-    # Determine environment
-    environment = env_override if env_override else "prod"
-    validate_environment(environment)
-
-    # Start with defaults for this node type
-    defaults = NODE_DEFAULTS.get(node_type, {})
-    settings = dict(defaults)
-
-    # TODO: Load from config.json and merge
-    # TODO: Load from settings.toml and merge secrets
+    cached = None
+    key = None
+    if cache_path:
+        key = [
+            CACHE_VERSION,
+            node_type,
+            env_override,
+            _fingerprint(config_path),
+            _fingerprint(settings_path),
+        ]
+        cached = _read_cache(cache_path, key)
 
-    return Config(node_type, environment, settings)
+    if cached is None:
+        environment, settings, secrets = _merge_sources(
+            node_type, env_override, config_path, settings_path
+        )
+        if cache_path:
+            _write_cache(cache_path, key, environment, settings)
+    else:
+        environment, settings = cached
+        secrets = _read_secrets(settings_path)
+    config = Config(node_type, environment, settings, secrets)
+    if updates:
+        config = config.with_updates(updates)
+    return config
@@ -13,3 +13,57 @@ class ConfigurationError(Exception):
     Used for invalid configuration values, missing required fields,
     or unknown node types/environments.
     """
+
+
+def _type_name(value):
+    """Return a readable type name for error messages."""
+    return type(value).__name__
+
+
+def validate_settings(settings, defaults, prefix=""):
+    """
+    Check settings against the types of their defaults.
+
+    Keys without a default are not checked. An int is accepted where the
+    default is a float; bools are only accepted for bool defaults. Nested
+    dictionaries are checked recursively.
+
+    Args:
+        settings: Merged settings dictionary
+        defaults: Default settings dictionary
+        prefix: Key prefix used in error messages (for nested settings)
+
+    Raises:
+        ConfigurationError: If a value has the wrong type
+    """
+    for key, default in defaults.items():
+        if key not in settings or default is None:
+            continue
+        value = settings[key]
+        name = prefix + key
+        if isinstance(default, dict):
+            if not isinstance(value, dict):
+                raise ConfigurationError(f"{name} must be a dict, got {_type_name(value)}")
+            validate_settings(value, default, name + ".")
+            continue
+        if isinstance(default, bool) or isinstance(value, bool):
+            ok = isinstance(value, bool) and isinstance(default, bool)
+        elif isinstance(default, float):
+            ok = isinstance(value, (int, float))
+        else:
+            ok = isinstance(value, type(default))
+        if not ok:
+            raise ConfigurationError(
+                f"{name} must be {_type_name(default)}, got {_type_name(value)}"
+            )
+
+
+# Settings that only take effect after a restart (architecture.md
+# "Restart-required"); hardware pins and credentials live in settings.toml
+RESTART_REQUIRED_KEYS = (
+    "device_id",
+    "device_type",
+    "environment",
+    "feed_group",
+    "hardware_enabled",
+)
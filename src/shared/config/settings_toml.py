@@ -0,0 +1,100 @@
+# settings.toml parser
+# CircuitPython compatible (no dataclasses, no type annotations in signatures)
+
+from .schema import ConfigurationError
+
+_ESCAPES = {
+    "n": "\n",
+    "t": "\t",
+    "r": "\r",
+    '"': '"',
+    "\\": "\\",
+}
+
+_HEX_DIGITS = "0123456789abcdefABCDEF"
+
+
+def _parse_string(text, line_number):
+    """Parse a double-quoted string value (with escapes)."""
+    out = []
+    i = 1
+    while i < len(text):
+        char = text[i]
+        if char == '"':
+            rest = text[i + 1 :].strip()
+            if rest and not rest.startswith("#"):
+                raise ConfigurationError(f"settings.toml line {line_number}: text after string")
+            return "".join(out)
+        if char == "\\":
+            i += 1
+            if i >= len(text):
+                break
+            escape = text[i]
+            if escape == "u" and i + 4 < len(text):
+                digits = text[i + 1 : i + 5]
+                # int() alone would also take signs, spaces and underscores
+                if not all(c in _HEX_DIGITS for c in digits):
+                    raise ConfigurationError(
+                        f"settings.toml line {line_number}: invalid \\u escape"
+                    )
+                out.append(chr(int(digits, 16)))
+                i += 4
+            elif escape in _ESCAPES:
+                out.append(_ESCAPES[escape])
+            else:
+                raise ConfigurationError(
+                    f"settings.toml line {line_number}: unknown escape \\{escape}"
+                )
+        else:
+            out.append(char)
+        i += 1
+    raise ConfigurationError(f"settings.toml line {line_number}: unterminated string")
+
+
+def _parse_value(text, line_number):
+    """Parse a string, integer or boolean value."""
+    if text.startswith('"'):
+        return _parse_string(text, line_number)
+    value = text.split("#", 1)[0].strip()
+    if value == "true":
+        return True
+    if value == "false":
+        return False
+    try:
+        return int(value, 0)
+    except ValueError:
+        raise ConfigurationError(
+            f"settings.toml line {line_number}: unsupported value {value!r}"
+        ) from None
+
+
+def parse_settings_toml(text):
+    """
+    Parse the top-level keys of a CircuitPython settings.toml.
+
+    Supports the subset CircuitPython itself reads: KEY = "string" (with
+    escapes), integers (decimal or 0x hex) and true/false, plus comments.
+    Parsing stops at the first [table] header, as on the device.
+
+    Args:
+        text: File contents
+
+    Returns:
+        Dictionary of key to value
+
+    Raises:
+        ConfigurationError: If a line cannot be parsed
+    """
+    values = {}
+    for line_number, line in enumerate(text.splitlines(), 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("["):
+            break
+        key, sep, value = line.partition("=")
+        key = key.strip()
+        if not sep or not key:
+            raise ConfigurationError(f"settings.toml line {line_number}: expected KEY = value")
+        values[key] = _parse_value(value.strip(), line_number)
+    return values
@@ -0,0 +1,253 @@
+# Live configuration store with hot reload
+# CircuitPython compatible (no dataclasses, no type annotations in signatures)
+
+import json
+
+from ..storage import read_atomic, write_atomic
+from .loader import _iter_updates
+from .schema import RESTART_REQUIRED_KEYS, ConfigurationError
+
+# ConfigUpdate source that reverts a key to its file/default value
+SOURCE_DEFAULT = "default"
+
+# Marker for a removed overlay key
+_MISSING = object()
+
+
+def _lookup(settings, key):
+    """Return the value at a dotted key, or _MISSING."""
+    value = settings
+    for part in key.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+
+def _related(a, b):
+    """Return True if dotted keys a and b overlap (equal, parent or child)."""
+    return a == b or a.startswith(b + ".") or b.startswith(a + ".")
+
+
+class ConfigStore:
+    """
+    Holds the live Config and applies config_update messages without a restart.
+
+    Updates are kept in an overlay on top of the boot-time Config (defaults,
+    config.json, settings.toml). Each apply() validates the whole overlay,
+    swaps in a new immutable snapshot in one assignment, persists the
+    overlay and then notifies subscribers of the keys that changed. Code
+    that holds store.config keeps a consistent snapshot; code that needs
+    the newest values reads store.config again or subscribes.
+
+    Keys in restart_keys (device ID, environment, ...) are persisted but
+    not applied until the next boot; they are listed in pending_restart.
+
+    A ConfigUpdate with source "default" removes its key from the overlay,
+    reverting it to the file/default value.
+
+    Example:
+        store = ConfigStore(load_config("valve_node", ...), "/sd/config_overlay.json")
+        store.subscribe("fill_check_interval", scheduler.set_interval_minutes)
+        ...
+        store.handle(decoded_config_update)
+    """
+
+    def __init__(self, config, overlay_path=None, restart_keys=RESTART_REQUIRED_KEYS, logger=None):
+        """
+        Initialize ConfigStore and apply the persisted overlay.
+
+        An overlay that no longer validates (e.g. after a firmware change)
+        is discarded.
+
+        Args:
+            config: Boot-time Config from load_config()
+            overlay_path: JSON file persisting applied updates (None keeps
+                them in memory only)
+            restart_keys: Top-level keys that require a restart
+            logger: Optional logger for diagnostics
+        """
+        self._base = config
+        self.overlay_path = overlay_path
+        self.restart_keys = tuple(restart_keys)
+        self._logger = logger
+        self._subscribers = {}
+
+        overlay = self._load_overlay()
+        try:
+            config = self._build(overlay, overlay)
+        except ConfigurationError as e:
+            if logger:
+                logger.warning("Discarding invalid config overlay: %s", e)
+            overlay = {}
+        # Values restart keys had at boot stay live until the next boot
+        self._boot_overlay = dict(overlay)
+        self._overlay = overlay
+        self.config = config
+        self.updates_applied = 0
+
+    @property
+    def overlay(self):
+        """Return a copy of the persisted overlay (dotted key to value)."""
+        return dict(self._overlay)
+
+    @property
+    def pending_restart(self):
+        """Return the restart-required keys changed since boot."""
+        keys = []
+        for key in set(self._overlay) | set(self._boot_overlay):
+            if self._needs_restart(key) and self._overlay.get(
+                key, _MISSING
+            ) != self._boot_overlay.get(key, _MISSING):
+                keys.append(key)
+        return sorted(keys)
+
+    def _needs_restart(self, key):
+        return key.split(".", 1)[0] in self.restart_keys
+
+    def _build(self, overlay, boot_overlay):
+        """Return the live Config for an overlay (validating it)."""
+        live = {}
+        for key, value in overlay.items():
+            if not self._needs_restart(key):
+                live[key] = value
+        for key, value in boot_overlay.items():
+            if self._needs_restart(key):
+                live[key] = value
+        # Validate restart keys too, so a bad value is rejected now, not at boot
+        if live != overlay:
+            self._base.with_updates(overlay)
+        return self._base.with_updates(live) if live else self._base
+
+    def subscribe(self, key, callback):
+        """
+        Call callback(key, value, config) when a key changes.
+
+        Args:
+            key: Dotted setting key, or None for every change
+            callback: Function taking (key, new value, new Config); value
+                is None if the key was removed
+        """
+        self._subscribers.setdefault(key, []).append(callback)
+
+    def unsubscribe(self, key, callback):
+        """Remove a callback registered with subscribe()."""
+        callbacks = self._subscribers.get(key, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+
+    def handle(self, message):
+        """
+        Apply one ConfigUpdate message.
+
+        Args:
+            message: ConfigUpdate
+
+        Returns:
+            List of keys whose live value changed
+        """
+        if message.source == SOURCE_DEFAULT:
+            return self.reset(message.config_key)
+        return self.apply([message])
+
+    def apply(self, updates):
+        """
+        Validate and apply updates atomically.
+
+        Args:
+            updates: Dictionary of dotted key to value, or an iterable of
+                ConfigUpdate messages or (key, value) pairs
+
+        Returns:
+            List of keys whose live value changed
+
+        Raises:
+            ConfigurationError: If any update is invalid (nothing is applied)
+        """
+        overlay = dict(self._overlay)
+        for key, value in _iter_updates(updates):
+            overlay[key] = value
+        return self._commit(overlay)
+
+    def reset(self, key=None):
+        """
+        Revert one key (default: all keys) to the file/default value.
+
+        Returns:
+            List of keys whose live value changed
+        """
+        if key is None:
+            overlay = {}
+        else:
+            overlay = {k: v for k, v in self._overlay.items() if not _related(k, key)}
+        return self._commit(overlay)
+
+    def _commit(self, overlay):
+        """Swap in the config for overlay, persist it and notify subscribers."""
+        config = self._build(overlay, self._boot_overlay)
+        old = self.config
+        changed = []
+        for key in set(overlay) | set(self._overlay):
+            if _lookup(old.settings, key) != _lookup(config.settings, key):
+                changed.append(key)
+        changed.sort()
+
+        self.config = config
+        self._overlay = overlay
+        self.updates_applied += 1
+        self._save_overlay()
+        if self._logger:
+            if changed:
+                self._logger.info("Config updated: %s", ", ".join(changed))
+            pending = self.pending_restart
+            if pending:
+                self._logger.info("Restart required for: %s", ", ".join(pending))
+        if changed:
+            self._notify(changed, config)
+        return changed
+
+    def _notify(self, changed, config):
+        """Call subscribers of the changed keys."""
+        for key, callbacks in self._subscribers.items():
+            if not callbacks:
+                continue
+            if key is None:
+                targets = changed
+            elif any(_related(key, changed_key) for changed_key in changed):
+                targets = [key]
+            else:
+                continue
+            for target in targets:
+                value = _lookup(config.settings, target)
+                if value is _MISSING:
+                    value = None
+                for callback in list(callbacks):
+                    try:
+                        callback(target, value, config)
+                    except Exception as e:
+                        # One broken subscriber must not block the others
+                        if self._logger:
+                            self._logger.error("Config subscriber for %s failed: %s", target, e)
+
+    def _load_overlay(self):
+        """Read the persisted overlay, falling back to an interrupted save."""
+        if not self.overlay_path:
+            return {}
+        data = read_atomic(self.overlay_path)
+        if data is None:
+            return {}
+        try:
+            overlay = json.loads(data.decode("utf-8"))
+        except ValueError:
+            return {}
+        return overlay if isinstance(overlay, dict) else {}
+
+    def _save_overlay(self):
+        """Persist the overlay; a read-only filesystem is logged, not raised."""
+        if not self.overlay_path:
+            return
+        try:
+            write_atomic(self.overlay_path, json.dumps(self._overlay).encode("utf-8"))
+        except OSError as e:
+            if self._logger:
+                self._logger.warning("Could not save config overlay: %s", e)
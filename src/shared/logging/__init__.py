@@ -1,13 +1,41 @@
 # Logging module for Poolio IoT system
 # CircuitPython compatible wrapper around adafruit_logging
+#
+# Names are imported from their submodules on first use (see shared._lazy),
+# so get_logger() does not load the file handlers or the log shipper.
 
-from .filesystem import add_file_logging, is_writable
-from .logger import get_logger
-from .rotating_handler import RotatingFileHandler
+from .._lazy import lazy_exports
+
+_EXPORTS = {
+    "get_logger": "logger",
+    "add_file_logging": "filesystem",
+    "is_writable": "filesystem",
+    "clear_writable_cache": "filesystem",
+    "remount": "filesystem",
+    "RotatingFileHandler": "rotating_handler",
+    "BufferedRotatingFileHandler": "buffered_handler",
+    "BinaryLogHandler": "binary_handler",
+    "list_segments": "segments",
+    "read_segment": "segments",
+    "iter_log_lines": "segments",
+    "LogShipper": "shipper",
+    "StoreLogHandler": "store_handler",
+}
 
 __all__ = [
     "get_logger",
     "add_file_logging",
     "is_writable",
+    "clear_writable_cache",
+    "remount",
     "RotatingFileHandler",
+    "BufferedRotatingFileHandler",
+    "BinaryLogHandler",
+    "list_segments",
+    "read_segment",
+    "iter_log_lines",
+    "LogShipper",
+    "StoreLogHandler",
 ]
+
+_LAZY = lazy_exports(__name__, globals(), _EXPORTS)
@@ -0,0 +1,43 @@
+# Type stubs for logging module exports
+
+from .binary_handler import (
+    BinaryLogHandler as BinaryLogHandler,
+)
+from .buffered_handler import (
+    BufferedRotatingFileHandler as BufferedRotatingFileHandler,
+)
+from .filesystem import (
+    add_file_logging as add_file_logging,
+)
+from .filesystem import (
+    clear_writable_cache as clear_writable_cache,
+)
+from .filesystem import (
+    is_writable as is_writable,
+)
+from .filesystem import (
+    remount as remount,
+)
+from .logger import (
+    get_logger as get_logger,
+)
+from .rotating_handler import (
+    RotatingFileHandler as RotatingFileHandler,
+)
+from .segments import (
+    iter_log_lines as iter_log_lines,
+)
+from .segments import (
+    list_segments as list_segments,
+)
+from .segments import (
+    read_segment as read_segment,
+)
+from .shipper import (
+    LogShipper as LogShipper,
+)
+from .store_handler import (
+    StoreLogHandler as StoreLogHandler,
+)
+
+__all__: list[str]
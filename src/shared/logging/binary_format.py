@@ -0,0 +1,234 @@
+# Binary structured log format
+# CircuitPython compatible (no dataclasses, no type annotations in signatures)
+#
+# A binary log is a sequence of sessions. Each session starts with MAGIC and
+# is written by one handler between opening and closing its file (so every
+# boot and every rotation starts a new session). All integers are
+# little-endian.
+#
+#   MAGIC            b"\x00PLG\x01"
+#   Define entry     "D" code:u16 length:u16 utf-8 bytes
+#   Record entry     "R" timestamp:u32 level:u8 name:u16 msg:u16 argc:u8 args...
+#
+# Logger names and message templates are sent once per session as Define
+# entries and referenced by code afterwards. Arguments are packed by type:
+#
+#   "i" i32   "f" f32   "b" u8 (bool)   "n" (None)
+#   "s" length:u16 utf-8 bytes   "I" length:u16 decimal digits (large int)
+#
+# Formatting (template % args) happens only when a log is decoded.
+
+import struct
+
+MAGIC = b"\x00PLG\x01"
+
+TAG_DEFINE = 0x44  # "D"
+TAG_RECORD = 0x52  # "R"
+
+_DEFINE_HEADER = "<BHH"
+_RECORD_HEADER = "<BIBHHB"
+_DEFINE_HEADER_SIZE = struct.calcsize(_DEFINE_HEADER)
+_RECORD_HEADER_SIZE = struct.calcsize(_RECORD_HEADER)
+
+# Longest string payload (u16 length prefix)
+MAX_STRING = 0xFFFF
+
+_INT_MIN = -(2**31)
+_INT_MAX = 2**31 - 1
+
+LEVEL_NAMES = {
+    10: "DEBUG",
+    20: "INFO",
+    30: "WARNING",
+    40: "ERROR",
+    50: "CRITICAL",
+}
+
+
+def _pack_string(tag, text):
+    """Pack a length-prefixed UTF-8 string, truncated to MAX_STRING bytes."""
+    data = text.encode("utf-8")[:MAX_STRING]
+    return struct.pack("<BH", tag, len(data)) + data
+
+
+def pack_arg(value):
+    """
+    Pack one message argument.
+
+    Values of unsupported types are stored as their str().
+
+    Args:
+        value: Argument value
+
+    Returns:
+        Encoded bytes
+    """
+    # bool is a subclass of int, so check it first
+    if value is True or value is False:
+        return struct.pack("<BB", 0x62, 1 if value else 0)
+    if value is None:
+        return b"n"
+    if isinstance(value, int):
+        if _INT_MIN <= value <= _INT_MAX:
+            return struct.pack("<Bi", 0x69, value)
+        return _pack_string(0x49, str(value))
+    if isinstance(value, float):
+        return struct.pack("<Bf", 0x66, value)
+    return _pack_string(0x73, str(value))
+
+
+def pack_define(code, text):
+    """
+    Pack a Define entry binding a code to a string.
+
+    Args:
+        code: String code (0-65535)
+        text: Logger name or message template
+
+    Returns:
+        Encoded bytes
+    """
+    data = text.encode("utf-8")[:MAX_STRING]
+    return struct.pack(_DEFINE_HEADER, TAG_DEFINE, code, len(data)) + data
+
+
+def pack_record(timestamp, level, name_code, msg_code, args):
+    """
+    Pack a Record entry.
+
+    Args:
+        timestamp: Seconds since the epoch
+        level: Numeric log level
+        name_code: Code of the logger name
+        msg_code: Code of the message template
+        args: Sequence of message arguments (at most 255)
+
+    Returns:
+        Encoded bytes
+    """
+    args = args[:255]
+    header = struct.pack(
+        _RECORD_HEADER,
+        TAG_RECORD,
+        int(timestamp) & 0xFFFFFFFF,
+        level & 0xFF,
+        name_code,
+        msg_code,
+        len(args),
+    )
+    return header + b"".join(pack_arg(arg) for arg in args)
+
+
+class DecodeError(ValueError):
+    """Raised when a binary log entry cannot be decoded."""
+
+
+def _unpack_arg(data, offset):
+    """Unpack one argument at offset; return (value, next offset)."""
+    tag = data[offset]
+    offset += 1
+    if tag == 0x69:  # "i"
+        return struct.unpack_from("<i", data, offset)[0], offset + 4
+    if tag == 0x66:  # "f"
+        return struct.unpack_from("<f", data, offset)[0], offset + 4
+    if tag == 0x62:  # "b"
+        return data[offset] != 0, offset + 1
+    if tag == 0x6E:  # "n"
+        return None, offset
+    if tag in (0x73, 0x49):  # "s", "I"
+        (length,) = struct.unpack_from("<H", data, offset)
+        offset += 2
+        end = offset + length
+        if end > len(data):
+            raise DecodeError("truncated string argument")
+        text = bytes(data[offset:end]).decode("utf-8", "replace")
+        return (int(text) if tag == 0x49 else text), end
+    raise DecodeError(f"unknown argument tag 0x{tag:02x}")
+
+
+def decode_session(data):
+    """
+    Decode the entries of one session (the bytes after a MAGIC marker).
+
+    A trailing entry cut short (e.g. by a reset mid-write) or a corrupt
+    entry ends the session; records before it are still returned.
+
+    Args:
+        data: Session bytes
+
+    Yields:
+        Tuples of (timestamp, level, name, template, args)
+    """
+    strings = {}
+    offset = 0
+    size = len(data)
+    while offset < size:
+        tag = data[offset]
+        try:
+            if tag == TAG_DEFINE:
+                _, code, length = struct.unpack_from(_DEFINE_HEADER, data, offset)
+                start = offset + _DEFINE_HEADER_SIZE
+                if start + length > size:
+                    return
+                strings[code] = bytes(data[start : start + length]).decode("utf-8", "replace")
+                offset = start + length
+            elif tag == TAG_RECORD:
+                _, timestamp, level, name_code, msg_code, argc = struct.unpack_from(
+                    _RECORD_HEADER, data, offset
+                )
+                offset += _RECORD_HEADER_SIZE
+                args = []
+                for _ in range(argc):
+                    value, offset = _unpack_arg(data, offset)
+                    args.append(value)
+                yield (
+                    timestamp,
+                    level,
+                    strings.get(name_code, f"<name {name_code}>"),
+                    strings.get(msg_code, f"<msg {msg_code}>"),
+                    tuple(args),
+                )
+            else:
+                return
+        except (struct.error, IndexError, DecodeError):
+            return
+
+
+def decode(data):
+    """
+    Decode a complete binary log file.
+
+    Bytes before the first MAGIC marker are ignored.
+
+    Args:
+        data: File contents
+
+    Yields:
+        Tuples of (timestamp, level, name, template, args)
+    """
+    for session in bytes(data).split(MAGIC)[1:]:
+        yield from decode_session(session)
+
+
+def render_message(template, args):
+    """
+    Apply args to a message template.
+
+    Args:
+        template: %-style message template
+        args: Tuple of arguments
+
+    Returns:
+        Formatted message; template and args side by side if they don't match
+    """
+    if not args:
+        return template
+    try:
+        return template % args
+    except (TypeError, ValueError):
+        return f"{template} {args!r}"
+
+
+def level_name(level):
+    """Return the name for a numeric log level."""
+    return LEVEL_NAMES.get(level, f"Level {level}")
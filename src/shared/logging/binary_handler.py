@@ -0,0 +1,121 @@
+# Binary structured log handler
+# CircuitPython compatible (no dataclasses, no type annotations in signatures)
+
+import time
+
+from .binary_format import MAGIC, pack_define, pack_record
+from .buffered_handler import BufferedRotatingFileHandler
+
+# Use adafruit_logging on CircuitPython, standard logging for tests
+try:
+    import adafruit_logging as logging
+except ImportError:
+    import logging
+
+# Template used for records that arrive already formatted
+_PREFORMATTED = "%s"
+
+# Highest string code (codes are u16)
+_MAX_CODE = 0xFFFF
+
+
+class BinaryLogHandler(BufferedRotatingFileHandler):
+    """
+    A rotating handler that writes binary records instead of text.
+
+    Each record is stored as (timestamp, level, logger name code, message
+    template code, packed args); the message is never formatted on the
+    device. Names and templates are written once per file session and
+    referenced by a 16-bit code afterwards. See binary_format.py for the
+    layout and scripts/decode_logs.py to render a log as text.
+
+    Rotation and segment options behave as in RotatingFileHandler.
+    Records are written through by default (bufferSize=0); pass a
+    bufferSize to batch them like BufferedRotatingFileHandler.
+    """
+
+    def __init__(
+        self,
+        filename,
+        maxBytes=128000,
+        backupCount=2,
+        bufferSize=0,
+        flushInterval=30,
+        flushLevel=logging.WARNING,
+        compress=False,
+        maxTotalBytes=0,
+    ):
+        """
+        Initialize BinaryLogHandler.
+
+        Args:
+            filename: Path to the log file
+            maxBytes: Maximum file size before rotation (default 125KB)
+            backupCount: Number of backup files to keep (default 2)
+            bufferSize: Pending bytes that trigger a flush; 0 writes every
+                record immediately (default 0)
+            flushInterval: Seconds between time-based flushes, 0 disables (default 30)
+            flushLevel: Records at this level or above flush immediately
+                (default WARNING)
+            compress: Roll into compressed segments (default False)
+            maxTotalBytes: Byte budget across the current file and rolled
+                segments; 0 means limit by backupCount (default 0)
+        """
+        self._codes = {}
+        super().__init__(
+            filename,
+            maxBytes=maxBytes,
+            backupCount=backupCount,
+            bufferSize=bufferSize,
+            flushInterval=flushInterval,
+            flushLevel=flushLevel,
+            compress=compress,
+            maxTotalBytes=maxTotalBytes,
+        )
+
+    def _open_file(self):
+        """Open the log file and start a new session."""
+        super()._open_file()
+        # Codes are only valid within a session
+        self._codes = {}
+        self._write(MAGIC)
+        self._size += len(MAGIC)
+
+    def _code(self, text, out):
+        """Return the code for a string, appending its Define entry if new."""
+        code = self._codes.get(text)
+        if code is None:
+            code = len(self._codes)
+            self._codes[text] = code
+            out.append(pack_define(code, text))
+        return code
+
+    def _encode(self, record):
+        """Encode a record (plus any new Define entries) without formatting it."""
+        msg = record.msg
+        args = record.args
+        exc_info = getattr(record, "exc_info", None)
+        if not isinstance(msg, str) or not isinstance(args, tuple) or exc_info:
+            # Mapping args, non-string messages and tracebacks are formatted here
+            text = _message(record)
+            if exc_info:
+                text += "\n" + logging.Formatter().formatException(exc_info)
+            msg = _PREFORMATTED
+            args = (text,)
+
+        out = []
+        if len(self._codes) > _MAX_CODE - 1:
+            # Code table full: start a fresh session in the same file
+            self._codes = {}
+            out.append(MAGIC)
+        name_code = self._code(record.name, out)
+        msg_code = self._code(msg, out)
+        out.append(pack_record(time.time(), record.levelno, name_code, msg_code, args))
+        return b"".join(out)
+
+
+def _message(record):
+    """Return the formatted message of a record."""
+    if record.args:
+        return str(record.msg) % record.args
+    return str(record.msg)
@@ -0,0 +1,202 @@
+# Buffered rotating file handler for logging
+# CircuitPython compatible (no dataclasses, no type annotations in signatures)
+
+import time
+
+from .rotating_handler import RotatingFileHandler
+
+# Use adafruit_logging on CircuitPython, standard logging for tests
+try:
+    import adafruit_logging as logging
+except ImportError:
+    import logging
+
+# Background writer is CPython only (CircuitPython has no threading)
+try:
+    import queue
+    import threading
+except ImportError:
+    queue = None
+    threading = None
+
+# Queue item telling the writer thread to rotate before the next chunk
+_ROTATE = object()
+
+
+class BufferedRotatingFileHandler(RotatingFileHandler):
+    """
+    A RotatingFileHandler that batches writes in memory.
+
+    Records are buffered and written in one call when any of these hold:
+    - bufferSize bytes are pending
+    - flushInterval seconds have passed since the last flush
+    - a record at flushLevel or above arrives (WARNING by default)
+
+    The file size is tracked in memory, so the file is only stat'ed when
+    it is opened. Records still pending when the device resets are lost;
+    lower flushLevel or bufferSize if that matters more than flash wear
+    and main-loop time.
+
+    With threaded=True (CPython only) flushed chunks are handed to a
+    background thread that does the file I/O and rotation. A chunk the
+    thread fails to write (e.g. full or read-only filesystem) is counted
+    in dropped and reported through handleError().
+    """
+
+    def __init__(
+        self,
+        filename,
+        maxBytes=128000,
+        backupCount=2,
+        bufferSize=4096,
+        flushInterval=30,
+        flushLevel=logging.WARNING,
+        threaded=False,
+        compress=False,
+        maxTotalBytes=0,
+    ):
+        """
+        Initialize BufferedRotatingFileHandler.
+
+        Args:
+            filename: Path to the log file
+            maxBytes: Maximum file size before rotation (default 125KB)
+            backupCount: Number of backup files to keep (default 2)
+            bufferSize: Pending bytes that trigger a flush (default 4096)
+            flushInterval: Seconds between time-based flushes, 0 disables (default 30)
+            flushLevel: Records at this level or above flush immediately
+                (default WARNING)
+            threaded: Write from a background thread (CPython only)
+            compress: Roll into compressed segments (default False)
+            maxTotalBytes: Byte budget across the current file and rolled
+                segments; 0 means limit by backupCount (default 0)
+
+        Raises:
+            RuntimeError: If threaded=True and threading is not available
+        """
+        if threaded and threading is None:
+            raise RuntimeError("threading module not available")
+        self._queue = None
+        self._thread = None
+        super().__init__(
+            filename,
+            maxBytes=maxBytes,
+            backupCount=backupCount,
+            compress=compress,
+            maxTotalBytes=maxTotalBytes,
+        )
+        self.bufferSize = bufferSize
+        self.flushInterval = flushInterval
+        self.flushLevel = flushLevel
+        self._buffer = []
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        # Chunks of records the writer thread failed to write
+        self.dropped = 0
+        if threaded:
+            self._queue = queue.Queue()
+            self._thread = threading.Thread(target=self._writer, daemon=True)
+            self._thread.start()
+
+    def emit(self, record):
+        """
+        Buffer a log record, flushing if a threshold is reached.
+
+        Args:
+            record: LogRecord to write
+        """
+        try:
+            if self._should_rotate():
+                self._flush_buffer()
+                self._rotate()
+
+            data = self._encode(record)
+            self._buffer.append(data)
+            self._pending += len(data)
+            self._size += len(data)
+
+            if (
+                record.levelno >= self.flushLevel
+                or self._pending >= self.bufferSize
+                or (
+                    self.flushInterval > 0
+                    and time.monotonic() - self._last_flush >= self.flushInterval
+                )
+            ):
+                self._flush_buffer()
+        except Exception:
+            self.handleError(record)
+
+    def _open_file(self):
+        """Open the log file; the writer thread leaves size tracking to emit()."""
+        if self._thread is not None and threading.current_thread() is self._thread:
+            self._open_stream()
+        else:
+            super()._open_file()
+
+    def _rotate(self):
+        """Rotate now, or queue the rotation behind pending writes."""
+        if self._queue is not None:
+            self._queue.put(_ROTATE)
+            # Size restarts from zero once the writer rotates
+            self._size = 0
+        else:
+            self._do_rotation()
+
+    def _flush_buffer(self):
+        """Write pending records as one chunk."""
+        self._last_flush = time.monotonic()
+        if not self._buffer:
+            return
+        chunk = b"".join(self._buffer)
+        self._buffer = []
+        self._pending = 0
+        if self._queue is not None:
+            self._queue.put(chunk)
+        else:
+            self._write_chunk(chunk)
+
+    def _write_chunk(self, chunk):
+        """Write a chunk to the file and flush it."""
+        self._write(chunk)
+
+    def _writer(self):
+        """Background thread: perform queued writes and rotations."""
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                if item is _ROTATE:
+                    self._do_rotation()
+                else:
+                    self._write_chunk(item)
+            except Exception:
+                # No single record to report against: describe what was lost
+                if item is _ROTATE:
+                    message = {"msg": "Log rotation failed"}
+                else:
+                    self.dropped += 1
+                    message = {"msg": "Dropped %d bytes of log records", "args": (len(item),)}
+                self.handleError(logging.makeLogRecord(message))
+            finally:
+                self._queue.task_done()
+
+    def flush(self):
+        """Write all pending records (waits for the writer thread if threaded)."""
+        self._flush_buffer()
+        if self._queue is not None:
+            self._queue.join()
+
+    def close(self):
+        """Flush pending records, stop the writer thread, and close the file."""
+        try:
+            self.flush()
+        except Exception:
+            pass  # Still release the file below
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+            self._queue = None
+        super().close()
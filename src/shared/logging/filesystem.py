@@ -3,18 +3,116 @@
 
 import os
 
+from .binary_handler import BinaryLogHandler
+from .buffered_handler import BufferedRotatingFileHandler
 from .rotating_handler import RotatingFileHandler
 
+# storage is CircuitPython only (mount info and remount)
+try:
+    import storage
+except ImportError:
+    storage = None
 
-def is_writable(path):
+
+# Errno raised when writing to a read-only filesystem
+EROFS = 30
+
+# statvfs f_flag bit for a read-only mount
+ST_RDONLY = 1
+
+# Cached writability per mount point: {mount: bool}. Filled on first use
+# and kept for the process lifetime; cleared by remount() or
+# clear_writable_cache().
+_mount_writable = {}
+
+
+def _mount_point(path):
+    """Return the mount point containing path."""
+    if hasattr(os.path, "ismount"):
+        path = os.path.abspath(path)
+        while not os.path.ismount(path):
+            parent = os.path.dirname(path)
+            if parent == path:
+                break
+            path = parent
+        return path
+
+    # CircuitPython: "/" plus top-level mounts such as "/sd"
+    if storage is not None and path.startswith("/") and len(path) > 1:
+        top = "/" + path.split("/")[1]
+        try:
+            storage.getmount(top)
+            return top
+        except (OSError, ValueError):
+            pass
+    return "/"
+
+
+def _probe_write(path):
+    """
+    Create and delete a test file in path.
+
+    Returns:
+        True if writable, False if the mount is read-only, None if only
+        this directory refused the write (e.g. permissions)
+    """
+    test_file = os.path.join(path, ".write_test")
+    try:
+        with open(test_file, "w") as f:
+            f.write("test")
+        os.remove(test_file)
+        return True
+    except OSError as e:
+        if e.args and e.args[0] == EROFS:
+            return False
+        return None
+
+
+def _probe_flags(mount):
+    """
+    Read the read-only flag of a mount without writing.
+
+    Uses the CircuitPython mount's readonly attribute, or the statvfs
+    f_flag on CPython.
+
+    Returns:
+        True if writable, False if read-only, None if unknown
+    """
+    if storage is not None:
+        try:
+            readonly = getattr(storage.getmount(mount), "readonly", None)
+            if readonly is not None:
+                return not readonly
+        except (OSError, ValueError):
+            pass
+    if hasattr(os, "statvfs"):
+        try:
+            stats = os.statvfs(mount)
+            flags = getattr(stats, "f_flag", None)
+            if flags is None and len(stats) > 8:
+                flags = stats[8]
+            if flags is not None:
+                return not flags & ST_RDONLY
+        except OSError:
+            pass
+    return None
+
+
+def is_writable(path, probe="write"):
     """
     Check if a path is writable.
 
-    Attempts to create a temporary file in the directory to verify
-    write access. Handles read-only filesystems gracefully.
+    The answer for the mount holding path is cached for the process
+    lifetime, so only the first check per mount touches the filesystem.
+    Call remount() (or clear_writable_cache() after remounting some other
+    way) to re-check.
 
     Args:
         path: Directory path to check
+        probe: How to check a mount the first time:
+            "write" creates and deletes a temporary file (default);
+            "flags" reads the mount's read-only flag instead, falling back
+            to "write" where the flag isn't available
 
     Returns:
         True if writable, False otherwise
@@ -27,21 +125,68 @@ def is_writable(path):
         if not os.path.isdir(path):
             return False
 
-        # Try to create a temporary file
-        test_file = os.path.join(path, ".write_test")
-        try:
-            with open(test_file, "w") as f:
-                f.write("test")
-            os.remove(test_file)
-            return True
-        except OSError:
+        mount = _mount_point(path)
+        writable = _mount_writable.get(mount)
+        if writable is None:
+            if probe == "flags":
+                writable = _probe_flags(mount)
+            if writable is None:
+                writable = _probe_write(path)
+                if writable is None:
+                    # Refused for this directory only; don't cache the mount
+                    return False
+            _mount_writable[mount] = writable
+
+        if not writable:
             return False
+        # Directory permissions (CPython); CircuitPython has none
+        if hasattr(os, "access"):
+            return os.access(path, os.W_OK)
+        return True
     except Exception:
         # Catch any unexpected exceptions
         return False
 
 
-def add_file_logging(logger, log_path):
+def clear_writable_cache(mount=None):
+    """
+    Forget cached writability results.
+
+    Args:
+        mount: Mount point to forget (default: all mounts)
+    """
+    if mount is None:
+        _mount_writable.clear()
+    else:
+        _mount_writable.pop(mount, None)
+
+
+def remount(mount_path, readonly=False, disable_concurrent_write_protection=False):
+    """
+    Remount a filesystem and invalidate its cached writability.
+
+    Args:
+        mount_path: Mount point to remount (e.g. "/")
+        readonly: True to make it read-only to CircuitPython
+        disable_concurrent_write_protection: Allow writes while USB has
+            the drive mounted (risks corruption)
+
+    Raises:
+        RuntimeError: If storage module is not available
+    """
+    if storage is None:
+        raise RuntimeError("storage module not available")
+    try:
+        storage.remount(
+            mount_path,
+            readonly=readonly,
+            disable_concurrent_write_protection=disable_concurrent_write_protection,
+        )
+    finally:
+        clear_writable_cache(mount_path)
+
+
+def add_file_logging(logger, log_path, buffered=False, binary=False, probe="write"):
     """
     Add file logging to a logger.
 
@@ -51,6 +196,10 @@ def add_file_logging(logger, log_path):
     Args:
         logger: Logger instance to add file handler to
         log_path: Path for the log file
+        buffered: If True, use BufferedRotatingFileHandler to batch writes
+        binary: If True, write BinaryLogHandler records instead of text
+            (decode with scripts/decode_logs.py)
+        probe: Writability probe passed to is_writable ("write" or "flags")
 
     Returns:
         True if file logging was added, False otherwise
@@ -62,11 +211,16 @@ def add_file_logging(logger, log_path):
             log_dir = "."
 
         # Check if directory is writable
-        if not is_writable(log_dir):
+        if not is_writable(log_dir, probe=probe):
             return False
 
         # Create rotating file handler
-        handler = RotatingFileHandler(log_path)
+        if binary:
+            handler = BinaryLogHandler(log_path, bufferSize=4096 if buffered else 0)
+        elif buffered:
+            handler = BufferedRotatingFileHandler(log_path)
+        else:
+            handler = RotatingFileHandler(log_path)
 
         # Use same formatter as other handlers if available
         if logger.handlers and logger.handlers[0].formatter:
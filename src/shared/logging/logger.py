@@ -7,6 +7,52 @@ try:
 except ImportError:
     import logging
 
+# adafruit_logging keeps its loggers in logger_cache; CPython logging doesn't
+_ADAFRUIT = hasattr(logging, "logger_cache")
+
+if _ADAFRUIT:
+    import time
+
+    _LEVEL_NAMES = dict(logging.LEVELS)
+
+    class _LazyLogger(logging.Logger):
+        """
+        adafruit_logging Logger that checks the level before doing any work.
+
+        adafruit_logging builds "msg % args" and a record for every call,
+        even ones the level filters out. This skips filtered calls up front
+        and leaves msg unformatted; text handlers format it through
+        _LazyFormatter and BinaryLogHandler never formats it.
+        """
+
+        def _log(self, level, msg, *args):
+            if level < self._level:
+                return
+            record = logging.LogRecord(
+                self.name, level, _LEVEL_NAMES.get(level, "NOTSET"), msg, time.monotonic(), args
+            )
+            self.handle(record)
+
+    class _LazyFormatter(logging.Formatter):
+        """adafruit_logging Formatter that applies record args at output time."""
+
+        def format(self, record):
+            if record.args:
+                record = logging.LogRecord(
+                    record.name,
+                    record.levelno,
+                    record.levelname,
+                    record.msg % record.args,
+                    record.created,
+                    (),
+                )
+            return super().format(record)
+
+    _Formatter = _LazyFormatter
+else:
+    # CPython logging already checks the level first and formats lazily
+    _Formatter = logging.Formatter
+
 
 def get_logger(device_id, debug_logging=False):
     """
@@ -15,6 +61,9 @@ def get_logger(device_id, debug_logging=False):
     Creates a logger with the device_id included in all log messages.
     A StreamHandler for console output is always added.
 
+    Calls below the logger level return before the message is formatted,
+    and messages are only formatted by handlers that output text.
+
     Args:
         device_id: Device identifier to include in log messages
         debug_logging: If True, set level to DEBUG; otherwise INFO
@@ -23,6 +72,8 @@ def get_logger(device_id, debug_logging=False):
         Configured logger instance
     """
     # Create logger with unique name based on device_id
+    if _ADAFRUIT and device_id not in logging.logger_cache:
+        logging.logger_cache[device_id] = _LazyLogger(device_id)
     logger = logging.getLogger(device_id)
 
     # Set log level
@@ -42,7 +93,7 @@ def get_logger(device_id, debug_logging=False):
 
         # Create formatter with device_id
         # Format: "LEVEL device_id: message"
-        formatter = logging.Formatter(fmt=f"%(levelname)s {device_id}: %(message)s")
+        formatter = _Formatter(fmt=f"%(levelname)s {device_id}: %(message)s")
         console_handler.setFormatter(formatter)
 
         logger.addHandler(console_handler)
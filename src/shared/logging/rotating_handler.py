@@ -3,6 +3,9 @@
 
 import os
 
+from ..storage.stats import flash_stats
+from .segments import scan_segments, write_segment
+
 # Use adafruit_logging on CircuitPython, standard logging for tests
 try:
     import adafruit_logging as logging
@@ -21,9 +24,23 @@ class RotatingFileHandler(logging.Handler):
         - test.log (current)
         - test.log.1 (first backup)
         - test.log.2 (oldest backup)
+
+    Segment mode (compress=True or maxTotalBytes > 0) rolls the current
+    file into a sequence-numbered segment instead of renaming a chain of
+    backups. Segments are zlib-compressed where the platform supports it,
+    and the oldest are deleted to keep the total under maxTotalBytes
+    (or, without a budget, to keep backupCount segments):
+        - test.log (current)
+        - test.log.7.z (oldest kept segment)
+        - test.log.8.z (newest segment)
+
+    Text logs typically compress 5-10x, so a byte budget holds several
+    times more history than the same flash spent on raw backups.
+
+    Every write is counted in shared.storage.flash_stats().
     """
 
-    def __init__(self, filename, maxBytes=128000, backupCount=2):
+    def __init__(self, filename, maxBytes=128000, backupCount=2, compress=False, maxTotalBytes=0):
         """
         Initialize RotatingFileHandler.
 
@@ -31,21 +48,50 @@ class RotatingFileHandler(logging.Handler):
             filename: Path to the log file
             maxBytes: Maximum file size before rotation (default 125KB)
             backupCount: Number of backup files to keep (default 2)
+            compress: Roll into compressed segments (default False)
+            maxTotalBytes: Byte budget for the current file plus all rolled
+                segments; 0 means limit by backupCount (default 0)
         """
         super().__init__()
         self.filename = filename
         self.maxBytes = maxBytes
         self.backupCount = backupCount
+        self.compress = compress
+        self.maxTotalBytes = maxTotalBytes
         self._file = None
+        self._size = 0
+        # End of the open file, for flash write accounting
+        self._offset = 0
+        # Rolled segments as [seq, path, size], oldest first (segment mode only)
+        self._segments = None
+        if compress or maxTotalBytes > 0:
+            self._segments = [
+                [seq, path, os.path.getsize(path)] for seq, path in scan_segments(filename)
+            ]
         self._open_file()
 
     def _open_file(self):
-        """Open the log file for appending."""
-        # Ensure directory exists
+        """Open the log file for appending and record its current size."""
+        self._open_stream()
+        # Stat only at open; emit() tracks the size in memory afterwards
+        try:
+            self._size = os.path.getsize(self.filename)
+        except OSError:
+            self._size = 0
+        self._offset = self._size
+
+    def _open_stream(self):
+        """Open the log file for appending, creating its directory if needed."""
         dirname = os.path.dirname(self.filename)
         if dirname and not os.path.exists(dirname):
             os.makedirs(dirname)
-        self._file = open(self.filename, "a")
+        self._file = open(self.filename, "ab")
+        # A new file after rotation; _open_file() sets the real size
+        self._offset = 0
+
+    def _encode(self, record):
+        """Format a record as a UTF-8 encoded line."""
+        return (self.format(record) + "\n").encode("utf-8")
 
     def emit(self, record):
         """
@@ -60,23 +106,26 @@ class RotatingFileHandler(logging.Handler):
                 self._do_rotation()
 
             # Format and write the record
-            msg = self.format(record)
-            self._file.write(msg + "\n")
-            self._file.flush()
+            data = self._encode(record)
+            self._write(data)
+            self._size += len(data)
         except Exception:
             self.handleError(record)
 
+    def _write(self, data):
+        """Append bytes to the log file, flush them and count the write."""
+        self._file.write(data)
+        self._file.flush()
+        stats = flash_stats()
+        stats.record(self._offset, len(data), logical=len(data))
+        stats.commits += 1
+        self._offset += len(data)
+
     def _should_rotate(self):
         """Check if the file should be rotated."""
         if self.maxBytes <= 0:
             return False
-        try:
-            # Get current file size
-            self._file.flush()
-            size = os.path.getsize(self.filename)
-            return size >= self.maxBytes
-        except OSError:
-            return False
+        return self._size >= self.maxBytes
 
     def _do_rotation(self):
         """Rotate the log files."""
@@ -85,6 +134,11 @@ class RotatingFileHandler(logging.Handler):
             self._file.close()
             self._file = None
 
+        if self._segments is not None:
+            self._roll_segment()
+            self._open_file()
+            return
+
         # Rotate backup files
         # Delete oldest backup if it exists
         oldest = f"{self.filename}.{self.backupCount}"
@@ -105,6 +159,27 @@ class RotatingFileHandler(logging.Handler):
         # Reopen fresh log file
         self._open_file()
 
+    def _roll_segment(self):
+        """Roll the closed current file into the next segment and trim old ones."""
+        if os.path.exists(self.filename):
+            seq = self._segments[-1][0] + 1 if self._segments else 1
+            path, size = write_segment(
+                self.filename, f"{self.filename}.{seq}", compress=self.compress
+            )
+            self._segments.append([seq, path, size])
+
+        if self.maxTotalBytes > 0:
+            # Reserve room for the current file to grow to maxBytes
+            total = self.maxBytes + sum(segment[2] for segment in self._segments)
+            while self._segments and total > self.maxTotalBytes:
+                _, path, size = self._segments.pop(0)
+                os.remove(path)
+                total -= size
+        else:
+            while len(self._segments) > self.backupCount:
+                _, path, _ = self._segments.pop(0)
+                os.remove(path)
+
     def close(self):
         """Close the handler and release resources."""
         if self._file:
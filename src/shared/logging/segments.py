@@ -0,0 +1,231 @@
+# Rolled log segment storage and reading
+# CircuitPython compatible (no dataclasses, no type annotations in signatures)
+#
+# Two naming schemes exist for rolled log files:
+# - Backup chain (default): app.log.1 (newest) ... app.log.N (oldest)
+# - Segments (compress or maxTotalBytes set): app.log.<seq>.z (zlib) or
+#   app.log.<seq>.raw, where a higher sequence number is newer
+#
+# Readers in this module understand both, so callers don't need to know
+# which mode the handler was configured with.
+
+import os
+
+from ..storage.stats import flash_stats
+
+# Compression backends: CPython zlib, or MicroPython-style deflate module.
+# CircuitPython builds may only provide zlib.decompress; rolled segments
+# are then stored uncompressed (.raw) but still count against the budget.
+try:
+    import zlib
+except ImportError:
+    zlib = None
+
+try:
+    import deflate
+except ImportError:
+    deflate = None
+
+COMPRESSED_SUFFIX = ".z"
+RAW_SUFFIX = ".raw"
+
+# Read/write chunk size for streaming (de)compression
+CHUNK_SIZE = 2048
+
+
+def can_compress():
+    """Return True if rolled segments can be compressed on this platform."""
+    if zlib is not None and hasattr(zlib, "compressobj"):
+        return True
+    return deflate is not None and hasattr(deflate, "DeflateIO")
+
+
+def _split(filename):
+    """Return (directory, basename) for a log file path."""
+    return os.path.dirname(filename) or ".", os.path.basename(filename)
+
+
+def scan_segments(filename):
+    """
+    Find sequence-numbered segments for a log file.
+
+    Args:
+        filename: Path of the active log file
+
+    Returns:
+        List of (seq, path) tuples, oldest first
+    """
+    directory, base = _split(filename)
+    prefix = base + "."
+    found = []
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return found
+    for name in names:
+        if not name.startswith(prefix):
+            continue
+        rest = name[len(prefix) :]
+        for suffix in (COMPRESSED_SUFFIX, RAW_SUFFIX):
+            if rest.endswith(suffix) and rest[: -len(suffix)].isdigit():
+                found.append((int(rest[: -len(suffix)]), os.path.join(directory, name)))
+                break
+    found.sort()
+    return found
+
+
+def _scan_backups(filename):
+    """Return backup-chain files (app.log.N), oldest first."""
+    directory, base = _split(filename)
+    prefix = base + "."
+    found = []
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return found
+    for name in names:
+        if name.startswith(prefix) and name[len(prefix) :].isdigit():
+            found.append((int(name[len(prefix) :]), os.path.join(directory, name)))
+    # Backup chain numbers grow with age
+    found.sort(reverse=True)
+    return found
+
+
+def list_segments(filename):
+    """
+    List rolled log files for a log, oldest first.
+
+    The active log file itself is not included.
+
+    Args:
+        filename: Path of the active log file
+
+    Returns:
+        List of paths
+    """
+    return [path for _, path in _scan_backups(filename)] + [
+        path for _, path in scan_segments(filename)
+    ]
+
+
+def write_segment(src_path, dst_base, compress=True):
+    """
+    Turn the active log file into a rolled segment.
+
+    Compressed segments are written to a temporary file and renamed into
+    place, so a reset mid-write never leaves a truncated segment. The
+    source file is removed (or renamed, when stored raw). The compressed
+    copy is counted in flash_stats() as a rewrite (no new payload).
+
+    Args:
+        src_path: Path of the file to roll
+        dst_base: Segment path without suffix (e.g. "app.log.7")
+        compress: Compress if the platform supports it
+
+    Returns:
+        Tuple of (segment path, segment size in bytes)
+    """
+    if not (compress and can_compress()):
+        dst = dst_base + RAW_SUFFIX
+        size = os.stat(src_path)[6]
+        os.rename(src_path, dst)
+        return dst, size
+
+    dst = dst_base + COMPRESSED_SUFFIX
+    tmp = dst + ".tmp"
+    size = 0
+    with open(src_path, "rb") as src, open(tmp, "wb") as out:
+        if zlib is not None and hasattr(zlib, "compressobj"):
+            compressor = zlib.compressobj()
+            while True:
+                chunk = src.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                data = compressor.compress(chunk)
+                out.write(data)
+                size += len(data)
+            data = compressor.flush()
+            out.write(data)
+            size += len(data)
+        else:
+            with deflate.DeflateIO(out, deflate.ZLIB) as stream:
+                while True:
+                    chunk = src.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    stream.write(chunk)
+            out.flush()
+            size = out.tell()
+    stats = flash_stats()
+    stats.record(0, size)
+    stats.commits += 1
+    stats.files_created += 1
+    os.rename(tmp, dst)
+    os.remove(src_path)
+    return dst, size
+
+
+def read_segment(path):
+    """
+    Stream the decompressed contents of one log file.
+
+    Args:
+        path: Segment, backup or active log path
+
+    Yields:
+        Chunks of bytes
+    """
+    with open(path, "rb") as f:
+        if not path.endswith(COMPRESSED_SUFFIX):
+            while True:
+                chunk = f.read(CHUNK_SIZE)
+                if not chunk:
+                    return
+                yield chunk
+
+        if zlib is not None and hasattr(zlib, "decompressobj"):
+            decompressor = zlib.decompressobj()
+            while True:
+                chunk = f.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield decompressor.decompress(chunk)
+            yield decompressor.flush()
+        elif deflate is not None:
+            stream = deflate.DeflateIO(f, deflate.ZLIB)
+            while True:
+                chunk = stream.read(CHUNK_SIZE)
+                if not chunk:
+                    return
+                yield chunk
+        elif zlib is not None:
+            yield zlib.decompress(f.read())
+        else:
+            raise RuntimeError("zlib module not available")
+
+
+def iter_log_lines(filename, include_active=True):
+    """
+    Stream log lines across all rolled segments, oldest first.
+
+    Args:
+        filename: Path of the active log file
+        include_active: Also read the active log file (default True)
+
+    Yields:
+        Log lines as strings, without trailing newlines
+    """
+    paths = list_segments(filename)
+    if include_active and os.path.exists(filename):
+        paths.append(filename)
+
+    for path in paths:
+        pending = b""
+        for chunk in read_segment(path):
+            pending += chunk
+            lines = pending.split(b"\n")
+            pending = lines.pop()
+            for line in lines:
+                yield line.decode("utf-8")
+        if pending:
+            yield pending.decode("utf-8")
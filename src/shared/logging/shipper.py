@@ -0,0 +1,323 @@
+# Remote log shipping over the cloud backend
+# CircuitPython compatible (no dataclasses, no type annotations in signatures)
+
+import json
+import time
+
+from ..storage import read_atomic, write_atomic
+from .segments import read_segment, scan_segments
+
+try:
+    import binascii
+except ImportError:
+    binascii = None
+
+# Errors from a corrupt segment: bad compressed data or text that isn't
+# UTF-8 (UnicodeDecodeError is a ValueError). Retrying never helps.
+try:
+    import zlib
+
+    SEGMENT_ERRORS = (ValueError, zlib.error)
+except (ImportError, AttributeError):
+    SEGMENT_ERRORS = (ValueError,)
+
+# Seconds to wait after a failed upload (same schedule as MQTT throttling)
+RETRY_BACKOFF = [60, 120, 240, 300]
+
+# Default payload bytes per published value (Adafruit IO caps values at 1KB)
+DEFAULT_CHUNK_SIZE = 900
+
+
+class LogShipper:
+    """
+    Uploads rolled log segments through a CloudBackend during idle time.
+
+    Only sequence-numbered segments (RotatingFileHandler with compress=True
+    or maxTotalBytes > 0) are shipped: their names stay stable across
+    rotations, so a (seq, offset) position identifies the next byte to
+    send. The active log file is left alone until it rolls.
+
+    Each published value is one chunk of a decompressed segment:
+        "<source> <seq>:<offset> <payload>"
+    Text payloads end on a line boundary where possible; use
+    encoding="base64" for BinaryLogHandler logs.
+
+    Call poll() when the main loop is idle. Each call sends at most
+    batch_size chunks in one publish_batch() and waits min_interval
+    seconds per chunk sent before sending again, leaving room in the
+    Adafruit IO rate limit for sensor data. Throttled or failed uploads are
+    retried later, backing off by RETRY_BACKOFF. A segment that can't be
+    decoded is skipped with a warning. The position is saved to state_path
+    after every upload, so a reset resends at most one batch.
+    """
+
+    def __init__(
+        self,
+        backend,
+        log_path,
+        source,
+        feed="logs",
+        state_path=None,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        batch_size=1,
+        min_interval=10,
+        encoding="text",
+        logger=None,
+    ):
+        """
+        Initialize LogShipper.
+
+        Args:
+            backend: CloudBackend to publish through
+            log_path: Path of the active log file whose segments are shipped
+            source: Name identifying this log in published values (e.g. device ID)
+            feed: Logical feed name (default "logs")
+            state_path: File storing the shipping position
+                (default log_path + ".ship")
+            chunk_size: Maximum payload bytes per value (default 900)
+            batch_size: Maximum chunks per poll() (default 1)
+            min_interval: Seconds between chunks (default 10)
+            encoding: "text" or "base64" (default "text")
+            logger: Optional logger for skipped segments
+
+        Raises:
+            ValueError: If encoding is not supported
+            RuntimeError: If encoding is "base64" and binascii is not available
+        """
+        if encoding not in ("text", "base64"):
+            raise ValueError(f"Unsupported encoding: {encoding}")
+        if encoding == "base64" and binascii is None:
+            raise RuntimeError("binascii module not available")
+        self._backend = backend
+        self.log_path = log_path
+        self.source = source
+        self.feed = feed
+        self.state_path = state_path or log_path + ".ship"
+        self.chunk_size = chunk_size
+        self.batch_size = batch_size
+        self.min_interval = min_interval
+        self.encoding = encoding
+        self._logger = logger
+
+        # Next byte to ship: offset within the decompressed segment seq.
+        # seq 0 means nothing has been shipped yet.
+        self._seq = 0
+        self._offset = 0
+        self._load_state()
+
+        # Open segment reader and decompressed bytes starting at _offset
+        self._reader = None
+        self._pending = b""
+        self._eof = False
+
+        self._next_time = 0
+        self._failures = 0
+
+        self.chunks_sent = 0
+        self.bytes_sent = 0
+        self.segments_shipped = 0
+        self.segments_missed = 0
+        self.segments_corrupt = 0
+        self.errors = 0
+
+    @property
+    def position(self):
+        """Return the (seq, offset) of the next byte to ship."""
+        return self._seq, self._offset
+
+    def poll(self, now=None):
+        """
+        Ship the next chunks if the rate limit allows.
+
+        Args:
+            now: Current time.monotonic() value (default: read the clock)
+
+        Returns:
+            Number of chunks published (0 if idle, throttled or failed)
+        """
+        if now is None:
+            now = time.monotonic()
+        if now < self._next_time or not self._backend.is_connected:
+            return 0
+
+        try:
+            chunks = self._take(self.batch_size)
+            if not chunks:
+                # Nothing rolled yet; don't rescan the directory every call
+                self._next_time = now + self.min_interval
+                return 0
+            values = [self._format(offset, data) for offset, data in chunks]
+        except SEGMENT_ERRORS as e:
+            self._skip_segment(e)
+            self._next_time = now + self.min_interval
+            return 0
+        except (OSError, RuntimeError):
+            self._fail(now)
+            return 0
+
+        try:
+            sent = self._backend.publish_batch(self.feed, values)
+        except (OSError, RuntimeError):
+            self._fail(now)
+            return 0
+
+        if not sent:
+            # Throttled: keep the chunks and back off, but it isn't an error
+            self._next_time = now + self._backoff()
+            return 0
+
+        self._failures = 0
+        self._next_time = now + self.min_interval * sent
+        shipped = sum(len(data) for _, data in chunks[:sent])
+        self._pending = self._pending[shipped:]
+        self._offset += shipped
+        self.chunks_sent += sent
+        self.bytes_sent += shipped
+        self._save_state()
+        return sent
+
+    def _backoff(self):
+        """Return the next RETRY_BACKOFF delay and advance the schedule."""
+        delay = RETRY_BACKOFF[min(self._failures, len(RETRY_BACKOFF) - 1)]
+        self._failures += 1
+        return delay
+
+    def _fail(self, now):
+        """Count a failed read or upload and back off."""
+        self.errors += 1
+        self._next_time = now + self._backoff()
+        self._close_reader()
+
+    def _skip_segment(self, error):
+        """Move past the current segment, which can't be decoded."""
+        if self._logger:
+            self._logger.warning("Skipping corrupt log segment %d: %s", self._seq, error)
+        self.segments_corrupt += 1
+        self._seq += 1
+        self._offset = 0
+        self._close_reader()
+        self._save_state()
+
+    def _take(self, count):
+        """
+        Return up to count (offset, bytes) chunks from the current position.
+
+        Finished segments are skipped past; nothing is consumed.
+        """
+        while True:
+            if self._reader is None and not self._open_next():
+                return []
+            # One byte past the last chunk tells whether it ends mid-line
+            want = count * self.chunk_size + 1
+            while len(self._pending) < want and not self._eof:
+                try:
+                    self._pending += next(self._reader)
+                except StopIteration:
+                    self._eof = True
+            if self._pending:
+                break
+            # Segment fully shipped: move on to the next one
+            self.segments_shipped += 1
+            self._seq += 1
+            self._offset = 0
+            self._close_reader()
+            self._save_state()
+
+        chunks = []
+        start = 0
+        offset = self._offset
+        while start < len(self._pending) and len(chunks) < count:
+            end = self._chunk_end(start)
+            chunks.append((offset, self._pending[start:end]))
+            offset += end - start
+            start = end
+        return chunks
+
+    def _chunk_end(self, start):
+        """Return the end index of the chunk beginning at start in _pending."""
+        data = self._pending
+        if self.encoding == "base64":
+            # Base64 grows data by 4/3
+            return min(len(data), start + self.chunk_size * 3 // 4)
+
+        limit = start + self.chunk_size
+        if limit >= len(data):
+            return len(data)
+        newline = data.rfind(b"\n", start, limit)
+        if newline >= 0:
+            return newline + 1
+        # Single long line: don't split a UTF-8 sequence
+        while limit > start + 1 and (data[limit] & 0xC0) == 0x80:
+            limit -= 1
+        return limit
+
+    def _format(self, offset, data):
+        """Build the published value for a chunk."""
+        if self.encoding == "base64":
+            payload = binascii.b2a_base64(data).strip().decode("ascii")
+        else:
+            payload = data.decode("utf-8")
+        return f"{self.source} {self._seq}:{offset} {payload}"
+
+    def _open_next(self):
+        """Open the segment at or after the current position; False if none."""
+        for seq, path in scan_segments(self.log_path):
+            if seq < self._seq:
+                continue
+            if seq > self._seq:
+                if self._seq > 0:
+                    # Deleted by the byte budget before we got to them
+                    self.segments_missed += seq - self._seq
+                self._seq = seq
+                self._offset = 0
+            self._reader = read_segment(path)
+            self._pending = b""
+            self._eof = False
+            self._skip(self._offset)
+            return True
+        return False
+
+    def _skip(self, count):
+        """Discard the first count bytes of the open segment (when resuming)."""
+        while count > 0 and not self._eof:
+            try:
+                chunk = next(self._reader)
+            except StopIteration:
+                self._eof = True
+                break
+            if len(chunk) > count:
+                self._pending = chunk[count:]
+                return
+            count -= len(chunk)
+
+    def _close_reader(self):
+        """Drop the open segment reader."""
+        if self._reader is not None:
+            self._reader.close()
+        self._reader = None
+        self._pending = b""
+        self._eof = False
+
+    def _load_state(self):
+        """Restore the shipping position saved by _save_state()."""
+        data = read_atomic(self.state_path)
+        if data is None:
+            return
+        try:
+            state = json.loads(data.decode("utf-8"))
+            self._seq = int(state["seq"])
+            self._offset = int(state["offset"])
+        except (ValueError, KeyError, TypeError, AttributeError):
+            pass
+
+    def _save_state(self):
+        """Persist the shipping position (not possible on a read-only CIRCUITPY)."""
+        state = json.dumps({"seq": self._seq, "offset": self._offset})
+        try:
+            write_atomic(self.state_path, state.encode("utf-8"))
+        except OSError:
+            pass
+
+    def close(self):
+        """Release the open segment, if any."""
+        self._close_reader()
@@ -0,0 +1,64 @@
+# Log handler writing to a FlashStore append log
+# CircuitPython compatible (no dataclasses, no type annotations in signatures)
+
+# Use adafruit_logging on CircuitPython, standard logging for tests
+try:
+    import adafruit_logging as logging
+except ImportError:
+    import logging
+
+
+class StoreLogHandler(logging.Handler):
+    """
+    A handler that stores formatted records in a shared.storage AppendLog.
+
+    Records are appended to the log's pending batch and committed (one
+    write and flush) when commitSize bytes are pending or a record at
+    flushLevel or above arrives. Flash use is bounded by the log's slots
+    and counted in the store's write stats.
+    """
+
+    def __init__(self, log, commitSize=1024, flushLevel=logging.WARNING):
+        """
+        Initialize StoreLogHandler.
+
+        Args:
+            log: AppendLog from FlashStore.open_log()
+            commitSize: Pending bytes that trigger a commit (default 1024)
+            flushLevel: Records at this level or above commit immediately
+                (default WARNING)
+        """
+        super().__init__()
+        self.log = log
+        self.commitSize = commitSize
+        self.flushLevel = flushLevel
+
+    def emit(self, record):
+        """
+        Append a log record, committing if a threshold is reached.
+
+        Args:
+            record: LogRecord to write
+        """
+        try:
+            data = self.format(record).encode("utf-8")
+            # Commit early rather than overflow a slot
+            if not self.log.fits(len(data)):
+                self.flush()
+            self.log.append(data)
+            if record.levelno >= self.flushLevel or self.log.pending_bytes >= self.commitSize:
+                self.flush()
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        """Commit pending records."""
+        self.log.commit()
+
+    def close(self):
+        """Commit pending records and close the handler."""
+        try:
+            self.flush()
+        except Exception:
+            pass
+        super().close()
@@ -1,48 +1,46 @@
 # Message type classes and envelope functions for Poolio IoT system
 # CircuitPython compatible (no dataclasses, no type annotations in signatures)
+#
+# Names are imported from their submodules on first use (see shared._lazy),
+# so encoding a message does not load the decoder or the validator.
 
-from .decoder import camel_to_snake, decode_message
-from .encoder import encode_message, snake_to_camel
-from .envelope import (
-    PROTOCOL_VERSION,
-    create_envelope,
-    parse_envelope,
-    validate_device_id,
-)
-from .types import (
-    Battery,
-    # Control types
-    Command,
-    CommandResponse,
-    ConfigUpdate,
-    DisplayStatus,
-    Error,
-    # Constants
-    ErrorCode,
-    # Event types
-    FillStart,
-    FillStop,
-    Humidity,
-    # Composite types
-    PoolStatus,
-    ScheduleInfo,
-    Temperature,
-    ValveState,
-    ValveStatus,
-    # Base types
-    WaterLevel,
-)
-from .validator import (
-    COMMAND_MAX_AGE_SECONDS,
-    COMMAND_TYPES,
-    MAX_FUTURE_SECONDS,
-    MAX_MESSAGE_SIZE_BYTES,
-    STATUS_MAX_AGE_SECONDS,
-    validate_envelope,
-    validate_message_size,
-    validate_payload,
-    validate_timestamp_freshness,
-)
+from .._lazy import lazy_exports
+
+_EXPORTS = {
+    "PROTOCOL_VERSION": "envelope",
+    "create_envelope": "envelope",
+    "parse_envelope": "envelope",
+    "validate_device_id": "envelope",
+    "COMMAND_MAX_AGE_SECONDS": "validator",
+    "COMMAND_TYPES": "validator",
+    "MAX_FUTURE_SECONDS": "validator",
+    "MAX_MESSAGE_SIZE_BYTES": "validator",
+    "STATUS_MAX_AGE_SECONDS": "validator",
+    "validate_envelope": "validator",
+    "validate_message_size": "validator",
+    "validate_payload": "validator",
+    "validate_timestamp_freshness": "validator",
+    "encode_message": "encoder",
+    "snake_to_camel": "encoder",
+    "camel_to_snake": "decoder",
+    "decode_message": "decoder",
+    "Battery": "types",
+    "Command": "types",
+    "CommandResponse": "types",
+    "ConfigUpdate": "types",
+    "DisplayStatus": "types",
+    "Error": "types",
+    "ErrorCode": "types",
+    "FillStart": "types",
+    "FillStop": "types",
+    "Humidity": "types",
+    "PoolStatus": "types",
+    "ScheduleInfo": "types",
+    "Temperature": "types",
+    "ValveState": "types",
+    "ValveStatus": "types",
+    "WaterLevel": "types",
+}
 
 __all__ = [
     # Envelope functions
@@ -88,3 +86,5 @@ __all__ = [
     # Constants
     "ErrorCode",
 ]
+
+_LAZY = lazy_exports(__name__, globals(), _EXPORTS)
@@ -1,11 +1,34 @@
 # Sensor utilities for Poolio IoT system
 # CircuitPython compatible
+#
+# Names are imported from their submodules on first use (see shared._lazy).
 
-from .bus_recovery import recover_i2c_bus, recover_onewire_bus
-from .retry import retry_with_backoff
+from .._lazy import lazy_exports
+
+_EXPORTS = {
+    "retry_with_backoff": "retry",
+    "RetryPolicy": "retry",
+    "recover_i2c_bus": "bus_recovery",
+    "recover_onewire_bus": "bus_recovery",
+    "CircuitBreaker": "circuit_breaker",
+    "CircuitOpenError": "circuit_breaker",
+    "SensorScheduler": "scheduler",
+    "ScheduleTimeout": "scheduler",
+    "FloatSwitchDebouncer": "debounce",
+    "SampleBuffer": "history",
+}
 
 __all__ = [
     "retry_with_backoff",
+    "RetryPolicy",
     "recover_i2c_bus",
     "recover_onewire_bus",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "SensorScheduler",
+    "ScheduleTimeout",
+    "FloatSwitchDebouncer",
+    "SampleBuffer",
 ]
+
+_LAZY = lazy_exports(__name__, globals(), _EXPORTS)
@@ -0,0 +1,34 @@
+# Type stubs for sensor utility module exports
+
+from .bus_recovery import (
+    recover_i2c_bus as recover_i2c_bus,
+)
+from .bus_recovery import (
+    recover_onewire_bus as recover_onewire_bus,
+)
+from .circuit_breaker import (
+    CircuitBreaker as CircuitBreaker,
+)
+from .circuit_breaker import (
+    CircuitOpenError as CircuitOpenError,
+)
+from .debounce import (
+    FloatSwitchDebouncer as FloatSwitchDebouncer,
+)
+from .history import (
+    SampleBuffer as SampleBuffer,
+)
+from .retry import (
+    RetryPolicy as RetryPolicy,
+)
+from .retry import (
+    retry_with_backoff as retry_with_backoff,
+)
+from .scheduler import (
+    ScheduleTimeout as ScheduleTimeout,
+)
+from .scheduler import (
+    SensorScheduler as SensorScheduler,
+)
+
+__all__: list[str]
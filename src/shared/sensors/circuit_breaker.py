@@ -0,0 +1,227 @@
+# Circuit breaker for sensor reads and bus recovery
+# CircuitPython compatible (no type annotations in signatures)
+
+import struct
+import time
+
+# Sleep memory survives deep sleep but not a power cycle
+try:
+    import alarm
+except ImportError:
+    alarm = None
+
+# Breaker states
+CLOSED = 0
+OPEN = 1
+HALF_OPEN = 2
+
+STATE_NAMES = {CLOSED: "closed", OPEN: "open", HALF_OPEN: "half-open"}
+
+# Persisted record: marker, state, failures, trips, opened_at (u32 seconds)
+_RECORD_FORMAT = "<BBBBI"
+_RECORD_MARKER = 0xCB
+
+# Bytes one breaker uses in persistent memory
+RECORD_SIZE = struct.calcsize(_RECORD_FORMAT)
+
+
+class CircuitOpenError(Exception):
+    """Raised by CircuitBreaker.call() while the breaker is open."""
+
+
+def default_memory():
+    """Return alarm.sleep_memory, or None if it is not available."""
+    if alarm is None:
+        return None
+    return getattr(alarm, "sleep_memory", None)
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker that stops calling a sensor after repeated failures.
+
+    States:
+    - closed: calls go through; failure_threshold consecutive failures
+      open the breaker
+    - open: calls are skipped until the cool-down has passed
+    - half-open: one trial call; success closes the breaker, failure
+      opens it again with the cool-down doubled (up to max_cooldown)
+
+    Wrap the whole read, including retries and bus recovery, so a dead
+    sensor costs nothing while the breaker is open:
+
+        breaker = CircuitBreaker("water_temp", offset=0)
+
+        def read():
+            try:
+                return retry_with_backoff(sensor.read_temperature)
+            except OSError:
+                recover_onewire_bus(board.D10)
+                raise
+
+        try:
+            temperature = breaker.call(read)
+        except (CircuitOpenError, OSError):
+            temperature = None  # Report as missing
+
+    State is stored in memory (default alarm.sleep_memory) at offset, so it
+    survives deep sleep. Give each breaker its own RECORD_SIZE bytes. The
+    cool-down is measured with time.time(), which keeps running through
+    deep sleep. With no memory available, state lives only in the object.
+    """
+
+    def __init__(
+        self,
+        name,
+        failure_threshold=3,
+        cooldown=300,
+        max_cooldown=3600,
+        memory=None,
+        offset=0,
+    ):
+        """
+        Initialize CircuitBreaker and restore persisted state.
+
+        Args:
+            name: Sensor name used in logs and reports
+            failure_threshold: Consecutive failures that open the breaker
+                (default 3)
+            cooldown: Seconds to stay open after the first trip (default 300)
+            max_cooldown: Longest cool-down after repeated trips (default 3600)
+            memory: Writable bytearray-like storage (default alarm.sleep_memory)
+            offset: Byte offset of this breaker's record in memory
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self._memory = memory if memory is not None else default_memory()
+        self._offset = offset
+
+        self.state = CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.opened_at = 0
+        self._load()
+
+    @property
+    def state_name(self):
+        """Return the state as a string."""
+        return STATE_NAMES[self.state]
+
+    def current_cooldown(self):
+        """Return the cool-down for the current trip in seconds."""
+        if self.trips <= 1:
+            return self.cooldown
+        return min(self.max_cooldown, self.cooldown * (2 ** (self.trips - 1)))
+
+    def remaining(self, now=None):
+        """Return seconds left before an open breaker allows a trial call."""
+        if self.state != OPEN:
+            return 0
+        if now is None:
+            now = time.time()
+        return max(0, self.opened_at + self.current_cooldown() - int(now))
+
+    def allow(self, now=None):
+        """
+        Return True if the sensor should be read now.
+
+        An open breaker whose cool-down has passed moves to half-open and
+        allows one trial call.
+
+        Args:
+            now: Current time.time() value (default: read the clock)
+        """
+        if self.state != OPEN:
+            return True
+        if self.remaining(now) > 0:
+            return False
+        self.state = HALF_OPEN
+        self._save()
+        return True
+
+    def record_success(self):
+        """Record a successful read and close the breaker."""
+        if self.state == CLOSED and self.failures == 0 and self.trips == 0:
+            return
+        self.state = CLOSED
+        self.failures = 0
+        self.trips = 0
+        self._save()
+
+    def record_failure(self, now=None):
+        """
+        Record a failed read, opening the breaker if needed.
+
+        Args:
+            now: Current time.time() value (default: read the clock)
+        """
+        self.failures = min(self.failures + 1, 255)
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = OPEN
+            self.trips = min(self.trips + 1, 255)
+            self.opened_at = int(now if now is not None else time.time())
+        self._save()
+
+    def call(self, func, now=None):
+        """
+        Call func through the breaker.
+
+        Args:
+            func: Callable performing the read (no arguments)
+            now: Current time.time() value (default: read the clock)
+
+        Returns:
+            Return value of func()
+
+        Raises:
+            CircuitOpenError: If the breaker is open
+            Exception: Whatever func() raised (recorded as a failure)
+        """
+        if not self.allow(now):
+            raise CircuitOpenError(f"{self.name} circuit open")
+        try:
+            result = func()
+        except Exception:
+            self.record_failure(now)
+            raise
+        self.record_success()
+        return result
+
+    def reset(self):
+        """Close the breaker and clear its persisted state."""
+        self.state = CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.opened_at = 0
+        self._save()
+
+    def _load(self):
+        """Restore state from memory; invalid or missing records are ignored."""
+        if self._memory is None:
+            return
+        try:
+            data = bytes(self._memory[self._offset : self._offset + RECORD_SIZE])
+            marker, state, failures, trips, opened_at = struct.unpack(_RECORD_FORMAT, data)
+        except (ValueError, struct.error):
+            return
+        if marker != _RECORD_MARKER or state not in STATE_NAMES:
+            return
+        self.state = state
+        self.failures = failures
+        self.trips = trips
+        self.opened_at = opened_at
+
+    def _save(self):
+        """Write state to memory."""
+        if self._memory is None:
+            return
+        self._memory[self._offset : self._offset + RECORD_SIZE] = struct.pack(
+            _RECORD_FORMAT,
+            _RECORD_MARKER,
+            self.state,
+            self.failures,
+            self.trips,
+            self.opened_at & 0xFFFFFFFF,
+        )
@@ -0,0 +1,177 @@
+# Float switch debouncing with early stopping
+# CircuitPython compatible (no type annotations in signatures)
+
+import math
+import time
+from array import array
+
+from ..messages.types import WaterLevel
+
+
+class FloatSwitchDebouncer:
+    """
+    Debounces a float switch by majority vote over a ring of samples.
+
+    Samples are stored as 0/1 in a preallocated array("b") ring buffer of
+    max_reads entries; the count of high samples is updated as samples are
+    added and overwritten, so majority and confidence cost O(1).
+
+    Sampling stops early with a sequential probability ratio test: each
+    sample is assumed to be wrong (splash, ripple) with probability
+    error_rate, so the evidence for the majority grows with the lead of
+    the majority over the minority. Once that lead reaches the margin
+    needed for the target confidence (and at least min_reads samples were
+    taken), more reads would not change the answer. A still surface with
+    the default settings settles after min_reads reads instead of 30.
+
+    Example:
+        debouncer = FloatSwitchDebouncer(max_reads=30)
+        level = debouncer.sample(lambda: float_pin.value, interval=0.01)
+        print(level.float_switch, level.confidence, debouncer.count)
+    """
+
+    def __init__(self, max_reads=30, min_reads=5, target=0.99, error_rate=0.1):
+        """
+        Initialize FloatSwitchDebouncer.
+
+        Args:
+            max_reads: Ring buffer size and maximum reads per sample() (default 30)
+            min_reads: Reads before an early stop is allowed (default 5)
+            target: Posterior probability of the majority needed to stop
+                early, 0.5-1.0 exclusive (default 0.99)
+            error_rate: Assumed probability that one read is wrong,
+                0.0-0.5 exclusive (default 0.1)
+
+        Raises:
+            ValueError: If an argument is out of range
+        """
+        if max_reads < 1:
+            raise ValueError("max_reads must be at least 1")
+        if not 0.5 < target < 1:
+            raise ValueError("target must be between 0.5 and 1")
+        if not 0 < error_rate < 0.5:
+            raise ValueError("error_rate must be between 0 and 0.5")
+        self.max_reads = max_reads
+        self.min_reads = min(min_reads, max_reads)
+        self.target = target
+        self.error_rate = error_rate
+
+        # Log-likelihood ratio contributed by each read of lead
+        self._step = math.log((1 - error_rate) / error_rate)
+        # Lead (majority - minority reads) needed to reach target
+        self.margin = math.ceil(math.log(target / (1 - target)) / self._step - 1e-9)
+
+        self._samples = array("b", bytes(max_reads))
+        self._index = 0
+        self._count = 0
+        self._high = 0
+
+    @property
+    def count(self):
+        """Return the number of samples in the buffer."""
+        return self._count
+
+    @property
+    def majority(self):
+        """Return the majority value (ties go to the latest sample)."""
+        low = self._count - self._high
+        if self._high != low:
+            return self._high > low
+        if self._count == 0:
+            return False
+        return self._samples[(self._index - 1) % self.max_reads] == 1
+
+    @property
+    def confidence(self):
+        """Return the fraction of samples agreeing with the majority."""
+        if self._count == 0:
+            return 0.0
+        return max(self._high, self._count - self._high) / self._count
+
+    @property
+    def posterior(self):
+        """Return the probability that the majority is the true state."""
+        lead = abs(2 * self._high - self._count)
+        return 1 / (1 + math.exp(-lead * self._step))
+
+    @property
+    def settled(self):
+        """Return True once more samples cannot be expected to change the result."""
+        if self._count >= self.max_reads:
+            return True
+        if self._count < self.min_reads:
+            return False
+        return abs(2 * self._high - self._count) >= self.margin
+
+    def add(self, value):
+        """
+        Add one sample, overwriting the oldest once the ring is full.
+
+        Args:
+            value: Switch reading (truthy for high)
+        """
+        bit = 1 if value else 0
+        if self._count == self.max_reads:
+            self._high -= self._samples[self._index]
+        else:
+            self._count += 1
+        self._samples[self._index] = bit
+        self._high += bit
+        self._index = (self._index + 1) % self.max_reads
+
+    def reset(self):
+        """Discard all samples."""
+        for i in range(self.max_reads):
+            self._samples[i] = 0
+        self._index = 0
+        self._count = 0
+        self._high = 0
+
+    def result(self):
+        """Return the current reading as a WaterLevel."""
+        return WaterLevel(float_switch=self.majority, confidence=self.confidence)
+
+    def steps(self, read, interval=0.01):
+        """
+        Sample as a SensorScheduler job.
+
+        Starts from an empty buffer, reads until settled and yields
+        interval between reads.
+
+        Args:
+            read: Callable returning the switch value
+            interval: Seconds between reads (default 0.01)
+
+        Yields:
+            Seconds to wait before the next read
+
+        Returns:
+            WaterLevel
+        """
+        self.reset()
+        while True:
+            self.add(read())
+            if self.settled:
+                return self.result()
+            yield interval
+
+    def sample(self, read, interval=0.01, sleep=None):
+        """
+        Sample until settled, blocking between reads.
+
+        Args:
+            read: Callable returning the switch value
+            interval: Seconds between reads (default 0.01)
+            sleep: Function sleeping for seconds (default time.sleep)
+
+        Returns:
+            WaterLevel
+        """
+        sleep = sleep or time.sleep
+        steps = self.steps(read, interval)
+        while True:
+            try:
+                delay = next(steps)
+            except StopIteration as e:
+                return e.value
+            sleep(delay)
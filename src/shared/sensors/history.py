@@ -0,0 +1,233 @@
+# Fixed-size sample history with streaming statistics
+# CircuitPython compatible (no type annotations in signatures)
+
+import math
+from array import array
+
+
+class SampleBuffer:
+    """
+    Fixed-capacity ring of sensor readings with streaming statistics.
+
+    Values are stored in a preallocated array("f") (4 bytes each) and
+    timestamps, truncated to whole seconds, in an array("L"), so a buffer
+    never allocates after construction. Mean and variance over the window
+    are updated in O(1) per sample with a sliding Welford update; min and
+    max are kept
+    incrementally and only rescanned when the current extreme leaves the
+    window. The EWMA covers every accepted sample, not just the window.
+
+    Outlier rejection: once min_samples values are stored, a value more
+    than outlier_sigma standard deviations (and more than min_spread)
+    from the window mean is rejected and counted in rejected. After
+    max_rejects consecutive rejections the readings are treated as a real
+    level change: the window is cleared and restarts from the new value.
+
+    Example:
+        temps = SampleBuffer(capacity=60, outlier_sigma=3.0, min_spread=0.5)
+        if not temps.add(reading, time.time()):
+            logger.warning("Ignoring outlier %.1f", reading)
+        publish(Temperature(round(temps.ewma, 1)))
+    """
+
+    def __init__(
+        self,
+        capacity=60,
+        alpha=0.2,
+        outlier_sigma=None,
+        min_spread=0.0,
+        min_samples=5,
+        max_rejects=3,
+    ):
+        """
+        Initialize SampleBuffer.
+
+        Args:
+            capacity: Number of samples kept (default 60)
+            alpha: EWMA weight of each new sample, 0-1 (default 0.2)
+            outlier_sigma: Reject values this many standard deviations from
+                the mean; None disables rejection (default None)
+            min_spread: Never reject values within this distance of the
+                mean (default 0.0)
+            min_samples: Samples needed before rejecting (default 5)
+            max_rejects: Consecutive rejections that restart the window
+                (default 3)
+
+        Raises:
+            ValueError: If capacity is less than 1 or alpha is out of range
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be between 0 and 1")
+        self.capacity = capacity
+        self.alpha = alpha
+        self.outlier_sigma = outlier_sigma
+        self.min_spread = min_spread
+        self.min_samples = min_samples
+        self.max_rejects = max_rejects
+
+        self._values = array("f", bytes(4 * capacity))
+        self._times = array("L", [0] * capacity)
+        self.rejected = 0
+        self._ewma = None
+        self._clear()
+
+    def _clear(self):
+        """Reset the window statistics (EWMA and rejected are kept)."""
+        self._index = 0
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._min = None
+        self._max = None
+        self._consecutive_rejects = 0
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def mean(self):
+        """Return the window mean, or None if empty."""
+        return self._mean if self._count else None
+
+    @property
+    def variance(self):
+        """Return the window population variance, or None if empty."""
+        if not self._count:
+            return None
+        return max(0.0, self._m2 / self._count)
+
+    @property
+    def stddev(self):
+        """Return the window standard deviation, or None if empty."""
+        variance = self.variance
+        return None if variance is None else math.sqrt(variance)
+
+    @property
+    def min(self):
+        """Return the smallest value in the window, or None if empty."""
+        return self._min
+
+    @property
+    def max(self):
+        """Return the largest value in the window, or None if empty."""
+        return self._max
+
+    @property
+    def ewma(self):
+        """Return the exponentially weighted moving average, or None."""
+        return self._ewma
+
+    @property
+    def last(self):
+        """Return the newest value, or None if empty."""
+        if not self._count:
+            return None
+        return self._values[(self._index - 1) % self.capacity]
+
+    def is_outlier(self, value):
+        """Return True if value would be rejected by add()."""
+        if self.outlier_sigma is None or self._count < self.min_samples:
+            return False
+        distance = abs(value - self._mean)
+        if distance <= self.min_spread:
+            return False
+        return distance > self.outlier_sigma * self.stddev
+
+    def add(self, value, timestamp=0):
+        """
+        Add a reading.
+
+        Args:
+            value: Reading (float)
+            timestamp: Optional time of the reading in seconds, e.g.
+                time.time() or time.monotonic(); stored truncated to an int
+
+        Returns:
+            True if the value was stored, False if rejected as an outlier
+        """
+        # Convert before touching any state, so a bad timestamp changes nothing
+        timestamp = int(timestamp)
+        if self.is_outlier(value):
+            self._consecutive_rejects += 1
+            if self._consecutive_rejects < self.max_rejects:
+                self.rejected += 1
+                return False
+            # The level really changed; start over from here
+            self._clear()
+            self._ewma = None
+
+        self._consecutive_rejects = 0
+        # Read back through the array so statistics match what is stored
+        index = self._index
+        self._times[index] = timestamp
+        rescan = False
+        if self._count == self.capacity:
+            old = self._values[index]
+            self._values[index] = value
+            value = self._values[index]
+            delta = value - old
+            mean = self._mean + delta / self._count
+            self._m2 += delta * (value - mean + old - self._mean)
+            self._mean = mean
+            rescan = old in (self._min, self._max)
+        else:
+            self._values[index] = value
+            value = self._values[index]
+            self._count += 1
+            delta = value - self._mean
+            self._mean += delta / self._count
+            self._m2 += delta * (value - self._mean)
+
+        self._index = (index + 1) % self.capacity
+        if rescan:
+            self._rescan()
+        else:
+            if self._min is None or value < self._min:
+                self._min = value
+            if self._max is None or value > self._max:
+                self._max = value
+        self._update_ewma(value)
+        return True
+
+    def _update_ewma(self, value):
+        """Fold a value into the EWMA."""
+        if self._ewma is None:
+            self._ewma = value
+        else:
+            self._ewma += self.alpha * (value - self._ewma)
+
+    def _rescan(self):
+        """Recompute min and max after an extreme left the window."""
+        low = high = self._values[0]
+        for i in range(1, self._count):
+            value = self._values[i]
+            if value < low:
+                low = value
+            elif value > high:
+                high = value
+        self._min = low
+        self._max = high
+
+    def values(self):
+        """Return the window values, oldest first, as a list."""
+        return [value for _, value in self.items()]
+
+    def items(self):
+        """
+        Iterate over the window, oldest first.
+
+        Yields:
+            Tuples of (timestamp, value)
+        """
+        start = (self._index - self._count) % self.capacity
+        for i in range(self._count):
+            index = (start + i) % self.capacity
+            yield self._times[index], self._values[index]
+
+    def clear(self):
+        """Discard all samples and the EWMA."""
+        self._clear()
+        self._ewma = None
+        self.rejected = 0
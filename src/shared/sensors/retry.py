@@ -1,6 +1,7 @@
 # Retry utilities for sensor operations
 # CircuitPython compatible (no type annotations in signatures)
 
+import random
 import time
 
 
@@ -80,3 +81,254 @@ def retry_with_backoff(
 
     # If we get here, all retries were exhausted
     raise last_exception
+
+
+# Jitter modes for RetryPolicy
+JITTER_NONE = "none"
+JITTER_FULL = "full"
+JITTER_DECORRELATED = "decorrelated"
+
+
+class _SensorStats:
+    """Per-key counters kept by RetryPolicy."""
+
+    def __init__(self):
+        self.calls = 0
+        self.attempts = 0
+        self.retries = 0
+        self.exhausted = 0
+        self.deadline_hits = 0
+        self.sleep_time = 0.0
+        self.busy_time = 0.0
+        # Smoothed per-attempt success rate, None until the first attempt
+        self.success_rate = None
+        self.samples = 0
+
+    def as_dict(self):
+        return {
+            "calls": self.calls,
+            "attempts": self.attempts,
+            "retries": self.retries,
+            "exhausted": self.exhausted,
+            "deadline_hits": self.deadline_hits,
+            "sleep_time": self.sleep_time,
+            "busy_time": self.busy_time,
+            "success_rate": self.success_rate,
+        }
+
+
+class RetryPolicy:
+    """
+    Reusable retry policy with jitter, a deadline and per-sensor health.
+
+    Unlike retry_with_backoff, a policy remembers how each sensor (key) has
+    behaved. Once a sensor's smoothed attempt success rate reaches
+    healthy_threshold (after min_samples attempts) it gets only
+    healthy_retries retries: a healthy sensor's failure is usually a
+    one-off glitch, and the next cycle will read it anyway. The overall
+    deadline caps the awake time any call can spend, including the time
+    spent inside func.
+
+    Delays grow exponentially from base_delay up to max_delay, with jitter:
+    - "full": uniform between 0 and the exponential delay
+    - "decorrelated": uniform between base_delay and 3x the previous delay
+    - "none": the exponential delay itself (same as retry_with_backoff)
+
+    Example:
+        policy = RetryPolicy(max_retries=3, deadline=1.5)
+        temp = policy.call(sensor.read_temperature, key="water_temp")
+        print(policy.stats("water_temp"))
+    """
+
+    def __init__(
+        self,
+        max_retries=3,
+        base_delay=0.1,
+        max_delay=2.0,
+        jitter=JITTER_FULL,
+        deadline=None,
+        exceptions=(Exception,),
+        healthy_threshold=0.95,
+        healthy_retries=1,
+        min_samples=10,
+        smoothing=0.1,
+        on_attempt=None,
+    ):
+        """
+        Initialize RetryPolicy.
+
+        Args:
+            max_retries: Retries after the initial attempt (int)
+            base_delay: Initial delay in seconds (float)
+            max_delay: Maximum delay cap in seconds (float)
+            jitter: "full", "decorrelated" or "none" (default "full")
+            deadline: Seconds a call may take in total, None for no limit
+            exceptions: Tuple of exception types to catch and retry
+            healthy_threshold: Success rate at which a sensor counts as
+                healthy (default 0.95)
+            healthy_retries: Retries for healthy sensors (default 1)
+            min_samples: Attempts before a sensor can count as healthy
+                (default 10)
+            smoothing: Weight of each new attempt in the success rate
+                (default 0.1)
+            on_attempt: Optional callback(key, attempt, error, duration)
+                called after every attempt; error is None on success
+
+        Raises:
+            ValueError: If jitter is not a supported mode
+        """
+        if jitter not in (JITTER_NONE, JITTER_FULL, JITTER_DECORRELATED):
+            raise ValueError(f"Unsupported jitter mode: {jitter}")
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.deadline = deadline
+        self.exceptions = exceptions
+        self.healthy_threshold = healthy_threshold
+        self.healthy_retries = healthy_retries
+        self.min_samples = min_samples
+        self.smoothing = smoothing
+        self.on_attempt = on_attempt
+        self._stats = {}
+
+    def _stats_for(self, key):
+        """Return the stats object for a key, creating it if needed."""
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = _SensorStats()
+            self._stats[key] = stats
+        return stats
+
+    def is_healthy(self, key="default"):
+        """Return True if the sensor's recent attempts mostly succeed."""
+        stats = self._stats.get(key)
+        if stats is None or stats.samples < self.min_samples:
+            return False
+        return stats.success_rate >= self.healthy_threshold
+
+    def retries_for(self, key="default"):
+        """Return the number of retries the next call for key may use."""
+        if self.is_healthy(key):
+            return min(self.healthy_retries, self.max_retries)
+        return self.max_retries
+
+    def stats(self, key="default"):
+        """
+        Return counters for a key.
+
+        Returns:
+            Dictionary with calls, attempts, retries, exhausted,
+            deadline_hits, sleep_time, busy_time and success_rate
+        """
+        return self._stats_for(key).as_dict()
+
+    def reset(self, key=None):
+        """Forget history for one key (default: all keys)."""
+        if key is None:
+            self._stats = {}
+        else:
+            self._stats.pop(key, None)
+
+    def next_delay(self, attempt, previous):
+        """
+        Return the delay before retry number attempt + 1.
+
+        Args:
+            attempt: Zero-based index of the failed attempt
+            previous: Previous delay (base_delay before the first retry)
+
+        Returns:
+            Delay in seconds
+        """
+        if self.jitter == JITTER_DECORRELATED:
+            upper = max(self.base_delay, previous * 3)
+            return min(self.max_delay, random.uniform(self.base_delay, upper))
+        delay = min(self.max_delay, self.base_delay * (2**attempt))
+        if self.jitter == JITTER_FULL:
+            return random.uniform(0, delay)
+        return delay
+
+    def _record(self, key, stats, attempt, error, started):
+        """Update stats for one attempt and call the hook."""
+        duration = time.monotonic() - started
+        stats.attempts += 1
+        stats.busy_time += duration
+        outcome = 0.0 if error is not None else 1.0
+        if stats.success_rate is None:
+            stats.success_rate = outcome
+        else:
+            stats.success_rate += self.smoothing * (outcome - stats.success_rate)
+        stats.samples += 1
+        if self.on_attempt is not None:
+            self.on_attempt(key, attempt, error, duration)
+
+    def call(self, func, key="default", logger=None):
+        """
+        Call func, retrying on failure according to the policy.
+
+        Args:
+            func: Callable to execute (no arguments)
+            key: Sensor name used for health tracking and stats
+            logger: Optional logger for diagnostics
+
+        Returns:
+            Return value of func() on success
+
+        Raises:
+            The last exception if retries or the deadline are exhausted
+        """
+        stats = self._stats_for(key)
+        stats.calls += 1
+        retries = self.retries_for(key)
+        start = time.monotonic()
+        previous = self.base_delay
+        last_exception = None
+
+        for attempt in range(retries + 1):
+            started = time.monotonic()
+            try:
+                result = func()
+            except self.exceptions as e:
+                last_exception = e
+                self._record(key, stats, attempt + 1, e, started)
+            else:
+                self._record(key, stats, attempt + 1, None, started)
+                return result
+
+            if attempt >= retries:
+                break
+            delay = self.next_delay(attempt, previous)
+            previous = delay
+            if self.deadline is not None and time.monotonic() - start + delay > self.deadline:
+                stats.deadline_hits += 1
+                if logger:
+                    logger.debug(
+                        "%s: deadline %.3fs reached after %d attempts",
+                        key,
+                        self.deadline,
+                        attempt + 1,
+                    )
+                break
+            if logger:
+                logger.debug(
+                    "%s: attempt %d/%d failed: %s, retrying in %.3fs",
+                    key,
+                    attempt + 1,
+                    retries + 1,
+                    last_exception,
+                    delay,
+                )
+            time.sleep(delay)
+            stats.sleep_time += delay
+            stats.retries += 1
+
+        stats.exhausted += 1
+        if logger:
+            logger.warning(
+                "%s: giving up after %d attempts, last error: %s",
+                key,
+                attempt + 1,
+                last_exception,
+            )
+        raise last_exception
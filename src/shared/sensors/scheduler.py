@@ -0,0 +1,255 @@
+# Cooperative scheduler for concurrent sensor reads
+# CircuitPython compatible (no type annotations in signatures)
+
+import time
+
+from .circuit_breaker import CircuitOpenError
+
+
+class ScheduleTimeout(Exception):
+    """Recorded for reads still unfinished when SensorScheduler.run() times out."""
+
+
+def _is_generator(value):
+    """Return True if value is a generator (works on CircuitPython too)."""
+    return hasattr(value, "send") and hasattr(value, "throw")
+
+
+class _Task:
+    """State of one scheduled read."""
+
+    def __init__(self, name, job, recover, breaker, retries, exceptions):
+        self.name = name
+        self.job = job
+        self.recover = recover
+        self.breaker = breaker
+        self.retries = retries
+        self.exceptions = exceptions
+        self.attempt = 0
+        self.gen = None
+        self.wake = 0
+        self.done = False
+
+
+class SensorScheduler:
+    """
+    Tick-based scheduler that overlaps slow sensor reads.
+
+    A job is a callable that returns either a value or a generator. A
+    generator job yields the number of seconds to wait before it is resumed
+    and returns the reading, so other jobs run while it waits:
+
+        def read_temperature():
+            delay = ds18.start_temperature_read()  # ~750ms conversion
+            yield delay
+            return ds18.read_temperature()
+
+        def read_water_level():
+            high = 0
+            for _ in range(30):
+                high += float_pin.value
+                yield 0.01
+            return high > 15
+
+        scheduler = SensorScheduler()
+        scheduler.add("temperature", read_temperature, recover=recover_ow)
+        scheduler.add("water_level", read_water_level)
+        scheduler.add("battery", lambda: gauge.cell_percent)
+        results = scheduler.run(timeout=5)
+
+    A failed job is retried with the retry_with_backoff schedule, but the
+    backoff is a scheduled wake-up instead of time.sleep(), so other reads
+    keep going. recover() (e.g. a bus recovery function) is called before
+    each retry; its own microsecond bus timing still runs inline.
+
+    With a CircuitBreaker, an open breaker skips the read (its error is
+    CircuitOpenError) and the outcome of the read is recorded on it.
+
+    An exception outside the job's retry exceptions, or one raised by
+    recover(), fails that read only (it is in self.errors); run() never
+    raises for a single read.
+    """
+
+    def __init__(
+        self,
+        max_retries=3,
+        base_delay=0.1,
+        max_delay=2.0,
+        recover_delay=0.2,
+        clock=None,
+        sleep=None,
+        logger=None,
+    ):
+        """
+        Initialize SensorScheduler.
+
+        Args:
+            max_retries: Default retries after the first attempt (int)
+            base_delay: Initial retry delay in seconds (float)
+            max_delay: Maximum retry delay in seconds (float)
+            recover_delay: Minimum wait after recover() before retrying, to
+                let devices stabilize (default 0.2)
+            clock: Function returning seconds (default time.monotonic)
+            sleep: Function sleeping for seconds (default time.sleep)
+            logger: Optional logger for diagnostics
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.recover_delay = recover_delay
+        self._clock = clock or time.monotonic
+        self._sleep = sleep or time.sleep
+        self._logger = logger
+        self._tasks = []
+
+        self.results = {}
+        self.errors = {}
+        self.elapsed = 0
+
+    def add(
+        self,
+        name,
+        job,
+        recover=None,
+        breaker=None,
+        max_retries=None,
+        exceptions=(Exception,),
+    ):
+        """
+        Schedule a read for the next run().
+
+        Args:
+            name: Result key
+            job: Callable returning a value or a generator (see class docs)
+            recover: Optional callable run before each retry
+            breaker: Optional CircuitBreaker guarding this read
+            max_retries: Retries for this job (default: scheduler's max_retries)
+            exceptions: Tuple of exception types that trigger a retry
+        """
+        retries = self.max_retries if max_retries is None else max_retries
+        self._tasks.append(_Task(name, job, recover, breaker, retries, exceptions))
+
+    def run(self, timeout=None):
+        """
+        Run all scheduled reads to completion.
+
+        Args:
+            timeout: Seconds after which unfinished reads are abandoned
+                (None for no limit)
+
+        Returns:
+            Dictionary of name to reading; failed reads map to None and
+            their exception is in self.errors
+        """
+        self.results = {}
+        self.errors = {}
+        start = self._clock()
+        pending = []
+        for task in self._tasks:
+            if task.breaker is not None and not task.breaker.allow():
+                self._finish(task, None, CircuitOpenError(f"{task.name} circuit open"))
+                continue
+            task.wake = start
+            pending.append(task)
+
+        while pending:
+            now = self._clock()
+            if timeout is not None and now - start >= timeout:
+                for task in pending:
+                    self._close(task)
+                    self._finish(task, None, ScheduleTimeout(f"{task.name} timed out"))
+                break
+
+            wake = min(task.wake for task in pending)
+            if wake > now:
+                if timeout is not None:
+                    wake = min(wake, start + timeout)
+                self._sleep(wake - now)
+                continue
+
+            for task in pending:
+                if task.wake <= now:
+                    self._step(task, now)
+            pending = [task for task in pending if not task.done]
+
+        self._tasks = []
+        self.elapsed = self._clock() - start
+        return self.results
+
+    def _step(self, task, now):
+        """Advance a task by one step."""
+        try:
+            if task.gen is None:
+                value = task.job()
+                if not _is_generator(value):
+                    self._finish(task, value, None)
+                    return
+                task.gen = value
+            delay = next(task.gen)
+        except StopIteration as e:
+            task.gen = None
+            self._finish(task, getattr(e, "value", None), None)
+            return
+        except task.exceptions as e:
+            self._close(task)
+            self._retry(task, now, e)
+            return
+        except Exception as e:
+            # Not retryable: fail this read only, the others keep running
+            self._close(task)
+            self._finish(task, None, e)
+            return
+        task.wake = now + (delay or 0)
+
+    def _retry(self, task, now, error):
+        """Schedule the next attempt of a failed task, or fail it."""
+        if task.attempt >= task.retries:
+            if self._logger:
+                self._logger.warning(
+                    "%s: all %d attempts failed, last error: %s",
+                    task.name,
+                    task.attempt + 1,
+                    error,
+                )
+            self._finish(task, None, error)
+            return
+
+        delay = min(self.base_delay * (2**task.attempt), self.max_delay)
+        task.attempt += 1
+        if task.recover is not None:
+            try:
+                task.recover()
+            except Exception as e:
+                if self._logger:
+                    self._logger.warning("%s: recovery failed: %s", task.name, e)
+                self._finish(task, None, e)
+                return
+            delay = max(delay, self.recover_delay)
+        if self._logger:
+            self._logger.debug(
+                "%s: attempt %d failed: %s, retrying in %.2fs",
+                task.name,
+                task.attempt,
+                error,
+                delay,
+            )
+        task.wake = now + delay
+
+    def _close(self, task):
+        """Close a task's generator, if any."""
+        if task.gen is not None:
+            task.gen.close()
+            task.gen = None
+
+    def _finish(self, task, value, error):
+        """Record a task's outcome."""
+        task.done = True
+        self.results[task.name] = value
+        if error is not None:
+            self.errors[task.name] = error
+        if task.breaker is None or isinstance(error, CircuitOpenError):
+            return
+        if error is None:
+            task.breaker.record_success()
+        else:
+            task.breaker.record_failure()
@@ -0,0 +1,343 @@
+# Simulated I2C and OneWire buses for testing and benchmarking
+# CircuitPython compatible (no type annotations in signatures)
+#
+# Models bus timing on a virtual clock and injects faults, so retry and
+# recovery strategies can be compared over thousands of simulated wake
+# cycles without hardware. Not imported by shared.sensors; import it
+# explicitly from tests and benchmarks.
+
+# Durations in seconds
+I2C_TRANSACTION_TIME = 0.0005
+I2C_INIT_TIME = 0.001
+ONEWIRE_RESET_TIME = 0.001
+ONEWIRE_READ_TIME = 0.015
+DS18X20_CONVERSION_TIME = 0.75
+
+# Shortest low pulse that resets OneWire devices
+ONEWIRE_RESET_PULSE = 0.00048
+
+
+class SimClock:
+    """Virtual clock; stands in for the time module."""
+
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            self.now += seconds
+
+
+class StuckSDA:
+    """
+    A slave holding SDA low after an interrupted transaction.
+
+    Each wake cycle the bus starts stuck with the given probability. While
+    stuck, every transaction times out; clocking SCL clocks_needed times
+    (recover_i2c_bus) releases it.
+    """
+
+    def __init__(self, probability=0.01, clocks_needed=9, timeout=0.05):
+        self.probability = probability
+        self.clocks_needed = clocks_needed
+        self.timeout = timeout
+        self.stuck = False
+
+    def start_cycle(self, rng):
+        self.stuck = rng.random() < self.probability
+
+    def check(self, clock, rng):
+        if self.stuck:
+            clock.sleep(self.timeout)
+            return OSError(116, "I2C transaction timed out")
+        return None
+
+    def on_scl_clocks(self, count, rng):
+        if count >= self.clocks_needed:
+            self.stuck = False
+
+    def on_reset_pulse(self, rng):
+        pass
+
+
+class MissingPresence:
+    """
+    A OneWire device that stops answering reset with a presence pulse.
+
+    Each wake cycle the device goes missing with the given probability. A
+    reset pulse from recover_onewire_bus brings it back with probability
+    recover_probability (a device that has really lost power never does).
+    """
+
+    def __init__(self, probability=0.01, recover_probability=0.8):
+        self.probability = probability
+        self.recover_probability = recover_probability
+        self.missing = False
+
+    def start_cycle(self, rng):
+        self.missing = rng.random() < self.probability
+
+    def check(self, clock, rng):
+        if self.missing:
+            return OSError(19, "No presence pulse")
+        return None
+
+    def on_scl_clocks(self, count, rng):
+        pass
+
+    def on_reset_pulse(self, rng):
+        if self.missing and rng.random() < self.recover_probability:
+            self.missing = False
+
+
+class CRCErrors:
+    """Independent read errors (noise on a long cable), not fixed by recovery."""
+
+    def __init__(self, rate=0.02):
+        self.rate = rate
+
+    def start_cycle(self, rng):
+        pass
+
+    def check(self, clock, rng):
+        if rng.random() < self.rate:
+            return RuntimeError("CRC error")
+        return None
+
+    def on_scl_clocks(self, count, rng):
+        pass
+
+    def on_reset_pulse(self, rng):
+        pass
+
+
+class SimBus:
+    """A bus with a clock, a random source and fault models."""
+
+    def __init__(self, clock, rng, faults=(), transaction_time=I2C_TRANSACTION_TIME):
+        """
+        Initialize SimBus.
+
+        Args:
+            clock: SimClock advanced by bus activity
+            rng: random.Random (or compatible) used by fault models
+            faults: Fault model objects (StuckSDA, MissingPresence, CRCErrors)
+            transaction_time: Seconds per successful transaction
+        """
+        self.clock = clock
+        self.rng = rng
+        self.faults = list(faults)
+        self.transaction_time = transaction_time
+        self.transactions = 0
+        self.errors = 0
+        self.recoveries = 0
+
+    def start_cycle(self):
+        """Roll the per-cycle fault state (call once per simulated wake)."""
+        for fault in self.faults:
+            fault.start_cycle(self.rng)
+
+    def transaction(self, faults=None):
+        """
+        Perform one transaction, raising the first fault that fires.
+
+        Args:
+            faults: Fault types to check (default: all)
+        """
+        self.transactions += 1
+        for fault in self.faults:
+            if faults is not None and not isinstance(fault, faults):
+                continue
+            error = fault.check(self.clock, self.rng)
+            if error is not None:
+                self.errors += 1
+                raise error
+        self.clock.sleep(self.transaction_time)
+
+    def clock_scl(self, count):
+        """Notify fault models that SCL was toggled count times."""
+        self.recoveries += 1
+        for fault in self.faults:
+            fault.on_scl_clocks(count, self.rng)
+
+    def reset_pulse(self):
+        """Notify fault models of a OneWire reset pulse."""
+        self.recoveries += 1
+        for fault in self.faults:
+            fault.on_reset_pulse(self.rng)
+
+
+class SimFuelGauge:
+    """LC709203F-like I2C fuel gauge."""
+
+    def __init__(self, bus, voltage=3.9, percent=87.0):
+        self._bus = bus
+        self._voltage = voltage
+        self._percent = percent
+
+    @property
+    def cell_voltage(self):
+        self._bus.transaction()
+        return self._voltage
+
+    @property
+    def cell_percent(self):
+        self._bus.transaction()
+        return self._percent
+
+
+class SimDS18X20:
+    """DS18X20-like OneWire temperature sensor with a conversion delay."""
+
+    def __init__(self, bus, temperature=25.5, conversion_time=DS18X20_CONVERSION_TIME):
+        self._bus = bus
+        self._temperature = temperature
+        self.conversion_time = conversion_time
+
+    def start_temperature_read(self):
+        """Reset the bus and start a conversion; return the conversion delay."""
+        self._bus.clock.sleep(ONEWIRE_RESET_TIME - self._bus.transaction_time)
+        self._bus.transaction(faults=MissingPresence)
+        return self.conversion_time
+
+    def read_scratchpad(self):
+        """Read the converted temperature (may fail with a CRC error)."""
+        self._bus.clock.sleep(ONEWIRE_READ_TIME - self._bus.transaction_time)
+        self._bus.transaction(faults=(MissingPresence, CRCErrors))
+        return self._temperature
+
+    @property
+    def temperature(self):
+        """Blocking read, as in adafruit_ds18x20."""
+        delay = self.start_temperature_read()
+        self._bus.clock.sleep(delay)
+        return self.read_scratchpad()
+
+
+class _Namespace:
+    """Attribute container standing in for a module."""
+
+
+class _SimDigitalInOut:
+    """digitalio.DigitalInOut on a simulated pin."""
+
+    def __init__(self, hardware, pin):
+        self._hardware = hardware
+        self._pin = pin
+        self._value = True
+        self._low_since = None
+        self._falling_edges = 0
+        self.direction = None
+
+    @property
+    def value(self):
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        if self._value and not value:
+            self._falling_edges += 1
+            self._low_since = self._hardware.clock.now
+        self._value = value
+
+    def __setattr__(self, name, value):
+        if name == "direction" and value == "input" and self._low_since is not None:
+            # Releasing the line ends a low pulse
+            if self._hardware.clock.now - self._low_since >= ONEWIRE_RESET_PULSE:
+                self._hardware.on_reset_pulse(self._pin)
+            self._low_since = None
+        object.__setattr__(self, name, value)
+
+    def deinit(self):
+        if self._falling_edges:
+            self._hardware.on_scl_clocks(self._pin, self._falling_edges)
+            self._falling_edges = 0
+
+
+class _SimDevice:
+    """busio.I2C / onewireio.OneWire stand-in that only costs init time."""
+
+    def __init__(self, clock, *pins):
+        clock.sleep(I2C_INIT_TIME)
+
+    def deinit(self):
+        pass
+
+
+class SimHardware:
+    """
+    Stand-ins for the busio, digitalio, onewireio and time modules.
+
+    install() swaps them into modules such as shared.sensors.bus_recovery
+    and shared.sensors.retry, so the real recovery and retry code runs
+    against simulated buses and the virtual clock:
+
+        clock = SimClock()
+        i2c = SimBus(clock, rng, [StuckSDA(0.05)])
+        hardware = SimHardware(clock, i2c_bus=i2c, scl_pin="SCL")
+        restore = hardware.install(bus_recovery, retry)
+        try:
+            recover_i2c_bus("SCL", "SDA")
+        finally:
+            restore()
+    """
+
+    def __init__(self, clock, i2c_bus=None, onewire_bus=None, scl_pin="SCL", data_pin="D10"):
+        self.clock = clock
+        self.i2c_bus = i2c_bus
+        self.onewire_bus = onewire_bus
+        self.scl_pin = scl_pin
+        self.data_pin = data_pin
+
+        hardware = self
+        self.digitalio = _Namespace()
+        self.digitalio.DigitalInOut = lambda pin: _SimDigitalInOut(hardware, pin)
+        self.digitalio.Direction = _Namespace()
+        self.digitalio.Direction.OUTPUT = "output"
+        self.digitalio.Direction.INPUT = "input"
+        self.busio = _Namespace()
+        self.busio.I2C = lambda scl, sda: _SimDevice(clock, scl, sda)
+        self.onewireio = _Namespace()
+        self.onewireio.OneWire = lambda pin: _SimDevice(clock, pin)
+
+    def on_scl_clocks(self, pin, count):
+        if pin == self.scl_pin and self.i2c_bus is not None:
+            self.i2c_bus.clock_scl(count)
+
+    def on_reset_pulse(self, pin):
+        if pin == self.data_pin and self.onewire_bus is not None:
+            self.onewire_bus.reset_pulse()
+
+    def install(self, *modules):
+        """
+        Replace hardware and time modules in the given modules.
+
+        Only names a module already has are replaced.
+
+        Returns:
+            Function that restores the original modules
+        """
+        replacements = {
+            "busio": self.busio,
+            "digitalio": self.digitalio,
+            "onewireio": self.onewireio,
+            "time": self.clock,
+        }
+        saved = []
+        for module in modules:
+            for name, value in replacements.items():
+                if hasattr(module, name):
+                    saved.append((module, name, getattr(module, name)))
+                    setattr(module, name, value)
+
+        def restore():
+            for module, name, value in reversed(saved):
+                setattr(module, name, value)
+
+        return restore
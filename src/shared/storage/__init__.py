@@ -0,0 +1,20 @@
+# Storage module for Poolio IoT system
+# CircuitPython compatible
+#
+# Names are imported from their submodules on first use (see shared._lazy),
+# so nodes that only write state files don't load FlashStore.
+
+from .._lazy import lazy_exports
+
+_EXPORTS = {
+    "FlashStore": "flash_store",
+    "AppendLog": "flash_store",
+    "WriteStats": "stats",
+    "flash_stats": "stats",
+    "write_atomic": "atomic",
+    "read_atomic": "atomic",
+}
+
+__all__ = ["FlashStore", "AppendLog", "WriteStats", "flash_stats", "write_atomic", "read_atomic"]
+
+_LAZY = lazy_exports(__name__, globals(), _EXPORTS)
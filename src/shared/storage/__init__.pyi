@@ -0,0 +1,22 @@
+# Type stubs for storage module exports
+
+from .atomic import (
+    read_atomic as read_atomic,
+)
+from .atomic import (
+    write_atomic as write_atomic,
+)
+from .flash_store import (
+    AppendLog as AppendLog,
+)
+from .flash_store import (
+    FlashStore as FlashStore,
+)
+from .stats import (
+    WriteStats as WriteStats,
+)
+from .stats import (
+    flash_stats as flash_stats,
+)
+
+__all__: list[str]
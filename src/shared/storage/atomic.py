@@ -0,0 +1,57 @@
+# Atomic replacement of small files (state, caches)
+# CircuitPython compatible (no dataclasses, no type annotations in signatures)
+
+import os
+
+from .stats import flash_stats
+
+
+def write_atomic(path, data):
+    """
+    Replace a file atomically via a temporary file.
+
+    The data is written to path + ".tmp", which replaces the old file only
+    once complete; read_atomic() falls back to the temporary file if a
+    reset hits between removing the old file and the rename. The write is
+    counted in flash_stats().
+
+    Args:
+        path: File path
+        data: Bytes to write
+
+    Raises:
+        OSError: If the file cannot be written (e.g. read-only filesystem)
+    """
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    stats = flash_stats()
+    stats.record(0, len(data), logical=len(data))
+    stats.commits += 1
+    stats.files_created += 1
+    # FAT rename does not replace an existing file
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+    os.rename(tmp, path)
+
+
+def read_atomic(path, default=None):
+    """
+    Read a file written by write_atomic().
+
+    Args:
+        path: File path
+        default: Returned if neither the file nor its temporary file exists
+
+    Returns:
+        File contents as bytes, or default
+    """
+    for candidate in (path, path + ".tmp"):
+        try:
+            with open(candidate, "rb") as f:
+                return f.read()
+        except OSError:
+            continue
+    return default
@@ -0,0 +1,448 @@
+# Flash-wear-aware storage for on-device persistence
+# CircuitPython compatible (no dataclasses, no type annotations in signatures)
+#
+# Two kinds of storage share one byte budget:
+#
+# - Append logs: a ring of preallocated slot files written in place.
+#   Preallocating means appends never grow a file, so FAT never has to
+#   allocate clusters or change the directory entry's size or cluster
+#   chain. Each commit still flushes and closes the slot file, which
+#   rewrites the directory entry's modification time (one sector) along
+#   with the data sectors appended to. When the current slot is full the
+#   slot with the oldest generation is reused, so writes rotate evenly
+#   across all slots.
+#
+#   Slot layout (little-endian):
+#     header   "PSLT" version:u8 pad:3 generation:u32
+#     record   "R" length:u16 payload
+#     commit   "C" generation:u32 crc32:u32   (crc over the batch + generation)
+#
+#   Records become visible only once the commit marker after them is on
+#   flash. A batch cut short by a reset, or stale bytes left over from an
+#   older generation of the slot, fail the commit check and are ignored.
+#
+# - Small files (state, caches) written atomically via a temporary file
+#   (see atomic.py).
+#
+# Only the store's own files count against its budget. Writes made by the
+# store and by every other writer (log handlers, segment rotation, state
+# files written with write_atomic()) are all counted in flash_stats().
+
+import os
+import struct
+
+from .atomic import read_atomic, write_atomic
+from .stats import DEFAULT_SECTOR_SIZE, WriteStats, flash_stats
+
+try:
+    from binascii import crc32
+except ImportError:
+    try:
+        from zlib import crc32
+    except ImportError:
+        crc32 = None
+
+SLOT_MAGIC = b"PSLT"
+SLOT_VERSION = 1
+
+_SLOT_HEADER = "<4sBxxxI"
+_RECORD_HEADER = "<BH"
+_COMMIT = "<BII"
+SLOT_HEADER_SIZE = struct.calcsize(_SLOT_HEADER)
+RECORD_HEADER_SIZE = struct.calcsize(_RECORD_HEADER)
+COMMIT_SIZE = struct.calcsize(_COMMIT)
+
+TAG_RECORD = 0x52  # "R"
+TAG_COMMIT = 0x43  # "C"
+
+# Value of unwritten flash, used to fill new slots
+ERASED = 0xFF
+
+# Fill/read chunk size
+CHUNK_SIZE = 512
+
+MAX_RECORD = 0xFFFF
+
+
+def _checksum(data, generation):
+    """Return the commit checksum of a batch."""
+    return crc32(struct.pack("<I", generation), crc32(data)) & 0xFFFFFFFF
+
+
+class FlashStore:
+    """
+    Shared storage for everything a node persists to flash.
+
+    Every log and file is reserved against one byte budget up front, so the
+    total flash a node can consume is fixed. Writes are counted in stats
+    (store-wide) and in each AppendLog's own stats.
+
+    Example:
+        store = FlashStore("/data", budget=256 * 1024)
+        events = store.open_log("events", slot_size=8192, slots=4)
+        events.append(b"valve opened")
+        events.commit()
+        store.write_file("shipper.json", b'{"seq": 3}')
+    """
+
+    def __init__(self, root, budget, sector_size=DEFAULT_SECTOR_SIZE):
+        """
+        Initialize FlashStore.
+
+        Args:
+            root: Directory holding the store's files
+            budget: Maximum bytes the store may occupy
+            sector_size: Flash erase sector size in bytes (default 4096)
+
+        Raises:
+            RuntimeError: If no crc32 implementation is available
+        """
+        if crc32 is None:
+            raise RuntimeError("crc32 not available (binascii or zlib)")
+        self.root = root
+        self.budget = budget
+        self.sector_size = sector_size
+        self.stats = WriteStats(sector_size)
+        # Bytes reserved per name
+        self._reserved = {}
+        self._logs = {}
+        if not os.path.exists(root):
+            os.makedirs(root)
+        # Files from earlier runs count against the budget; slot files are
+        # reserved when their log is opened
+        for name in os.listdir(root):
+            if not name.endswith(".slot") and not name.endswith(".tmp"):
+                self._reserved[name] = os.stat(self._path(name))[6]
+
+    @property
+    def used(self):
+        """Return the bytes reserved by logs and files."""
+        return sum(self._reserved.values())
+
+    def _path(self, name):
+        """Return the path of a file in the store."""
+        return os.path.join(self.root, name)
+
+    def _reserve(self, key, size):
+        """
+        Reserve size bytes under key, replacing its previous reservation.
+
+        Raises:
+            ValueError: If the reservation would exceed the budget
+        """
+        total = self.used - self._reserved.get(key, 0) + size
+        if total > self.budget:
+            raise ValueError(f"Storage budget exceeded: {total} > {self.budget} bytes ({key})")
+        self._reserved[key] = size
+
+    def open_log(self, name, slot_size=8192, slots=4):
+        """
+        Open (or create) an append log.
+
+        Args:
+            name: Log name (used in slot file names)
+            slot_size: Bytes per slot file (default 8192)
+            slots: Number of slot files in the ring (default 4)
+
+        Returns:
+            AppendLog instance (the same one for repeated calls)
+
+        Raises:
+            ValueError: If the log does not fit in the budget
+        """
+        log = self._logs.get(name)
+        if log is not None:
+            return log
+        if slots < 2:
+            raise ValueError("An append log needs at least 2 slots")
+        if slot_size < SLOT_HEADER_SIZE + RECORD_HEADER_SIZE + COMMIT_SIZE + 1:
+            raise ValueError(f"Slot size too small: {slot_size}")
+        self._reserve(f"{name}.log", slot_size * slots)
+        log = AppendLog(self, name, slot_size, slots)
+        self._logs[name] = log
+        return log
+
+    def write_file(self, name, data):
+        """
+        Replace a file atomically.
+
+        See write_atomic().
+
+        Args:
+            name: File name within the store
+            data: Bytes to write
+
+        Raises:
+            ValueError: If the file does not fit in the budget
+        """
+        self._reserve(name, len(data))
+        # write_atomic() counts the write in flash_stats()
+        write_atomic(self._path(name), data)
+        self.stats.record(0, len(data), logical=len(data))
+        self.stats.commits += 1
+        self.stats.files_created += 1
+
+    def read_file(self, name, default=None):
+        """
+        Read a file written by write_file().
+
+        Args:
+            name: File name within the store
+            default: Returned if the file does not exist
+
+        Returns:
+            File contents as bytes, or default
+        """
+        data = read_atomic(self._path(name))
+        if data is None:
+            return default
+        self._reserved.setdefault(name, len(data))
+        return data
+
+    def remove_file(self, name):
+        """Delete a file and release its reservation."""
+        path = self._path(name)
+        for candidate in (path, path + ".tmp"):
+            try:
+                os.remove(candidate)
+            except OSError:
+                pass
+        self._reserved.pop(name, None)
+
+
+class AppendLog:
+    """
+    An append-only record log stored in a ring of preallocated slot files.
+
+    append() buffers records in memory; commit() writes them plus a commit
+    marker with one write and one flush. Only committed records are
+    returned by read(). When every slot is full the oldest slot is reused,
+    dropping its records.
+
+    Create through FlashStore.open_log().
+    """
+
+    def __init__(self, store, name, slot_size, slots):
+        """
+        Initialize AppendLog, creating or recovering its slot files.
+
+        Args:
+            store: Owning FlashStore
+            name: Log name
+            slot_size: Bytes per slot file
+            slots: Number of slot files
+        """
+        self._store = store
+        self.name = name
+        self.slot_size = slot_size
+        self.stats = WriteStats(store.sector_size)
+        self._all_stats = (self.stats, store.stats, flash_stats())
+        self._paths = [store._path(f"{name}.{i}.slot") for i in range(slots)]
+        self._batch = []
+        self._batch_bytes = 0
+        self._batch_logical = 0
+
+        # Generation per slot; 0 means empty/invalid
+        self._generations = [self._open_slot(i) for i in range(slots)]
+        self._current = 0
+        for i in range(slots):
+            if self._generations[i] > self._generations[self._current]:
+                self._current = i
+        if self._generations[self._current] == 0:
+            self._start_slot(self._current, 1)
+        self._pos = self._scan(self._current)[1]
+
+    @property
+    def capacity(self):
+        """Return the largest batch (framing included) a single commit can hold."""
+        return self.slot_size - SLOT_HEADER_SIZE - COMMIT_SIZE
+
+    @property
+    def pending(self):
+        """Return the number of appended but uncommitted records."""
+        return len(self._batch)
+
+    @property
+    def pending_bytes(self):
+        """Return the framed size of the uncommitted records."""
+        return self._batch_bytes
+
+    def fits(self, size):
+        """Return True if a payload of size bytes can join the pending batch."""
+        return size <= MAX_RECORD and self._batch_bytes + RECORD_HEADER_SIZE + size <= self.capacity
+
+    def _account(self, offset, nbytes, logical=0):
+        """Record a write in the log's, the store's and the node's stats."""
+        for stats in self._all_stats:
+            stats.record(offset, nbytes, logical)
+
+    def _count(self, name):
+        """Increment a counter in the log's, the store's and the node's stats."""
+        for stats in self._all_stats:
+            setattr(stats, name, getattr(stats, name) + 1)
+
+    def _open_slot(self, index):
+        """Create a missing slot file and return its generation (0 if none)."""
+        path = self._paths[index]
+        try:
+            size = os.stat(path)[6]
+        except OSError:
+            size = -1
+        if size != self.slot_size:
+            # One-time fill; later writes never change the file size
+            fill = bytes([ERASED]) * CHUNK_SIZE
+            with open(path, "wb") as f:
+                remaining = self.slot_size
+                while remaining > 0:
+                    f.write(fill[: min(CHUNK_SIZE, remaining)])
+                    remaining -= CHUNK_SIZE
+            self._account(0, self.slot_size)
+            self._count("files_created")
+            return 0
+        with open(path, "rb") as f:
+            header = f.read(SLOT_HEADER_SIZE)
+        if len(header) < SLOT_HEADER_SIZE:
+            return 0
+        magic, version, generation = struct.unpack(_SLOT_HEADER, header)
+        if magic != SLOT_MAGIC or version != SLOT_VERSION:
+            return 0
+        return generation
+
+    def _write_at(self, index, offset, data, logical=0):
+        """Write data in place into a slot file and flush it."""
+        with open(self._paths[index], "r+b") as f:
+            f.seek(offset)
+            f.write(data)
+            f.flush()
+        self._account(offset, len(data), logical)
+
+    def _start_slot(self, index, generation):
+        """Claim a slot for a new generation by rewriting its header."""
+        header = struct.pack(_SLOT_HEADER, SLOT_MAGIC, SLOT_VERSION, generation)
+        self._write_at(index, 0, header)
+        self._generations[index] = generation
+        self._current = index
+        self._pos = SLOT_HEADER_SIZE
+
+    def _scan(self, index):
+        """
+        Parse a slot's committed batches.
+
+        Returns:
+            Tuple of (list of payloads, offset just past the last commit)
+        """
+        generation = self._generations[index]
+        end = SLOT_HEADER_SIZE
+        committed = []
+        if generation == 0:
+            return committed, end
+        with open(self._paths[index], "rb") as f:
+            data = f.read()
+
+        batch = []
+        batch_start = end
+        offset = end
+        size = len(data)
+        while offset < size:
+            tag = data[offset]
+            if tag == TAG_RECORD and offset + RECORD_HEADER_SIZE <= size:
+                _, length = struct.unpack_from(_RECORD_HEADER, data, offset)
+                start = offset + RECORD_HEADER_SIZE
+                if start + length > size:
+                    break
+                batch.append(data[start : start + length])
+                offset = start + length
+            elif tag == TAG_COMMIT and offset + COMMIT_SIZE <= size:
+                _, commit_gen, checksum = struct.unpack_from(_COMMIT, data, offset)
+                if commit_gen != generation or (
+                    checksum != _checksum(data[batch_start:offset], generation)
+                ):
+                    break
+                offset += COMMIT_SIZE
+                committed.extend(batch)
+                batch = []
+                batch_start = offset
+                end = offset
+            else:
+                break
+        return committed, end
+
+    def append(self, payload):
+        """
+        Buffer a record for the next commit.
+
+        Args:
+            payload: Record bytes (at most 65535)
+
+        Raises:
+            ValueError: If the record does not fit with the pending batch
+                (commit first; see fits())
+        """
+        if isinstance(payload, str):
+            payload = payload.encode("utf-8")
+        if not self.fits(len(payload)):
+            raise ValueError(f"Record too large for slot: {len(payload)} bytes")
+        self._batch.append(struct.pack(_RECORD_HEADER, TAG_RECORD, len(payload)) + payload)
+        self._batch_bytes += RECORD_HEADER_SIZE + len(payload)
+        self._batch_logical += len(payload)
+
+    def commit(self):
+        """
+        Write buffered records followed by a commit marker.
+
+        Moves to the next slot first if the batch doesn't fit in the
+        current one.
+
+        Returns:
+            Number of bytes written (0 if nothing was pending)
+        """
+        if not self._batch:
+            return 0
+        data = b"".join(self._batch)
+        if self._pos + len(data) + COMMIT_SIZE > self.slot_size:
+            self._advance()
+        generation = self._generations[self._current]
+        blob = data + struct.pack(_COMMIT, TAG_COMMIT, generation, _checksum(data, generation))
+        self._write_at(self._current, self._pos, blob, logical=self._batch_logical)
+        self._pos += len(blob)
+        self._count("commits")
+        self._batch = []
+        self._batch_bytes = 0
+        self._batch_logical = 0
+        return len(blob)
+
+    def _advance(self):
+        """Reuse the slot with the oldest generation."""
+        oldest = 0
+        for i in range(len(self._generations)):
+            if self._generations[i] < self._generations[oldest]:
+                oldest = i
+        if self._generations[oldest]:
+            self._count("slot_reuses")
+        self._start_slot(oldest, max(self._generations) + 1)
+
+    def read(self):
+        """
+        Iterate committed records, oldest first.
+
+        Yields:
+            Record payloads as bytes
+        """
+        order = sorted(
+            (generation, i) for i, generation in enumerate(self._generations) if generation
+        )
+        for _, index in order:
+            yield from self._scan(index)[0]
+
+    def clear(self):
+        """Drop all records (pending and committed) by starting a new generation."""
+        self._batch = []
+        self._batch_bytes = 0
+        self._batch_logical = 0
+        generation = max(self._generations) + 1
+        for i in range(len(self._generations)):
+            if i != self._current and self._generations[i]:
+                # Invalidate with a header the reader rejects
+                self._write_at(i, 0, b"\x00")
+                self._generations[i] = 0
+        self._start_slot(self._current, generation)
@@ -0,0 +1,86 @@
+# Flash write accounting
+# CircuitPython compatible (no dataclasses, no type annotations in signatures)
+#
+# Every module that writes to flash (log handlers, segment rotation, atomic
+# state files, FlashStore) records its writes in flash_stats(), so write
+# amplification is measured across the whole node, not per feature.
+
+# Typical erase block of the CIRCUITPY flash
+DEFAULT_SECTOR_SIZE = 4096
+
+
+class WriteStats:
+    """
+    Counters for flash writes.
+
+    logical_bytes counts payload bytes callers asked to store;
+    physical_bytes counts every byte written (framing, headers, fill);
+    sector_writes counts erase sectors touched by each write, which is
+    what actually wears the flash.
+    """
+
+    def __init__(self, sector_size=DEFAULT_SECTOR_SIZE):
+        """
+        Initialize WriteStats.
+
+        Args:
+            sector_size: Flash erase sector size in bytes (default 4096)
+        """
+        self.sector_size = sector_size
+        self.reset()
+
+    def reset(self):
+        """Zero all counters."""
+        self.logical_bytes = 0
+        self.physical_bytes = 0
+        self.sector_writes = 0
+        self.writes = 0
+        self.commits = 0
+        self.files_created = 0
+        self.slot_reuses = 0
+
+    def record(self, offset, nbytes, logical=0):
+        """
+        Account for one write.
+
+        Args:
+            offset: File offset of the write
+            nbytes: Bytes written
+            logical: Payload bytes among them
+        """
+        if nbytes <= 0:
+            return
+        first = offset // self.sector_size
+        last = (offset + nbytes - 1) // self.sector_size
+        self.sector_writes += last - first + 1
+        self.physical_bytes += nbytes
+        self.logical_bytes += logical
+        self.writes += 1
+
+    @property
+    def write_amplification(self):
+        """Bytes of sectors written per payload byte (0 before any payload)."""
+        if not self.logical_bytes:
+            return 0
+        return self.sector_writes * self.sector_size / self.logical_bytes
+
+    def as_dict(self):
+        """Return the counters as a dictionary."""
+        return {
+            "logical_bytes": self.logical_bytes,
+            "physical_bytes": self.physical_bytes,
+            "sector_writes": self.sector_writes,
+            "writes": self.writes,
+            "commits": self.commits,
+            "files_created": self.files_created,
+            "slot_reuses": self.slot_reuses,
+            "write_amplification": self.write_amplification,
+        }
+
+
+_FLASH_STATS = WriteStats()
+
+
+def flash_stats():
+    """Return the WriteStats counting every flash write made by shared modules."""
+    return _FLASH_STATS
@@ -9,6 +9,8 @@ Usage on device:
     runner.run_all()  # Run all discovered tests
     runner.run_module_by_name("shared.test_messages")  # Run specific module
     runner.run_pattern("temperature")  # Run tests matching pattern
+    runner.run_import_profile()  # Time imports of shared modules (fresh boot)
+    runner.run_node_import_profile("valve_node")  # Imports one node needs (fresh boot)
 """
 
 import gc
@@ -23,6 +25,52 @@ FAIL = "FAIL"
 ERROR = "ERROR"
 SKIP = "SKIP"
 
+# Modules timed by run_import_profile(), dependencies first
+PROFILE_MODULES = (
+    "shared.messages",
+    "shared.config",
+    "shared.logging",
+    "shared.storage",
+    "shared.sensors",
+    "shared.cloud",
+)
+
+# Names each node imports from the shared packages, timed by
+# run_node_import_profile(). The production pool node runs C++; its entry
+# stands for an HTTP-only CircuitPython client with the same duties.
+NODE_IMPORTS = {
+    "pool_node": (
+        ("shared.config", ("load_config",)),
+        ("shared.logging", ("get_logger",)),
+        ("shared.messages", ("encode_message", "PoolStatus", "Temperature", "Battery")),
+        ("shared.sensors", ("retry_with_backoff", "recover_i2c_bus", "recover_onewire_bus")),
+        ("shared.cloud", ("AdafruitIOHTTP",)),
+    ),
+    "valve_node": (
+        ("shared.config", ("load_config", "ConfigStore")),
+        ("shared.logging", ("get_logger", "add_file_logging")),
+        (
+            "shared.messages",
+            (
+                "encode_message",
+                "decode_message",
+                "ValveStatus",
+                "FillStart",
+                "FillStop",
+                "CommandResponse",
+            ),
+        ),
+        ("shared.sensors", ("FloatSwitchDebouncer", "SensorScheduler")),
+        ("shared.cloud", ("AdafruitIOMQTT",)),
+    ),
+    "display_node": (
+        ("shared.config", ("load_config", "ConfigStore")),
+        ("shared.logging", ("get_logger",)),
+        ("shared.messages", ("decode_message", "encode_message", "Command", "DisplayStatus")),
+        ("shared.cloud", ("AdafruitIOMQTT", "AdafruitIOHTTP")),
+    ),
+}
+
 
 class TestResult:
     """Stores result of a single test."""
@@ -342,3 +390,126 @@ def run_pattern(pattern):
 
     runner.print_summary()
     return runner.get_exit_code()
+
+
+def run_import_profile(modules=PROFILE_MODULES):
+    """Time the import of shared modules and their heap cost.
+
+    Run right after a reload (Ctrl-D), before anything else imports them;
+    modules already imported are skipped. Deploy once with .py source and
+    once with deploy.py --mpy and compare the output to see what
+    compiling on the device costs.
+
+    For each module prints the import time, the heap allocated while
+    importing (including compiler garbage) and the heap still held after
+    gc.collect(), and whether it was loaded from .py or .mpy.
+
+    Args:
+        modules: Module names to import, in order
+
+    Returns:
+        Exit code (0=all imported, 1=import error)
+    """
+    board_name, cp_version = TestRunner()._get_board_info()
+    print("=== IMPORT PROFILE START ===")
+    print(f"BOARD: {board_name}")
+    print(f"CIRCUITPYTHON: {cp_version}")
+
+    total_ms = 0
+    total_allocated = 0
+    total_retained = 0
+    exit_code = 0
+    for name in modules:
+        if name in sys.modules:
+            print(f"[{SKIP}] {name}: already imported")
+            continue
+
+        gc.collect()
+        free_before = gc.mem_free()
+        start = time.monotonic_ns()
+        try:
+            module = __import__(name, None, None, ["__name__"])
+        except ImportError as e:
+            print(f"[{ERROR}] {name}: {e}")
+            exit_code = 1
+            continue
+        duration_ms = (time.monotonic_ns() - start) // 1000000
+        allocated = free_before - gc.mem_free()
+        gc.collect()
+        retained = free_before - gc.mem_free()
+
+        source = "mpy" if getattr(module, "__file__", "").endswith(".mpy") else "py"
+        print(
+            f"IMPORT: {name} {duration_ms}ms allocated={allocated} retained={retained} ({source})"
+        )
+        total_ms += duration_ms
+        total_allocated += allocated
+        total_retained += retained
+
+    print(f"IMPORT_TOTAL: {total_ms}ms allocated={total_allocated} retained={total_retained}")
+    print(f"MEMORY_FREE: {gc.mem_free()} bytes")
+    print("=== IMPORT PROFILE END ===")
+    return exit_code
+
+
+def load_node_imports(node_type, eager=False):
+    """Import the shared names a node uses.
+
+    With eager, every name each package exports is loaded as well, which is
+    what importing the package cost before its exports became lazy.
+
+    Args:
+        node_type: Key of NODE_IMPORTS
+        eager: Also load every export of the packages
+
+    Returns:
+        Dictionary of name to imported object
+    """
+    names = {}
+    for package, wanted in NODE_IMPORTS[node_type]:
+        module = __import__(package, None, None, ["__name__"])
+        for name in getattr(module, "_EXPORTS", ()) if eager else ():
+            getattr(module, name)
+        for name in wanted:
+            names[name] = getattr(module, name)
+    return names
+
+
+def run_node_import_profile(node_type, eager=False):
+    """Time the shared imports of one node type and their heap cost.
+
+    Run right after a reload (Ctrl-D). Run once with eager=False and, after
+    another reload, once with eager=True to see what lazy package exports
+    save for that node.
+
+    Args:
+        node_type: Key of NODE_IMPORTS
+        eager: Load every export of the packages, as before lazy loading
+
+    Returns:
+        Exit code (0=all imported, 1=import error)
+    """
+    print("=== NODE IMPORT PROFILE START ===")
+    print(f"NODE: {node_type} ({'eager' if eager else 'lazy'})")
+
+    loaded_before = set(sys.modules)
+    gc.collect()
+    free_before = gc.mem_free()
+    start = time.monotonic_ns()
+    try:
+        load_node_imports(node_type, eager)
+    except (ImportError, AttributeError) as e:
+        print(f"[{ERROR}] {node_type}: {e}")
+        print("=== NODE IMPORT PROFILE END ===")
+        return 1
+    duration_ms = (time.monotonic_ns() - start) // 1000000
+    allocated = free_before - gc.mem_free()
+    gc.collect()
+    retained = free_before - gc.mem_free()
+
+    modules = sorted(name for name in sys.modules if name not in loaded_before)
+    print(f"MODULES: {len(modules)} {' '.join(modules)}")
+    print(f"IMPORT_TOTAL: {duration_ms}ms allocated={allocated} retained={retained}")
+    print(f"MEMORY_FREE: {gc.mem_free()} bytes")
+    print("=== NODE IMPORT PROFILE END ===")
+    return 0
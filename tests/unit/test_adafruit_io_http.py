@@ -160,6 +160,55 @@ class TestAdafruitIOHTTPPublish:
         assert "nonprod-pooltemp" in call_args[0][0]
 
 
+class TestAdafruitIOHTTPPublishBatch:
+    """Test publish_batch() functionality."""
+
+    @patch("shared.cloud.adafruit_io_http.requests")
+    def test_publish_batch_posts_to_batch_endpoint(self, mock_requests: MagicMock) -> None:
+        """publish_batch() sends all values in one POST to the batch endpoint."""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_requests.post.return_value = mock_response
+
+        client = AdafruitIOHTTP("testuser", "test_api_key", environment="nonprod")
+        assert client.publish_batch("logs", ["a", "b"]) == 2
+
+        mock_requests.post.assert_called_once()
+        call_args = mock_requests.post.call_args
+        assert call_args[0][0].endswith("testuser/feeds/nonprod-logs/data/batch")
+        assert call_args[1]["json"] == {"data": [{"value": "a"}, {"value": "b"}]}
+        mock_response.close.assert_called_once()
+
+    @patch("shared.cloud.adafruit_io_http.requests")
+    def test_publish_batch_empty_makes_no_request(self, mock_requests: MagicMock) -> None:
+        """publish_batch() with no values returns 0 without a request."""
+        client = AdafruitIOHTTP("testuser", "test_api_key")
+        assert client.publish_batch("logs", []) == 0
+        mock_requests.post.assert_not_called()
+
+    @patch("shared.cloud.adafruit_io_http.requests")
+    def test_publish_batch_throttled_on_429(self, mock_requests: MagicMock) -> None:
+        """publish_batch() reports nothing published when rate limited."""
+        mock_response = MagicMock()
+        mock_response.status_code = 429
+        mock_requests.post.return_value = mock_response
+
+        client = AdafruitIOHTTP("testuser", "test_api_key")
+        assert client.publish_batch("logs", ["a"]) == 0
+        mock_response.close.assert_called_once()
+
+    @patch("shared.cloud.adafruit_io_http.requests")
+    def test_publish_batch_raises_on_error(self, mock_requests: MagicMock) -> None:
+        """publish_batch() raises RuntimeError on other HTTP errors."""
+        mock_response = MagicMock()
+        mock_response.status_code = 400
+        mock_requests.post.return_value = mock_response
+
+        client = AdafruitIOHTTP("testuser", "test_api_key")
+        with pytest.raises(RuntimeError, match="400"):
+            client.publish_batch("logs", ["a"])
+
+
 class TestAdafruitIOHTTPFetchLatest:
     """Test fetch_latest() functionality."""
 
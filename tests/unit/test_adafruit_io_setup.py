@@ -1,6 +1,10 @@
 """Tests for the Adafruit IO setup script."""
 
+import json
 import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -15,10 +19,14 @@ sys.modules["Adafruit_IO"] = MagicMock(Client=_mock_client_class, RequestError=m
 sys.path.insert(0, "scripts")
 from adafruit_io_setup import (
     FEEDS,
+    AdafruitIOAPI,
+    ProvisioningError,
     create_feed,
     create_group,
     get_group_name,
     main,
+    plan_feeds,
+    provision_feeds,
 )
 
 
@@ -134,8 +142,8 @@ class TestFeedsConstant:
     """Tests for the FEEDS constant."""
 
     def test_feeds_contains_expected_count(self):
-        """FEEDS list contains 12 feeds."""
-        assert len(FEEDS) == 12
+        """FEEDS list contains 13 feeds."""
+        assert len(FEEDS) == 13
 
     def test_feeds_contains_gateway(self):
         """FEEDS list contains gateway feed."""
@@ -150,6 +158,20 @@ class TestFeedsConstant:
         assert "config-valve-node" in feed_names
         assert "config-display-node" in feed_names
 
+    def test_feeds_match_cloud_feed_registry(self):
+        """FEEDS lists the same feeds the cloud FeedRegistry resolves up front."""
+        from shared.cloud.feeds import FEED_NAMES
+
+        assert tuple(name for name, _ in FEEDS) == FEED_NAMES
+
+    def test_every_feed_has_exactly_one_description(self):
+        """FEED_DESCRIPTIONS covers FEED_NAMES with no leftover entries."""
+        from adafruit_io_setup import FEED_DESCRIPTIONS
+
+        from shared.cloud.feeds import FEED_NAMES
+
+        assert set(FEED_DESCRIPTIONS) == set(FEED_NAMES)
+
     def test_poolvalveruntime_description_uses_minutes(self):
         """poolvalveruntime description uses minutes, not seconds."""
         for name, desc in FEEDS:
@@ -228,3 +250,223 @@ class TestMain:
         assert result == 0
         mock_verify.assert_called_once_with("testuser", "testkey", "nonprod")
         mock_setup.assert_not_called()
+
+
+class FakeAdafruitIO(BaseHTTPRequestHandler):
+    """Local stand-in for the Adafruit IO groups and feeds endpoints."""
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status, body=None, headers=()):
+        data = json.dumps(body).encode() if body is not None else b""
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _enter(self):
+        state = self.server.state
+        with state["lock"]:
+            state["requests"].append((self.command, self.path))
+            state["keys"].add(self.headers.get("X-AIO-Key"))
+            if state["throttle"] > 0:
+                state["throttle"] -= 1
+                return False
+        return True
+
+    def do_GET(self):
+        if not self._enter():
+            self._reply(429, {"error": "throttled"}, [("Retry-After", "0")])
+            return
+        if self.path != "/api/v2/user/groups":
+            self._reply(404, {"error": "not found"})
+            return
+        groups = self.server.state["groups"]
+        self._reply(200, [{"key": k, "name": k, "feeds": v} for k, v in groups.items()])
+
+    def do_POST(self):
+        state = self.server.state
+        if not self._enter():
+            self._reply(429, {"error": "throttled"}, [("Retry-After", "0")])
+            return
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        parts = self.path.split("/")
+        if self.path == "/api/v2/user/groups":
+            with state["lock"]:
+                state["groups"][body["name"]] = []
+            self._reply(201, {"key": body["name"]})
+            return
+        if len(parts) == 7 and parts[4] == "groups" and parts[6] == "feeds":
+            name = body["feed"]["name"]
+            if name in state["fail"]:
+                self._reply(422, {"error": "invalid"})
+                return
+            with state["lock"]:
+                state["active"] += 1
+                state["max_active"] = max(state["max_active"], state["active"])
+            time.sleep(0.02)
+            with state["lock"]:
+                state["active"] -= 1
+                state["groups"][parts[5]].append({"key": f"{parts[5]}.{name}", "name": name})
+            self._reply(201, {"key": f"{parts[5]}.{name}"})
+            return
+        self._reply(404, {"error": "not found"})
+
+
+@pytest.fixture
+def fake_aio():
+    """Run FakeAdafruitIO on a local port; yields (base_url, state)."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeAdafruitIO)
+    server.state = {
+        "lock": threading.Lock(),
+        "groups": {},
+        "requests": [],
+        "keys": set(),
+        "throttle": 0,
+        "fail": set(),
+        "active": 0,
+        "max_active": 0,
+    }
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", server.state
+    server.shutdown()
+    server.server_close()
+
+
+class TestPlanFeeds:
+    """Tests for plan_feeds function."""
+
+    def test_missing_group_needs_everything(self):
+        """Without the group every feed is missing."""
+        assert plan_feeds([{"key": "other", "feeds": []}], "poolio-nonprod") == (
+            False,
+            FEEDS,
+            [],
+        )
+
+    def test_existing_feeds_are_skipped(self):
+        """Feeds already in the group (full or bare keys) are not missing."""
+        groups = [
+            {
+                "key": "poolio-nonprod",
+                "feeds": [
+                    {"key": "poolio-nonprod.gateway"},
+                    {"key": "pooltemp"},
+                    {"key": "poolio-nonprod.legacy"},
+                ],
+            }
+        ]
+
+        exists, missing, extra = plan_feeds(groups, "poolio-nonprod")
+
+        assert exists is True
+        assert [name for name, _ in missing] == [name for name, _ in FEEDS[2:]]
+        assert extra == ["poolio-nonprod.legacy"]
+
+
+class TestProvisionFeeds:
+    """Tests for provision_feeds against a local stand-in server."""
+
+    def test_creates_group_and_all_feeds(self, fake_aio, capsys):
+        """A new environment gets its group and every feed."""
+        base_url, state = fake_aio
+
+        result = provision_feeds("user", "secret", "nonprod", base_url=base_url, workers=4)
+
+        assert result == 0
+        assert len(state["groups"]["poolio-nonprod"]) == len(FEEDS)
+        assert state["requests"][0] == ("GET", "/api/v2/user/groups")
+        assert state["requests"][1] == ("POST", "/api/v2/user/groups")
+        assert state["keys"] == {"secret"}
+        assert 1 < state["max_active"] <= 4
+        assert f"{len(FEEDS)} created, 0 already present" in capsys.readouterr().out
+
+    def test_creates_only_missing_feeds(self, fake_aio):
+        """Existing feeds are listed once and not recreated."""
+        base_url, state = fake_aio
+        state["groups"]["poolio-nonprod"] = [
+            {"key": f"poolio-nonprod.{name}"} for name, _ in FEEDS[:10]
+        ]
+
+        result = provision_feeds("user", "secret", "nonprod", base_url=base_url)
+
+        assert result == 0
+        posts = [path for method, path in state["requests"] if method == "POST"]
+        assert len(posts) == len(FEEDS) - 10
+        assert all(path.endswith("/groups/poolio-nonprod/feeds") for path in posts)
+
+    def test_up_to_date_environment_makes_one_request(self, fake_aio):
+        """Nothing is created when every feed exists."""
+        base_url, state = fake_aio
+        state["groups"]["poolio"] = [{"key": f"poolio.{name}"} for name, _ in FEEDS]
+
+        assert provision_feeds("user", "secret", "prod", base_url=base_url) == 0
+        assert state["requests"] == [("GET", "/api/v2/user/groups")]
+
+    def test_rate_limited_requests_are_retried(self, fake_aio, capsys):
+        """429 responses are retried after Retry-After."""
+        base_url, state = fake_aio
+        state["throttle"] = 3
+
+        result = provision_feeds("user", "secret", "nonprod", base_url=base_url)
+
+        assert result == 0
+        assert len(state["groups"]["poolio-nonprod"]) == len(FEEDS)
+        assert "3 rate limited" in capsys.readouterr().out
+
+    def test_failed_feed_is_reported(self, fake_aio, capsys):
+        """A rejected feed fails the run without stopping the others."""
+        base_url, state = fake_aio
+        state["fail"].add("events")
+
+        result = provision_feeds("user", "secret", "nonprod", base_url=base_url)
+
+        assert result == 1
+        assert len(state["groups"]["poolio-nonprod"]) == len(FEEDS) - 1
+        out = capsys.readouterr().out
+        assert "ERROR creating feed 'poolio-nonprod.events': HTTP 422" in out
+
+    def test_verify_only_creates_nothing(self, fake_aio, capsys):
+        """verify_only reports missing feeds without creating them."""
+        base_url, state = fake_aio
+        state["groups"]["poolio-nonprod"] = [{"key": "poolio-nonprod.gateway"}]
+
+        result = provision_feeds("user", "secret", "nonprod", base_url=base_url, verify_only=True)
+
+        assert result == 1
+        assert state["requests"] == [("GET", "/api/v2/user/groups")]
+        assert f"{len(FEEDS) - 1} feed(s) missing" in capsys.readouterr().out
+
+    def test_unreachable_server_returns_error(self, capsys):
+        """A connection failure is reported, not raised."""
+        assert provision_feeds("user", "secret", "nonprod", base_url="http://127.0.0.1:9") == 1
+        assert "ERROR listing groups" in capsys.readouterr().out
+
+    def test_retries_are_bounded(self, fake_aio):
+        """A server that keeps throttling eventually raises."""
+        base_url, state = fake_aio
+        state["throttle"] = 100
+        api = AdafruitIOAPI("user", "secret", base_url, max_retries=2)
+
+        with pytest.raises(ProvisioningError, match="HTTP 429"):
+            api.list_groups()
+        assert api.requests == 3
+        assert api.throttled == 2
+
+    def test_bulk_flag_calls_provision_feeds(self):
+        """--bulk routes to provision_feeds with the chosen workers."""
+        with patch.dict("os.environ", {"AIO_USERNAME": "u", "AIO_KEY": "k"}, clear=True):
+            with patch(
+                "sys.argv", ["prog", "--environment", "dev", "--bulk", "--verify", "-w", "8"]
+            ):
+                with patch("adafruit_io_setup.provision_feeds", return_value=0) as mock_bulk:
+                    result = main()
+
+        assert result == 0
+        mock_bulk.assert_called_once_with(
+            "u", "k", "dev", base_url="https://io.adafruit.com", workers=8, verify_only=True
+        )
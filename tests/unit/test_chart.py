@@ -0,0 +1,256 @@
+# Tests for incremental chart rendering
+# Tests SparklineChart and WhiskerChart dirty-column tracking
+
+import pytest
+
+BG = 0
+FG = 1
+
+
+class FrameBuffer:
+    """Minimal surface that records pixels and fill_rect calls."""
+
+    def __init__(self, width=240, height=320):
+        self.width = width
+        self.height = height
+        self.pixels = [[BG] * width for _ in range(height)]
+        self.calls = []
+
+    def fill_rect(self, x, y, width, height, color):
+        self.calls.append((x, y, width, height, color))
+        for row in range(y, y + height):
+            for col in range(x, x + width):
+                self.pixels[row][col] = color
+
+
+def full_render(chart):
+    """Render a chart from scratch onto a fresh framebuffer."""
+    fb = FrameBuffer()
+    chart.invalidate()
+    chart.render(fb)
+    return fb
+
+
+class TestSpanHelpers:
+    """Tests for span merge/subtract helpers."""
+
+    def test_merge_overlapping_and_adjacent(self):
+        """Overlapping and touching spans are merged."""
+        from display_node.ui.chart import _merge_spans
+
+        assert _merge_spans([(5, 7), (0, 2), (3, 4), (10, 12), (11, 15)]) == ((0, 7), (10, 15))
+
+    def test_merge_empty(self):
+        """Merging nothing returns an empty tuple."""
+        from display_node.ui.chart import _merge_spans
+
+        assert _merge_spans([]) == ()
+
+    def test_subtract_splits_span(self):
+        """Subtracting a span from the middle splits it in two."""
+        from display_node.ui.chart import _subtract_spans
+
+        assert _subtract_spans(((0, 10),), ((3, 5),)) == [(0, 2), (6, 10)]
+
+    def test_subtract_fully_covered(self):
+        """Fully covered spans disappear."""
+        from display_node.ui.chart import _subtract_spans
+
+        assert _subtract_spans(((3, 5),), ((0, 10),)) == []
+
+    def test_subtract_disjoint(self):
+        """Disjoint spans are unchanged."""
+        from display_node.ui.chart import _subtract_spans
+
+        assert _subtract_spans(((0, 2), (8, 9)), ((4, 6),)) == [(0, 2), (8, 9)]
+
+
+class TestSparklineChart:
+    """Tests for SparklineChart."""
+
+    def test_rejects_tiny_chart(self):
+        """Charts smaller than 2x2 are rejected."""
+        from display_node.ui.chart import SparklineChart
+
+        with pytest.raises(ValueError):
+            SparklineChart(0, 0, 1, 10, capacity=10, color=FG)
+
+    def test_append_drops_oldest_at_capacity(self):
+        """Appending past capacity shifts the series."""
+        from display_node.ui.chart import SparklineChart
+
+        chart = SparklineChart(0, 0, 50, 20, capacity=3, color=FG)
+        for value in (1, 2, 3, 4):
+            chart.append(value)
+
+        assert chart.values == [2, 3, 4]
+        assert chart.min_value == 2
+        assert chart.max_value == 4
+
+    def test_set_values_keeps_newest(self):
+        """set_values keeps only the newest capacity samples."""
+        from display_node.ui.chart import SparklineChart
+
+        chart = SparklineChart(0, 0, 50, 20, capacity=3, color=FG)
+        chart.set_values([1, 2, 3, 4, 5])
+
+        assert chart.values == [3, 4, 5]
+
+    def test_first_render_clears_whole_area(self):
+        """The first render clears the chart zone before drawing."""
+        from display_node.ui.chart import SparklineChart
+
+        fb = FrameBuffer()
+        chart = SparklineChart(10, 20, 100, 40, capacity=20, color=FG)
+        chart.set_values(range(20))
+        chart.render(fb)
+
+        assert fb.calls[0] == (10, 20, 100, 40, BG)
+        assert chart.dirty_region == (10, 20, 100, 40)
+        assert chart.pixels_pushed > 100 * 40
+
+    def test_fewer_than_two_samples_draws_nothing(self):
+        """A single sample draws no line."""
+        from display_node.ui.chart import SparklineChart
+
+        fb = FrameBuffer()
+        chart = SparklineChart(0, 0, 50, 20, capacity=10, color=FG)
+        chart.append(5)
+        chart.render(fb)
+
+        assert all(FG not in row for row in fb.pixels)
+
+    def test_rerender_without_changes_pushes_nothing(self):
+        """Rendering an unchanged chart pushes zero pixels."""
+        from display_node.ui.chart import SparklineChart
+
+        fb = FrameBuffer()
+        chart = SparklineChart(0, 0, 100, 40, capacity=20, color=FG)
+        chart.set_values([i % 5 for i in range(20)])
+        chart.render(fb)
+
+        assert chart.render(fb) == 0
+        assert chart.rects_pushed == 0
+        assert chart.dirty_region is None
+
+    def test_incremental_matches_full_redraw(self):
+        """Incremental updates produce the same pixels as a full redraw."""
+        from display_node.ui.chart import SparklineChart
+
+        fb = FrameBuffer()
+        chart = SparklineChart(10, 215, 200, 85, capacity=50, color=FG)
+        chart.set_values([54 + (i % 7) for i in range(50)])
+        chart.render(fb)
+
+        for i in range(30):
+            chart.append(54 + ((i * 3) % 11))
+            chart.render(fb)
+            assert fb.pixels == full_render(chart).pixels
+
+    def test_incremental_pushes_fewer_pixels_than_full(self):
+        """A small change pushes far fewer pixels than a full redraw."""
+        from display_node.ui.chart import SparklineChart
+
+        fb = FrameBuffer()
+        chart = SparklineChart(10, 215, 200, 85, capacity=50, color=FG)
+        values = [54.0] * 49 + [60.0]
+        chart.set_values(values)
+        chart.render(fb)
+
+        # Same extremes, only the last points move
+        chart.set_values([54.0] * 48 + [60.0, 57.0])
+        incremental = chart.render(fb)
+        dirty_x, _, dirty_w, _ = chart.dirty_region
+        full = full_render(chart).pixels
+
+        assert 0 < incremental < 200 * 85 // 10
+        assert dirty_x >= 10 + 150
+        assert dirty_x + dirty_w <= 10 + 200
+        assert fb.pixels == full
+
+    def test_flat_series_draws_single_band(self):
+        """A constant series is drawn along the bottom row band."""
+        from display_node.ui.chart import SparklineChart
+
+        fb = FrameBuffer(width=20, height=10)
+        chart = SparklineChart(0, 0, 20, 10, capacity=5, color=FG)
+        chart.set_values([3, 3, 3, 3, 3])
+        chart.render(fb)
+
+        assert all(fb.pixels[9][col] == FG for col in range(20))
+        assert all(fb.pixels[0][col] == BG for col in range(20))
+
+    def test_invalidate_forces_full_repaint(self):
+        """invalidate() makes the next render clear the whole area."""
+        from display_node.ui.chart import SparklineChart
+
+        fb = FrameBuffer()
+        chart = SparklineChart(0, 0, 100, 40, capacity=20, color=FG)
+        chart.set_values(range(20))
+        chart.render(fb)
+        chart.invalidate()
+        fb.calls.clear()
+        chart.render(fb)
+
+        assert fb.calls[0] == (0, 0, 100, 40, BG)
+
+
+class TestWhiskerChart:
+    """Tests for WhiskerChart."""
+
+    def week(self):
+        return [(50 + d, 60 + d) for d in range(7)]
+
+    def test_append_drops_oldest_at_capacity(self):
+        """Appending past capacity shifts the bars."""
+        from display_node.ui.chart import WhiskerChart
+
+        chart = WhiskerChart(0, 0, 100, 50, capacity=2, color=FG)
+        chart.append(1, 2)
+        chart.append(3, 4)
+        chart.append(5, 6)
+
+        assert chart.data == [(3, 4), (5, 6)]
+
+    def test_empty_chart_draws_nothing(self):
+        """An empty chart only clears its area."""
+        from display_node.ui.chart import WhiskerChart
+
+        fb = FrameBuffer()
+        chart = WhiskerChart(0, 0, 100, 50, capacity=7, color=FG)
+        chart.render(fb)
+
+        assert fb.calls == [(0, 0, 100, 50, BG)]
+
+    def test_incremental_matches_full_redraw(self):
+        """Incremental updates produce the same pixels as a full redraw."""
+        from display_node.ui.chart import WhiskerChart
+
+        fb = FrameBuffer()
+        chart = WhiskerChart(5, 55, 230, 110, capacity=7, color=FG)
+        chart.set_data(self.week())
+        chart.render(fb)
+
+        for day in range(10):
+            chart.append(52 + day % 3, 63 + day % 4)
+            chart.render(fb)
+            assert fb.pixels == full_render(chart).pixels
+
+    def test_changing_last_bar_only_touches_its_columns(self):
+        """Updating today's bar leaves the other bars alone."""
+        from display_node.ui.chart import WhiskerChart
+
+        fb = FrameBuffer()
+        chart = WhiskerChart(5, 55, 230, 110, capacity=7, color=FG)
+        data = self.week()
+        chart.set_data(data)
+        chart.render(fb)
+
+        # Keep the global extremes, move today's range inward
+        data[-1] = (60, 66)
+        chart.set_data(data)
+        chart.render(fb)
+
+        dirty_x, _, _, _ = chart.dirty_region
+        assert dirty_x >= 5 + 230 * 6 // 7
+        assert chart.pixels_pushed < 230 * 110 // 20
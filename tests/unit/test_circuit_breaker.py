@@ -0,0 +1,153 @@
+# Tests for sensor circuit breaker
+# Tests the CircuitBreaker class
+
+from unittest.mock import Mock
+
+import pytest
+
+
+class TestCircuitBreaker:
+    """Tests for CircuitBreaker."""
+
+    def test_starts_closed(self):
+        """A new breaker allows calls."""
+        from src.shared.sensors.circuit_breaker import CircuitBreaker
+
+        breaker = CircuitBreaker("temp", memory=bytearray(16))
+
+        assert breaker.state_name == "closed"
+        assert breaker.allow(now=0)
+
+    def test_opens_after_threshold(self):
+        """Consecutive failures open the breaker."""
+        from src.shared.sensors.circuit_breaker import OPEN, CircuitBreaker
+
+        breaker = CircuitBreaker("temp", failure_threshold=3, memory=bytearray(16))
+        breaker.record_failure(now=100)
+        breaker.record_failure(now=100)
+        assert breaker.allow(now=100)
+
+        breaker.record_failure(now=100)
+        assert breaker.state == OPEN
+        assert not breaker.allow(now=101)
+        assert breaker.remaining(now=101) == 299
+
+    def test_success_resets_failures(self):
+        """A success in between resets the failure count."""
+        from src.shared.sensors.circuit_breaker import CLOSED, CircuitBreaker
+
+        breaker = CircuitBreaker("temp", failure_threshold=2, memory=bytearray(16))
+        breaker.record_failure(now=0)
+        breaker.record_success()
+        breaker.record_failure(now=0)
+
+        assert breaker.state == CLOSED
+
+    def test_half_open_after_cooldown(self):
+        """After the cool-down one trial call is allowed."""
+        from src.shared.sensors.circuit_breaker import HALF_OPEN, CircuitBreaker
+
+        breaker = CircuitBreaker("temp", failure_threshold=1, cooldown=60, memory=bytearray(16))
+        breaker.record_failure(now=1000)
+
+        assert not breaker.allow(now=1059)
+        assert breaker.allow(now=1060)
+        assert breaker.state == HALF_OPEN
+
+    def test_half_open_success_closes(self):
+        """A successful trial closes the breaker."""
+        from src.shared.sensors.circuit_breaker import CLOSED, CircuitBreaker
+
+        breaker = CircuitBreaker("temp", failure_threshold=1, cooldown=60, memory=bytearray(16))
+        breaker.record_failure(now=0)
+
+        assert breaker.call(lambda: 25.5, now=60) == 25.5
+        assert breaker.state == CLOSED
+        assert breaker.trips == 0
+
+    def test_half_open_failure_doubles_cooldown(self):
+        """A failed trial reopens with a longer cool-down."""
+        from src.shared.sensors.circuit_breaker import OPEN, CircuitBreaker
+
+        breaker = CircuitBreaker(
+            "temp", failure_threshold=1, cooldown=60, max_cooldown=100, memory=bytearray(16)
+        )
+        breaker.record_failure(now=0)
+        assert breaker.allow(now=60)
+        breaker.record_failure(now=60)
+
+        assert breaker.state == OPEN
+        assert breaker.current_cooldown() == 100
+        assert not breaker.allow(now=159)
+        assert breaker.allow(now=160)
+
+    def test_call_skips_while_open(self):
+        """call() raises CircuitOpenError without calling func."""
+        from src.shared.sensors.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+        breaker = CircuitBreaker("temp", failure_threshold=1, memory=bytearray(16))
+        func = Mock(side_effect=OSError("no sensor"))
+
+        with pytest.raises(OSError):
+            breaker.call(func, now=0)
+        with pytest.raises(CircuitOpenError):
+            breaker.call(func, now=1)
+
+        assert func.call_count == 1
+
+    def test_state_survives_reload(self):
+        """A new breaker on the same memory restores the state."""
+        from src.shared.sensors.circuit_breaker import OPEN, CircuitBreaker
+
+        memory = bytearray(16)
+        breaker = CircuitBreaker("temp", failure_threshold=1, memory=memory, offset=8)
+        breaker.record_failure(now=500)
+
+        restored = CircuitBreaker("temp", failure_threshold=1, memory=memory, offset=8)
+        assert restored.state == OPEN
+        assert restored.opened_at == 500
+        assert not restored.allow(now=600)
+
+    def test_separate_offsets(self):
+        """Breakers at different offsets don't interfere."""
+        from src.shared.sensors.circuit_breaker import (
+            CLOSED,
+            RECORD_SIZE,
+            CircuitBreaker,
+        )
+
+        memory = bytearray(RECORD_SIZE * 2)
+        temp = CircuitBreaker("temp", failure_threshold=1, memory=memory)
+        CircuitBreaker("level", failure_threshold=1, memory=memory, offset=RECORD_SIZE)
+        temp.record_failure(now=0)
+
+        level = CircuitBreaker("level", memory=memory, offset=RECORD_SIZE)
+        assert level.state == CLOSED
+
+    def test_invalid_memory_ignored(self):
+        """Uninitialized memory starts a closed breaker."""
+        from src.shared.sensors.circuit_breaker import CLOSED, CircuitBreaker
+
+        breaker = CircuitBreaker("temp", memory=bytearray(b"\xff" * 16))
+
+        assert breaker.state == CLOSED
+
+    def test_works_without_memory(self):
+        """Without persistent memory state is kept in the object."""
+        from src.shared.sensors.circuit_breaker import OPEN, CircuitBreaker
+
+        breaker = CircuitBreaker("temp", failure_threshold=1)
+        breaker.record_failure(now=0)
+
+        assert breaker.state == OPEN
+
+    def test_reset(self):
+        """reset() closes the breaker and persists it."""
+        from src.shared.sensors.circuit_breaker import CLOSED, CircuitBreaker
+
+        memory = bytearray(16)
+        breaker = CircuitBreaker("temp", failure_threshold=1, memory=memory)
+        breaker.record_failure(now=0)
+        breaker.reset()
+
+        assert CircuitBreaker("temp", memory=memory).state == CLOSED
@@ -43,6 +43,18 @@ class TestCloudBackendBaseClass:
         with pytest.raises(NotImplementedError):
             backend.publish("feed", "value", qos=1)
 
+    def test_cloudbackend_publish_batch_uses_publish(self) -> None:
+        """Default publish_batch() publishes one value at a time."""
+        backend = MockBackend()
+        assert backend.publish_batch("feed", [1, 2, 3]) == 3
+        assert backend.fetch_latest("feed") == 3
+
+    def test_cloudbackend_publish_batch_stops_when_throttled(self) -> None:
+        """Default publish_batch() stops at the first throttled value."""
+        backend = MockBackend()
+        with patch.object(backend, "publish", side_effect=[True, False, True]):
+            assert backend.publish_batch("feed", [1, 2, 3]) == 1
+
     def test_cloudbackend_subscribe_raises_not_implemented(self) -> None:
         """subscribe() raises NotImplementedError."""
         backend = CloudBackend()
@@ -422,3 +422,493 @@ class TestLoadConfig:
         result = load_config("display_node")
         assert result.node_type == "display_node"
         assert result.get("chart_history_hours") == 24
+
+
+class TestConfigSnapshot:
+    """Test Config attribute access and immutability."""
+
+    def test_attribute_access(self) -> None:
+        """Settings can be read as attributes."""
+        from shared.config import Config
+
+        config = Config("pool_node", "prod", {"sleep_duration": 120})
+        assert config.sleep_duration == 120
+
+    def test_nested_attribute_access(self) -> None:
+        """Nested sections support attribute access."""
+        from shared.config import Config
+
+        config = Config("valve_node", "prod", {"valve": {"cooldown_minutes": 1}})
+        assert config.valve.cooldown_minutes == 1
+
+    def test_cannot_set_attribute(self) -> None:
+        """Config attributes cannot be assigned."""
+        from shared.config import Config
+
+        config = Config("pool_node", "prod", {"sleep_duration": 120})
+        with pytest.raises(AttributeError):
+            config.sleep_duration = 10
+
+    def test_settings_read_only(self) -> None:
+        """Settings and nested sections cannot be modified."""
+        from shared.config import Config
+
+        config = Config("valve_node", "prod", {"valve": {"cooldown_minutes": 1}})
+        with pytest.raises(TypeError):
+            config.settings["sleep_duration"] = 10
+        with pytest.raises(TypeError):
+            config.valve["cooldown_minutes"] = 5
+
+    def test_settings_copied(self) -> None:
+        """Changing the source dict does not change the snapshot."""
+        from shared.config import Config
+
+        settings = {"sleep_duration": 120}
+        config = Config("pool_node", "prod", settings)
+        settings["sleep_duration"] = 10
+        assert config.sleep_duration == 120
+
+    def test_reserved_keys_not_shadowed(self) -> None:
+        """A setting named like a Config attribute is only available via get()."""
+        from shared.config import Config
+
+        config = Config("pool_node", "prod", {"environment": "nonprod"})
+        assert config.environment == "prod"
+        assert config.get("environment") == "nonprod"
+
+    def test_with_updates(self) -> None:
+        """with_updates() returns a new snapshot."""
+        from shared.config import Config
+
+        config = Config("pool_node", "prod", {"sleep_duration": 120})
+        updated = config.with_updates({"sleep_duration": 60})
+        assert updated.sleep_duration == 60
+        assert config.sleep_duration == 120
+
+    def test_with_updates_dotted_key(self) -> None:
+        """Dotted keys update nested sections."""
+        from shared.config import Config
+
+        config = Config("valve_node", "prod", {"valve": {"cooldown_minutes": 1, "max": 5}})
+        updated = config.with_updates([("valve.cooldown_minutes", 3)])
+        assert updated.valve == {"cooldown_minutes": 3, "max": 5}
+
+    def test_with_updates_config_update_messages(self) -> None:
+        """ConfigUpdate messages are accepted."""
+        from shared.config import Config
+        from shared.messages import ConfigUpdate
+
+        config = Config("pool_node", "prod", {"sleep_duration": 120})
+        updated = config.with_updates([ConfigUpdate("sleep_duration", 300, "cloud")])
+        assert updated.sleep_duration == 300
+
+    def test_with_updates_validates(self) -> None:
+        """Updates with the wrong type are rejected."""
+        from shared.config import Config, ConfigurationError
+
+        config = Config("pool_node", "prod", {"sleep_duration": 120})
+        with pytest.raises(ConfigurationError, match="sleep_duration"):
+            config.with_updates({"sleep_duration": "soon"})
+
+
+class TestValidateSettings:
+    """Test validate_settings function."""
+
+    def test_accepts_matching_types(self) -> None:
+        """Values matching the default types pass."""
+        from shared.config import validate_settings
+
+        validate_settings({"a": 1, "b": "x", "c": 2, "extra": []}, {"a": 0, "b": "", "c": 1.5})
+
+    def test_rejects_bool_for_int(self) -> None:
+        """A bool is not accepted for an int default."""
+        from shared.config import ConfigurationError, validate_settings
+
+        with pytest.raises(ConfigurationError, match="a must be int"):
+            validate_settings({"a": True}, {"a": 0})
+
+    def test_nested(self) -> None:
+        """Nested sections are checked with a dotted name."""
+        from shared.config import ConfigurationError, validate_settings
+
+        with pytest.raises(ConfigurationError, match="valve.max"):
+            validate_settings({"valve": {"max": "x"}}, {"valve": {"max": 5}})
+
+
+class TestParseSettingsToml:
+    """Test parse_settings_toml function."""
+
+    def test_strings_ints_bools(self) -> None:
+        """Supported value types are parsed."""
+        from shared.config import parse_settings_toml
+
+        text = (
+            "# WiFi\n"
+            'CIRCUITPY_WIFI_SSID = "home \\"net\\""\n'
+            "POOLIO_SLEEP_DURATION = 60  # seconds\n"
+            "MASK = 0x1F\n"
+            "DEBUG = true\n"
+            'URL = "http://x#y"\n'
+        )
+        assert parse_settings_toml(text) == {
+            "CIRCUITPY_WIFI_SSID": 'home "net"',
+            "POOLIO_SLEEP_DURATION": 60,
+            "MASK": 31,
+            "DEBUG": True,
+            "URL": "http://x#y",
+        }
+
+    def test_stops_at_table(self) -> None:
+        """Keys after a [table] header are ignored."""
+        from shared.config import parse_settings_toml
+
+        assert parse_settings_toml("A = 1\n[section]\nB = 2\n") == {"A": 1}
+
+    def test_invalid_line(self) -> None:
+        """Unparseable lines raise ConfigurationError."""
+        from shared.config import ConfigurationError, parse_settings_toml
+
+        with pytest.raises(ConfigurationError, match="line 2"):
+            parse_settings_toml("A = 1\nB = [1, 2]\n")
+
+    def test_unicode_escape(self) -> None:
+        """\\uXXXX escapes are decoded; malformed ones raise ConfigurationError."""
+        from shared.config import ConfigurationError, parse_settings_toml
+
+        assert parse_settings_toml('A = "caf\\u00e9"\n') == {"A": "café"}
+        for digits in ("ZZZZ", "+0ff", " 0ff", "0_ff"):
+            with pytest.raises(ConfigurationError, match="line 2: invalid \\\\u escape"):
+                parse_settings_toml(f'A = 1\nB = "\\u{digits}"\n')
+
+
+class TestLoadConfigLayers:
+    """Test load_config merging config.json, settings.toml and updates."""
+
+    def write_sources(self, tmp_path, config=None, settings=None):
+        config_path = tmp_path / "config.json"
+        settings_path = tmp_path / "settings.toml"
+        if config is not None:
+            config_path.write_text(config)
+        if settings is not None:
+            settings_path.write_text(settings)
+        return str(config_path), str(settings_path)
+
+    def test_missing_files_use_defaults(self, tmp_path) -> None:
+        """Missing files are skipped."""
+        from shared.config import load_config
+
+        config_path, settings_path = self.write_sources(tmp_path)
+        config = load_config("pool_node", config_path=config_path, settings_path=settings_path)
+        assert config.sleep_duration == 120
+
+    def test_config_json_overrides_defaults(self, tmp_path) -> None:
+        """config.json values override defaults and add keys."""
+        from shared.config import load_config
+
+        config_path, _ = self.write_sources(
+            tmp_path, config='{"sleep_duration": 300, "device_id": "pool-1"}'
+        )
+        config = load_config("pool_node", config_path=config_path)
+        assert config.sleep_duration == 300
+        assert config.device_id == "pool-1"
+        assert config.watchdog_timeout == 60
+
+    def test_settings_toml_overrides_config_json(self, tmp_path) -> None:
+        """POOLIO_ keys override; other keys become secrets."""
+        from shared.config import load_config
+
+        config_path, settings_path = self.write_sources(
+            tmp_path,
+            config='{"sleep_duration": 300}',
+            settings='POOLIO_SLEEP_DURATION = 60\nAIO_USERNAME = "me"\n',
+        )
+        config = load_config("pool_node", config_path=config_path, settings_path=settings_path)
+        assert config.sleep_duration == 60
+        assert config.secrets["AIO_USERNAME"] == "me"
+        assert config.get("AIO_USERNAME") is None
+
+    def test_updates_override_files(self, tmp_path) -> None:
+        """Cloud updates are applied last."""
+        from shared.config import load_config
+
+        _, settings_path = self.write_sources(tmp_path, settings="POOLIO_SLEEP_DURATION = 60\n")
+        config = load_config(
+            "pool_node", settings_path=settings_path, updates={"sleep_duration": 30}
+        )
+        assert config.sleep_duration == 30
+
+    def test_environment_precedence(self, tmp_path) -> None:
+        """settings.toml ENVIRONMENT beats config.json; env_override beats both."""
+        from shared.config import load_config
+
+        config_path, settings_path = self.write_sources(
+            tmp_path, config='{"environment": "prod"}', settings='ENVIRONMENT = "nonprod"\n'
+        )
+        paths = {"config_path": config_path, "settings_path": settings_path}
+        assert load_config("pool_node", **paths).environment == "nonprod"
+        assert load_config("pool_node", env_override="prod", **paths).environment == "prod"
+        assert load_config("pool_node", config_path=config_path).environment == "prod"
+
+    def test_invalid_json(self, tmp_path) -> None:
+        """Invalid config.json raises ConfigurationError."""
+        from shared.config import ConfigurationError, load_config
+
+        config_path, _ = self.write_sources(tmp_path, config="{not json")
+        with pytest.raises(ConfigurationError, match="Invalid JSON"):
+            load_config("pool_node", config_path=config_path)
+
+    def test_invalid_type(self, tmp_path) -> None:
+        """Values with the wrong type are rejected at load time."""
+        from shared.config import ConfigurationError, load_config
+
+        config_path, _ = self.write_sources(tmp_path, config='{"sleep_duration": "120"}')
+        with pytest.raises(ConfigurationError, match="sleep_duration"):
+            load_config("pool_node", config_path=config_path)
+
+    def test_cache_skips_merging(self, tmp_path) -> None:
+        """A warm load with unchanged files does not parse and merge them again."""
+        from unittest.mock import patch
+
+        from shared.config import load_config
+
+        config_path, settings_path = self.write_sources(
+            tmp_path, config='{"sleep_duration": 300}', settings='AIO_USERNAME = "me"\n'
+        )
+        cache_path = str(tmp_path / "config.cache")
+        paths = {
+            "config_path": config_path,
+            "settings_path": settings_path,
+            "cache_path": cache_path,
+        }
+        cold = load_config("pool_node", **paths)
+
+        with patch("shared.config.loader._merge_sources") as mock_merge:
+            warm = load_config("pool_node", **paths)
+
+        mock_merge.assert_not_called()
+        assert warm.settings == cold.settings
+        assert warm.secrets == cold.secrets
+
+    def test_cache_holds_no_secrets(self, tmp_path) -> None:
+        """WiFi passwords and API keys are not written to the cache file."""
+        from shared.config import load_config
+
+        config_path, settings_path = self.write_sources(
+            tmp_path,
+            settings='CIRCUITPY_WIFI_PASSWORD = "hunter2"\nAIO_KEY_PROD = "aio_secret"\n',
+        )
+        cache_path = tmp_path / "config.cache"
+        paths = {"config_path": config_path, "settings_path": settings_path}
+        load_config("pool_node", cache_path=str(cache_path), **paths)
+
+        text = cache_path.read_text()
+        assert "hunter2" not in text
+        assert "aio_secret" not in text
+        warm = load_config("pool_node", cache_path=str(cache_path), **paths)
+        assert warm.secrets["AIO_KEY_PROD"] == "aio_secret"
+
+    def test_cache_invalidated_by_change(self, tmp_path) -> None:
+        """Changing a source file invalidates the cache."""
+        from shared.config import load_config
+
+        config_path, _ = self.write_sources(tmp_path, config='{"sleep_duration": 300}')
+        cache_path = str(tmp_path / "config.cache")
+        load_config("pool_node", config_path=config_path, cache_path=cache_path)
+
+        self.write_sources(tmp_path, config='{"sleep_duration": 400}')
+        config = load_config("pool_node", config_path=config_path, cache_path=cache_path)
+        assert config.sleep_duration == 400
+
+    def test_cache_keyed_by_environment_override(self, tmp_path) -> None:
+        """A different env_override does not reuse the cached environment."""
+        from shared.config import load_config
+
+        cache_path = str(tmp_path / "config.cache")
+        load_config("pool_node", env_override="nonprod", cache_path=cache_path)
+        assert load_config("pool_node", cache_path=cache_path).environment == "prod"
+
+    def test_corrupt_cache_ignored(self, tmp_path) -> None:
+        """An unreadable cache falls back to parsing."""
+        from shared.config import load_config
+
+        cache_path = tmp_path / "config.cache"
+        cache_path.write_text("{garbage")
+        config = load_config("pool_node", cache_path=str(cache_path))
+        assert config.sleep_duration == 120
+
+
+class TestConfigStore:
+    """Test ConfigStore hot reload."""
+
+    def make_store(self, tmp_path=None, **kwargs):
+        from shared.config import Config, ConfigStore
+
+        base = Config(
+            "valve_node",
+            "prod",
+            {
+                "fill_check_interval": 10,
+                "max_fill_minutes": 9,
+                "device_id": "valve-1",
+                "valve": {"cooldown_minutes": 1},
+            },
+        )
+        path = str(tmp_path / "overlay.json") if tmp_path else None
+        return ConfigStore(base, overlay_path=path, **kwargs)
+
+    def test_apply_swaps_snapshot(self) -> None:
+        """apply() installs a new snapshot; old snapshots are unchanged."""
+        store = self.make_store()
+        before = store.config
+
+        changed = store.apply({"fill_check_interval": 5})
+
+        assert changed == ["fill_check_interval"]
+        assert store.config.fill_check_interval == 5
+        assert before.fill_check_interval == 10
+
+    def test_invalid_update_applies_nothing(self) -> None:
+        """A batch with one invalid value is rejected as a whole."""
+        from shared.config import ConfigurationError
+
+        store = self.make_store()
+        with pytest.raises(ConfigurationError):
+            store.apply([("fill_check_interval", 5), ("max_fill_minutes", "nine")])
+
+        assert store.config.fill_check_interval == 10
+        assert store.overlay == {}
+
+    def test_subscribers_notified_per_key(self) -> None:
+        """Only subscribers of changed keys are called."""
+        store = self.make_store()
+        calls = []
+        store.subscribe("fill_check_interval", lambda *a: calls.append(("interval", a[:2])))
+        store.subscribe("max_fill_minutes", lambda *a: calls.append(("max", a[:2])))
+
+        store.apply({"fill_check_interval": 5})
+
+        assert calls == [("interval", ("fill_check_interval", 5))]
+
+    def test_unchanged_value_not_notified(self) -> None:
+        """Setting a key to its current value notifies nobody."""
+        store = self.make_store()
+        calls = []
+        store.subscribe(None, lambda *a: calls.append(a))
+
+        assert store.apply({"fill_check_interval": 10}) == []
+        assert calls == []
+
+    def test_nested_key_notifies_section_subscriber(self) -> None:
+        """A dotted update notifies subscribers of its section."""
+        store = self.make_store()
+        calls = []
+        store.subscribe("valve", lambda key, value, config: calls.append((key, value)))
+
+        store.apply({"valve.cooldown_minutes": 3})
+
+        assert calls == [("valve", {"cooldown_minutes": 3})]
+
+    def test_wildcard_subscriber(self) -> None:
+        """A None subscriber sees every changed key."""
+        store = self.make_store()
+        calls = []
+        store.subscribe(None, lambda key, value, config: calls.append(key))
+
+        store.apply({"fill_check_interval": 5, "max_fill_minutes": 7})
+
+        assert sorted(calls) == ["fill_check_interval", "max_fill_minutes"]
+
+    def test_failing_subscriber_does_not_block_others(self) -> None:
+        """An exception in one subscriber does not stop the others."""
+        store = self.make_store()
+        calls = []
+
+        def broken(key, value, config):
+            raise RuntimeError("boom")
+
+        store.subscribe("fill_check_interval", broken)
+        store.subscribe("fill_check_interval", lambda *a: calls.append(a[1]))
+        store.apply({"fill_check_interval": 5})
+
+        assert calls == [5]
+
+    def test_unsubscribe(self) -> None:
+        """Unsubscribed callbacks are not called."""
+        store = self.make_store()
+        calls = []
+
+        def callback(*args):
+            calls.append(args)
+
+        store.subscribe("fill_check_interval", callback)
+        store.unsubscribe("fill_check_interval", callback)
+        store.apply({"fill_check_interval": 5})
+
+        assert calls == []
+
+    def test_handle_config_update(self) -> None:
+        """ConfigUpdate messages are applied."""
+        from shared.messages import ConfigUpdate
+
+        store = self.make_store()
+        store.handle(ConfigUpdate("max_fill_minutes", 7, "cloud"))
+
+        assert store.config.max_fill_minutes == 7
+
+    def test_default_source_reverts_key(self) -> None:
+        """A ConfigUpdate with source 'default' removes the override."""
+        from shared.messages import ConfigUpdate
+
+        store = self.make_store()
+        store.apply({"max_fill_minutes": 7})
+        store.handle(ConfigUpdate("max_fill_minutes", None, "default"))
+
+        assert store.config.max_fill_minutes == 9
+        assert store.overlay == {}
+
+    def test_restart_key_deferred(self) -> None:
+        """Restart-required keys are stored but not applied live."""
+        store = self.make_store()
+
+        assert store.apply({"device_id": "valve-2"}) == []
+        assert store.config.device_id == "valve-1"
+        assert store.overlay == {"device_id": "valve-2"}
+        assert store.pending_restart == ["device_id"]
+
+    def test_overlay_persisted_and_restored(self, tmp_path) -> None:
+        """The overlay survives a restart, including restart-required keys."""
+        store = self.make_store(tmp_path)
+        store.apply({"fill_check_interval": 5, "device_id": "valve-2"})
+
+        restarted = self.make_store(tmp_path)
+
+        assert restarted.config.fill_check_interval == 5
+        assert restarted.config.device_id == "valve-2"
+        assert restarted.pending_restart == []
+
+    def test_overlay_recovered_from_interrupted_save(self, tmp_path) -> None:
+        """An overlay left only in the temporary file by a reset is used."""
+        (tmp_path / "overlay.json.tmp").write_text('{"fill_check_interval": 5}')
+
+        store = self.make_store(tmp_path)
+
+        assert store.config.fill_check_interval == 5
+
+    def test_invalid_persisted_overlay_discarded(self, tmp_path) -> None:
+        """An overlay that no longer validates is ignored."""
+        (tmp_path / "overlay.json").write_text('{"fill_check_interval": "often"}')
+
+        store = self.make_store(tmp_path)
+
+        assert store.config.fill_check_interval == 10
+        assert store.overlay == {}
+
+    def test_reset_all(self) -> None:
+        """reset() reverts every override."""
+        store = self.make_store()
+        store.apply({"fill_check_interval": 5, "max_fill_minutes": 7})
+
+        changed = store.reset()
+
+        assert changed == ["fill_check_interval", "max_fill_minutes"]
+        assert store.config.fill_check_interval == 10
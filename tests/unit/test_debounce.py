@@ -0,0 +1,144 @@
+# Tests for float switch debouncing
+# Pin readings are simulated with recorded traces
+
+import pytest
+
+
+def trace_reader(trace):
+    """Return a read() callable replaying a trace of 0/1 values."""
+    values = iter(trace)
+    return lambda: next(values)
+
+
+class TestFloatSwitchDebouncer:
+    """Tests for FloatSwitchDebouncer."""
+
+    def test_steady_high_stops_at_min_reads(self):
+        """A steady switch settles after min_reads reads."""
+        from src.shared.sensors.debounce import FloatSwitchDebouncer
+
+        debouncer = FloatSwitchDebouncer(max_reads=30, min_reads=5)
+        level = debouncer.sample(trace_reader([1] * 30), sleep=lambda s: None)
+
+        assert level.float_switch is True
+        assert level.confidence == 1.0
+        assert debouncer.count == 5
+
+    def test_steady_low(self):
+        """A steady low switch reads False."""
+        from src.shared.sensors.debounce import FloatSwitchDebouncer
+
+        debouncer = FloatSwitchDebouncer()
+        level = debouncer.sample(trace_reader([0] * 30), sleep=lambda s: None)
+
+        assert level.float_switch is False
+        assert level.confidence == 1.0
+
+    def test_noisy_trace_needs_more_reads(self):
+        """Splashes delay the stop until the lead reaches the margin."""
+        from src.shared.sensors.debounce import FloatSwitchDebouncer
+
+        debouncer = FloatSwitchDebouncer(min_reads=5, target=0.99, error_rate=0.1)
+        assert debouncer.margin == 3
+        trace = [1, 0, 1, 0, 1, 0, 1, 1, 1, 1]
+        level = debouncer.sample(trace_reader(trace), sleep=lambda s: None)
+
+        # Lead reaches 3 at the 9th read
+        assert debouncer.count == 9
+        assert level.float_switch is True
+        assert level.confidence == pytest.approx(6 / 9)
+
+    def test_undecided_trace_uses_max_reads(self):
+        """An alternating trace never settles early."""
+        from src.shared.sensors.debounce import FloatSwitchDebouncer
+
+        debouncer = FloatSwitchDebouncer(max_reads=30)
+        debouncer.sample(trace_reader([1, 0] * 15), sleep=lambda s: None)
+
+        assert debouncer.count == 30
+        assert debouncer.confidence == 0.5
+
+    def test_sleeps_between_reads(self):
+        """sample() sleeps interval between reads, not after the last."""
+        from src.shared.sensors.debounce import FloatSwitchDebouncer
+
+        sleeps = []
+        debouncer = FloatSwitchDebouncer(min_reads=3)
+        debouncer.sample(trace_reader([1] * 30), interval=0.02, sleep=sleeps.append)
+
+        assert sleeps == [0.02, 0.02]
+
+    def test_ring_buffer_overwrites_oldest(self):
+        """Once full, new samples replace the oldest ones."""
+        from src.shared.sensors.debounce import FloatSwitchDebouncer
+
+        debouncer = FloatSwitchDebouncer(max_reads=4, min_reads=1)
+        for value in [1, 1, 1, 1, 0, 0, 0]:
+            debouncer.add(value)
+
+        assert debouncer.count == 4
+        assert debouncer.majority is False
+        assert debouncer.confidence == 0.75
+
+    def test_tie_goes_to_latest_sample(self):
+        """With equal counts the latest sample wins."""
+        from src.shared.sensors.debounce import FloatSwitchDebouncer
+
+        debouncer = FloatSwitchDebouncer()
+        debouncer.add(0)
+        debouncer.add(1)
+
+        assert debouncer.majority is True
+
+    def test_posterior_grows_with_lead(self):
+        """More agreeing samples mean a higher posterior."""
+        from src.shared.sensors.debounce import FloatSwitchDebouncer
+
+        debouncer = FloatSwitchDebouncer(error_rate=0.1)
+        debouncer.add(1)
+        first = debouncer.posterior
+        debouncer.add(1)
+
+        assert first == pytest.approx(0.9)
+        assert debouncer.posterior > first
+
+    def test_steps_for_scheduler(self):
+        """steps() works as a SensorScheduler job."""
+        from src.shared.sensors.debounce import FloatSwitchDebouncer
+        from src.shared.sensors.scheduler import SensorScheduler
+
+        clock = [0.0]
+
+        def sleep(seconds):
+            clock[0] += seconds
+
+        debouncer = FloatSwitchDebouncer(min_reads=5)
+        read = trace_reader([1] * 30)
+        scheduler = SensorScheduler(clock=lambda: clock[0], sleep=sleep)
+        scheduler.add("water_level", lambda: debouncer.steps(read, interval=0.01))
+        results = scheduler.run()
+
+        assert results["water_level"].float_switch is True
+        assert clock[0] == pytest.approx(0.04)
+
+    def test_reset(self):
+        """reset() empties the buffer."""
+        from src.shared.sensors.debounce import FloatSwitchDebouncer
+
+        debouncer = FloatSwitchDebouncer()
+        debouncer.add(1)
+        debouncer.reset()
+
+        assert debouncer.count == 0
+        assert debouncer.confidence == 0.0
+
+    def test_invalid_arguments(self):
+        """Out of range settings are rejected."""
+        from src.shared.sensors.debounce import FloatSwitchDebouncer
+
+        with pytest.raises(ValueError):
+            FloatSwitchDebouncer(max_reads=0)
+        with pytest.raises(ValueError):
+            FloatSwitchDebouncer(target=0.4)
+        with pytest.raises(ValueError):
+            FloatSwitchDebouncer(error_rate=0.5)
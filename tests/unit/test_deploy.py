@@ -1,14 +1,43 @@
 """Tests for the CircuitPython deploy script."""
 
+import hashlib
+import io
 import json
+import stat
 import sys
+import threading
+import zipfile
+from argparse import Namespace
+from http.server import BaseHTTPRequestHandler, HTTPServer
 from pathlib import Path
 
 import pytest
 
 # Import the module under test
 sys.path.insert(0, "circuitpython")
-from deploy import check_settings_toml, deploy_config
+from deploy import (
+    DEVICE_MARKER,
+    MANIFEST_NAME,
+    PrefixedOutput,
+    check_settings_toml,
+    collect_pruned_libraries,
+    collect_tree,
+    compile_tree,
+    deploy_config,
+    deploy_fleet,
+    extract_libraries,
+    fetch_cached,
+    find_devices,
+    find_imports,
+    identify_device,
+    index_bundle,
+    load_manifest,
+    mpy_names,
+    read_boot_out,
+    resolve_imports,
+    sync_files,
+    write_device_marker,
+)
 
 
 class TestCheckSettingsToml:
@@ -152,3 +181,714 @@ class TestDeployConfig:
         assert result is False
         captured = capsys.readouterr()
         assert "Unknown target" in captured.out
+
+
+class TestSyncFiles:
+    """Tests for incremental deploy (sync_files)."""
+
+    @pytest.fixture
+    def source(self, tmp_path: Path):
+        """Create a small source tree."""
+        src = tmp_path / "src"
+        (src / "sensors").mkdir(parents=True)
+        (src / "__init__.py").write_text("")
+        (src / "sensors" / "__init__.py").write_text("# sensors")
+        (src / "sensors" / "retry.py").write_text("def retry(): pass\n")
+        (src / "sensors" / "__pycache__").mkdir()
+        (src / "sensors" / "__pycache__" / "retry.cpython-311.pyc").write_bytes(b"x")
+        return src
+
+    @pytest.fixture
+    def device(self, tmp_path: Path):
+        device = tmp_path / "device"
+        device.mkdir()
+        return device
+
+    def sections(self, source):
+        return {"source": collect_tree(source, "lib/shared", ("__pycache__", "*.pyc"))}
+
+    def test_collect_tree_skips_ignored(self, source: Path):
+        """collect_tree maps device paths to sources, skipping ignored names."""
+        files = collect_tree(source, "lib/shared", ("__pycache__",))
+        assert sorted(files) == [
+            "lib/shared/__init__.py",
+            "lib/shared/sensors/__init__.py",
+            "lib/shared/sensors/retry.py",
+        ]
+
+    def test_first_deploy_writes_everything(self, source: Path, device: Path):
+        """A device without a manifest gets every file."""
+        stats = sync_files(device, self.sections(source))
+
+        assert stats.written == 3
+        assert stats.skipped == 0
+        assert (device / "lib/shared/sensors/retry.py").read_text() == "def retry(): pass\n"
+        assert sorted(load_manifest(device)) == sorted(self.sections(source)["source"])
+
+    def test_redeploy_writes_nothing(self, source: Path, device: Path):
+        """Unchanged files are not rewritten."""
+        sync_files(device, self.sections(source))
+        manifest_mtime = (device / MANIFEST_NAME).stat().st_mtime_ns
+
+        stats = sync_files(device, self.sections(source))
+
+        assert stats.written == 0
+        assert stats.bytes_written == 0
+        assert stats.skipped == 3
+        assert (device / MANIFEST_NAME).stat().st_mtime_ns == manifest_mtime
+
+    def test_changed_file_is_written(self, source: Path, device: Path):
+        """Only the changed file is copied."""
+        sync_files(device, self.sections(source))
+        (source / "sensors" / "retry.py").write_text("def retry(): return 1\n")
+
+        stats = sync_files(device, self.sections(source))
+
+        assert stats.written == 1
+        assert stats.bytes_written == len("def retry(): return 1\n")
+        assert (device / "lib/shared/sensors/retry.py").read_text() == "def retry(): return 1\n"
+
+    def test_existing_identical_files_are_not_written(self, source: Path, device: Path):
+        """Without a manifest, files already on the device are compared by hash."""
+        sync_files(device, self.sections(source))
+        (device / MANIFEST_NAME).unlink()
+
+        stats = sync_files(device, self.sections(source))
+
+        assert stats.written == 0
+        assert load_manifest(device)
+
+    def test_file_edited_on_device_is_rewritten(self, source: Path, device: Path):
+        """A device file changed behind the manifest's back is restored."""
+        sync_files(device, self.sections(source))
+        (device / "lib/shared/sensors/retry.py").write_text("def retry(): fail\n")
+
+        stats = sync_files(device, self.sections(source))
+
+        assert stats.written == 1
+        assert (device / "lib/shared/sensors/retry.py").read_text() == "def retry(): pass\n"
+
+    def test_deleted_source_is_removed(self, source: Path, device: Path):
+        """Files removed from the source are removed from the device."""
+        sync_files(device, self.sections(source))
+        (source / "sensors" / "retry.py").unlink()
+        (source / "sensors" / "__init__.py").unlink()
+
+        stats = sync_files(device, self.sections(source))
+
+        assert stats.removed == 2
+        assert not (device / "lib/shared/sensors").exists()
+        assert (device / "lib/shared/__init__.py").exists()
+
+    def test_untracked_files_are_kept(self, source: Path, device: Path):
+        """Files the deploy never wrote are never removed."""
+        (device / "settings.toml").write_text('AIO_KEY = "x"')
+        (device / "lib/shared").mkdir(parents=True)
+        (device / "lib/shared/local.py").write_text("")
+
+        sync_files(device, self.sections(source))
+        sync_files(device, {"source": {}})
+
+        assert (device / "settings.toml").exists()
+        assert (device / "lib/shared/local.py").exists()
+
+    def test_other_sections_are_kept(self, source: Path, device: Path, tmp_path: Path):
+        """Deploying one section leaves files of other sections alone."""
+        config = tmp_path / "config.json"
+        config.write_text("{}")
+        sync_files(device, {**self.sections(source), "config": {"config.json": config}})
+
+        stats = sync_files(device, {"config": {"config.json": config}})
+
+        assert stats.removed == 0
+        assert (device / "lib/shared/sensors/retry.py").exists()
+        assert "lib/shared/sensors/retry.py" in load_manifest(device)
+
+    def test_sections_written_in_order(
+        self, source: Path, device: Path, tmp_path: Path, monkeypatch
+    ):
+        """Libraries are written before source, config last."""
+        library = tmp_path / "adafruit_ds18x20.mpy"
+        library.write_bytes(b"mpy")
+        config = tmp_path / "config.json"
+        config.write_text("{}")
+        written = []
+        import deploy
+
+        real_copyfile = deploy.shutil.copyfile
+
+        def copyfile(src, dest):
+            written.append(Path(dest).relative_to(device).as_posix())
+            return real_copyfile(src, dest)
+
+        monkeypatch.setattr(deploy.shutil, "copyfile", copyfile)
+
+        sync_files(
+            device,
+            {
+                "config": {"config.json": config},
+                "source": {"lib/shared/__init__.py": source / "__init__.py"},
+                "libraries": {"lib/adafruit_ds18x20.mpy": library},
+            },
+        )
+
+        assert written == ["lib/adafruit_ds18x20.mpy", "lib/shared/__init__.py", "config.json"]
+
+    def test_py_shadowing_mpy_is_removed(self, device: Path, tmp_path: Path):
+        """A .py left next to a deployed .mpy is removed (it would be imported instead)."""
+        (device / "lib/shared").mkdir(parents=True)
+        (device / "lib/shared/retry.py").write_text("old")
+        compiled = tmp_path / "retry.mpy"
+        compiled.write_bytes(b"M")
+
+        stats = sync_files(device, {"source": {"lib/shared/retry.mpy": compiled}})
+
+        assert stats.removed == 1
+        assert not (device / "lib/shared/retry.py").exists()
+        assert (device / "lib/shared/retry.mpy").exists()
+
+
+FAKE_MPY_CROSS = """#!{python}
+import sys
+
+if sys.argv[1] == "--version":
+    print("{version}")
+    sys.exit(0)
+args = sys.argv[1:]
+out = args[args.index("-o") + 1]
+source_name = args[args.index("-s") + 1]
+src = args[-1]
+with open("{log}", "a") as f:
+    f.write(source_name + "\\n")
+text = open(src).read()
+if "syntax error" in text:
+    print("SyntaxError: invalid syntax", file=sys.stderr)
+    sys.exit(1)
+with open(out, "wb") as f:
+    f.write(b"C" + text.encode())
+"""
+
+
+class TestCompileTree:
+    """Tests for .mpy compilation with mpy-cross."""
+
+    def make_mpy_cross(self, tmp_path: Path, version="CircuitPython 9.2.1 on 2024-11-20"):
+        """Write a stand-in mpy-cross that logs each compile."""
+        log = tmp_path / "compiled.log"
+        log.write_text("")
+        script = tmp_path / "mpy-cross"
+        script.write_text(FAKE_MPY_CROSS.format(python=sys.executable, version=version, log=log))
+        script.chmod(script.stat().st_mode | stat.S_IEXEC)
+        return str(script), log
+
+    @pytest.fixture
+    def source(self, tmp_path: Path):
+        src = tmp_path / "shared"
+        (src / "sensors").mkdir(parents=True)
+        (src / "__init__.py").write_text("")
+        (src / "py.typed").write_text("")
+        (src / "sensors" / "retry.py").write_text("def retry(): pass\n")
+        return src
+
+    def test_compiles_py_and_passes_other_files(self, tmp_path: Path, source: Path):
+        """.py files map to .mpy artifacts; other files are passed through."""
+        mpy_cross, log = self.make_mpy_cross(tmp_path)
+
+        files = compile_tree(source, "lib/shared", mpy_cross, cache_dir=tmp_path / "cache")
+
+        assert sorted(files) == [
+            "lib/shared/__init__.mpy",
+            "lib/shared/py.typed",
+            "lib/shared/sensors/retry.mpy",
+        ]
+        assert files["lib/shared/sensors/retry.mpy"].read_bytes() == b"Cdef retry(): pass\n"
+        assert files["lib/shared/py.typed"] == source / "py.typed"
+        assert "shared/sensors/retry.py" in log.read_text().split()
+
+    def test_unchanged_sources_use_cache(self, tmp_path: Path, source: Path):
+        """Only changed modules are compiled again."""
+        mpy_cross, log = self.make_mpy_cross(tmp_path)
+        cache = tmp_path / "cache"
+        compile_tree(source, "lib/shared", mpy_cross, cache_dir=cache)
+        log.write_text("")
+        (source / "sensors" / "retry.py").write_text("def retry(): return 1\n")
+
+        files = compile_tree(source, "lib/shared", mpy_cross, cache_dir=cache)
+
+        assert log.read_text().split() == ["shared/sensors/retry.py"]
+        assert files["lib/shared/sensors/retry.mpy"].read_bytes() == b"Cdef retry(): return 1\n"
+
+    def test_version_mismatch_exits(self, tmp_path: Path, source: Path, capsys):
+        """mpy-cross for another CircuitPython major version is rejected."""
+        mpy_cross, _ = self.make_mpy_cross(tmp_path, version="CircuitPython 8.2.10")
+
+        with pytest.raises(SystemExit):
+            compile_tree(source, "lib/shared", mpy_cross, cache_dir=tmp_path / "cache")
+
+        assert "not for CircuitPython 9.x" in capsys.readouterr().out
+
+    def test_compile_error_exits(self, tmp_path: Path, source: Path, capsys):
+        """A module that fails to compile stops the deploy."""
+        mpy_cross, _ = self.make_mpy_cross(tmp_path)
+        (source / "broken.py").write_text("syntax error")
+
+        with pytest.raises(SystemExit):
+            compile_tree(source, "lib/shared", mpy_cross, cache_dir=tmp_path / "cache")
+
+        assert "SyntaxError" in capsys.readouterr().out
+
+
+def mpy_uint(value: int) -> bytes:
+    """Encode a .mpy variable-length uint."""
+    out = [value & 0x7F]
+    value >>= 7
+    while value:
+        out.insert(0, 0x80 | (value & 0x7F))
+        value >>= 7
+    return bytes(out)
+
+
+def write_mpy(path: Path, *names: str):
+    """Write a stand-in .mpy v6 whose qstr table holds names (no code)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    table = b"".join(mpy_uint(len(n) << 1) + n.encode() + b"\x00" for n in names)
+    path.write_bytes(b"C\x06\x00\x1f" + mpy_uint(len(names)) + mpy_uint(0) + table)
+
+
+class TestLibraryPruning:
+    """Tests for the bundle import resolver."""
+
+    @pytest.fixture
+    def bundle(self, tmp_path: Path):
+        """A bundle with a module, a dependency chain and a package."""
+        bundle = tmp_path / "bundle"
+        lib = bundle / "lib"
+        write_mpy(lib / "adafruit_ticks.mpy", "ticks_ms")
+        write_mpy(lib / "adafruit_minimqtt" / "__init__.mpy")
+        write_mpy(lib / "adafruit_minimqtt" / "adafruit_minimqtt.mpy", "adafruit_ticks", "MQTT")
+        write_mpy(lib / "adafruit_minimqtt" / "matcher.mpy", "MQTTMatcher")
+        write_mpy(lib / "adafruit_layout" / "__init__.mpy")
+        write_mpy(lib / "adafruit_layout" / "grid.mpy", "cell", "widget")
+        write_mpy(lib / "adafruit_layout" / "widget.mpy")
+        write_mpy(lib / "adafruit_layout" / "cartesian.mpy", "adafruit_ticks")
+        (lib / "adafruit_layout" / "font.bin").write_bytes(b"\x00" * 10)
+        write_mpy(lib / "neopixel.mpy", "pixelbuf")
+        return bundle
+
+    def test_find_imports(self, tmp_path: Path):
+        """Absolute imports are collected, including from-imported submodules."""
+        code = tmp_path / "code.py"
+        code.write_text(
+            "import time\n"
+            "from adafruit_minimqtt.adafruit_minimqtt import MQTT\n"
+            "from . import local\n"
+            "try:\n"
+            "    import adafruit_logging as logging\n"
+            "except ImportError:\n"
+            "    logging = None\n"
+        )
+
+        names = find_imports(code)
+
+        assert {"time", "adafruit_minimqtt.adafruit_minimqtt", "adafruit_logging"} <= names
+        assert "adafruit_minimqtt.adafruit_minimqtt.MQTT" in names
+        assert "local" not in names
+
+    def test_index_bundle(self, bundle: Path):
+        """Modules and packages are indexed by dotted name."""
+        index = index_bundle(bundle / "lib")
+
+        assert index["adafruit_ticks"] == bundle / "lib" / "adafruit_ticks.mpy"
+        assert index["adafruit_layout"] == bundle / "lib" / "adafruit_layout"
+        assert "adafruit_layout.grid" in index
+        assert "adafruit_layout.__init__" not in index
+
+    def test_follows_transitive_imports(self, bundle: Path):
+        """Imports inside bundle .mpy files are followed."""
+        index = index_bundle(bundle / "lib")
+
+        reached = resolve_imports(index, {"adafruit_minimqtt.adafruit_minimqtt"})
+
+        assert reached == {
+            "adafruit_minimqtt",
+            "adafruit_minimqtt.adafruit_minimqtt",
+            "adafruit_ticks",
+        }
+
+    def test_follows_relative_imports(self, bundle: Path):
+        """Names relative to a module's package resolve to sibling modules."""
+        index = index_bundle(bundle / "lib")
+
+        reached = resolve_imports(index, {"adafruit_layout.grid"})
+
+        assert "adafruit_layout.widget" in reached
+        assert "adafruit_layout.cartesian" not in reached
+
+    def test_follows_cross_package_submodule_imports(self, bundle: Path):
+        """ "from pkg import mod" in another package's module reaches pkg.mod."""
+        lib = bundle / "lib"
+        write_mpy(lib / "adafruit_bus_device" / "__init__.mpy")
+        write_mpy(lib / "adafruit_bus_device" / "i2c_device.mpy", "I2CDevice")
+        write_mpy(lib / "adafruit_bus_device" / "spi_device.mpy", "SPIDevice")
+        write_mpy(lib / "adafruit_lc709203f.mpy", "adafruit_bus_device", "i2c_device")
+        index = index_bundle(lib)
+
+        reached = resolve_imports(index, {"adafruit_lc709203f"})
+
+        assert "adafruit_bus_device.i2c_device" in reached
+        assert "adafruit_bus_device.spi_device" not in reached
+
+    def test_mpy_names_reads_qstr_table(self, tmp_path: Path):
+        """Names whose length prefix is a letter (33+ chars) come back whole."""
+        long_name = "adafruit_display_text_bitmap_label"
+        path = tmp_path / "mod.mpy"
+        write_mpy(path, long_name, "x", "a" * 200)
+        data = path.read_bytes()
+        # Add a static qstr (bit 0 set), which holds an index, not a string
+        path.write_bytes(data[:4] + mpy_uint(4) + data[5:] + mpy_uint(7 << 1 | 1))
+
+        assert mpy_names(path) == {long_name, "x", "a" * 200}
+
+    def test_mpy_names_falls_back_to_scan(self, tmp_path: Path):
+        """Files that are not .mpy v6 are scanned for identifier-like strings."""
+        path = tmp_path / "old.mpy"
+        path.write_bytes(b"C\x05\x00\x1f\x10adafruit_onewire\x00\x01bus")
+
+        assert {"adafruit_onewire", "bus"} <= mpy_names(path)
+
+    def test_collect_prunes_unused(self, bundle: Path, capsys):
+        """Only reachable modules are deployed and the rest is reported."""
+        files = collect_pruned_libraries(
+            bundle,
+            ["adafruit_minimqtt", "adafruit_layout", "neopixel"],
+            {"adafruit_minimqtt.adafruit_minimqtt", "adafruit_layout.grid"},
+        )
+
+        assert sorted(files) == [
+            "lib/adafruit_layout/__init__.mpy",
+            "lib/adafruit_layout/font.bin",
+            "lib/adafruit_layout/grid.mpy",
+            "lib/adafruit_layout/widget.mpy",
+            "lib/adafruit_minimqtt/__init__.mpy",
+            "lib/adafruit_minimqtt/adafruit_minimqtt.mpy",
+            "lib/adafruit_ticks.mpy",
+        ]
+        out = capsys.readouterr().out
+        assert "Pruned (not imported): neopixel" in out
+        assert "Added (imported, not in requirements): adafruit_ticks" in out
+
+
+BUNDLE_ROOT = "adafruit-circuitpython-bundle-9.x-mpy-20241224"
+
+
+def make_bundle_zip(path: Path) -> bytes:
+    """Write a small bundle zip and return its bytes."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        zf.writestr(f"{BUNDLE_ROOT}/VERSIONS.txt", "versions")
+        zf.writestr(f"{BUNDLE_ROOT}/lib/adafruit_ticks.mpy", b"C\x06ticks_ms")
+        zf.writestr(f"{BUNDLE_ROOT}/lib/adafruit_ds18x20.mpy", b"C\x06\x10adafruit_onewire")
+        zf.writestr(f"{BUNDLE_ROOT}/lib/adafruit_onewire/__init__.mpy", b"C\x06")
+        zf.writestr(f"{BUNDLE_ROOT}/lib/adafruit_onewire/bus.mpy", b"C\x06bus" * 50)
+        zf.writestr(f"{BUNDLE_ROOT}/lib/neopixel.mpy", b"C\x06pixelbuf")
+        zf.writestr(f"{BUNDLE_ROOT}/examples/ticks_simpletest.py", "import adafruit_ticks")
+    data = buffer.getvalue()
+    path.write_bytes(data)
+    return data
+
+
+class RangeHandler(BaseHTTPRequestHandler):
+    """Serves one payload with Range support and records request headers."""
+
+    payload = b""
+    ranges = []
+
+    def do_GET(self):
+        start = 0
+        header = self.headers.get("Range")
+        type(self).ranges.append(header)
+        if header:
+            start = int(header.split("=")[1].split("-")[0])
+            self.send_response(206)
+        else:
+            self.send_response(200)
+        body = self.payload[start:]
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestBundleCache:
+    """Tests for cached, verified and resumable bundle downloads."""
+
+    def test_file_url_is_cached_by_digest(self, tmp_path: Path):
+        """A download is stored under its SHA-256 and reused without the source."""
+        source = tmp_path / "bundle.zip"
+        data = make_bundle_zip(source)
+        digest = hashlib.sha256(data).hexdigest()
+        cache = tmp_path / "cache"
+
+        path = fetch_cached(source.as_uri(), cache)
+        source.unlink()
+        again = fetch_cached(source.as_uri(), cache)
+
+        assert path == again == cache / f"{digest}.zip"
+        assert json.loads((cache / "index.json").read_text()) == {source.as_uri(): digest}
+
+    def test_checksum_mismatch_rejected(self, tmp_path: Path):
+        """A download that does not match the pinned digest is discarded."""
+        source = tmp_path / "bundle.zip"
+        make_bundle_zip(source)
+        cache = tmp_path / "cache"
+
+        with pytest.raises(ValueError, match="Checksum mismatch"):
+            fetch_cached(source.as_uri(), cache, sha256="0" * 64)
+
+        assert not list(cache.glob("*.zip"))
+        assert not list(cache.glob("*.part"))
+
+    def test_corrupt_archive_rejected(self, tmp_path: Path):
+        """A truncated archive fails verification."""
+        source = tmp_path / "bundle.zip"
+        source.write_bytes(make_bundle_zip(tmp_path / "full.zip")[:100])
+
+        with pytest.raises(ValueError, match="Corrupt archive"):
+            fetch_cached(source.as_uri(), tmp_path / "cache")
+
+    def test_cached_copy_verified_before_use(self, tmp_path: Path):
+        """A cached archive that no longer matches its digest is downloaded again."""
+        source = tmp_path / "bundle.zip"
+        make_bundle_zip(source)
+        cache = tmp_path / "cache"
+        path = fetch_cached(source.as_uri(), cache)
+        path.write_bytes(b"damaged")
+
+        again = fetch_cached(source.as_uri(), cache)
+
+        assert zipfile.ZipFile(again).testzip() is None
+
+    def test_interrupted_download_resumes(self, tmp_path: Path):
+        """A .part file is completed with a Range request."""
+        data = make_bundle_zip(tmp_path / "bundle.zip")
+        RangeHandler.payload = data
+        RangeHandler.ranges = []
+        server = HTTPServer(("127.0.0.1", 0), RangeHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            url = f"http://127.0.0.1:{server.server_port}/bundle.zip"
+            cache = tmp_path / "cache"
+            cache.mkdir()
+            part = cache / f"{hashlib.sha256(url.encode()).hexdigest()[:16]}.part"
+            part.write_bytes(data[:200])
+
+            path = fetch_cached(url, cache, sha256=hashlib.sha256(data).hexdigest())
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert RangeHandler.ranges == ["bytes=200-"]
+        assert path.read_bytes() == data
+
+    def test_selective_extraction(self, tmp_path: Path):
+        """Only the lib/ entries of the requested libraries are extracted."""
+        zip_path = tmp_path / "bundle.zip"
+        make_bundle_zip(zip_path)
+        dest = tmp_path / "bundle"
+
+        found = extract_libraries(zip_path, dest, ["adafruit_ticks", "adafruit_missing"])
+
+        assert found == {"adafruit_ticks"}
+        files = sorted(p.relative_to(dest).as_posix() for p in dest.rglob("*") if p.is_file())
+        assert files == [f"{BUNDLE_ROOT}/lib/adafruit_ticks.mpy"]
+
+    def test_extract_all_libraries(self, tmp_path: Path):
+        """libraries=None extracts the whole lib/ directory."""
+        zip_path = tmp_path / "bundle.zip"
+        make_bundle_zip(zip_path)
+        dest = tmp_path / "bundle"
+
+        found = extract_libraries(zip_path, dest, None)
+
+        assert found == {"adafruit_ticks", "adafruit_ds18x20", "adafruit_onewire", "neopixel"}
+        files = sorted(p.relative_to(dest / BUNDLE_ROOT).as_posix() for p in dest.rglob("*.mpy"))
+        assert files == [
+            "lib/adafruit_ds18x20.mpy",
+            "lib/adafruit_onewire/__init__.mpy",
+            "lib/adafruit_onewire/bus.mpy",
+            "lib/adafruit_ticks.mpy",
+            "lib/neopixel.mpy",
+        ]
+        assert not (dest / BUNDLE_ROOT / "examples").exists()
+
+    def test_extraction_follows_imports(self, tmp_path: Path):
+        """With follow, libraries imported by extracted .mpy files are extracted too."""
+        zip_path = tmp_path / "bundle.zip"
+        make_bundle_zip(zip_path)
+        dest = tmp_path / "bundle"
+
+        found = extract_libraries(zip_path, dest, ["adafruit_ds18x20"], follow=True)
+
+        assert found == {"adafruit_ds18x20", "adafruit_onewire"}
+        assert (dest / BUNDLE_ROOT / "lib" / "adafruit_onewire" / "bus.mpy").exists()
+        assert not (dest / BUNDLE_ROOT / "lib" / "neopixel.mpy").exists()
+
+    def test_extraction_rejects_path_traversal(self, tmp_path: Path):
+        """Members that escape the destination are refused."""
+        zip_path = tmp_path / "bundle.zip"
+        with zipfile.ZipFile(zip_path, "w") as zf:
+            zf.writestr("bundle/lib/evil/../../../../escape.mpy", b"x")
+
+        with pytest.raises(ValueError, match="escapes"):
+            extract_libraries(zip_path, tmp_path / "out", ["evil"])
+
+
+def fleet_args(**overrides):
+    """Options as parsed by main() for a fleet deploy."""
+    options = {
+        "target": None,
+        "env": None,
+        "source": False,
+        "tests": False,
+        "prune": False,
+        "code": [],
+        "incremental": True,
+        "verbose": False,
+        "jobs": None,
+    }
+    options.update(overrides)
+    return Namespace(**options)
+
+
+class TestFleetDeploy:
+    """Tests for deploying several devices at once."""
+
+    @pytest.fixture
+    def mounts(self, tmp_path: Path, monkeypatch):
+        """Three mounted devices: marker, config.json only, unidentified."""
+        media = tmp_path / "media" / "user"
+        for name in ("CIRCUITPY", "CIRCUITPY1", "CIRCUITPY2"):
+            (media / name).mkdir(parents=True)
+            (media / name / "boot_out.txt").write_text(
+                "Adafruit CircuitPython 9.2.1 on 2024-11-20; Adafruit Feather ESP32 V2\n"
+                "Board ID:adafruit_feather_esp32_v2\n"
+            )
+            (media / name / "settings.toml").write_text("")
+        (media / "CIRCUITPY" / DEVICE_MARKER).write_text(
+            json.dumps({"target": "valve-node", "environment": "nonprod"})
+        )
+        (media / "CIRCUITPY1" / "config.json").write_text(
+            json.dumps({"device_type": "display-node", "environment": "prod"})
+        )
+        (tmp_path / "media" / "user" / "OTHER").mkdir()
+        monkeypatch.setattr("deploy.FLEET_MOUNT_PATTERNS", (str(media / "CIRCUITPY*"),))
+        return media
+
+    @pytest.fixture
+    def bundle(self, tmp_path: Path, monkeypatch):
+        """Requirements of one library and an extracted bundle holding it."""
+        bundle = tmp_path / "bundle"
+        write_mpy(bundle / "lib" / "adafruit_ticks.mpy", "ticks_ms")
+        monkeypatch.setattr("deploy.load_requirements", lambda target: ["adafruit_ticks"])
+        monkeypatch.setattr("deploy.download_bundle", lambda *args, **kwargs: bundle)
+        return bundle
+
+    def test_find_devices(self, mounts: Path):
+        """All CIRCUITPY mounts are found, in order."""
+        assert [d.name for d in find_devices()] == ["CIRCUITPY", "CIRCUITPY1", "CIRCUITPY2"]
+
+    def test_identify_device(self, mounts: Path):
+        """Marker first, then config.json, else unknown."""
+        assert identify_device(mounts / "CIRCUITPY") == ("valve-node", "nonprod")
+        assert identify_device(mounts / "CIRCUITPY1") == ("display-node", "prod")
+        assert identify_device(mounts / "CIRCUITPY2") == (None, None)
+
+    def test_marker_keeps_environment_without_env(self, mounts: Path):
+        """A deploy without --env keeps the recorded environment."""
+        device = mounts / "CIRCUITPY"
+
+        write_device_marker(device, "valve-node", None)
+        assert identify_device(device) == ("valve-node", "nonprod")
+
+        write_device_marker(device, "valve-node", "prod")
+        assert identify_device(device) == ("valve-node", "prod")
+
+        write_device_marker(mounts / "CIRCUITPY1", "display-node", None)
+        assert json.loads((mounts / "CIRCUITPY1" / DEVICE_MARKER).read_text()) == {
+            "target": "display-node",
+            "environment": "prod",
+        }
+
+    def test_read_boot_out(self, mounts: Path, tmp_path: Path):
+        """boot_out.txt gives the version line and board ID."""
+        info = read_boot_out(mounts / "CIRCUITPY")
+        assert info["board_id"] == "adafruit_feather_esp32_v2"
+        assert info["version"].startswith("Adafruit CircuitPython 9.2.1")
+        assert read_boot_out(tmp_path) is None
+
+    def test_prefixed_output(self):
+        """Lines from device threads are written whole with the device prefix."""
+        stream = io.StringIO()
+        output = PrefixedOutput(stream)
+
+        def worker(name):
+            output.set_prefix(name)
+            for i in range(50):
+                output.write(f"line {i}")
+                output.write("\n")
+
+        threads = [threading.Thread(target=worker, args=(f"DEV{n}",)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        lines = stream.getvalue().splitlines()
+        assert len(lines) == 200
+        assert all(line.startswith("[DEV") and " line " in line for line in lines)
+
+    def test_deploys_identified_devices(self, mounts: Path, bundle: Path, capsys):
+        """Every identified device is deployed; unknown ones are skipped."""
+        exit_code = deploy_fleet(bundle.parent, fleet_args())
+
+        assert exit_code == 0
+        for name in ("CIRCUITPY", "CIRCUITPY1"):
+            assert (mounts / name / "lib" / "adafruit_ticks.mpy").exists()
+        assert not (mounts / "CIRCUITPY2" / "lib").exists()
+        assert json.loads((mounts / "CIRCUITPY1" / DEVICE_MARKER).read_text()) == {
+            "target": "display-node",
+            "environment": "prod",
+        }
+        out = capsys.readouterr().out
+        assert "[CIRCUITPY1] Syncing changed files..." in out
+        assert "CIRCUITPY2: skipped, unknown target" in out
+        assert "Fleet summary:" in out
+
+    def test_target_filter(self, mounts: Path, bundle: Path):
+        """--target limits the fleet to matching devices."""
+        deploy_fleet(bundle.parent, fleet_args(target="valve-node"))
+
+        assert (mounts / "CIRCUITPY" / "lib").exists()
+        assert not (mounts / "CIRCUITPY1" / "lib").exists()
+
+    def test_failure_is_reported(self, mounts: Path, bundle: Path, monkeypatch, capsys):
+        """A device that fails is reported and sets the exit code."""
+        import deploy
+
+        real_sync = deploy.sync_files
+
+        def sync_files(device_path, sections, verbose=False):
+            if device_path.name == "CIRCUITPY1":
+                raise OSError("device disconnected")
+            return real_sync(device_path, sections, verbose)
+
+        monkeypatch.setattr(deploy, "sync_files", sync_files)
+
+        exit_code = deploy_fleet(bundle.parent, fleet_args())
+
+        assert exit_code == 1
+        assert "FAILED: device disconnected" in capsys.readouterr().out
+        assert (mounts / "CIRCUITPY" / "lib" / "adafruit_ticks.mpy").exists()
@@ -0,0 +1,113 @@
+# Tests for FeedRegistry feed name, URL and topic resolution
+from shared.cloud import FEED_NAMES, AdafruitIOHTTP, AdafruitIOMQTT, FeedRegistry
+
+
+class TestFeedRegistry:
+    """Tests for FeedRegistry."""
+
+    def test_prod_keys_are_unprefixed(self) -> None:
+        """Prod feed keys equal the logical names."""
+        registry = FeedRegistry("prod", "user")
+        assert registry.key("pooltemp") == "pooltemp"
+        assert registry.topic("pooltemp") == "user/feeds/pooltemp"
+
+    def test_nonprod_keys_are_prefixed(self) -> None:
+        """Non-prod feed keys get the environment prefix."""
+        registry = FeedRegistry("nonprod", "user")
+        assert registry.key("pooltemp") == "nonprod-pooltemp"
+        assert registry.topic("gateway") == "user/feeds/nonprod-gateway"
+
+    def test_urls(self) -> None:
+        """Feed URLs point at the data endpoints of the prefixed key."""
+        registry = FeedRegistry("dev", "user", "https://example.com/api/v2")
+        feed = registry.get("pooltemp")
+        assert feed.data_url == "https://example.com/api/v2/user/feeds/dev-pooltemp/data"
+        assert feed.batch_url == feed.data_url + "/batch"
+        assert feed.last_url == feed.data_url + "/last"
+        assert feed.chart_url == feed.data_url + "/chart"
+
+    def test_known_feeds_resolved_up_front(self) -> None:
+        """All FEED_NAMES are resolved at construction."""
+        registry = FeedRegistry("prod")
+        for name in FEED_NAMES:
+            assert name in registry
+        assert [feed.name for feed in registry] == list(FEED_NAMES)
+
+    def test_get_returns_cached_feed(self) -> None:
+        """Repeated lookups return the same Feed and strings."""
+        registry = FeedRegistry("test", "user")
+        assert registry.get("pooltemp") is registry.get("pooltemp")
+        assert registry.topic("pooltemp") is registry.topic("pooltemp")
+
+    def test_unknown_feed_resolved_on_first_use(self) -> None:
+        """Names outside FEED_NAMES are resolved lazily and kept."""
+        registry = FeedRegistry("test", "user")
+        assert "custom" not in registry
+        assert registry.key("custom") == "test-custom"
+        assert "custom" in registry
+        assert registry.name_for_topic("user/feeds/test-custom") == "custom"
+
+    def test_name_for_topic_known_feed(self) -> None:
+        """Topics of resolved feeds map back to logical names."""
+        registry = FeedRegistry("nonprod", "user")
+        assert registry.name_for_topic("user/feeds/nonprod-config-pool-node") == "config-pool-node"
+
+    def test_name_for_topic_unresolved_feed(self) -> None:
+        """Unresolved feed topics are parsed and unprefixed."""
+        registry = FeedRegistry("nonprod", "user")
+        assert registry.name_for_topic("other/feeds/nonprod-extra") == "extra"
+        assert registry.name_for_topic("user/feeds/group/feed") == "group/feed"
+
+    def test_name_for_topic_prod_keeps_key(self) -> None:
+        """Prod has no prefix to strip."""
+        registry = FeedRegistry("prod", "user")
+        assert registry.name_for_topic("user/feeds/dev-pooltemp") == "dev-pooltemp"
+
+    def test_name_for_topic_non_feed_topic(self) -> None:
+        """Topics that are not feed topics return None."""
+        registry = FeedRegistry("prod", "user")
+        assert registry.name_for_topic("user/errors") is None
+        assert registry.name_for_topic("user/throttle/x") is None
+
+
+class TestBackendFeedRegistry:
+    """Tests for backends using the FeedRegistry."""
+
+    def test_http_uses_registry_urls(self) -> None:
+        """AdafruitIOHTTP resolves URLs through its registry."""
+        client = AdafruitIOHTTP("user", "key", "nonprod")
+        assert client._feeds.get("pooltemp").data_url == (
+            "https://io.adafruit.com/api/v2/user/feeds/nonprod-pooltemp/data"
+        )
+        assert client._get_feed_name("pooltemp") == "nonprod-pooltemp"
+
+    def test_mqtt_topic_from_registry(self) -> None:
+        """AdafruitIOMQTT topics come from its registry."""
+        client = AdafruitIOMQTT("user", "key", "dev")
+        assert client._get_topic("gateway") == "user/feeds/dev-gateway"
+        assert client._get_topic("gateway") is client._get_topic("gateway")
+
+    def test_mqtt_shares_registry_with_http_fallback(self) -> None:
+        """AdafruitIOMQTT builds one registry and its HTTP fallback reuses it."""
+        client = AdafruitIOMQTT("user", "key", "dev")
+        assert client._http._feeds is client._feeds
+        assert client._http._feeds.get("gateway").data_url == (
+            "https://io.adafruit.com/api/v2/user/feeds/dev-gateway/data"
+        )
+
+    def test_backends_build_one_registry(self, monkeypatch) -> None:
+        """Constructing a backend allocates a single FeedRegistry."""
+        import shared.cloud.feeds as feeds
+
+        created = []
+        real_init = feeds.FeedRegistry.__init__
+
+        def counting_init(self, *args, **kwargs):
+            created.append(self)
+            real_init(self, *args, **kwargs)
+
+        monkeypatch.setattr(feeds.FeedRegistry, "__init__", counting_init)
+        AdafruitIOHTTP("user", "key", "dev")
+        assert len(created) == 1
+        AdafruitIOMQTT("user", "key", "dev")
+        assert len(created) == 2
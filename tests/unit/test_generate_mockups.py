@@ -0,0 +1,68 @@
+# Tests for the mockup generator's render cache
+import sys
+
+import pytest
+
+pytest.importorskip("PIL")
+
+sys.path.insert(0, "docs/mockups")
+from generate_mockups import SCREENS, generate, screen_key  # noqa: E402
+
+SETTINGS = ("08_settings.png", "generate_settings", {}, 1)
+DIALOG = ("09_dialog.png", "generate_confirmation_dialog", {"title": "A", "message": "B"}, 1)
+
+
+class TestRenderCache:
+    """Tests for skipping unchanged screens."""
+
+    def test_unchanged_screens_are_skipped(self, tmp_path):
+        """A second run with nothing changed renders nothing."""
+        paths, skipped = generate(tmp_path, screens=[SETTINGS, DIALOG])
+        assert len(paths) == 2 and skipped == 0
+
+        paths, skipped = generate(tmp_path, screens=[SETTINGS, DIALOG])
+        assert paths == []
+        assert skipped == 2
+
+    def test_changed_screen_is_rendered_again(self, tmp_path):
+        """Only the screen whose arguments changed is re-rendered."""
+        generate(tmp_path, screens=[SETTINGS, DIALOG])
+        changed = (
+            "09_dialog.png",
+            "generate_confirmation_dialog",
+            {"title": "C", "message": "B"},
+            1,
+        )
+
+        paths, skipped = generate(tmp_path, screens=[SETTINGS, changed])
+
+        assert paths == [tmp_path / "09_dialog.png"]
+        assert skipped == 1
+
+    def test_missing_output_is_rendered_again(self, tmp_path):
+        """A screen whose PNG was deleted is rendered even if its key matches."""
+        generate(tmp_path, screens=[SETTINGS])
+        (tmp_path / "08_settings.png").unlink()
+
+        paths, skipped = generate(tmp_path, screens=[SETTINGS])
+
+        assert paths == [tmp_path / "08_settings.png"]
+        assert skipped == 0
+
+    def test_force_renders_everything(self, tmp_path):
+        """force ignores the cache."""
+        generate(tmp_path, screens=[SETTINGS])
+        paths, skipped = generate(tmp_path, force=True, screens=[SETTINGS])
+        assert len(paths) == 1 and skipped == 0
+
+    def test_screen_keys_differ_by_arguments(self):
+        """Screens sharing a generator get distinct keys."""
+        keys = [screen_key(spec) for spec in SCREENS]
+        assert len(set(keys)) == len(keys)
+
+    def test_parallel_jobs_match_serial(self, tmp_path):
+        """Rendering with worker processes writes the same images."""
+        serial, _ = generate(tmp_path / "serial", screens=[SETTINGS, DIALOG])
+        parallel, _ = generate(tmp_path / "parallel", jobs=2, screens=[SETTINGS, DIALOG])
+        for a, b in zip(serial, parallel, strict=True):
+            assert a.read_bytes() == b.read_bytes()
@@ -0,0 +1,186 @@
+# Tests for sensor sample history
+# Tests the SampleBuffer class
+
+import statistics
+
+import pytest
+
+
+class TestSampleBuffer:
+    """Tests for SampleBuffer."""
+
+    def test_empty(self):
+        """An empty buffer has no statistics."""
+        from src.shared.sensors.history import SampleBuffer
+
+        buffer = SampleBuffer(capacity=4)
+
+        assert len(buffer) == 0
+        assert buffer.mean is None
+        assert buffer.variance is None
+        assert buffer.min is None
+        assert buffer.ewma is None
+        assert buffer.last is None
+
+    def test_statistics_before_wrap(self):
+        """Mean, variance, min and max match the stored values."""
+        from src.shared.sensors.history import SampleBuffer
+
+        buffer = SampleBuffer(capacity=10)
+        values = [78.5, 79.0, 77.5, 80.25]
+        for value in values:
+            buffer.add(value)
+
+        assert buffer.mean == pytest.approx(statistics.fmean(values))
+        assert buffer.variance == pytest.approx(statistics.pvariance(values))
+        assert buffer.min == 77.5
+        assert buffer.max == 80.25
+        assert buffer.last == 80.25
+
+    def test_sliding_window(self):
+        """Once full, statistics cover only the newest capacity values."""
+        from src.shared.sensors.history import SampleBuffer
+
+        buffer = SampleBuffer(capacity=5)
+        values = [float(v) for v in [3, 9, 1, 4, 7, 2, 8, 6, 5, 0, 4, 4]]
+        for value in values:
+            buffer.add(value)
+
+        window = values[-5:]
+        assert buffer.values() == window
+        assert buffer.mean == pytest.approx(statistics.fmean(window))
+        assert buffer.variance == pytest.approx(statistics.pvariance(window), abs=1e-5)
+        assert buffer.min == min(window)
+        assert buffer.max == max(window)
+
+    def test_min_max_rescan_when_extreme_leaves(self):
+        """Evicting the current extreme recomputes min and max."""
+        from src.shared.sensors.history import SampleBuffer
+
+        buffer = SampleBuffer(capacity=3)
+        for value in [100.0, 1.0, 2.0, 3.0]:
+            buffer.add(value)
+
+        assert buffer.max == 3.0
+        assert buffer.min == 1.0
+
+    def test_ewma(self):
+        """The EWMA follows new values with weight alpha."""
+        from src.shared.sensors.history import SampleBuffer
+
+        buffer = SampleBuffer(alpha=0.5)
+        buffer.add(10.0)
+        buffer.add(20.0)
+        buffer.add(20.0)
+
+        assert buffer.ewma == pytest.approx(17.5)
+
+    def test_items_with_timestamps(self):
+        """items() yields (timestamp, value) oldest first."""
+        from src.shared.sensors.history import SampleBuffer
+
+        buffer = SampleBuffer(capacity=2)
+        buffer.add(1.0, 100)
+        buffer.add(2.0, 200)
+        buffer.add(3.0, 300)
+
+        assert list(buffer.items()) == [(200, 2.0), (300, 3.0)]
+
+    def test_float_timestamps(self):
+        """time.time() and time.monotonic() floats are stored as whole seconds."""
+        import time
+
+        from src.shared.sensors.history import SampleBuffer
+
+        buffer = SampleBuffer(capacity=4)
+        wall = time.time()
+        tick = time.monotonic()
+        assert buffer.add(1.0, wall)
+        assert buffer.add(2.0, tick)
+        assert buffer.add(3.0, 12.75)
+
+        assert list(buffer.items()) == [(int(wall), 1.0), (int(tick), 2.0), (12, 3.0)]
+
+    def test_bad_timestamp_leaves_state_unchanged(self):
+        """A timestamp that can't be stored is rejected before the window changes."""
+        from src.shared.sensors.history import SampleBuffer
+
+        buffer = SampleBuffer(capacity=4)
+        buffer.add(1.0, 1)
+        buffer.add(3.0, 2)
+
+        with pytest.raises(TypeError):
+            buffer.add(100.0, None)
+
+        assert len(buffer) == 2
+        assert buffer.mean == pytest.approx(2.0)
+        assert buffer.max == 3.0
+        assert buffer.ewma == pytest.approx(1.4)
+
+    def test_outlier_rejected(self):
+        """A spike far from the mean is not stored."""
+        from src.shared.sensors.history import SampleBuffer
+
+        buffer = SampleBuffer(outlier_sigma=3.0, min_samples=5)
+        for value in [78.0, 78.5, 78.0, 78.5, 78.0, 78.5]:
+            assert buffer.add(value)
+
+        assert buffer.is_outlier(185.0)
+        assert not buffer.add(185.0)
+        assert buffer.rejected == 1
+        assert buffer.max == 78.5
+
+    def test_min_spread_prevents_rejection(self):
+        """Small changes on a very steady signal are accepted."""
+        from src.shared.sensors.history import SampleBuffer
+
+        buffer = SampleBuffer(outlier_sigma=3.0, min_spread=0.5, min_samples=3)
+        for _ in range(5):
+            buffer.add(78.0)
+
+        assert buffer.add(78.25)
+
+    def test_no_rejection_before_min_samples(self):
+        """Early values are always accepted."""
+        from src.shared.sensors.history import SampleBuffer
+
+        buffer = SampleBuffer(outlier_sigma=1.0, min_samples=5)
+        buffer.add(1.0)
+        buffer.add(1.5)
+
+        assert buffer.add(100.0)
+
+    def test_level_change_restarts_window(self):
+        """Repeated 'outliers' are accepted as a new level."""
+        from src.shared.sensors.history import SampleBuffer
+
+        buffer = SampleBuffer(outlier_sigma=3.0, min_samples=3, max_rejects=3)
+        for value in [50.0, 50.5, 50.0, 50.5]:
+            buffer.add(value)
+
+        assert not buffer.add(80.0)
+        assert not buffer.add(80.5)
+        assert buffer.add(80.0)
+        assert len(buffer) == 1
+        assert buffer.mean == 80.0
+        assert buffer.ewma == 80.0
+
+    def test_clear(self):
+        """clear() discards samples, EWMA and counters."""
+        from src.shared.sensors.history import SampleBuffer
+
+        buffer = SampleBuffer()
+        buffer.add(1.0)
+        buffer.clear()
+
+        assert len(buffer) == 0
+        assert buffer.ewma is None
+
+    def test_invalid_arguments(self):
+        """Invalid capacity or alpha is rejected."""
+        from src.shared.sensors.history import SampleBuffer
+
+        with pytest.raises(ValueError):
+            SampleBuffer(capacity=0)
+        with pytest.raises(ValueError):
+            SampleBuffer(alpha=0)
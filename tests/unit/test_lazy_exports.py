@@ -0,0 +1,117 @@
+# Tests for lazy package exports (shared._lazy)
+import importlib
+import subprocess
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+import shared.cloud
+import shared.config
+import shared.logging
+import shared.messages
+import shared.sensors
+import shared.storage
+from shared._lazy import lazy_exports
+
+SRC = str(Path(__file__).resolve().parents[2] / "src")
+
+PACKAGES = [
+    shared.cloud,
+    shared.config,
+    shared.logging,
+    shared.messages,
+    shared.sensors,
+    shared.storage,
+]
+
+
+def loaded_after(code: str) -> set[str]:
+    """Run code in a fresh interpreter and return the shared modules it loaded."""
+    script = f"import sys; sys.path.insert(0, {SRC!r}); {code}; print(' '.join(sys.modules))"
+    output = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    ).stdout
+    return {name for name in output.split() if name.startswith("shared.")}
+
+
+class TestPackageExports:
+    """Tests for the lazy exports of the shared packages."""
+
+    @pytest.mark.parametrize("package", PACKAGES, ids=lambda p: p.__name__)
+    def test_all_matches_exports(self, package: types.ModuleType) -> None:
+        """__all__ lists exactly the lazily exported names."""
+        assert sorted(package.__all__) == sorted(package._EXPORTS)
+
+    @pytest.mark.parametrize("package", PACKAGES, ids=lambda p: p.__name__)
+    def test_exports_resolve_to_submodule_objects(self, package: types.ModuleType) -> None:
+        """Every export is the object defined in its submodule."""
+        for name, submodule in package._EXPORTS.items():
+            module = importlib.import_module(f"{package.__name__}.{submodule}")
+            assert getattr(package, name) is getattr(module, name)
+
+    def test_lazy_loading_is_active(self) -> None:
+        """CPython supports module __getattr__, so exports load lazily."""
+        assert all(package._LAZY for package in PACKAGES)
+
+    def test_unknown_name_raises_attribute_error(self) -> None:
+        """Names that are not exported raise AttributeError."""
+        with pytest.raises(AttributeError, match="no attribute 'Nope'"):
+            _ = shared.cloud.Nope
+
+    def test_package_import_loads_no_submodules(self) -> None:
+        """Importing a package loads only the package and the helper."""
+        loaded = loaded_after("import shared.cloud, shared.messages")
+        assert loaded == {"shared._lazy", "shared.cloud", "shared.messages"}
+
+    def test_http_backend_does_not_load_mqtt(self) -> None:
+        """An HTTP-only node never loads the MQTT client or the mock."""
+        loaded = loaded_after("from shared.cloud import AdafruitIOHTTP")
+        assert "shared.cloud.adafruit_io_http" in loaded
+        assert "shared.cloud.adafruit_io_mqtt" not in loaded
+        assert "shared.cloud.mock" not in loaded
+
+    def test_encoder_does_not_load_decoder_or_validator(self) -> None:
+        """Encoding messages leaves the decoder and validator unloaded."""
+        loaded = loaded_after("from shared.messages import encode_message, PoolStatus")
+        assert "shared.messages.encoder" in loaded
+        assert "shared.messages.decoder" not in loaded
+        assert "shared.messages.validator" not in loaded
+
+    def test_atomic_helpers_do_not_load_flash_store(self) -> None:
+        """State-file writers never load FlashStore and AppendLog."""
+        loaded = loaded_after("from shared.storage import write_atomic")
+        assert "shared.storage.atomic" in loaded
+        assert "shared.storage.flash_store" not in loaded
+
+    def test_star_import_loads_everything(self) -> None:
+        """from package import * still provides every name in __all__."""
+        namespace: dict[str, object] = {}
+        exec("from shared.sensors import *", namespace)
+        assert set(shared.sensors.__all__) <= set(namespace)
+
+
+class TestLazyExportsFallback:
+    """Tests for lazy_exports on interpreters without module __getattr__."""
+
+    def test_eager_import_without_module_getattr(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """If the probe lookup fails, every export is imported immediately."""
+        (tmp_path / "first.py").write_text("VALUE = 1\n")
+        (tmp_path / "second.py").write_text("OTHER = 2\n")
+        # The package's own namespace never sees the installed __getattr__,
+        # like a CircuitPython build without MICROPY_MODULE_GETATTR
+        package = types.ModuleType("lazyfallback")
+        package.__path__ = [str(tmp_path)]
+        monkeypatch.setitem(sys.modules, "lazyfallback", package)
+        namespace: dict[str, object] = {}
+
+        lazy = lazy_exports("lazyfallback", namespace, {"VALUE": "first", "OTHER": "second"})
+
+        assert lazy is False
+        assert namespace["VALUE"] == 1
+        assert namespace["OTHER"] == 2
+        for name in ("lazyfallback.first", "lazyfallback.second"):
+            monkeypatch.delitem(sys.modules, name)
@@ -154,6 +154,139 @@ class TestIsWritable:
         assert result is False
 
 
+class TestWritableCache:
+    """Tests for per-mount caching of is_writable probes."""
+
+    @pytest.fixture(autouse=True)
+    def _clear_cache(self):  # type: ignore[no-untyped-def]
+        from shared.logging import clear_writable_cache
+
+        clear_writable_cache()
+        yield
+        clear_writable_cache()
+
+    def test_probe_runs_once_per_mount(self, tmp_path: pytest.TempPathFactory) -> None:
+        """Only the first check on a mount writes a test file."""
+        from unittest.mock import patch
+
+        from shared.logging import filesystem, is_writable
+
+        other = tmp_path / "other"
+        other.mkdir()
+        with patch.object(filesystem, "_probe_write", wraps=filesystem._probe_write) as probe:
+            assert is_writable(str(tmp_path)) is True
+            assert is_writable(str(tmp_path)) is True
+            assert is_writable(str(other)) is True
+
+        assert probe.call_count == 1
+
+    def test_read_only_mount_is_cached(self, tmp_path: pytest.TempPathFactory) -> None:
+        """A read-only filesystem error marks the whole mount read-only."""
+        from unittest.mock import patch
+
+        from shared.logging import filesystem, is_writable
+
+        with patch("builtins.open", side_effect=OSError(30, "Read-only filesystem")):
+            assert is_writable(str(tmp_path)) is False
+        # Cached: no new probe even though writes would now succeed
+        assert is_writable(str(tmp_path)) is False
+        assert filesystem._mount_writable[filesystem._mount_point(str(tmp_path))] is False
+
+    def test_permission_error_is_not_cached(self, tmp_path: pytest.TempPathFactory) -> None:
+        """Errors specific to one directory don't poison the mount."""
+        from unittest.mock import patch
+
+        from shared.logging import filesystem, is_writable
+
+        with patch("builtins.open", side_effect=PermissionError(13, "Permission denied")):
+            assert is_writable(str(tmp_path)) is False
+        assert filesystem._mount_writable == {}
+        assert is_writable(str(tmp_path)) is True
+
+    def test_clear_writable_cache_forces_new_probe(self, tmp_path: pytest.TempPathFactory) -> None:
+        """clear_writable_cache() makes the next check probe again."""
+        from unittest.mock import patch
+
+        from shared.logging import clear_writable_cache, filesystem, is_writable
+
+        with patch.object(filesystem, "_probe_write", wraps=filesystem._probe_write) as probe:
+            is_writable(str(tmp_path))
+            clear_writable_cache(filesystem._mount_point(str(tmp_path)))
+            is_writable(str(tmp_path))
+
+        assert probe.call_count == 2
+
+    def test_flags_probe_does_not_write(self, tmp_path: pytest.TempPathFactory) -> None:
+        """probe="flags" uses the statvfs read-only flag instead of a write."""
+        import os
+        from unittest.mock import MagicMock, patch
+
+        from shared.logging import filesystem, is_writable
+
+        stats = MagicMock(f_flag=filesystem.ST_RDONLY)
+        with (
+            patch.object(os, "statvfs", return_value=stats, create=True),
+            patch.object(filesystem, "_probe_write") as probe,
+        ):
+            assert is_writable(str(tmp_path), probe="flags") is False
+        probe.assert_not_called()
+
+    def test_flags_probe_uses_circuitpython_mount(self, tmp_path: pytest.TempPathFactory) -> None:
+        """The CircuitPython mount's readonly attribute takes precedence."""
+        from unittest.mock import MagicMock, patch
+
+        from shared.logging import filesystem, is_writable
+
+        storage = MagicMock()
+        storage.getmount.return_value.readonly = False
+        with (
+            patch.object(filesystem, "storage", storage),
+            patch.object(filesystem, "_probe_write") as probe,
+        ):
+            assert is_writable(str(tmp_path), probe="flags") is True
+        probe.assert_not_called()
+
+    def test_flags_probe_falls_back_to_write(self, tmp_path: pytest.TempPathFactory) -> None:
+        """Without flag information, probe="flags" writes a test file."""
+        from unittest.mock import patch
+
+        from shared.logging import filesystem, is_writable
+
+        with (
+            patch.object(filesystem, "_probe_flags", return_value=None),
+            patch.object(filesystem, "_probe_write", return_value=True) as probe,
+        ):
+            assert is_writable(str(tmp_path), probe="flags") is True
+        probe.assert_called_once()
+
+    def test_remount_invalidates_cache(self) -> None:
+        """remount() calls storage.remount and forgets the mount's result."""
+        from unittest.mock import MagicMock, patch
+
+        from shared.logging import filesystem, remount
+
+        storage = MagicMock()
+        filesystem._mount_writable["/"] = False
+        filesystem._mount_writable["/sd"] = True
+        with patch.object(filesystem, "storage", storage):
+            remount("/", readonly=False)
+
+        storage.remount.assert_called_once_with(
+            "/", readonly=False, disable_concurrent_write_protection=False
+        )
+        assert filesystem._mount_writable == {"/sd": True}
+
+    def test_remount_without_storage_raises(self) -> None:
+        """remount() raises RuntimeError off CircuitPython."""
+        from unittest.mock import patch
+
+        from shared.logging import filesystem, remount
+
+        with patch.object(filesystem, "storage", None):
+            with pytest.raises(RuntimeError, match="storage"):
+                remount("/")
+
+
 class TestRotatingFileHandler:
     """Tests for RotatingFileHandler class."""
 
@@ -363,6 +496,800 @@ class TestRotatingFileHandler:
         assert log_file.exists()
         assert (tmp_path / "a" / "b" / "c").is_dir()
 
+    def test_rotating_file_handler_stats_only_at_open(
+        self, tmp_path: pytest.TempPathFactory
+    ) -> None:
+        """RotatingFileHandler tracks size in memory instead of stat'ing per record."""
+        from unittest.mock import patch
+
+        from shared.logging import RotatingFileHandler
+
+        log_file = tmp_path / "test.log"
+        log_file.write_text("existing\n")
+        handler = RotatingFileHandler(str(log_file), maxBytes=1000)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        assert handler._size == len("existing\n")
+
+        with patch("shared.logging.rotating_handler.os.path.getsize") as mock_getsize:
+            handler.emit(_make_record("hello"))
+            mock_getsize.assert_not_called()
+
+        assert handler._size == len("existing\nhello\n")
+        handler.close()
+        assert log_file.stat().st_size == handler._size
+
+
+def _make_record(msg: str, level: int = logging.INFO) -> logging.LogRecord:
+    """Create a LogRecord for handler tests."""
+    return logging.LogRecord(
+        name="test",
+        level=level,
+        pathname="",
+        lineno=0,
+        msg=msg,
+        args=(),
+        exc_info=None,
+    )
+
+
+class TestBufferedRotatingFileHandler:
+    """Tests for BufferedRotatingFileHandler class."""
+
+    def _handler(self, log_file, **kwargs):  # type: ignore[no-untyped-def]
+        from shared.logging import BufferedRotatingFileHandler
+
+        handler = BufferedRotatingFileHandler(str(log_file), **kwargs)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        return handler
+
+    def test_buffered_handler_can_be_imported(self) -> None:
+        """BufferedRotatingFileHandler can be imported from shared.logging."""
+        from shared.logging import BufferedRotatingFileHandler
+
+        assert BufferedRotatingFileHandler is not None
+
+    def test_info_records_are_buffered(self, tmp_path: pytest.TempPathFactory) -> None:
+        """INFO records stay in memory until a threshold is reached."""
+        log_file = tmp_path / "test.log"
+        handler = self._handler(log_file, bufferSize=1024, flushInterval=0)
+
+        handler.emit(_make_record("buffered message"))
+
+        assert log_file.read_text() == ""
+        handler.close()
+        assert log_file.read_text() == "buffered message\n"
+
+    def test_warning_flushes_immediately(self, tmp_path: pytest.TempPathFactory) -> None:
+        """WARNING records flush the buffer, including earlier records."""
+        log_file = tmp_path / "test.log"
+        handler = self._handler(log_file, bufferSize=1024, flushInterval=0)
+
+        handler.emit(_make_record("first"))
+        handler.emit(_make_record("problem", level=logging.WARNING))
+
+        assert log_file.read_text() == "first\nproblem\n"
+        handler.close()
+
+    def test_flushes_when_buffer_size_reached(self, tmp_path: pytest.TempPathFactory) -> None:
+        """Records flush once bufferSize bytes are pending."""
+        log_file = tmp_path / "test.log"
+        handler = self._handler(log_file, bufferSize=20, flushInterval=0)
+
+        handler.emit(_make_record("0123456789"))
+        assert log_file.read_text() == ""
+        handler.emit(_make_record("0123456789"))
+
+        assert log_file.read_text() == "0123456789\n0123456789\n"
+        handler.close()
+
+    def test_flushes_after_interval(self, tmp_path: pytest.TempPathFactory) -> None:
+        """Records flush once flushInterval seconds have passed."""
+        from unittest.mock import patch
+
+        log_file = tmp_path / "test.log"
+        with patch("shared.logging.buffered_handler.time.monotonic", return_value=100.0):
+            handler = self._handler(log_file, bufferSize=1024, flushInterval=5)
+            handler.emit(_make_record("early"))
+        assert log_file.read_text() == ""
+
+        with patch("shared.logging.buffered_handler.time.monotonic", return_value=106.0):
+            handler.emit(_make_record("late"))
+
+        assert log_file.read_text() == "early\nlate\n"
+        handler.close()
+
+    def test_explicit_flush_writes_pending(self, tmp_path: pytest.TempPathFactory) -> None:
+        """flush() writes pending records."""
+        log_file = tmp_path / "test.log"
+        handler = self._handler(log_file, bufferSize=1024, flushInterval=0)
+
+        handler.emit(_make_record("pending"))
+        handler.flush()
+
+        assert log_file.read_text() == "pending\n"
+        handler.close()
+
+    def test_rotates_on_record_boundaries(self, tmp_path: pytest.TempPathFactory) -> None:
+        """Rotation flushes pending records into the rotated file first."""
+        log_file = tmp_path / "test.log"
+        handler = self._handler(log_file, maxBytes=50, backupCount=2, bufferSize=1024)
+
+        for i in range(10):
+            handler.emit(_make_record(f"Message {i:04d} padding"))
+        handler.close()
+
+        files = [log_file, tmp_path / "test.log.1", tmp_path / "test.log.2"]
+        assert all(f.exists() for f in files)
+        assert not (tmp_path / "test.log.3").exists()
+        lines = []
+        for f in reversed(files):
+            lines.extend(f.read_text().splitlines())
+        assert lines == [f"Message {i:04d} padding" for i in range(3, 10)]
+
+    def test_does_not_stat_per_record(self, tmp_path: pytest.TempPathFactory) -> None:
+        """Emitting records never stats the log file."""
+        from unittest.mock import patch
+
+        log_file = tmp_path / "test.log"
+        handler = self._handler(log_file, bufferSize=10)
+
+        with patch("shared.logging.rotating_handler.os.path.getsize") as mock_getsize:
+            for i in range(5):
+                handler.emit(_make_record(f"record {i}"))
+            mock_getsize.assert_not_called()
+        handler.close()
+
+    def test_threaded_writes_all_records(self, tmp_path: pytest.TempPathFactory) -> None:
+        """Threaded mode writes every record in order, across rotations."""
+        log_file = tmp_path / "test.log"
+        handler = self._handler(log_file, maxBytes=200, backupCount=5, bufferSize=40, threaded=True)
+
+        for i in range(30):
+            handler.emit(_make_record(f"threaded {i:02d}"))
+        handler.close()
+
+        lines = []
+        for suffix in (".5", ".4", ".3", ".2", ".1", ""):
+            path = tmp_path / f"test.log{suffix}"
+            if path.exists():
+                lines.extend(path.read_text().splitlines())
+        assert lines[-1] == "threaded 29"
+        assert lines == sorted(lines)
+        assert (tmp_path / "test.log.1").exists()
+
+    def test_threaded_flush_waits_for_writer(self, tmp_path: pytest.TempPathFactory) -> None:
+        """flush() in threaded mode returns after the data is on disk."""
+        log_file = tmp_path / "test.log"
+        handler = self._handler(log_file, bufferSize=1024, threaded=True)
+
+        handler.emit(_make_record("via thread"))
+        handler.flush()
+
+        assert log_file.read_text() == "via thread\n"
+        handler.close()
+
+    def test_threaded_write_failure_is_reported(self, tmp_path: pytest.TempPathFactory) -> None:
+        """A chunk the writer thread can't write is counted and reported."""
+        from unittest.mock import patch
+
+        handler = self._handler(tmp_path / "test.log", bufferSize=1024, threaded=True)
+
+        with (
+            patch.object(handler, "_write_chunk", side_effect=OSError(28, "No space left")),
+            patch.object(handler, "handleError") as handle_error,
+        ):
+            handler.emit(_make_record("lost"))
+            handler.flush()
+
+        assert handler.dropped == 1
+        (record,), _ = handle_error.call_args
+        assert record.getMessage() == "Dropped 5 bytes of log records"
+        handler.emit(_make_record("kept"))
+        handler.close()
+        assert (tmp_path / "test.log").read_text() == "kept\n"
+
+    def test_threaded_without_threading_raises(self, tmp_path: pytest.TempPathFactory) -> None:
+        """threaded=True raises RuntimeError where threading is unavailable."""
+        from unittest.mock import patch
+
+        with patch("shared.logging.buffered_handler.threading", None):
+            with pytest.raises(RuntimeError, match="threading"):
+                self._handler(tmp_path / "test.log", threaded=True)
+
+
+class TestSegmentRotation:
+    """Tests for compressed, budgeted segment rotation and segment reading."""
+
+    def _write(self, handler, start, count):  # type: ignore[no-untyped-def]
+        for i in range(start, start + count):
+            handler.emit(_make_record(f"Pool temp reading {i:05d} value 78.5F battery 87%"))
+
+    def test_compress_rolls_into_sequence_segments(self, tmp_path: pytest.TempPathFactory) -> None:
+        """compress=True rolls the current file into numbered .z segments."""
+        from shared.logging import RotatingFileHandler, list_segments
+
+        log_file = tmp_path / "test.log"
+        handler = RotatingFileHandler(str(log_file), maxBytes=500, backupCount=3, compress=True)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        self._write(handler, 0, 50)
+        handler.close()
+
+        segments = list_segments(str(log_file))
+        assert [p.rsplit("/", 1)[-1] for p in segments] == [
+            "test.log.2.z",
+            "test.log.3.z",
+            "test.log.4.z",
+        ]
+        # Compressed segments are much smaller than maxBytes
+        assert all((tmp_path / p.rsplit("/", 1)[-1]).stat().st_size < 250 for p in segments)
+        assert not (tmp_path / "test.log.1").exists()
+
+    def test_iter_log_lines_streams_across_segments(self, tmp_path: pytest.TempPathFactory) -> None:
+        """iter_log_lines returns every retained line, oldest first."""
+        from shared.logging import RotatingFileHandler, iter_log_lines
+
+        log_file = tmp_path / "test.log"
+        handler = RotatingFileHandler(str(log_file), maxBytes=500, backupCount=10, compress=True)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        self._write(handler, 0, 40)
+        handler.close()
+
+        lines = list(iter_log_lines(str(log_file)))
+        assert lines == [f"Pool temp reading {i:05d} value 78.5F battery 87%" for i in range(40)]
+
+    def test_total_byte_budget_is_enforced(self, tmp_path: pytest.TempPathFactory) -> None:
+        """maxTotalBytes bounds the footprint of current file plus segments."""
+        from shared.logging import RotatingFileHandler, iter_log_lines
+
+        log_file = tmp_path / "test.log"
+        handler = RotatingFileHandler(
+            str(log_file), maxBytes=1000, compress=True, maxTotalBytes=1400
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        self._write(handler, 0, 400)
+        handler.close()
+
+        total = sum(f.stat().st_size for f in tmp_path.iterdir())
+        assert total <= 1400
+        lines = list(iter_log_lines(str(log_file)))
+        # Far more history than a single raw 1000-byte backup would hold
+        assert len(lines) > 2 * (1400 // 48)
+        assert lines[-1].startswith("Pool temp reading 00399")
+
+    def test_sequence_resumes_after_reopen(self, tmp_path: pytest.TempPathFactory) -> None:
+        """A new handler continues numbering after existing segments."""
+        from shared.logging import RotatingFileHandler, list_segments
+
+        log_file = tmp_path / "test.log"
+        for _ in range(2):
+            handler = RotatingFileHandler(
+                str(log_file), maxBytes=500, backupCount=10, compress=True
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            self._write(handler, 0, 20)
+            handler.close()
+
+        names = [p.rsplit("/", 1)[-1] for p in list_segments(str(log_file))]
+        assert names == [f"test.log.{i}.z" for i in range(1, len(names) + 1)]
+        assert len(names) >= 3
+
+    def test_stores_raw_segments_without_compressor(self, tmp_path: pytest.TempPathFactory) -> None:
+        """Without zlib/deflate, segments are stored raw but still budgeted."""
+        from unittest.mock import patch
+
+        from shared.logging import RotatingFileHandler, iter_log_lines, list_segments
+
+        log_file = tmp_path / "test.log"
+        with (
+            patch("shared.logging.segments.zlib", None),
+            patch("shared.logging.segments.deflate", None),
+        ):
+            handler = RotatingFileHandler(
+                str(log_file), maxBytes=500, compress=True, maxTotalBytes=1600
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            self._write(handler, 0, 60)
+            handler.close()
+            lines = list(iter_log_lines(str(log_file)))
+
+        segments = list_segments(str(log_file))
+        assert segments and all(p.endswith(".raw") for p in segments)
+        assert sum(f.stat().st_size for f in tmp_path.iterdir()) <= 1600 + 48
+        assert lines[-1].startswith("Pool temp reading 00059")
+
+    def test_list_segments_orders_backup_chain_oldest_first(
+        self, tmp_path: pytest.TempPathFactory
+    ) -> None:
+        """Backup-chain files are listed oldest (highest number) first."""
+        from shared.logging import RotatingFileHandler, iter_log_lines, list_segments
+
+        log_file = tmp_path / "test.log"
+        handler = RotatingFileHandler(str(log_file), maxBytes=100, backupCount=2)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        self._write(handler, 0, 8)
+        handler.close()
+
+        names = [p.rsplit("/", 1)[-1] for p in list_segments(str(log_file))]
+        assert names == ["test.log.2", "test.log.1"]
+        lines = list(iter_log_lines(str(log_file)))
+        assert lines == sorted(lines)
+
+    def test_buffered_handler_supports_compression(self, tmp_path: pytest.TempPathFactory) -> None:
+        """BufferedRotatingFileHandler passes segment options through."""
+        from shared.logging import BufferedRotatingFileHandler, iter_log_lines
+
+        log_file = tmp_path / "test.log"
+        handler = BufferedRotatingFileHandler(
+            str(log_file), maxBytes=500, compress=True, maxTotalBytes=5000, threaded=True
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        self._write(handler, 0, 50)
+        handler.close()
+
+        lines = list(iter_log_lines(str(log_file)))
+        assert len(lines) == 50
+        assert any(p.suffix == ".z" for p in tmp_path.iterdir())
+
+
+class TestBinaryLogHandler:
+    """Tests for BinaryLogHandler and the binary log format."""
+
+    def _record(self, msg, *args, level=logging.INFO, name="pool-node"):  # type: ignore[no-untyped-def]
+        return logging.LogRecord(
+            name=name, level=level, pathname="", lineno=0, msg=msg, args=args, exc_info=None
+        )
+
+    def _decode(self, path):  # type: ignore[no-untyped-def]
+        from shared.logging.binary_format import decode
+
+        return list(decode(path.read_bytes()))
+
+    def test_round_trips_template_and_args(self, tmp_path: pytest.TempPathFactory) -> None:
+        """Records decode back to their template and typed args."""
+        from shared.logging import BinaryLogHandler
+
+        log_file = tmp_path / "test.bin"
+        handler = BinaryLogHandler(str(log_file))
+        handler.emit(self._record("temp %.1fF %d%% %s %s %s", 78.5, 87, "ok", True, None, level=30))
+        handler.close()
+
+        [(timestamp, level, name, template, args)] = self._decode(log_file)
+        assert timestamp > 0
+        assert level == 30
+        assert name == "pool-node"
+        assert template == "temp %.1fF %d%% %s %s %s"
+        assert args == (78.5, 87, "ok", True, None)
+
+    def test_large_int_and_unknown_types(self, tmp_path: pytest.TempPathFactory) -> None:
+        """Ints beyond 32 bits keep their value; other objects are stored as str()."""
+        from shared.logging import BinaryLogHandler
+
+        log_file = tmp_path / "test.bin"
+        handler = BinaryLogHandler(str(log_file))
+        handler.emit(self._record("%d %s", 2**40, [1, 2]))
+        handler.close()
+
+        [entry] = self._decode(log_file)
+        assert entry[4] == (2**40, "[1, 2]")
+
+    def test_strings_are_defined_once_per_session(self, tmp_path: pytest.TempPathFactory) -> None:
+        """Repeated templates cost only the record after the first use."""
+        from shared.logging import BinaryLogHandler
+
+        log_file = tmp_path / "test.bin"
+        handler = BinaryLogHandler(str(log_file))
+        handler.emit(self._record("Pool temp reading %d value %.1fF", 1, 78.5))
+        first = log_file.stat().st_size
+        handler.emit(self._record("Pool temp reading %d value %.1fF", 2, 78.5))
+        second = log_file.stat().st_size - first
+        handler.close()
+
+        assert second < 25
+        assert log_file.read_bytes().count(b"Pool temp reading") == 1
+        assert [entry[4][0] for entry in self._decode(log_file)] == [1, 2]
+
+    def test_never_formats_args(self, tmp_path: pytest.TempPathFactory) -> None:
+        """Emitting a record does not apply args to the template."""
+        from shared.logging import BinaryLogHandler
+
+        log_file = tmp_path / "test.bin"
+        handler = BinaryLogHandler(str(log_file))
+        # Would raise TypeError if formatted
+        handler.emit(self._record("%d items", "not a number"))
+        handler.close()
+
+        assert self._decode(log_file)[0][3:] == ("%d items", ("not a number",))
+
+    def test_exception_is_stored_preformatted(self, tmp_path: pytest.TempPathFactory) -> None:
+        """Records with exc_info keep the traceback text."""
+        import sys
+
+        from shared.logging import BinaryLogHandler
+
+        log_file = tmp_path / "test.bin"
+        handler = BinaryLogHandler(str(log_file))
+        try:
+            raise ValueError("bad reading")
+        except ValueError:
+            record = self._record("Read failed for %s", "sensor", level=logging.ERROR)
+            record.exc_info = sys.exc_info()
+        handler.emit(record)
+        handler.close()
+
+        [entry] = self._decode(log_file)
+        assert entry[3] == "%s"
+        assert entry[4][0].startswith("Read failed for sensor\nTraceback")
+        assert "ValueError: bad reading" in entry[4][0]
+
+    def test_reopen_appends_new_session(self, tmp_path: pytest.TempPathFactory) -> None:
+        """A new handler on an existing file redefines its strings."""
+        from shared.logging import BinaryLogHandler
+
+        log_file = tmp_path / "test.bin"
+        for boot in range(2):
+            handler = BinaryLogHandler(str(log_file))
+            handler.emit(self._record("boot %d", boot, name=f"node-{boot}"))
+            handler.close()
+
+        entries = self._decode(log_file)
+        assert [(e[2], e[4]) for e in entries] == [("node-0", (0,)), ("node-1", (1,))]
+
+    def test_truncated_tail_keeps_earlier_records(self, tmp_path: pytest.TempPathFactory) -> None:
+        """A record cut short by a reset doesn't hide the records before or after it."""
+        from shared.logging import BinaryLogHandler
+
+        log_file = tmp_path / "test.bin"
+        handler = BinaryLogHandler(str(log_file))
+        handler.emit(self._record("first %s", "record"))
+        handler.emit(self._record("second %s", "record"))
+        handler.close()
+        log_file.write_bytes(log_file.read_bytes()[:-3])
+
+        handler = BinaryLogHandler(str(log_file))
+        handler.emit(self._record("after reset"))
+        handler.close()
+
+        assert [e[3] for e in self._decode(log_file)] == ["first %s", "after reset"]
+
+    def test_rotation_starts_self_contained_files(self, tmp_path: pytest.TempPathFactory) -> None:
+        """Each rotated file decodes on its own."""
+        from shared.logging import BinaryLogHandler
+        from shared.logging.binary_format import decode
+
+        log_file = tmp_path / "test.bin"
+        handler = BinaryLogHandler(str(log_file), maxBytes=200, backupCount=5)
+        for i in range(30):
+            handler.emit(self._record("Pool temp reading %d", i))
+        handler.close()
+
+        seen = []
+        for path in sorted(tmp_path.glob("test.bin.*"), reverse=True) + [log_file]:
+            entries = list(decode(path.read_bytes()))
+            assert entries
+            assert all(e[3] == "Pool temp reading %d" for e in entries)
+            seen.extend(e[4][0] for e in entries)
+        assert seen == sorted(seen)
+        assert seen[-1] == 29
+
+    def test_buffered_writes_batch(self, tmp_path: pytest.TempPathFactory) -> None:
+        """bufferSize batches records until flush."""
+        from shared.logging import BinaryLogHandler
+
+        log_file = tmp_path / "test.bin"
+        handler = BinaryLogHandler(str(log_file), bufferSize=4096)
+        handler.emit(self._record("queued %d", 1))
+        pending = self._decode(log_file)
+        handler.close()
+
+        assert pending == []
+        assert len(self._decode(log_file)) == 1
+
+    def test_render_message_falls_back_on_mismatch(self) -> None:
+        """Mismatched templates render with the raw args instead of failing."""
+        from shared.logging.binary_format import render_message
+
+        assert render_message("%d items", (3,)) == "3 items"
+        assert render_message("%d items", ("x",)) == "%d items ('x',)"
+        assert render_message("100%", ()) == "100%"
+
+    def test_decode_logs_cli_renders_segments(
+        self, tmp_path: pytest.TempPathFactory, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """decode_logs.py prints rolled segments and the active file as text."""
+        import sys
+
+        sys.path.insert(0, "scripts")
+        import decode_logs
+
+        from shared.logging import BinaryLogHandler
+
+        log_file = tmp_path / "test.bin"
+        handler = BinaryLogHandler(str(log_file), maxBytes=150, compress=True)
+        for i in range(12):
+            handler.emit(self._record("cycle %d temp %.1f", i, 78.5, level=logging.WARNING))
+        handler.emit(self._record("debug detail", level=logging.DEBUG))
+        handler.close()
+
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(sys, "argv", ["decode_logs.py", str(log_file), "--level", "info", "--utc"])
+            assert decode_logs.main() == 0
+
+        lines = capsys.readouterr().out.splitlines()
+        assert lines[-1].endswith("WARNING pool-node: cycle 11 temp 78.5")
+        assert not any("debug detail" in line for line in lines)
+        assert [int(line.split("cycle ")[1].split()[0]) for line in lines] == sorted(
+            int(line.split("cycle ")[1].split()[0]) for line in lines
+        )
+
+
+class TestLogShipper:
+    """Tests for LogShipper."""
+
+    def _log(self, tmp_path, lines=40, **kwargs):  # type: ignore[no-untyped-def]
+        from shared.logging import RotatingFileHandler
+
+        log_file = tmp_path / "node.log"
+        options = {"maxBytes": 500, "backupCount": 20, "compress": True}
+        options.update(kwargs)
+        handler = RotatingFileHandler(str(log_file), **options)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        for i in range(lines):
+            handler.emit(_make_record(f"Pool temp reading {i:05d} value 78.5F"))
+        handler.close()
+        return log_file
+
+    def _backend(self):  # type: ignore[no-untyped-def]
+        from shared.cloud import MockBackend
+
+        backend = MockBackend()
+        backend.connect()
+        return backend
+
+    def _drain(self, shipper, limit=500):  # type: ignore[no-untyped-def]
+        now = 0.0
+        for _ in range(limit):
+            shipper.poll(now)
+            now += shipper.min_interval
+            if shipper._reader is None and not shipper._take(1):
+                return
+
+    def _values(self, backend):  # type: ignore[no-untyped-def]
+        return [value for _, value in backend._feeds.get("logs", [])]
+
+    def _reassemble(self, values):  # type: ignore[no-untyped-def]
+        segments = {}
+        for value in values:
+            source, position, payload = value.split(" ", 2)
+            seq, offset = (int(part) for part in position.split(":"))
+            assert source == "valve-node"
+            data = segments.setdefault(seq, b"")
+            assert offset == len(data)
+            segments[seq] = data + payload.encode("utf-8")
+        return segments
+
+    def test_ships_rolled_segments_in_order(self, tmp_path: pytest.TempPathFactory) -> None:
+        """Every rolled segment is shipped once, in order, and reassembles exactly."""
+        from shared.logging import LogShipper, read_segment
+        from shared.logging.segments import scan_segments
+
+        log_file = self._log(tmp_path)
+        backend = self._backend()
+        shipper = LogShipper(backend, str(log_file), "valve-node", chunk_size=200)
+        self._drain(shipper)
+
+        segments = self._reassemble(self._values(backend))
+        rolled = scan_segments(str(log_file))
+        assert sorted(segments) == [seq for seq, _ in rolled]
+        for seq, path in rolled:
+            assert segments[seq] == b"".join(read_segment(path))
+        assert shipper.segments_shipped == len(rolled)
+        assert shipper.bytes_sent == sum(len(data) for data in segments.values())
+
+    def test_text_chunks_end_on_line_boundaries(self, tmp_path: pytest.TempPathFactory) -> None:
+        """Text chunks stay under chunk_size and end with a newline."""
+        from shared.logging import LogShipper
+
+        log_file = self._log(tmp_path)
+        backend = self._backend()
+        shipper = LogShipper(backend, str(log_file), "valve-node", chunk_size=100, batch_size=3)
+        self._drain(shipper)
+
+        payloads = [value.split(" ", 2)[2] for value in self._values(backend)]
+        assert payloads
+        assert all(len(payload.encode()) <= 100 for payload in payloads)
+        assert all(payload.endswith("\n") for payload in payloads)
+
+    def test_waits_min_interval_per_chunk(self, tmp_path: pytest.TempPathFactory) -> None:
+        """poll() sends nothing until min_interval per chunk has passed."""
+        from shared.logging import LogShipper
+
+        log_file = self._log(tmp_path)
+        shipper = LogShipper(
+            self._backend(),
+            str(log_file),
+            "valve-node",
+            chunk_size=100,
+            batch_size=2,
+            min_interval=5,
+        )
+
+        assert shipper.poll(100.0) == 2
+        assert shipper.poll(109.0) == 0
+        assert shipper.poll(110.0) == 2
+
+    def test_resumes_from_persisted_position(self, tmp_path: pytest.TempPathFactory) -> None:
+        """A new shipper continues where the previous one stopped."""
+        from shared.logging import LogShipper
+
+        log_file = self._log(tmp_path)
+        backend = self._backend()
+        first = LogShipper(backend, str(log_file), "valve-node", chunk_size=120)
+        for step in range(3):
+            first.poll(step * 10.0)
+        position = first.position
+        first.close()
+
+        second = LogShipper(backend, str(log_file), "valve-node", chunk_size=120)
+        assert second.position == position
+        self._drain(second)
+
+        # No gaps or duplicates across the restart
+        self._reassemble(self._values(backend))
+
+    def test_resumes_from_interrupted_save(self, tmp_path: pytest.TempPathFactory) -> None:
+        """A position left in the temporary file by a reset is recovered."""
+        from shared.logging import LogShipper
+
+        log_file = self._log(tmp_path)
+        (tmp_path / "node.log.ship.tmp").write_text('{"seq": 2, "offset": 40}')
+
+        shipper = LogShipper(self._backend(), str(log_file), "valve-node")
+        assert shipper.position == (2, 40)
+
+    def test_throttled_publish_is_retried(self, tmp_path: pytest.TempPathFactory) -> None:
+        """A throttled batch is not consumed, backs off and is sent again later."""
+        from unittest.mock import patch
+
+        from shared.logging import LogShipper
+        from shared.logging.shipper import RETRY_BACKOFF
+
+        log_file = self._log(tmp_path)
+        backend = self._backend()
+        shipper = LogShipper(backend, str(log_file), "valve-node")
+
+        with patch.object(backend, "publish", return_value=False):
+            assert shipper.poll(0.0) == 0
+        assert shipper.position[1] == 0
+        assert shipper.errors == 0
+        assert shipper.poll(RETRY_BACKOFF[0] - 1) == 0
+        assert shipper.poll(RETRY_BACKOFF[0]) == 1
+        assert self._values(backend)[0].split(" ", 2)[1] == f"{shipper.position[0]}:0"
+
+    def test_failed_publish_backs_off(self, tmp_path: pytest.TempPathFactory) -> None:
+        """Upload errors back off using RETRY_BACKOFF."""
+        from unittest.mock import patch
+
+        from shared.logging import LogShipper
+        from shared.logging.shipper import RETRY_BACKOFF
+
+        log_file = self._log(tmp_path)
+        backend = self._backend()
+        shipper = LogShipper(backend, str(log_file), "valve-node")
+
+        with patch.object(backend, "publish_batch", side_effect=RuntimeError("HTTP 429")):
+            assert shipper.poll(0.0) == 0
+            assert shipper.poll(RETRY_BACKOFF[0] - 1) == 0
+            assert shipper.poll(RETRY_BACKOFF[0]) == 0
+        assert shipper.errors == 2
+        assert shipper.poll(RETRY_BACKOFF[0] + RETRY_BACKOFF[1]) == 1
+
+    def test_corrupt_segment_is_skipped(self, tmp_path: pytest.TempPathFactory) -> None:
+        """A segment that can't be decompressed is skipped once, with a warning."""
+        from unittest.mock import MagicMock
+
+        from shared.logging import LogShipper
+        from shared.logging.segments import read_segment, scan_segments
+
+        log_file = self._log(tmp_path)
+        (first_seq, first), (second_seq, second) = scan_segments(str(log_file))[:2]
+        with open(first, "wb") as f:
+            f.write(b"x\x9c not a zlib stream")
+        expected = b"".join(read_segment(second))
+        backend = self._backend()
+        logger = MagicMock()
+        shipper = LogShipper(backend, str(log_file), "valve-node", chunk_size=200, logger=logger)
+
+        assert shipper.poll(0.0) == 0
+        assert shipper.segments_corrupt == 1
+        assert shipper.errors == 0
+        assert shipper.position == (first_seq + 1, 0)
+        assert "corrupt" in logger.warning.call_args[0][0]
+        self._drain(shipper)
+
+        segments = self._reassemble(self._values(backend))
+        assert first_seq not in segments
+        assert segments[second_seq] == expected
+        assert LogShipper(backend, str(log_file), "valve-node").position == shipper.position
+
+    def test_skips_when_disconnected(self, tmp_path: pytest.TempPathFactory) -> None:
+        """Nothing is read or sent while the backend is disconnected."""
+        from shared.cloud import MockBackend
+        from shared.logging import LogShipper
+
+        log_file = self._log(tmp_path)
+        shipper = LogShipper(MockBackend(), str(log_file), "valve-node")
+
+        assert shipper.poll(0.0) == 0
+        assert shipper._reader is None
+
+    def test_counts_segments_lost_to_budget(self, tmp_path: pytest.TempPathFactory) -> None:
+        """Segments deleted before shipping are skipped and counted."""
+        import os
+
+        from shared.logging import LogShipper
+        from shared.logging.segments import scan_segments
+
+        log_file = self._log(tmp_path, lines=120)
+        backend = self._backend()
+        shipper = LogShipper(backend, str(log_file), "valve-node")
+        shipper.poll(0.0)
+        seq = shipper.position[0]
+        shipper.close()
+
+        for later_seq, path in scan_segments(str(log_file)):
+            if later_seq <= seq + 2:
+                os.remove(path)
+        shipper = LogShipper(backend, str(log_file), "valve-node")
+        self._drain(shipper)
+
+        assert shipper.segments_missed == 3
+
+    def test_nothing_to_ship_without_segments(self, tmp_path: pytest.TempPathFactory) -> None:
+        """Backup-chain logs and the active file are not shipped."""
+        from shared.logging import LogShipper
+
+        log_file = self._log(tmp_path, compress=False, maxTotalBytes=0, backupCount=2)
+        backend = self._backend()
+        shipper = LogShipper(backend, str(log_file), "valve-node")
+
+        assert shipper.poll(0.0) == 0
+        assert self._values(backend) == []
+
+    def test_base64_ships_binary_logs(self, tmp_path: pytest.TempPathFactory) -> None:
+        """encoding="base64" ships binary segments that decode on the host."""
+        import base64
+
+        from shared.logging import BinaryLogHandler, LogShipper
+        from shared.logging.binary_format import decode
+
+        log_file = tmp_path / "node.log"
+        handler = BinaryLogHandler(str(log_file), maxBytes=300, maxTotalBytes=100000)
+        for i in range(60):
+            handler.emit(_make_record(f"reading {i}"))
+        handler.close()
+
+        backend = self._backend()
+        shipper = LogShipper(
+            backend, str(log_file), "valve-node", chunk_size=120, encoding="base64"
+        )
+        self._drain(shipper)
+
+        segments = {}
+        for value in self._values(backend):
+            _, position, payload = value.split(" ", 2)
+            seq = int(position.split(":")[0])
+            segments[seq] = segments.get(seq, b"") + base64.b64decode(payload)
+        messages = [entry[3] for seq in sorted(segments) for entry in decode(segments[seq])]
+        assert messages
+        assert messages == [f"reading {i}" for i in range(len(messages))]
+
+    def test_rejects_unknown_encoding(self, tmp_path: pytest.TempPathFactory) -> None:
+        """Unsupported encodings raise ValueError."""
+        from shared.logging import LogShipper
+
+        with pytest.raises(ValueError):
+            LogShipper(self._backend(), str(tmp_path / "node.log"), "valve-node", encoding="hex")
+
 
 class TestAddFileLogging:
     """Tests for add_file_logging function."""
@@ -395,6 +1322,19 @@ class TestAddFileLogging:
         # Cleanup
         new_handler.close()
 
+    def test_add_file_logging_buffered(self, tmp_path: pytest.TempPathFactory) -> None:
+        """add_file_logging(buffered=True) adds a BufferedRotatingFileHandler."""
+        from shared.logging import BufferedRotatingFileHandler, add_file_logging, get_logger
+
+        logger = get_logger("test-file-logging-buffered")
+        result = add_file_logging(logger, str(tmp_path / "test.log"), buffered=True)
+
+        assert result is True
+        new_handler = logger.handlers[-1]
+        assert isinstance(new_handler, BufferedRotatingFileHandler)
+        logger.removeHandler(new_handler)
+        new_handler.close()
+
     def test_add_file_logging_returns_false_for_readonly(
         self, tmp_path: pytest.TempPathFactory
     ) -> None:
@@ -465,3 +1405,25 @@ class TestAddFileLogging:
         assert log_file.exists()
         content = log_file.read_text()
         assert "Test bare filename message" in content
+
+    def test_add_file_logging_binary(self, tmp_path: pytest.TempPathFactory) -> None:
+        """binary=True adds a BinaryLogHandler."""
+        from shared.logging import BinaryLogHandler, add_file_logging, get_logger
+        from shared.logging.binary_format import decode
+
+        logger = get_logger("test-binary-file")
+        log_file = tmp_path / "test.bin"
+
+        assert add_file_logging(logger, str(log_file), binary=True) is True
+        handler = logger.handlers[-1]
+        assert isinstance(handler, BinaryLogHandler)
+
+        logger.info("Valve %s for %d min", "open", 15)
+        logger.debug("filtered %s", "out")
+        logger.removeHandler(handler)
+        handler.close()
+
+        entries = list(decode(log_file.read_bytes()))
+        assert [(e[2], e[3], e[4]) for e in entries] == [
+            ("test-binary-file", "Valve %s for %d min", ("open", 15))
+        ]
@@ -284,3 +284,207 @@ class TestRetryWithBackoffEdgeCases:
 
         # Delay should be capped at max_delay (1.0), not base_delay (5.0)
         mock_sleep.assert_called_once_with(1.0)
+
+
+class TestRetryPolicy:
+    """Tests for RetryPolicy."""
+
+    def test_success_first_attempt(self):
+        """Returns the result without sleeping."""
+        from src.shared.sensors.retry import RetryPolicy
+
+        policy = RetryPolicy()
+        func = Mock(return_value=42)
+
+        with patch("src.shared.sensors.retry.time.sleep") as mock_sleep:
+            assert policy.call(func, key="temp") == 42
+
+        mock_sleep.assert_not_called()
+        stats = policy.stats("temp")
+        assert stats["calls"] == 1
+        assert stats["attempts"] == 1
+        assert stats["success_rate"] == 1.0
+
+    def test_no_jitter_matches_exponential_schedule(self):
+        """jitter="none" uses the retry_with_backoff delays."""
+        from src.shared.sensors.retry import RetryPolicy
+
+        policy = RetryPolicy(max_retries=3, jitter="none")
+        func = Mock(side_effect=[ValueError(), ValueError(), ValueError(), "ok"])
+
+        with patch("src.shared.sensors.retry.time.sleep") as mock_sleep:
+            assert policy.call(func) == "ok"
+
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [0.1, 0.2, 0.4]
+        assert policy.stats()["retries"] == 3
+        assert abs(policy.stats()["sleep_time"] - 0.7) < 1e-9
+
+    def test_full_jitter_within_bounds(self):
+        """Full jitter delays stay between 0 and the exponential delay."""
+        from src.shared.sensors.retry import RetryPolicy
+
+        policy = RetryPolicy(base_delay=0.1, max_delay=2.0, jitter="full")
+        for attempt in range(8):
+            bound = min(2.0, 0.1 * 2**attempt)
+            for _ in range(20):
+                assert 0 <= policy.next_delay(attempt, 0.1) <= bound
+
+    def test_decorrelated_jitter_within_bounds(self):
+        """Decorrelated delays stay between base_delay and max_delay."""
+        from src.shared.sensors.retry import RetryPolicy
+
+        policy = RetryPolicy(base_delay=0.1, max_delay=1.0, jitter="decorrelated")
+        previous = 0.1
+        for attempt in range(20):
+            delay = policy.next_delay(attempt, previous)
+            assert 0.1 <= delay <= min(1.0, previous * 3)
+            previous = delay
+
+    def test_invalid_jitter_raises(self):
+        """Unknown jitter modes are rejected."""
+        from src.shared.sensors.retry import RetryPolicy
+
+        with pytest.raises(ValueError):
+            RetryPolicy(jitter="random")
+
+    def test_exhausted_raises_last_exception(self):
+        """The last exception is raised once retries run out."""
+        from src.shared.sensors.retry import RetryPolicy
+
+        policy = RetryPolicy(max_retries=2)
+        func = Mock(side_effect=[ValueError("1"), ValueError("2"), ValueError("3")])
+
+        with patch("src.shared.sensors.retry.time.sleep"):
+            with pytest.raises(ValueError, match="3"):
+                policy.call(func, key="temp")
+
+        assert func.call_count == 3
+        assert policy.stats("temp")["exhausted"] == 1
+
+    def test_unlisted_exception_not_retried(self):
+        """Exceptions outside the tuple propagate immediately."""
+        from src.shared.sensors.retry import RetryPolicy
+
+        policy = RetryPolicy(exceptions=(ValueError,))
+        func = Mock(side_effect=TypeError())
+
+        with pytest.raises(TypeError):
+            policy.call(func)
+
+        assert func.call_count == 1
+
+    def test_deadline_stops_retries(self):
+        """A retry that would overrun the deadline is not started."""
+        from src.shared.sensors.retry import RetryPolicy
+
+        policy = RetryPolicy(max_retries=5, jitter="none", deadline=0.35)
+        func = Mock(side_effect=ValueError())
+
+        with patch("src.shared.sensors.retry.time.sleep") as mock_sleep:
+            with pytest.raises(ValueError):
+                policy.call(func, key="temp")
+
+        # 0.1 + 0.2 fits in 0.35; 0.4 more would not
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [0.1, 0.2]
+        assert func.call_count == 3
+        assert policy.stats("temp")["deadline_hits"] == 1
+
+    def test_deadline_counts_time_in_func(self):
+        """Time spent inside func counts against the deadline."""
+        from src.shared.sensors.retry import RetryPolicy
+
+        clock = [0.0]
+
+        def slow_read():
+            clock[0] += 1.0
+            raise OSError("CRC error")
+
+        policy = RetryPolicy(max_retries=5, jitter="none", deadline=1.05)
+
+        with patch("src.shared.sensors.retry.time.monotonic", side_effect=lambda: clock[0]):
+            with patch("src.shared.sensors.retry.time.sleep"):
+                with pytest.raises(OSError):
+                    policy.call(slow_read)
+
+        assert policy.stats()["attempts"] == 1
+
+    def test_healthy_sensor_gets_short_schedule(self):
+        """A sensor with a high success rate uses healthy_retries."""
+        from src.shared.sensors.retry import RetryPolicy
+
+        policy = RetryPolicy(max_retries=3, healthy_retries=1, min_samples=5)
+        for _ in range(5):
+            policy.call(lambda: 1, key="temp")
+
+        assert policy.is_healthy("temp")
+        assert policy.retries_for("temp") == 1
+
+        func = Mock(side_effect=ValueError())
+        with patch("src.shared.sensors.retry.time.sleep"):
+            with pytest.raises(ValueError):
+                policy.call(func, key="temp")
+
+        assert func.call_count == 2
+
+    def test_failures_make_sensor_unhealthy(self):
+        """Repeated failures bring back the full schedule."""
+        from src.shared.sensors.retry import RetryPolicy
+
+        policy = RetryPolicy(max_retries=3, min_samples=2, smoothing=0.5)
+        policy.call(lambda: 1, key="temp")
+        policy.call(lambda: 1, key="temp")
+        assert policy.is_healthy("temp")
+
+        func = Mock(side_effect=ValueError())
+        with patch("src.shared.sensors.retry.time.sleep"):
+            with pytest.raises(ValueError):
+                policy.call(func, key="temp")
+
+        assert not policy.is_healthy("temp")
+        assert policy.retries_for("temp") == 3
+
+    def test_sensors_tracked_separately(self):
+        """Health is kept per key."""
+        from src.shared.sensors.retry import RetryPolicy
+
+        policy = RetryPolicy(min_samples=1)
+        policy.call(lambda: 1, key="temp")
+
+        assert policy.is_healthy("temp")
+        assert not policy.is_healthy("level")
+
+    def test_on_attempt_hook(self):
+        """The hook sees every attempt with its error and duration."""
+        from src.shared.sensors.retry import RetryPolicy
+
+        seen = []
+        policy = RetryPolicy(on_attempt=lambda *a: seen.append(a))
+        error = ValueError("bad read")
+        func = Mock(side_effect=[error, "ok"])
+
+        with patch("src.shared.sensors.retry.time.sleep"):
+            policy.call(func, key="temp")
+
+        assert [(k, n, e) for k, n, e, _ in seen] == [("temp", 1, error), ("temp", 2, None)]
+        assert all(duration >= 0 for _, _, _, duration in seen)
+
+    def test_reset(self):
+        """reset() forgets history."""
+        from src.shared.sensors.retry import RetryPolicy
+
+        policy = RetryPolicy(min_samples=1)
+        policy.call(lambda: 1, key="temp")
+        policy.call(lambda: 1, key="level")
+
+        policy.reset("temp")
+        assert not policy.is_healthy("temp")
+        assert policy.is_healthy("level")
+
+        policy.reset()
+        assert not policy.is_healthy("level")
+
+    def test_exported_from_package(self):
+        """RetryPolicy is exported from shared.sensors."""
+        from src.shared.sensors import RetryPolicy
+
+        assert RetryPolicy is not None
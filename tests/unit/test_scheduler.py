@@ -0,0 +1,233 @@
+# Tests for the sensor read scheduler
+# Uses a virtual clock so no test actually sleeps
+
+from unittest.mock import Mock
+
+import pytest
+
+
+class FakeClock:
+    """Clock advanced only by sleep()."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def make_scheduler(clock, **kwargs):
+    from src.shared.sensors.scheduler import SensorScheduler
+
+    return SensorScheduler(clock=clock.time, sleep=clock.sleep, **kwargs)
+
+
+class TestSensorScheduler:
+    """Tests for SensorScheduler."""
+
+    def test_plain_jobs(self):
+        """Jobs returning values complete in one step."""
+        clock = FakeClock()
+        scheduler = make_scheduler(clock)
+        scheduler.add("battery", lambda: 87)
+        scheduler.add("level", lambda: True)
+
+        assert scheduler.run() == {"battery": 87, "level": True}
+        assert scheduler.errors == {}
+        assert clock.sleeps == []
+
+    def test_generator_jobs_overlap(self):
+        """Waits of different jobs overlap instead of adding up."""
+        clock = FakeClock()
+        order = []
+
+        def temperature():
+            order.append("start conversion")
+            yield 0.75
+            order.append("read temperature")
+            return 78.5
+
+        def water_level():
+            for _ in range(3):
+                order.append("sample switch")
+                yield 0.1
+            return True
+
+        scheduler = make_scheduler(clock)
+        scheduler.add("temperature", temperature)
+        scheduler.add("level", water_level)
+        results = scheduler.run()
+
+        assert results == {"temperature": 78.5, "level": True}
+        assert order[0] == "start conversion"
+        assert order[-1] == "read temperature"
+        assert scheduler.elapsed == pytest.approx(0.75)
+
+    def test_retry_does_not_block_other_jobs(self):
+        """A failing job's backoff is a wake-up, not a sleep."""
+        clock = FakeClock()
+        battery = Mock(side_effect=[OSError("NACK"), 87])
+
+        def temperature():
+            yield 0.75
+            return 78.5
+
+        scheduler = make_scheduler(clock, base_delay=0.1)
+        scheduler.add("battery", battery)
+        scheduler.add("temperature", temperature)
+        results = scheduler.run()
+
+        assert results == {"battery": 87, "temperature": 78.5}
+        assert battery.call_count == 2
+        assert scheduler.elapsed == pytest.approx(0.75)
+
+    def test_retries_exhausted(self):
+        """After max_retries the reading is None and the error is kept."""
+        clock = FakeClock()
+        error = OSError("CRC error")
+        job = Mock(side_effect=error)
+
+        scheduler = make_scheduler(clock, max_retries=2, base_delay=0.1)
+        scheduler.add("temperature", job)
+        results = scheduler.run()
+
+        assert results == {"temperature": None}
+        assert scheduler.errors == {"temperature": error}
+        assert job.call_count == 3
+        assert scheduler.elapsed == pytest.approx(0.3)
+
+    def test_generator_failure_restarts_job(self):
+        """A generator job that raises is restarted from the beginning."""
+        clock = FakeClock()
+        starts = []
+
+        def temperature():
+            starts.append(clock.now)
+            yield 0.75
+            if len(starts) == 1:
+                raise OSError("CRC error")
+            return 78.5
+
+        scheduler = make_scheduler(clock, base_delay=0.1)
+        scheduler.add("temperature", temperature)
+
+        assert scheduler.run() == {"temperature": 78.5}
+        assert starts == [0.0, pytest.approx(0.85)]
+
+    def test_recover_called_before_retry(self):
+        """recover() runs before each retry and waits recover_delay."""
+        clock = FakeClock()
+        recover = Mock()
+        job = Mock(side_effect=[OSError(), 25.0])
+
+        scheduler = make_scheduler(clock, base_delay=0.1, recover_delay=0.2)
+        scheduler.add("temperature", job, recover=recover)
+
+        assert scheduler.run() == {"temperature": 25.0}
+        recover.assert_called_once()
+        assert scheduler.elapsed == pytest.approx(0.2)
+
+    def test_unlisted_exception_fails_only_that_read(self):
+        """Exceptions outside the job's tuple are not retried or raised."""
+        clock = FakeClock()
+        error = TypeError("bad driver")
+        job = Mock(side_effect=error)
+
+        def level():
+            yield 0.5
+            return True
+
+        scheduler = make_scheduler(clock)
+        scheduler.add("temperature", job, exceptions=(OSError,))
+        scheduler.add("level", level)
+        scheduler.add("battery", lambda: 87)
+
+        assert scheduler.run() == {"temperature": None, "level": True, "battery": 87}
+        assert scheduler.errors == {"temperature": error}
+        job.assert_called_once()
+
+    def test_failing_recover_fails_only_that_read(self):
+        """An exception from recover() is recorded as that read's failure."""
+        clock = FakeClock()
+        error = RuntimeError("SCL stuck low")
+        breaker = Mock()
+        breaker.allow.return_value = True
+
+        def level():
+            yield 0.5
+            return True
+
+        scheduler = make_scheduler(clock)
+        scheduler.add(
+            "temperature",
+            Mock(side_effect=OSError()),
+            recover=Mock(side_effect=error),
+            breaker=breaker,
+        )
+        scheduler.add("level", level)
+
+        assert scheduler.run() == {"temperature": None, "level": True}
+        assert scheduler.errors == {"temperature": error}
+        breaker.record_failure.assert_called_once()
+
+    def test_timeout(self):
+        """Unfinished reads are abandoned at the timeout."""
+        from src.shared.sensors.scheduler import ScheduleTimeout
+
+        clock = FakeClock()
+
+        def stuck():
+            while True:
+                yield 1.0
+
+        scheduler = make_scheduler(clock)
+        scheduler.add("temperature", stuck)
+        scheduler.add("battery", lambda: 87)
+        results = scheduler.run(timeout=2.5)
+
+        assert results == {"battery": 87, "temperature": None}
+        assert isinstance(scheduler.errors["temperature"], ScheduleTimeout)
+        assert scheduler.elapsed == pytest.approx(2.5)
+
+    def test_open_breaker_skips_job(self):
+        """An open circuit breaker skips the read."""
+        from src.shared.sensors.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+        clock = FakeClock()
+        breaker = CircuitBreaker("temperature", failure_threshold=1)
+        breaker.record_failure(now=2**31)
+        job = Mock(return_value=78.5)
+
+        scheduler = make_scheduler(clock)
+        scheduler.add("temperature", job, breaker=breaker)
+
+        assert scheduler.run() == {"temperature": None}
+        assert isinstance(scheduler.errors["temperature"], CircuitOpenError)
+        job.assert_not_called()
+
+    def test_breaker_records_outcome(self):
+        """The final outcome of a read is recorded on its breaker."""
+        from src.shared.sensors.circuit_breaker import OPEN, CircuitBreaker
+
+        clock = FakeClock()
+        breaker = CircuitBreaker("temperature", failure_threshold=1)
+
+        scheduler = make_scheduler(clock, max_retries=1)
+        scheduler.add("temperature", Mock(side_effect=OSError()), breaker=breaker)
+        scheduler.run()
+
+        assert breaker.state == OPEN
+
+    def test_jobs_cleared_after_run(self):
+        """Each run() uses the jobs added since the previous run."""
+        clock = FakeClock()
+        scheduler = make_scheduler(clock)
+        scheduler.add("battery", lambda: 87)
+        scheduler.run()
+
+        assert scheduler.run() == {}
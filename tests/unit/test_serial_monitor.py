@@ -0,0 +1,243 @@
+"""Tests for the serial monitor capture mode."""
+
+import gzip
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Import the module under test
+sys.path.insert(0, "scripts")
+from serial_monitor import (  # noqa: E402
+    CaptureCounters,
+    LineBuffer,
+    RotatingGzipWriter,
+    capture_ports,
+    parse_line,
+)
+
+
+class PipeSource:
+    """Read end of a pipe standing in for a serial port."""
+
+    def __init__(self, fd):
+        self.fd = fd
+
+    def fileno(self):
+        return self.fd
+
+    def read(self, size):
+        return os.read(self.fd, size)
+
+
+def read_records(directory: Path):
+    """Return all records in the capture files, oldest file first."""
+    records = []
+    for path in sorted(directory.glob("*.jsonl.gz")):
+        with gzip.open(path, "rt") as f:
+            records.extend(json.loads(line) for line in f)
+    return records
+
+
+class TestParseLine:
+    """Tests for parse_line function."""
+
+    def test_log_line(self):
+        """get_logger() lines are split into level, device and message."""
+        record = parse_line("WARNING valve-node-dev: Fill timeout: 5 min", "ttyACM0", 12.5)
+
+        assert record == {
+            "time": 12.5,
+            "port": "ttyACM0",
+            "level": "WARNING",
+            "device": "valve-node-dev",
+            "message": "Fill timeout: 5 min",
+        }
+
+    def test_other_line(self):
+        """Other output keeps the whole line as the message."""
+        record = parse_line("=== TEST RUN END ===", "ttyACM0", 0)
+
+        assert record["level"] is None
+        assert record["device"] is None
+        assert record["message"] == "=== TEST RUN END ==="
+
+
+class TestLineBuffer:
+    """Tests for LineBuffer."""
+
+    def test_partial_lines_held_back(self):
+        """A line split across reads is returned once complete."""
+        buffer = LineBuffer()
+
+        assert buffer.feed(b"INFO dev: hel") == []
+        assert buffer.feed(b"lo\r\nDEBUG dev: x\r\n\r\nINFO") == ["INFO dev: hello", "DEBUG dev: x"]
+        assert buffer.feed(b" dev: end\n") == ["INFO dev: end"]
+
+    def test_escape_sequences_removed(self):
+        """Terminal title and CSI sequences are stripped."""
+        buffer = LineBuffer()
+
+        lines = buffer.feed(b"\x1b]0;\xf0\x9f\x90\x8dcode.py | 9.2.1\x1b\\INFO dev: up\n\x1b[2Kx\n")
+
+        assert lines == ["INFO dev: up", "x"]
+
+    def test_invalid_utf8_replaced(self):
+        """Corrupt bytes do not stop parsing."""
+        assert LineBuffer().feed(b"INFO dev: \xff\n") == ["INFO dev: �"]
+
+    def test_flush_returns_partial_line(self):
+        """flush() hands back the held-back partial line once."""
+        buffer = LineBuffer()
+        buffer.feed(b"INFO dev: one\nINFO dev: tw")
+
+        assert buffer.flush() == ["INFO dev: tw"]
+        assert buffer.flush() == []
+
+
+class TestRotatingGzipWriter:
+    """Tests for RotatingGzipWriter."""
+
+    def test_rotates_and_keeps_backups(self, tmp_path: Path):
+        """New files start at max_bytes; only the newest backups remain."""
+        writer = RotatingGzipWriter(tmp_path, max_bytes=200, backups=3)
+        for i in range(40):
+            writer.write(parse_line(f"INFO dev: message {i}", "p", i))
+        writer.close()
+
+        files = sorted(p.name for p in tmp_path.iterdir())
+        assert len(files) == 3
+        records = read_records(tmp_path)
+        assert records[-1]["message"] == "message 39"
+        assert [r["time"] for r in records] == sorted(r["time"] for r in records)
+        assert writer.records == 40
+
+    def test_max_bytes_counts_encoded_bytes(self, tmp_path: Path):
+        """Rotation is by UTF-8 bytes, not characters."""
+        # About 80 characters but 140 bytes per line
+        record = parse_line("INFO dev: " + "é" * 60, "p", 0)
+        writer = RotatingGzipWriter(tmp_path, max_bytes=100)
+        writer.write(record)
+        writer.write(record)
+        writer.close()
+
+        assert len(list(tmp_path.iterdir())) == 2
+        assert [r["message"] for r in read_records(tmp_path)] == ["é" * 60] * 2
+
+    def test_rejects_zero_backups(self, tmp_path: Path):
+        """backups below 1 would keep no file (or every file) and is refused."""
+        with pytest.raises(ValueError, match="at least 1"):
+            RotatingGzipWriter(tmp_path, backups=0)
+
+    def test_numbering_continues(self, tmp_path: Path):
+        """A new writer does not overwrite earlier captures."""
+        writer = RotatingGzipWriter(tmp_path)
+        writer.write(parse_line("INFO dev: first", "p", 1))
+        writer.close()
+
+        writer = RotatingGzipWriter(tmp_path)
+        writer.write(parse_line("INFO dev: second", "p", 2))
+        writer.close()
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "capture.0001.jsonl.gz",
+            "capture.0002.jsonl.gz",
+        ]
+        assert [r["message"] for r in read_records(tmp_path)] == ["first", "second"]
+
+
+class TestCaptureCounters:
+    """Tests for CaptureCounters."""
+
+    def test_counts_and_rate(self):
+        """Lines, warnings and errors are counted per device; rate per window."""
+        now = [0.0]
+        counters = CaptureCounters(clock=lambda: now[0])
+        for level in ("INFO", "WARNING", "ERROR", "CRITICAL"):
+            counters.add(parse_line(f"{level} pool: x", "p", 0))
+        counters.add(parse_line("raw output", "ttyACM1", 0))
+        now[0] = 2.0
+
+        report = counters.report()
+
+        assert counters.get("pool") == {"lines": 4, "window": 0, "warnings": 1, "errors": 2}
+        assert counters.get("ttyACM1")["lines"] == 1
+        assert "2.0/s" in report[0]
+
+
+class TestCapturePorts:
+    """Tests for capture_ports function."""
+
+    def test_captures_several_ports(self, tmp_path: Path, capsys):
+        """Lines from all ports are parsed, written and counted."""
+        sources = {}
+        writers = []
+        for name in ("ttyACM0", "ttyACM1"):
+            read_fd, write_fd = os.pipe()
+            sources[name] = PipeSource(read_fd)
+            writers.append((name, write_fd))
+
+        def produce(name, fd):
+            device = f"{name}-dev"
+            for i in range(2000):
+                level = "ERROR" if i % 500 == 0 else "DEBUG"
+                os.write(fd, f"{level} {device}: reading {i}\r\n".encode())
+            os.close(fd)
+
+        threads = [threading.Thread(target=produce, args=writer) for writer in writers]
+        for thread in threads:
+            thread.start()
+
+        writer = RotatingGzipWriter(tmp_path, max_bytes=64 * 1024)
+        counters = CaptureCounters()
+        try:
+            count = capture_ports(sources, writer, counters, duration=30, stats_interval=60)
+        finally:
+            writer.close()
+            for thread in threads:
+                thread.join()
+            for source in sources.values():
+                os.close(source.fd)
+
+        assert count == 4000
+        records = read_records(tmp_path)
+        assert len(records) == 4000
+        for name in ("ttyACM0", "ttyACM1"):
+            messages = [r["message"] for r in records if r["port"] == name]
+            assert messages == [f"reading {i}" for i in range(2000)]
+            assert counters.get(f"{name}-dev")["errors"] == 4
+        out = capsys.readouterr().out
+        assert "[ttyACM0] ERROR ttyACM0-dev: reading 500" in out
+        assert "DEBUG" not in out
+
+    def test_flushes_last_line_and_echoes_unleveled(self, tmp_path: Path, capsys):
+        """A last line without newline is kept; tracebacks echo at WARNING."""
+        read_fd, write_fd = os.pipe()
+        os.write(
+            write_fd,
+            b"INFO dev: started\r\n"
+            b"Traceback (most recent call last):\r\n"
+            b"ValueError: bad reading\r\n"
+            b"ERROR dev: cut off",
+        )
+        os.close(write_fd)
+        writer = RotatingGzipWriter(tmp_path)
+        try:
+            capture_ports({"ttyACM0": PipeSource(read_fd)}, writer, CaptureCounters(), duration=30)
+        finally:
+            writer.close()
+            os.close(read_fd)
+
+        assert [r["message"] for r in read_records(tmp_path)] == [
+            "started",
+            "Traceback (most recent call last):",
+            "ValueError: bad reading",
+            "cut off",
+        ]
+        out = capsys.readouterr().out
+        assert "Traceback (most recent call last):\nValueError: bad reading\n" in out
+        assert "ERROR dev: cut off" in out
+        assert "started" not in out
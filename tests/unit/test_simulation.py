@@ -0,0 +1,127 @@
+# Tests for simulated sensor buses
+# Runs the real bus recovery code against the simulation
+
+import random
+
+import pytest
+
+
+@pytest.fixture
+def sim():
+    """Simulated I2C and OneWire buses installed into bus_recovery."""
+    import src.shared.sensors.bus_recovery as bus_recovery
+    from src.shared.sensors.simulation import (
+        CRCErrors,
+        MissingPresence,
+        SimBus,
+        SimClock,
+        SimHardware,
+        StuckSDA,
+    )
+
+    clock = SimClock()
+    rng = random.Random(1)
+    i2c = SimBus(clock, rng, [StuckSDA(probability=1.0)])
+    onewire = SimBus(
+        clock,
+        rng,
+        [MissingPresence(probability=1.0, recover_probability=1.0), CRCErrors(rate=0.0)],
+    )
+    hardware = SimHardware(clock, i2c_bus=i2c, onewire_bus=onewire)
+    bus_recovery._logger = None
+    restore = hardware.install(bus_recovery)
+    yield clock, i2c, onewire, hardware
+    restore()
+    bus_recovery._logger = None
+
+
+class TestSimulatedBuses:
+    """Tests for the simulated buses and fault models."""
+
+    def test_stuck_sda_times_out(self, sim):
+        """Transactions on a stuck bus fail after the timeout."""
+        from src.shared.sensors.simulation import SimFuelGauge
+
+        clock, i2c, _, _ = sim
+        i2c.start_cycle()
+
+        with pytest.raises(OSError):
+            _ = SimFuelGauge(i2c).cell_voltage
+
+        assert clock.now == pytest.approx(0.05)
+        assert i2c.errors == 1
+
+    def test_i2c_recovery_releases_stuck_sda(self, sim):
+        """recover_i2c_bus clocks SCL enough to release the bus."""
+        from src.shared.sensors.bus_recovery import recover_i2c_bus
+        from src.shared.sensors.simulation import SimFuelGauge
+
+        _, i2c, _, hardware = sim
+        i2c.start_cycle()
+
+        assert recover_i2c_bus(hardware.scl_pin, "SDA") is True
+        assert SimFuelGauge(i2c, voltage=3.7).cell_voltage == 3.7
+        assert i2c.recoveries == 1
+
+    def test_onewire_recovery_restores_presence(self, sim):
+        """recover_onewire_bus sends a long enough reset pulse."""
+        from src.shared.sensors.bus_recovery import recover_onewire_bus
+        from src.shared.sensors.simulation import SimDS18X20
+
+        _, _, onewire, hardware = sim
+        onewire.start_cycle()
+        sensor = SimDS18X20(onewire, temperature=26.0)
+
+        with pytest.raises(OSError):
+            _ = sensor.temperature
+        assert recover_onewire_bus(hardware.data_pin) is True
+        assert sensor.temperature == 26.0
+
+    def test_recovery_on_other_pin_ignored(self, sim):
+        """Toggling a pin other than SCL does not clear the fault."""
+        from src.shared.sensors.bus_recovery import recover_i2c_bus
+        from src.shared.sensors.simulation import SimFuelGauge
+
+        _, i2c, _, _ = sim
+        i2c.start_cycle()
+        recover_i2c_bus("D5", "SDA")
+
+        with pytest.raises(OSError):
+            _ = SimFuelGauge(i2c).cell_percent
+
+    def test_ds18x20_timing(self):
+        """A blocking read costs the conversion time plus bus time."""
+        from src.shared.sensors.simulation import SimBus, SimClock, SimDS18X20
+
+        clock = SimClock()
+        bus = SimBus(clock, random.Random(1))
+
+        assert SimDS18X20(bus).temperature == 25.5
+        assert clock.now == pytest.approx(0.001 + 0.75 + 0.015)
+
+    def test_crc_errors(self):
+        """CRC errors fail reads at roughly the configured rate."""
+        from src.shared.sensors.simulation import CRCErrors, SimBus, SimClock, SimDS18X20
+
+        bus = SimBus(SimClock(), random.Random(1), [CRCErrors(rate=0.25)])
+        sensor = SimDS18X20(bus, conversion_time=0)
+        failures = 0
+        for _ in range(2000):
+            try:
+                _ = sensor.temperature
+            except RuntimeError:
+                failures += 1
+
+        assert 400 < failures < 600
+
+    def test_install_restores_modules(self):
+        """The function returned by install() puts the originals back."""
+        import src.shared.sensors.bus_recovery as bus_recovery
+        from src.shared.sensors.simulation import SimClock, SimHardware
+
+        original_time = bus_recovery.time
+        restore = SimHardware(SimClock()).install(bus_recovery)
+        assert bus_recovery.time is not original_time
+        restore()
+
+        assert bus_recovery.time is original_time
@@ -0,0 +1,375 @@
+# Tests for the flash storage layer
+# Tests FlashStore budgets, AppendLog commits/recovery and write stats
+
+import pytest
+
+
+def open_store(tmp_path, budget=64 * 1024, **kwargs):
+    from shared.storage import FlashStore
+
+    return FlashStore(str(tmp_path / "data"), budget=budget, **kwargs)
+
+
+class TestWriteStats:
+    """Tests for WriteStats accounting."""
+
+    def test_counts_sectors_spanned(self):
+        """A write crossing a sector boundary touches two sectors."""
+        from shared.storage import WriteStats
+
+        stats = WriteStats(sector_size=4096)
+        stats.record(4090, 10, logical=8)
+
+        assert stats.sector_writes == 2
+        assert stats.physical_bytes == 10
+        assert stats.logical_bytes == 8
+        assert stats.write_amplification == 2 * 4096 / 8
+
+    def test_amplification_zero_without_payload(self):
+        """write_amplification is 0 before any payload is written."""
+        from shared.storage import WriteStats
+
+        assert WriteStats().write_amplification == 0
+
+
+class TestAppendLog:
+    """Tests for AppendLog."""
+
+    def test_only_committed_records_are_read(self, tmp_path):
+        """Appended records appear after commit()."""
+        log = open_store(tmp_path).open_log("events", slot_size=1024, slots=2)
+        log.append(b"one")
+        log.append("two")
+
+        assert list(log.read()) == []
+        assert log.commit() > 0
+        assert list(log.read()) == [b"one", b"two"]
+        assert log.pending == 0
+
+    def test_slot_files_never_change_size(self, tmp_path):
+        """Slots are preallocated and written in place."""
+        import os
+
+        store = open_store(tmp_path)
+        log = store.open_log("events", slot_size=1024, slots=3)
+        for i in range(200):
+            log.append(b"reading %d" % i)
+            log.commit()
+
+        sizes = {os.path.getsize(path) for path in log._paths}
+        assert sizes == {1024}
+
+    def test_recovers_after_restart(self, tmp_path):
+        """A new store sees committed records and appends after them."""
+        log = open_store(tmp_path).open_log("events", slot_size=1024, slots=2)
+        log.append(b"before")
+        log.commit()
+
+        log = open_store(tmp_path).open_log("events", slot_size=1024, slots=2)
+        log.append(b"after")
+        log.commit()
+
+        assert list(log.read()) == [b"before", b"after"]
+
+    def test_uncommitted_batch_is_lost_on_restart(self, tmp_path):
+        """Records appended without commit() are not persisted."""
+        log = open_store(tmp_path).open_log("events", slot_size=1024, slots=2)
+        log.append(b"kept")
+        log.commit()
+        log.append(b"lost")
+
+        log = open_store(tmp_path).open_log("events", slot_size=1024, slots=2)
+        assert list(log.read()) == [b"kept"]
+
+    def test_torn_commit_is_ignored(self, tmp_path):
+        """A batch whose commit marker didn't reach flash is discarded."""
+        from shared.storage.flash_store import COMMIT_SIZE
+
+        log = open_store(tmp_path).open_log("events", slot_size=1024, slots=2)
+        log.append(b"first")
+        log.commit()
+        log.append(b"second batch")
+        log.commit()
+
+        # Simulate a reset halfway through writing the second commit marker
+        path = log._paths[log._current]
+        with open(path, "r+b") as f:
+            f.seek(log._pos - COMMIT_SIZE // 2)
+            f.write(b"\xff" * (COMMIT_SIZE // 2))
+
+        log = open_store(tmp_path).open_log("events", slot_size=1024, slots=2)
+        assert list(log.read()) == [b"first"]
+        log.append(b"third")
+        log.commit()
+        assert list(log.read()) == [b"first", b"third"]
+
+    def test_ring_reuses_oldest_slot(self, tmp_path):
+        """When all slots are full the oldest is reused and its records dropped."""
+        store = open_store(tmp_path)
+        log = store.open_log("events", slot_size=256, slots=3)
+        for i in range(100):
+            log.append(b"reading %03d" % i)
+            log.commit()
+
+        records = list(log.read())
+        assert records[-1] == b"reading 099"
+        assert records == sorted(records)
+        assert len(records) < 100
+        assert log.stats.slot_reuses > 0
+
+    def test_wear_is_spread_across_slots(self, tmp_path):
+        """Every slot is written a similar number of times."""
+        from unittest.mock import patch
+
+        log = open_store(tmp_path).open_log("events", slot_size=256, slots=4)
+        writes = [0] * 4
+        original = log._write_at
+
+        def counting(index, offset, data, logical=0):
+            writes[index] += 1
+            return original(index, offset, data, logical)
+
+        with patch.object(log, "_write_at", side_effect=counting):
+            for i in range(400):
+                log.append(b"reading %03d" % i)
+                log.commit()
+
+        assert max(writes) - min(writes) <= max(writes) // 4
+
+    def test_stale_generation_data_is_ignored(self, tmp_path):
+        """Old batches left in a reused slot are not read back."""
+        log = open_store(tmp_path).open_log("events", slot_size=128, slots=2)
+        for i in range(30):
+            log.append(b"r%02d" % i)
+            log.commit()
+
+        reopened = open_store(tmp_path).open_log("events", slot_size=128, slots=2)
+        assert list(reopened.read()) == list(log.read())
+        assert list(log.read())[-1] == b"r29"
+
+    def test_batch_commits_once(self, tmp_path):
+        """Several records commit with a single write."""
+        log = open_store(tmp_path).open_log("events", slot_size=1024, slots=2)
+        before = log.stats.writes
+        for i in range(10):
+            log.append(b"x%d" % i)
+        log.commit()
+
+        assert log.stats.writes == before + 1
+        assert log.stats.commits == 1
+
+    def test_oversized_record_rejected(self, tmp_path):
+        """Records that cannot fit in a slot raise ValueError."""
+        log = open_store(tmp_path).open_log("events", slot_size=64, slots=2)
+        with pytest.raises(ValueError):
+            log.append(b"x" * 100)
+
+    def test_clear_drops_everything(self, tmp_path):
+        """clear() empties the log, also across restarts."""
+        log = open_store(tmp_path).open_log("events", slot_size=128, slots=2)
+        for i in range(20):
+            log.append(b"r%02d" % i)
+            log.commit()
+        log.clear()
+
+        assert list(log.read()) == []
+        assert list(open_store(tmp_path).open_log("events", 128, 2).read()) == []
+
+
+class TestFlashStore:
+    """Tests for FlashStore budgets and files."""
+
+    def test_open_log_reserves_budget(self, tmp_path):
+        """Logs reserve slot_size * slots against the budget."""
+        store = open_store(tmp_path, budget=4096)
+        store.open_log("a", slot_size=1024, slots=2)
+
+        assert store.used == 2048
+        with pytest.raises(ValueError, match="budget"):
+            store.open_log("b", slot_size=1024, slots=3)
+
+    def test_open_log_returns_same_instance(self, tmp_path):
+        """Opening a log twice returns the same object."""
+        store = open_store(tmp_path)
+        assert store.open_log("a", 512, 2) is store.open_log("a", 512, 2)
+
+    def test_write_file_round_trip(self, tmp_path):
+        """write_file replaces a file atomically and counts the write."""
+        store = open_store(tmp_path)
+        store.write_file("state.json", b"{}")
+        store.write_file("state.json", b'{"seq": 3}')
+
+        assert store.read_file("state.json") == b'{"seq": 3}'
+        assert store.used == len(b'{"seq": 3}')
+        assert store.stats.commits == 2
+
+    def test_write_file_respects_budget(self, tmp_path):
+        """Files that would exceed the budget are refused."""
+        store = open_store(tmp_path, budget=100)
+        with pytest.raises(ValueError, match="budget"):
+            store.write_file("big.bin", b"x" * 101)
+
+    def test_read_file_falls_back_to_tmp(self, tmp_path):
+        """An interrupted replace is recovered from the temporary file."""
+        store = open_store(tmp_path)
+        (tmp_path / "data" / "state.json.tmp").write_bytes(b"new")
+
+        assert store.read_file("state.json") == b"new"
+        assert store.read_file("missing", default=b"") == b""
+
+    def test_existing_files_count_against_budget(self, tmp_path):
+        """Files from a previous run are reserved at startup."""
+        store = open_store(tmp_path, budget=1000)
+        store.write_file("cache.bin", b"x" * 600)
+
+        store = open_store(tmp_path, budget=1000)
+        assert store.used == 600
+        with pytest.raises(ValueError):
+            store.write_file("other.bin", b"x" * 500)
+
+    def test_remove_file_releases_budget(self, tmp_path):
+        """remove_file() deletes the file and its reservation."""
+        store = open_store(tmp_path)
+        store.write_file("cache.bin", b"x" * 10)
+        store.remove_file("cache.bin")
+
+        assert store.used == 0
+        assert store.read_file("cache.bin") is None
+
+    def test_write_atomic_round_trip(self, tmp_path):
+        """write_atomic replaces a file and leaves no temporary file."""
+        from shared.storage import read_atomic, write_atomic
+
+        path = str(tmp_path / "state.json")
+        write_atomic(path, b"old")
+        write_atomic(path, b"new")
+
+        assert read_atomic(path) == b"new"
+        assert not (tmp_path / "state.json.tmp").exists()
+        assert read_atomic(str(tmp_path / "missing"), default=b"") == b""
+
+    def test_store_stats_cover_all_logs(self, tmp_path):
+        """Store stats include every log's writes."""
+        store = open_store(tmp_path)
+        a = store.open_log("a", 512, 2)
+        b = store.open_log("b", 512, 2)
+        a.append(b"1")
+        a.commit()
+        b.append(b"22")
+        b.commit()
+
+        assert store.stats.logical_bytes == 3
+        assert store.stats.physical_bytes == a.stats.physical_bytes + b.stats.physical_bytes
+
+
+class TestFlashStats:
+    """Tests for the node-wide flash_stats() accounting."""
+
+    @pytest.fixture
+    def stats(self):
+        from shared.storage import flash_stats
+
+        stats = flash_stats()
+        stats.reset()
+        yield stats
+        stats.reset()
+
+    def _record(self, msg):
+        import logging
+
+        return logging.LogRecord("node", logging.INFO, "", 0, msg, (), None)
+
+    def test_write_atomic_is_counted(self, tmp_path, stats):
+        """State files written with write_atomic() are counted."""
+        from shared.storage import write_atomic
+
+        write_atomic(str(tmp_path / "state.json"), b"x" * 10)
+
+        assert stats.logical_bytes == 10
+        assert stats.commits == 1
+        assert stats.files_created == 1
+
+    def test_rotating_handler_writes_are_counted(self, tmp_path, stats):
+        """Log handler appends are counted at their file offsets."""
+        import logging
+
+        from shared.logging import RotatingFileHandler
+
+        path = str(tmp_path / "node.log")
+        for count in (3, 1):
+            # Reopening continues at the end of the existing file
+            handler = RotatingFileHandler(path, maxBytes=0)
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            for _ in range(count):
+                handler.emit(self._record("y" * 2047))
+            handler.close()
+
+        assert stats.logical_bytes == 4 * 2048
+        assert stats.commits == 4
+        # Offsets 0, 2048, 4096 and 6144 (after reopening): one sector each
+        assert stats.sector_writes == 4
+
+    def test_segment_roll_counts_rewrite(self, tmp_path, stats):
+        """Compressing a rolled segment adds physical bytes but no payload."""
+        from shared.logging import BufferedRotatingFileHandler
+        from shared.logging.segments import can_compress
+
+        if not can_compress():
+            pytest.skip("no compression on this platform")
+        handler = BufferedRotatingFileHandler(
+            str(tmp_path / "node.log"), maxBytes=200, bufferSize=0, compress=True
+        )
+        for i in range(20):
+            handler.emit(self._record(f"reading {i:03d}"))
+        handler.close()
+
+        written = sum(len(f"reading {i:03d}\n") for i in range(20))
+        assert stats.logical_bytes == written
+        assert stats.physical_bytes > written
+        assert stats.files_created >= 1
+
+    def test_store_writes_are_counted(self, tmp_path, stats):
+        """FlashStore writes reach flash_stats() as well as the store's stats."""
+        store = open_store(tmp_path)
+        log = store.open_log("events", 512, 2)
+        log.append(b"abc")
+        log.commit()
+        store.write_file("state", b"12345")
+
+        assert stats.logical_bytes == store.stats.logical_bytes == 8
+        assert stats.commits == store.stats.commits == 2
+
+
+class TestStoreLogHandler:
+    """Tests for the StoreLogHandler logging handler."""
+
+    def _record(self, msg, level=20):
+        import logging
+
+        return logging.LogRecord("node", level, "", 0, msg, (), None)
+
+    def test_commits_on_flush_level(self, tmp_path):
+        """WARNING records commit immediately; INFO waits for commitSize."""
+        from shared.logging import StoreLogHandler
+
+        log = open_store(tmp_path).open_log("log", slot_size=2048, slots=2)
+        handler = StoreLogHandler(log, commitSize=1000)
+        handler.emit(self._record("info"))
+        assert list(log.read()) == []
+
+        handler.emit(self._record("warning", level=30))
+        assert list(log.read()) == [b"info", b"warning"]
+
+    def test_commits_before_overflowing_slot(self, tmp_path):
+        """Pending records are committed rather than exceed a slot."""
+        from shared.logging import StoreLogHandler
+
+        log = open_store(tmp_path).open_log("log", slot_size=128, slots=3)
+        handler = StoreLogHandler(log, commitSize=10000)
+        for i in range(40):
+            handler.emit(self._record(f"line {i:02d}"))
+        handler.close()
+
+        records = list(log.read())
+        assert records[-1] == b"line 39"
+        assert records == sorted(records)